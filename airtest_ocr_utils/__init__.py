@@ -25,9 +25,31 @@ from .ocr_utils import (
     ocr_swipe,
     ocr_touch_multiple,
     ocr_find_text_with_offset,
+    ocr_touch_relative,
     ocr_wait_text,
     ocr_get_all_texts,
+    ocr_scroll_find,
+    ocr_flow,
 )
+from .ocr_results import OcrResultSet
+from .spatial_index import SpatialIndex
+from .ocr_pipeline import ScalePolicy
+from .text_tracker import TextTracker
+from .text_state import TextStateTracker, TextTrack
+from .result_cache import OcrResultCache
+from .frame_bus import FrameBus, frame_bus
+from .engine_pool import EnginePool
+from .engine_cache import EngineCache
+from .text_prefilter import TextPrefilter
+from .tiled_ocr import TilePolicy
+from .scroll_search import ScrollIndex, ScrollSearchResult
+from .ocr_flow import OcrFlow, FlowResult
+from .screen_change import StabilityGate
+from .flight_recorder import FlightRecorder
+from .resource_guard import BufferPool, MemoryGuard
+from .model_profiles import ModelProfile, register_profile, benchmark_profiles
+from .batch import run_batch
+from .ocr_server import OcrServer, RemoteOcrEngine
 
 # 导入OCR Watcher（后台监控器）
 try:
@@ -41,6 +63,8 @@ try:
         OcrEngine,
         DeviceController,
     )
+    from .watch_scheduler import WatchGovernor
+    from .callback_executor import CallbackExecutor
     _watcher_available = True
 except ImportError:
     _watcher_available = False
@@ -53,8 +77,38 @@ __all__ = [
     "ocr_swipe",
     "ocr_touch_multiple",
     "ocr_find_text_with_offset",
+    "ocr_touch_relative",
     "ocr_wait_text",
     "ocr_get_all_texts",
+    "ocr_scroll_find",
+    "ocr_flow",
+    "OcrResultSet",
+    "SpatialIndex",
+    "ScalePolicy",
+    "TextTracker",
+    "TextStateTracker",
+    "TextTrack",
+    "OcrResultCache",
+    "FrameBus",
+    "frame_bus",
+    "EnginePool",
+    "EngineCache",
+    "TextPrefilter",
+    "TilePolicy",
+    "ScrollIndex",
+    "ScrollSearchResult",
+    "OcrFlow",
+    "FlowResult",
+    "StabilityGate",
+    "FlightRecorder",
+    "BufferPool",
+    "MemoryGuard",
+    "ModelProfile",
+    "register_profile",
+    "benchmark_profiles",
+    "run_batch",
+    "OcrServer",
+    "RemoteOcrEngine",
 ]
 
 # 如果Watcher可用，添加到导出列表
@@ -68,6 +122,8 @@ if _watcher_available:
         "OcrResult",
         "OcrEngine",
         "DeviceController",
+        "WatchGovernor",
+        "CallbackExecutor",
     ])
 
 __version__ = "1.1.0"
\ No newline at end of file
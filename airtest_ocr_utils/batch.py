@@ -0,0 +1,289 @@
+"""
+批量离线识别
+对截图目录或通配符匹配的图片多进程并行OCR，结果按 ocr_recognize 的字典格式逐行写入JSONL，
+中断后重新运行会跳过已完成的图片
+
+命令行示例:
+    airtest-ocr-batch screenshots/ "archive/**/*.png" -o results.jsonl -j 4 --text 网络错误 --match-mode fuzzy
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+from .model_profiles import ModelProfile, PRELOAD_ENV, create_engine, get_profile, list_profiles
+from .ocr_pipeline import ScalePolicy, load_image, run_ocr
+from .text_match import MATCH_MODES, text_match
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+# 子进程内的引擎和识别参数（由 _init_worker 设置）
+_worker_state: Dict = {}
+
+
+# ==================== 输入与续跑 ====================
+
+def collect_images(inputs: Sequence[str], recursive: bool = True) -> List[str]:
+    """
+    展开输入为图片路径列表（绝对路径，去重后排序）
+
+    Args:
+        inputs: 图片文件、目录或通配符（支持 ** 递归）
+        recursive: 目录是否包含子目录
+    """
+    found: Set[str] = set()
+
+    def add(path: str):
+        if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+            found.add(os.path.abspath(path))
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                for name in files:
+                    add(os.path.join(root, name))
+                if not recursive:
+                    break
+        elif glob.has_magic(item):
+            for path in glob.glob(item, recursive=True):
+                add(path)
+        else:
+            add(item)
+    return sorted(found)
+
+
+def load_done(output: str) -> Set[str]:
+    """读取已有结果文件中识别成功的图片，出错的记录在续跑时重试，被中断写了一半的行忽略"""
+    done: Set[str] = set()
+    if not output or not os.path.exists(output):
+        return done
+    with open(output, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'image' in record and 'error' not in record:
+                done.add(record['image'])
+    return done
+
+
+def _open_output(output: Optional[str], resume: bool):
+    """打开结果文件：续跑时追加（补齐被截断的最后一行），否则覆盖；None或'-'输出到标准输出"""
+    if not output or output == '-':
+        return sys.stdout
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    if resume and os.path.exists(output) and os.path.getsize(output) > 0:
+        with open(output, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            truncated = f.read(1) != b'\n'
+        handle = open(output, 'a', encoding='utf-8')
+        if truncated:
+            handle.write('\n')
+        return handle
+    return open(output, 'w', encoding='utf-8')
+
+
+# ==================== 识别 ====================
+
+def process_image(engine, path: str, scale_policy: ScalePolicy = None, cls: bool = True,
+                  confidence: float = None, texts: Sequence[str] = None, match_mode: str = 'contains',
+                  fuzzy_max_edits: int = None) -> Dict:
+    """
+    识别单张图片，返回一条JSONL记录
+
+    Returns:
+        {'image', 'width', 'height', 'elapsed', 'results'}，指定 texts 时 results 只保留匹配的文字，
+        并附加 'matched'（是否匹配）和 'matched_texts'（匹配到的目标文字）；出错时为 {'image', 'error'}
+    """
+    start = time.time()
+    try:
+        img = load_image(path)
+        if img is None:
+            raise ValueError("Unable to decode image")
+        results = run_ocr(engine, img, scale_policy, cls=cls).filter_confidence(confidence)
+    except Exception as e:
+        return {'image': path, 'error': f"{type(e).__name__}: {e}"}
+
+    record = {'image': path, 'width': int(img.shape[1]), 'height': int(img.shape[0])}
+    if texts:
+        hits = [[target for target in texts if text_match(text, target, match_mode, fuzzy_max_edits)]
+                for text in results.texts.tolist()]
+        results = results.take(np.asarray([bool(matched) for matched in hits], dtype=bool))
+        matched_texts = sorted({target for matched in hits for target in matched})
+        record.update({'matched': bool(matched_texts), 'matched_texts': matched_texts})
+    record['results'] = results.to_dicts()
+    record['elapsed'] = round(time.time() - start, 4)
+    return record
+
+
+def _init_worker(lang: str, use_gpu: bool, profile: ModelProfile, options: Dict):
+    """子进程初始化：每个进程创建一个引擎"""
+    _worker_state['engine'] = create_engine(profile, lang=lang, use_gpu=use_gpu, show_log=False)
+    _worker_state['options'] = options
+
+
+def _worker_process(path: str) -> Dict:
+    return process_image(_worker_state['engine'], path, **_worker_state['options'])
+
+
+def _iter_records(paths: List[str], workers: int, lang: str, use_gpu: bool, profile: ModelProfile,
+                  options: Dict) -> Iterator[Dict]:
+    """按完成顺序产出识别记录；workers为0时在当前进程中识别"""
+    if workers <= 0:
+        engine = create_engine(profile, lang=lang, use_gpu=use_gpu, show_log=False)
+        for path in paths:
+            yield process_image(engine, path, **options)
+        return
+
+    # 子进程不需要包内全局实例的引擎，关闭预加载；spawn避免复制父进程中的模型和加载线程
+    previous = os.environ.get(PRELOAD_ENV)
+    os.environ[PRELOAD_ENV] = "0"
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(lang, use_gpu, profile, options))
+    pending = set()
+    try:
+        queue = iter(paths)
+        window = workers * 4  # 限制排队的任务数，大目录也不会一次性提交
+        while True:
+            for path in queue:
+                pending.add(executor.submit(_worker_process, path))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+        if previous is None:
+            os.environ.pop(PRELOAD_ENV, None)
+        else:
+            os.environ[PRELOAD_ENV] = previous
+
+
+def run_batch(inputs: Sequence[str], output: Optional[str] = None, workers: int = 2, lang: str = 'ch',
+              use_gpu: bool = False, profile: Union[str, ModelProfile, None] = None,
+              scale_policy: ScalePolicy = None, confidence: float = None, texts: Sequence[str] = None,
+              match_mode: str = 'contains', fuzzy_max_edits: int = None,
+              resume: bool = True, recursive: bool = True, progress: bool = True) -> Dict[str, float]:
+    """
+    批量识别图片并写出JSONL
+
+    Args:
+        inputs: 图片文件、目录或通配符
+        output: 结果文件路径，None或'-'表示标准输出（不支持续跑）
+        workers: 工作进程数，每个进程加载一个引擎；0表示在当前进程中识别
+        profile: 模型配置档
+        scale_policy: 检测缩放策略
+        confidence: 置信度阈值，None表示不过滤
+        texts: 目标文字，指定后只保留匹配的文字并标记图片是否匹配
+        match_mode: 匹配模式，同 ocr_touch 的 match_mode
+        fuzzy_max_edits: fuzzy模式允许的最大错字数，None表示按目标文字长度
+        resume: 是否跳过结果文件中已成功识别的图片
+        recursive: 目录是否包含子目录
+        progress: 是否在标准错误输出进度
+
+    Returns:
+        统计：total、skipped、processed、errors、matched、elapsed
+    """
+    if match_mode not in MATCH_MODES:
+        raise ValueError(f"Unsupported match mode: {match_mode}, expected one of {MATCH_MODES}")
+    profile = get_profile(profile)
+    paths = collect_images(inputs, recursive=recursive)
+    to_stdout = not output or output == '-'
+    done = load_done(output) if resume and not to_stdout else set()
+    todo = [path for path in paths if path not in done]
+    stats = {'total': len(paths), 'skipped': len(paths) - len(todo), 'processed': 0, 'errors': 0,
+             'matched': 0, 'elapsed': 0.0}
+    if progress and stats['skipped']:
+        print(f"⚠️ 跳过已完成的 {stats['skipped']} 张图片", file=sys.stderr)
+
+    options = {'scale_policy': scale_policy, 'cls': profile.use_angle_cls, 'confidence': confidence,
+               'texts': list(texts) if texts else None, 'match_mode': match_mode,
+               'fuzzy_max_edits': fuzzy_max_edits}
+    start = time.time()
+    handle = _open_output(output, resume)
+    try:
+        for record in _iter_records(todo, workers, lang, use_gpu, profile, options):
+            handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+            handle.flush()
+            stats['processed'] += 1
+            if 'error' in record:
+                stats['errors'] += 1
+                status = f"❌ {record['error']}"
+            else:
+                stats['matched'] += int(record.get('matched', False))
+                status = f"{len(record['results'])} texts, {record['elapsed']:.2f}s"
+                if record.get('matched'):
+                    status = f"✅ {', '.join(record['matched_texts'])} | " + status
+            if progress:
+                print(f"[{stats['skipped'] + stats['processed']}/{stats['total']}] {record['image']} {status}",
+                      file=sys.stderr)
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+        stats['elapsed'] = time.time() - start
+    if progress:
+        print(f"✅ 完成: 识别 {stats['processed']} 张, 出错 {stats['errors']} 张, 匹配 {stats['matched']} 张, "
+              f"耗时 {stats['elapsed']:.1f}s", file=sys.stderr)
+    return stats
+
+
+# ==================== 命令行 ====================
+
+def main(argv: Sequence[str] = None) -> int:
+    """命令行入口 airtest-ocr-batch"""
+    parser = argparse.ArgumentParser(prog="airtest-ocr-batch", description="批量离线识别截图，结果输出为JSONL")
+    parser.add_argument("inputs", nargs="+", help="图片文件、目录或通配符（支持 **）")
+    parser.add_argument("-o", "--output", default="-", help="结果JSONL文件，默认输出到标准输出")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="工作进程数，0表示在当前进程中识别")
+    parser.add_argument("--lang", default="ch", help="识别语言")
+    parser.add_argument("--gpu", action="store_true", help="使用GPU")
+    parser.add_argument("--profile", default=None, help="模型配置档：default / mobile / server 或模型目录")
+    parser.add_argument("--det-max-side", type=int, default=None, help="检测缩放的最长边，不指定则不缩放")
+    parser.add_argument("--confidence", type=float, default=None, help="置信度阈值")
+    parser.add_argument("--text", action="append", dest="texts", help="目标文字，可重复指定")
+    parser.add_argument("--match-mode", default="contains", choices=MATCH_MODES, help="匹配模式")
+    parser.add_argument("--fuzzy-max-edits", type=int, default=None,
+                        help="fuzzy模式允许的最大错字数，默认按目标文字长度")
+    parser.add_argument("--no-resume", action="store_true", help="覆盖结果文件，重新识别全部图片")
+    parser.add_argument("--no-recursive", action="store_true", help="目录不包含子目录")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    args = parser.parse_args(argv)
+
+    profile = args.profile
+    if profile and os.path.isdir(profile):
+        profile = ModelProfile.from_dir(os.path.basename(os.path.normpath(profile)), profile)
+    elif profile and profile not in list_profiles():
+        parser.error(f"--profile: 未知的配置档 {profile!r}，可选 {', '.join(list_profiles())} 或模型目录")
+    to_stdout = args.output == '-'
+    if to_stdout and not args.no_resume:
+        print("⚠️ 结果输出到标准输出，无法跳过已完成的图片；需要中断后续跑时请用 -o 指定结果文件", file=sys.stderr)
+    try:
+        stats = run_batch(args.inputs, output=args.output, workers=args.workers, lang=args.lang,
+                          use_gpu=args.gpu, profile=profile,
+                          scale_policy=ScalePolicy(args.det_max_side) if args.det_max_side else None,
+                          confidence=args.confidence, texts=args.texts, match_mode=args.match_mode,
+                          fuzzy_max_edits=args.fuzzy_max_edits, resume=not args.no_resume,
+                          recursive=not args.no_recursive, progress=not args.quiet)
+    except KeyboardInterrupt:
+        print("⚠️ 已中断" + ("" if to_stdout else "，重新运行相同命令可继续"), file=sys.stderr)
+        return 130
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+批量离线识别的类型存根文件
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+from .model_profiles import ModelProfile
+from .ocr_pipeline import ScalePolicy
+
+IMAGE_EXTENSIONS: tuple
+
+def collect_images(inputs: Sequence[str], recursive: bool = True) -> List[str]: ...
+def load_done(output: str) -> Set[str]: ...
+def process_image(engine: Any, path: str, scale_policy: ScalePolicy = None, cls: bool = True,
+                  confidence: float = None, texts: Sequence[str] = None, match_mode: str = 'contains',
+                  fuzzy_max_edits: int = None) -> Dict: ...
+def run_batch(inputs: Sequence[str], output: Optional[str] = None, workers: int = 2, lang: str = 'ch',
+              use_gpu: bool = False, profile: Union[str, ModelProfile, None] = None,
+              scale_policy: ScalePolicy = None, confidence: float = None, texts: Sequence[str] = None,
+              match_mode: str = 'contains', fuzzy_max_edits: int = None,
+              resume: bool = True, recursive: bool = True, progress: bool = True) -> Dict[str, float]: ...
+def main(argv: Sequence[str] = None) -> int: ...
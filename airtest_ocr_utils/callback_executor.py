@@ -0,0 +1,222 @@
+"""
+回调执行器
+OcrWatcher 将规则回调交给有界线程池执行，慢回调或卡死的回调不会阻塞监控线程
+同一规则的回调按提交顺序串行执行，不同规则之间并行
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Optional
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+class _Task:
+    __slots__ = ('fn', 'args', 'label', 'submitted', 'started', 'timed_out')
+
+    def __init__(self, fn: Callable, args: tuple, label: str):
+        self.fn = fn
+        self.args = args
+        self.label = label
+        self.submitted = time.time()
+        self.started = 0.0
+        self.timed_out = False
+
+
+class _Worker:
+    __slots__ = ('thread', 'retired')
+
+    def __init__(self):
+        self.thread: Optional[threading.Thread] = None
+        self.retired = False  # 执行的回调超时后退役，由新线程补位
+
+
+class CallbackExecutor:
+    """
+    有界回调执行器
+
+    Args:
+        max_workers: 工作线程数
+        max_pending: 每个规则最多排队的回调数
+        timeout: 单个回调的超时时间（秒），超时的回调记为卡死并补充新的工作线程，None表示不检测
+        overflow: 规则队列已满时的处理策略
+            'drop_oldest' - 丢弃最早排队的回调（默认，保留最新画面的结果）
+            'drop_newest' - 丢弃新提交的回调
+            'block' - 阻塞提交方直到有空位
+        logger: 日志对象
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 4, timeout: Optional[float] = 10.0,
+                 overflow: str = 'drop_oldest', logger: logging.Logger = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}, expected one of {OVERFLOW_POLICIES}")
+        self.max_workers = max(int(max_workers), 1)
+        self.max_pending = max(int(max_pending), 1)
+        self.timeout = timeout
+        self.overflow = overflow
+        self.logger = logger or logging.getLogger("CallbackExecutor")
+
+        self._cond = threading.Condition()
+        self._queues: Dict[Hashable, Deque[_Task]] = {}
+        self._ready: Deque[Hashable] = deque()        # 有待执行回调且当前未在执行的规则
+        self._running: Dict[Hashable, _Task] = {}
+        self._workers: Dict[_Worker, Optional[_Task]] = {}
+        self._supervisor: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {'submitted': 0, 'completed': 0, 'errors': 0, 'dropped': 0,
+                      'timeouts': 0, 'late_completions': 0, 'total_latency': 0.0, 'max_latency': 0.0}
+        self.slow_callbacks: Dict[str, int] = {}      # 规则标签 -> 超时次数
+
+    # ==================== 提交 ====================
+
+    def submit(self, key: Hashable, fn: Callable, *args, label: str = None) -> bool:
+        """
+        提交回调，同一key的回调按提交顺序串行执行
+
+        Returns:
+            是否已入队（drop_newest策略下队列已满返回False）
+        """
+        task = _Task(fn, args, label if label is not None else str(key))
+        with self._cond:
+            self._closed = False
+            queue = self._queues.setdefault(key, deque())
+            if len(queue) >= self.max_pending:
+                if self.overflow == 'drop_newest':
+                    self.stats['dropped'] += 1
+                    return False
+                if self.overflow == 'drop_oldest':
+                    queue.popleft()
+                    self.stats['dropped'] += 1
+                else:
+                    while len(queue) >= self.max_pending and not self._closed:
+                        self._cond.wait(0.1)
+                    if self._closed:
+                        self.stats['dropped'] += 1
+                        return False
+            queue.append(task)
+            self.stats['submitted'] += 1
+            if key not in self._running and key not in self._ready:
+                self._ready.append(key)
+            self._ensure_threads()
+            self._cond.notify_all()
+        return True
+
+    def _ensure_threads(self):
+        """补足工作线程和超时监视线程（调用方持有锁）"""
+        active = sum(1 for worker in self._workers if not worker.retired)
+        for _ in range(self.max_workers - active):
+            worker = _Worker()
+            worker.thread = threading.Thread(name="OcrWatcherCallback", target=self._work,
+                                             args=(worker,), daemon=True)
+            self._workers[worker] = None
+            worker.thread.start()
+        if self.timeout and (self._supervisor is None or not self._supervisor.is_alive()):
+            self._supervisor = threading.Thread(name="OcrWatcherCallbackSupervisor",
+                                                target=self._supervise, daemon=True)
+            self._supervisor.start()
+
+    # ==================== 执行 ====================
+
+    def _work(self, worker: _Worker):
+        while True:
+            with self._cond:
+                while not self._ready and not self._closed:
+                    self._cond.wait(0.5)
+                if not self._ready:
+                    self._workers.pop(worker, None)
+                    return
+                key = self._ready.popleft()
+                task = self._queues[key].popleft()
+                task.started = time.time()
+                self._running[key] = task
+                self._workers[worker] = task
+
+            try:
+                task.fn(*task.args)
+                ok = True
+            except Exception as e:
+                ok = False
+                self.logger.error(f"Callback error [{task.label}]: {e}", exc_info=True)
+
+            with self._cond:
+                elapsed = time.time() - task.started
+                self._running.pop(key, None)
+                self._workers[worker] = None
+                self.stats['completed' if ok else 'errors'] += 1
+                self.stats['total_latency'] += elapsed
+                self.stats['max_latency'] = max(self.stats['max_latency'], elapsed)
+                if task.timed_out:
+                    self.stats['late_completions'] += 1
+                    self.logger.warning(f"Callback [{task.label}] finished after {elapsed:.1f}s")
+                queue = self._queues.get(key)
+                if queue:
+                    self._ready.append(key)
+                elif queue is not None:
+                    del self._queues[key]
+                self._cond.notify_all()
+                if worker.retired:
+                    self._workers.pop(worker, None)
+                    return
+
+    def _supervise(self):
+        """定期检查执行中的回调，超时的记为卡死并补充工作线程"""
+        while True:
+            with self._cond:
+                if self._closed and not self._running:
+                    return
+                now = time.time()
+                for worker, task in list(self._workers.items()):
+                    if task is None or task.timed_out or now - task.started <= self.timeout:
+                        continue
+                    task.timed_out = True
+                    worker.retired = True
+                    self.stats['timeouts'] += 1
+                    self.slow_callbacks[task.label] = self.slow_callbacks.get(task.label, 0) + 1
+                    self.logger.warning(f"Callback [{task.label}] exceeded {self.timeout}s, "
+                                        f"starting a replacement worker")
+                if not self._closed:
+                    self._ensure_threads()
+                self._cond.wait(max(self.timeout / 4.0, 0.05))
+
+    # ==================== 管理 ====================
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0, cancel_pending: bool = True):
+        """
+        停止执行器
+        :param cancel_pending: 是否丢弃尚未开始的回调
+        :param timeout: 等待执行中回调结束的最长时间（秒）
+        """
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                dropped = sum(len(queue) for queue in self._queues.values())
+                self.stats['dropped'] += dropped
+                self._queues = {key: deque() for key in self._running}
+                self._ready.clear()
+            self._cond.notify_all()
+            # 已判定卡死的回调不再等待
+            threads = [worker.thread for worker in self._workers if not worker.retired]
+        if wait:
+            deadline = time.time() + timeout
+            for thread in threads:
+                thread.join(max(deadline - time.time(), 0))
+
+    def pending(self) -> int:
+        """排队中的回调数"""
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def get_stats(self) -> Dict:
+        """执行统计：提交/完成/出错/丢弃/超时次数、排队与执行中数量、平均和最长耗时、各规则超时次数"""
+        with self._cond:
+            stats = dict(self.stats)
+            finished = stats['completed'] + stats['errors']
+            total_latency = stats.pop('total_latency')
+            stats['avg_latency'] = total_latency / finished if finished else 0.0
+            stats['pending'] = sum(len(queue) for queue in self._queues.values())
+            stats['running'] = len(self._running)
+            stats['hung'] = sum(1 for task in self._running.values() if task.timed_out)
+            stats['slow_callbacks'] = dict(self.slow_callbacks)
+        return stats
@@ -0,0 +1,24 @@
+"""
+回调执行器的类型存根文件
+"""
+
+import logging
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+OVERFLOW_POLICIES: Tuple[str, ...]
+
+class CallbackExecutor:
+    max_workers: int
+    max_pending: int
+    timeout: Optional[float]
+    overflow: str
+    logger: logging.Logger
+    stats: Dict[str, float]
+    slow_callbacks: Dict[str, int]
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 4, timeout: Optional[float] = 10.0,
+                 overflow: str = 'drop_oldest', logger: logging.Logger = None) -> None: ...
+    def submit(self, key: Hashable, fn: Callable, *args, label: str = None) -> bool: ...
+    def shutdown(self, wait: bool = True, timeout: float = 5.0, cancel_pending: bool = True) -> None: ...
+    def pending(self) -> int: ...
+    def get_stats(self) -> Dict: ...
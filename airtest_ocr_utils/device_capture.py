@@ -0,0 +1,45 @@
+"""
+设备画面截取
+通过Airtest当前连接的设备截图（Android / iOS / Windows 通用），区域截图在内存中按视图裁剪，坐标与 touch 一致
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from airtest.core.helper import G
+
+from .frame_bus import Region, clip_region, crop_frame
+
+
+def device_snapshot(device=None) -> Optional[np.ndarray]:
+    """
+    截取设备整帧画面
+
+    Args:
+        device: Airtest设备对象，None表示当前连接的设备 G.DEVICE
+
+    Returns:
+        BGR数组，截图失败返回None
+    """
+    device = device if device is not None else G.DEVICE
+    return device.snapshot(filename=None)
+
+
+def capture_region(region: Region = None, device=None) -> Tuple[Optional[np.ndarray], Region]:
+    """
+    截取设备画面中的区域
+
+    Args:
+        region: 区域 (x1, y1, x2, y2)，设备屏幕坐标，None表示全屏
+        device: Airtest设备对象，None表示当前连接的设备
+
+    Returns:
+        (画面, 实际区域)：区域按画面范围裁剪，画面为整帧的视图（不复制）；截图失败或区域为空时画面为None
+    """
+    frame = device_snapshot(device)
+    if frame is None:
+        return None, region
+    region = clip_region(region, frame.shape)
+    if region is not None and (region[2] <= region[0] or region[3] <= region[1]):
+        return None, region
+    return crop_frame(frame, region), region
@@ -0,0 +1,11 @@
+"""
+设备画面截取的类型存根文件
+"""
+
+from typing import Any, Optional, Tuple
+import numpy as np
+
+Region = Optional[Tuple[int, int, int, int]]
+
+def device_snapshot(device: Any = None) -> Optional[np.ndarray]: ...
+def capture_region(region: Region = None, device: Any = None) -> Tuple[Optional[np.ndarray], Region]: ...
@@ -0,0 +1,287 @@
+"""
+多语言引擎缓存
+按语言按需加载识别模型，检测模型相同的语言共用一个检测器，超出内存预算时淘汰最久未使用的语言模型；
+供同一个 OCRUtils / OcrWatcher 在调用或规则级别切换识别语言
+"""
+
+import gc
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Union
+
+from .engine_pool import EnginePool
+from .model_profiles import ModelProfile, create_engine, get_profile
+from .ocr_pipeline import ScalePolicy, detect_boxes, load_image, recognize_boxes, run_ocr
+from .ocr_results import OcrResultSet
+from .resource_guard import process_rss
+
+# 检测器共用方式：family 同一检测模型的语言共用，all 全部语言共用基础语言的检测器，none 不共用
+SHARE_MODES = ('family', 'all', 'none')
+
+# 无法读取进程内存时每个语言模型的估计占用（MB）
+DEFAULT_FOOTPRINT_MB = 120.0
+
+# PaddleOCR按语言选择检测模型：ch、en（含拉丁字母语言）各自一个，其余语言共用多语言（ml）检测模型
+_LATIN_LANGS = {
+    'af', 'az', 'bs', 'cs', 'cy', 'da', 'de', 'es', 'et', 'fr', 'ga', 'hr', 'hu', 'id', 'is', 'it', 'ku', 'la',
+    'lt', 'lv', 'mi', 'ms', 'mt', 'nl', 'no', 'oc', 'pi', 'pl', 'pt', 'ro', 'rs_latin', 'sk', 'sl', 'sq', 'sv',
+    'sw', 'tl', 'tr', 'uz', 'vi', 'french', 'german', 'latin',
+}
+
+_MB = 1024 * 1024
+
+
+def detector_family(lang: str, profile: Union[str, ModelProfile, None] = None) -> str:
+    """
+    语言使用的检测模型：同一family的语言检测结果完全相同，可以共用一个检测器
+
+    配置档指定了检测模型目录时所有语言都使用该模型
+    """
+    if get_profile(profile).det_model_dir:
+        return 'custom'
+    if lang == 'ch':
+        return 'ch'
+    if lang == 'en' or lang in _LATIN_LANGS:
+        return 'en'
+    return 'ml'
+
+
+def _drop_detector(engine):
+    """释放只用于识别的引擎内部的检测器（PaddleOCR的text_detector），检测由共用的检测器完成"""
+    if getattr(engine, 'text_detector', None) is not None:
+        engine.text_detector = None
+
+
+class _CacheEntry:
+    __slots__ = ('lang', 'pool', 'detector', 'pinned', 'footprint', 'users', 'hits')
+
+    def __init__(self, lang: str, pool: EnginePool, detector: bool, pinned: bool):
+        self.lang = lang
+        self.pool = pool
+        self.detector = detector  # 是否保留检测器（作为同组语言的共用检测器）
+        self.pinned = pinned  # 常驻，不参与淘汰
+        self.footprint = 0  # 估计内存占用（字节），外部传入的引擎池不计入
+        self.users = 0  # 正在使用的调用数
+        self.hits = 0
+
+
+class EngineCache:
+    """
+    多语言引擎缓存
+
+    每种语言一个引擎池，第一次使用时加载。检测器按 share_detector 共用：非检测器语言的引擎加载后释放
+    内部检测器，识别时先用共用检测器检测文字框、再用该语言的引擎识别。加载前后的进程内存差作为模型
+    占用估计，总占用超过 memory_budget_mb 时淘汰最久未使用且空闲的语言（检测器和基础语言常驻，
+    最近使用的语言至少保留一个）
+
+    Args:
+        profile: 模型配置档
+        base_lang: 基础语言，'all' 模式下作为所有语言的检测器
+        use_gpu: 是否使用GPU
+        memory_budget_mb: 语言模型的内存预算（MB），None表示不淘汰
+        share_detector: 检测器共用方式，见 SHARE_MODES
+        pool_size: 每种语言的最大引擎数
+        base_pool: 基础语言已有的引擎池（如 OCRUtils 的引擎池），直接复用且不计入预算
+        warmup: 加载后是否预热
+        default_footprint_mb: 无法读取进程内存时每个引擎的估计占用
+    """
+
+    def __init__(self, profile: Union[str, ModelProfile, None] = None, base_lang: str = 'ch',
+                 use_gpu: bool = False, memory_budget_mb: float = None, share_detector: str = 'family',
+                 pool_size: int = 1, base_pool: EnginePool = None, warmup: bool = True,
+                 default_footprint_mb: float = DEFAULT_FOOTPRINT_MB):
+        if share_detector not in SHARE_MODES:
+            raise ValueError(f"Unsupported detector sharing: {share_detector}, expected one of {SHARE_MODES}")
+        self.profile = get_profile(profile)
+        self.base_lang = base_lang
+        self.use_gpu = use_gpu
+        self.memory_budget_mb = memory_budget_mb
+        self.share_detector = share_detector
+        self.pool_size = max(int(pool_size), 1)
+        self.warmup = warmup
+        self.default_footprint_mb = default_footprint_mb
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()  # 按最近使用排序，最久未使用在前
+        self._detectors: Dict[str, str] = {}  # 检测模型 -> 作为检测器的语言
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # 串行加载，进程内存差才能归到对应的语言
+        self.stats = {'loads': 0, 'evictions': 0, 'hits': 0, 'misses': 0}
+        if base_pool is not None:
+            self._entries[base_lang] = _CacheEntry(base_lang, base_pool, detector=True, pinned=True)
+
+    # ==================== 识别 ====================
+
+    def recognize(self, image, lang: str, scale_policy: ScalePolicy = None, cls: bool = True) -> OcrResultSet:
+        """
+        用指定语言识别图片（路径、字节或BGR数组），返回图片内坐标
+
+        共用检测器时在检测器语言的引擎上检测文字框（按缩放策略缩小检测），再用该语言的引擎批量识别
+        """
+        detector = self.detector_lang(lang)
+        if detector == lang:
+            with self.engine(lang) as ocr:
+                return run_ocr(ocr, image, scale_policy, cls=cls)
+        img = load_image(image)
+        if img is None:
+            return OcrResultSet.empty()
+        scale = scale_policy.scale_for(img.shape) if scale_policy is not None else 1.0
+        with self.engine(detector) as ocr:
+            boxes = detect_boxes(ocr, img, scale)
+        if len(boxes) == 0:
+            return OcrResultSet.empty()
+        with self.engine(lang) as ocr:
+            return recognize_boxes(ocr, img, boxes, cls=cls)
+
+    def detector_lang(self, lang: str) -> str:
+        """该语言使用哪种语言的引擎做检测（返回自身表示不共用）"""
+        if self.share_detector == 'none':
+            return lang
+        if self.share_detector == 'all':
+            return self.base_lang
+        family = detector_family(lang, self.profile)
+        with self._lock:
+            detector = self._detectors.get(family)
+            if detector is None:
+                # 基础语言属于同一检测模型时由它担任检测器，否则由该组第一个使用的语言担任
+                detector = self.base_lang if detector_family(self.base_lang, self.profile) == family else lang
+                self._detectors[family] = detector
+        return detector
+
+    @contextmanager
+    def engine(self, lang: str) -> Iterator:
+        """借用该语言的引擎，未加载时加载；归还后按内存预算淘汰"""
+        entry = self._checkout(lang)
+        try:
+            with entry.pool.engine() as ocr:
+                yield ocr
+        finally:
+            with self._lock:
+                entry.users -= 1
+            self._evict()
+
+    def _checkout(self, lang: str) -> _CacheEntry:
+        detector = self.detector_lang(lang) == lang
+        with self._lock:
+            entry = self._entries.get(lang)
+            if entry is None:
+                # 检测器和基础语言常驻
+                entry = _CacheEntry(lang, None, detector=detector, pinned=detector or lang == self.base_lang)
+                entry.pool = EnginePool(self._engine_factory(entry), size=self.pool_size)
+                self._entries[lang] = entry
+                self.stats['misses'] += 1
+            else:
+                entry.hits += 1
+                self.stats['hits'] += 1
+            self._entries.move_to_end(lang)
+            entry.users += 1
+        return entry
+
+    def _engine_factory(self, entry: _CacheEntry):
+        def factory():
+            with self._load_lock:
+                before = process_rss()
+                # 预热需要完整流程，在释放检测器之前进行
+                ocr = create_engine(self.profile, lang=entry.lang, use_gpu=self.use_gpu, warmup=self.warmup,
+                                    show_log=False)
+                if not entry.detector:
+                    _drop_detector(ocr)
+                    gc.collect()
+                after = process_rss()
+            if before is not None and after is not None and after > before:
+                footprint = after - before
+            else:
+                footprint = int(self.default_footprint_mb * _MB)
+            with self._lock:
+                entry.footprint += footprint
+                self.stats['loads'] += 1
+            return ocr
+        return factory
+
+    # ==================== 预加载与淘汰 ====================
+
+    def preload(self, langs: Sequence[str]):
+        """提前加载语言模型（同时加载其检测器），超出预算时仍按最近使用淘汰"""
+        for lang in langs:
+            detector = self.detector_lang(lang)
+            if detector != lang:
+                with self.engine(detector):
+                    pass
+            with self.engine(lang):
+                pass
+
+    def _evict(self):
+        """总占用超过预算时，从最久未使用的语言开始淘汰空闲且非常驻的语言"""
+        if self.memory_budget_mb is None:
+            return
+        budget = int(self.memory_budget_mb * _MB)
+        evicted = []
+        with self._lock:
+            total = sum(entry.footprint for entry in self._entries.values())
+            newest = next(reversed(self._entries), None)
+            for lang, entry in list(self._entries.items()):
+                if total <= budget:
+                    break
+                if entry.pinned or entry.users or lang == newest or not entry.footprint:
+                    continue
+                del self._entries[lang]
+                total -= entry.footprint
+                evicted.append(entry)
+                self.stats['evictions'] += 1
+        if evicted:
+            del evicted
+            gc.collect()
+
+    def trim(self) -> int:
+        """淘汰全部空闲的非常驻语言（如内存超限时），返回淘汰数"""
+        with self._lock:
+            idle = [lang for lang, entry in self._entries.items() if not entry.pinned and not entry.users]
+            for lang in idle:
+                del self._entries[lang]
+            self.stats['evictions'] += len(idle)
+        if idle:
+            gc.collect()
+        return len(idle)
+
+    def evict(self, lang: str) -> bool:
+        """立即淘汰一种语言（常驻语言和正在使用的语言除外）"""
+        with self._lock:
+            entry = self._entries.get(lang)
+            if entry is None or entry.pinned or entry.users:
+                return False
+            del self._entries[lang]
+            self.stats['evictions'] += 1
+        gc.collect()
+        return True
+
+    def clear(self):
+        """释放全部由缓存加载的引擎（外部传入的基础语言引擎池保留）"""
+        with self._lock:
+            keep = [(lang, entry) for lang, entry in self._entries.items() if entry.pinned and not entry.footprint]
+            self._entries = OrderedDict(keep)
+            self._detectors.clear()
+        gc.collect()
+
+    def languages(self) -> List[str]:
+        """已加载的语言，按最近使用排序（最近使用的在后）"""
+        with self._lock:
+            return list(self._entries)
+
+    def __contains__(self, lang: str) -> bool:
+        with self._lock:
+            return lang in self._entries
+
+    def get_stats(self) -> Dict:
+        """缓存统计：加载/淘汰/命中次数，各语言的估计占用（MB）和总占用"""
+        with self._lock:
+            stats = dict(self.stats)
+            footprints = {lang: entry.footprint / _MB for lang, entry in self._entries.items()}
+            stats['detectors'] = dict(self._detectors)
+        stats['languages'] = list(footprints)
+        stats['footprint_mb'] = footprints
+        stats['memory_mb'] = float(sum(footprints.values()))
+        stats['memory_budget_mb'] = self.memory_budget_mb
+        return stats
+
+    def __repr__(self):
+        return (f"EngineCache(base_lang={self.base_lang!r}, languages={self.languages()}, "
+                f"share_detector={self.share_detector!r}, memory_budget_mb={self.memory_budget_mb})")
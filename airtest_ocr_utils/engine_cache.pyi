@@ -0,0 +1,43 @@
+"""
+多语言引擎缓存的类型存根文件
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .engine_pool import EnginePool
+from .model_profiles import ModelProfile
+from .ocr_pipeline import ScalePolicy
+from .ocr_results import OcrResultSet
+
+SHARE_MODES: Tuple[str, ...]
+DEFAULT_FOOTPRINT_MB: float
+
+def detector_family(lang: str, profile: Union[str, ModelProfile, None] = None) -> str: ...
+
+class EngineCache:
+    profile: ModelProfile
+    base_lang: str
+    use_gpu: bool
+    memory_budget_mb: Optional[float]
+    share_detector: str
+    pool_size: int
+    warmup: bool
+    default_footprint_mb: float
+    stats: Dict[str, int]
+
+    def __init__(self, profile: Union[str, ModelProfile, None] = None, base_lang: str = 'ch',
+                 use_gpu: bool = False, memory_budget_mb: float = None, share_detector: str = 'family',
+                 pool_size: int = 1, base_pool: EnginePool = None, warmup: bool = True,
+                 default_footprint_mb: float = ...) -> None: ...
+    def recognize(self, image: Any, lang: str, scale_policy: ScalePolicy = None, cls: bool = True) -> OcrResultSet: ...
+    def detector_lang(self, lang: str) -> str: ...
+    @contextmanager
+    def engine(self, lang: str) -> Iterator[Any]: ...
+    def preload(self, langs: Sequence[str]) -> None: ...
+    def trim(self) -> int: ...
+    def evict(self, lang: str) -> bool: ...
+    def clear(self) -> None: ...
+    def languages(self) -> List[str]: ...
+    def __contains__(self, lang: str) -> bool: ...
+    def get_stats(self) -> Dict: ...
@@ -0,0 +1,143 @@
+"""
+OCR引擎池
+PaddleOCR实例不能被多个线程同时使用，引擎池维护有限个实例，多线程调用时各自借用一个引擎；
+引擎全部忙碌时按到达顺序排队，归还的引擎直接交给最早等待的线程
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List
+
+
+class _Waiter:
+    __slots__ = ('event', 'engine', 'create')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.engine = None
+        self.create = False  # 扩容后由等待者自行创建引擎
+
+
+class EnginePool:
+    """
+    有界OCR引擎池
+
+    Args:
+        factory: 创建引擎的函数
+        size: 最大引擎数，引擎按需创建
+        engines: 已创建好的引擎（计入size）
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1, engines: List[Any] = None):
+        self.factory = factory
+        self.size = max(int(size), 1)
+        self._lock = threading.Lock()
+        self._idle: Deque[Any] = deque(engines or [])
+        self._created = len(self._idle)
+        self._waiters: Deque[_Waiter] = deque()
+        self.stats = {'acquisitions': 0, 'waits': 0, 'timeouts': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    def acquire(self, timeout: float = None) -> Any:
+        """
+        借用一个引擎，全部忙碌时排队等待
+
+        Raises:
+            TimeoutError: 超过timeout秒仍未借到引擎
+        """
+        start = time.time()
+        with self._lock:
+            if self._idle and not self._waiters:
+                self.stats['acquisitions'] += 1
+                return self._idle.popleft()
+            create = self._created < self.size and not self._waiters
+            if create:
+                self._created += 1
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self.stats['waits'] += 1
+
+        if create:
+            engine = self._create()
+            with self._lock:
+                self.stats['acquisitions'] += 1
+            return engine
+
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                if waiter.engine is None and not waiter.create:
+                    # 超时且尚未被分配，退出队列
+                    self._waiters.remove(waiter)
+                    self.stats['timeouts'] += 1
+                    raise TimeoutError(f"No OCR engine available within {timeout}s")
+        engine = self._create() if waiter.create else waiter.engine
+        waited = time.time() - start
+        with self._lock:
+            self.stats['acquisitions'] += 1
+            self.stats['total_wait'] += waited
+            self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+        return engine
+
+    def _create(self) -> Any:
+        """创建引擎（名额已预先计入_created）"""
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+                self._grant_creation()
+            raise
+
+    def _grant_creation(self):
+        """名额空出时让排队的线程自行创建引擎（调用方持有锁）"""
+        while self._created < self.size and self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.create = True
+            self._created += 1
+            waiter.event.set()
+
+    def release(self, engine: Any):
+        """归还引擎：有等待者时直接交给最早的等待者"""
+        with self._lock:
+            if self._created > self.size:
+                # 缩容后多出的引擎不再放回
+                self._created -= 1
+                return
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.engine = engine
+                waiter.event.set()
+            else:
+                self._idle.append(engine)
+
+    @contextmanager
+    def engine(self, timeout: float = None) -> Iterator[Any]:
+        """借用引擎的上下文管理器"""
+        engine = self.acquire(timeout)
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def resize(self, size: int):
+        """调整最大引擎数；缩小时空闲引擎立即释放，忙碌引擎归还时释放"""
+        with self._lock:
+            self.size = max(int(size), 1)
+            while self._created > self.size and self._idle:
+                self._idle.pop()
+                self._created -= 1
+            # 扩容时让排队的线程直接创建新引擎
+            self._grant_creation()
+
+    def get_stats(self) -> Dict[str, float]:
+        """引擎池统计：借用/排队/超时次数、平均和最长等待时间、引擎数量"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({'size': self.size, 'created': self._created, 'idle': len(self._idle),
+                          'waiting': len(self._waiters)})
+        waits = stats['waits'] - stats['timeouts']
+        total_wait = stats.pop('total_wait')
+        stats['avg_wait'] = total_wait / waits if waits > 0 else 0.0
+        return stats
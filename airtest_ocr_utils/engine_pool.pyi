@@ -0,0 +1,17 @@
+"""
+OCR引擎池的类型存根文件
+"""
+
+from typing import Any, Callable, ContextManager, Dict, List
+
+class EnginePool:
+    factory: Callable[[], Any]
+    size: int
+    stats: Dict[str, float]
+
+    def __init__(self, factory: Callable[[], Any], size: int = 1, engines: List[Any] = None) -> None: ...
+    def acquire(self, timeout: float = None) -> Any: ...
+    def release(self, engine: Any) -> None: ...
+    def engine(self, timeout: float = None) -> ContextManager[Any]: ...
+    def resize(self, size: int) -> None: ...
+    def get_stats(self) -> Dict[str, float]: ...
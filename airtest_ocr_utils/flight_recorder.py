@@ -0,0 +1,265 @@
+"""
+飞行记录器
+在内存中循环保存最近若干次识别的画面、识别结果和匹配判断，运行时只保存引用，
+超时、异常或手动请求时才把记录连同标注图片写到磁盘，代替每次调用都写调试图片的 debug=True
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+Region = Optional[Tuple[int, int, int, int]]
+
+
+class FlightEntry:
+    """
+    一条记录：一次识别的画面（区域截图，坐标偏移见region）、识别结果（屏幕坐标）和匹配判断
+
+    画面移出最近 raw_frames 条后在后台压缩为JPEG，image() 按需解码
+    """
+    __slots__ = ('seq', 'timestamp', 'source', 'event', 'region', 'results', 'decision', 'thread',
+                 '_image', '_jpeg')
+
+    def __init__(self, seq: int, source: str, event: str, image: Optional[np.ndarray], results: OcrResultSet,
+                 region: Region, decision: Optional[Dict]):
+        self.seq = seq
+        self.timestamp = time.time()
+        self.source = source
+        self.event = event
+        self.region = region
+        self.results = results
+        self.decision = dict(decision) if decision else {}
+        self.thread = threading.current_thread().name
+        self._image = image
+        self._jpeg: Optional[bytes] = None
+
+    def image(self) -> Optional[np.ndarray]:
+        """记录的画面（BGR），已压缩时解码"""
+        image = self._image
+        if image is not None:
+            return image
+        jpeg = self._jpeg
+        if jpeg is None:
+            return None
+        return cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+
+    @property
+    def nbytes(self) -> int:
+        """画面占用的内存（字节）"""
+        image = self._image
+        if image is not None:
+            return int(image.nbytes)
+        return len(self._jpeg) if self._jpeg is not None else 0
+
+    def to_dict(self) -> Dict:
+        """写入 records.json 的内容"""
+        bboxes = self.results.bboxes
+        return {
+            'seq': self.seq,
+            'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.timestamp))
+                    + f".{int(self.timestamp * 1000) % 1000:03d}",
+            'source': self.source,
+            'event': self.event,
+            'thread': self.thread,
+            'region': list(self.region) if self.region is not None else None,
+            'results': [{'index': i, 'text': str(text), 'confidence': round(float(conf), 4),
+                         'bbox': [round(float(v), 1) for v in bboxes[i]]}
+                        for i, (text, conf) in enumerate(zip(self.results.texts, self.results.confidences))],
+            'decision': self.decision,
+        }
+
+    def __repr__(self):
+        return (f"FlightEntry(seq={self.seq}, source={self.source!r}, event={self.event!r}, "
+                f"results={len(self.results)}, decision={self.decision!r})")
+
+
+class FlightRecorder:
+    """
+    最近识别记录的环形缓冲区
+
+    record() 只保存画面和结果的引用（画面来自每次新截图，之后不会被修改），开销可以忽略；
+    最近 raw_frames 条保留原始画面，更早的在后台线程压缩为JPEG，内存占用有上限。
+    dump() 把全部记录写到一个目录：每条一张标注图片（识别框为绿色，匹配判断中 matched_bbox 列出的命中框为红色，
+    框旁标注序号）和 records.json（文字、置信度、匹配判断，序号与图片对应）
+
+    Args:
+        capacity: 保留的记录条数
+        raw_frames: 保留原始画面的最近记录数，其余压缩
+        directory: 转储目录
+        jpeg_quality: 压缩质量
+        min_dump_interval: 自动转储（超时、异常）的最短间隔（秒），避免反复超时时连续写盘
+    """
+
+    def __init__(self, capacity: int = 30, raw_frames: int = 5, directory: str = "flight_records",
+                 jpeg_quality: int = 80, min_dump_interval: float = 10.0):
+        self.capacity = max(int(capacity), 1)
+        self.raw_frames = max(int(raw_frames), 1)
+        self.directory = directory
+        self.jpeg_quality = jpeg_quality
+        self.min_dump_interval = min_dump_interval
+        self._entries: "deque[FlightEntry]" = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 当前线程最近一条记录，供 note() 补充判断
+        self._seq = 0
+        self._compressor: Optional[ThreadPoolExecutor] = None
+        self._last_auto_dump = 0.0
+        self.stats = {'records': 0, 'compressed': 0, 'dumps': 0, 'suppressed': 0}
+
+    # ==================== 记录 ====================
+
+    def record(self, source: str, image: Optional[np.ndarray], results: OcrResultSet, region: Region = None,
+               event: str = "", decision: Dict = None) -> FlightEntry:
+        """
+        记录一次识别
+
+        Args:
+            source: 记录方，如 'OCRUtils' / 'OcrWatcher'
+            image: 识别的画面（区域截图），None表示没有画面
+            results: 识别结果（屏幕坐标）
+            region: 画面在屏幕上的区域，None表示全屏
+            event: 调用名称，如 'ocr_touch'
+            decision: 匹配判断，如目标文字、匹配模式、命中位置
+        """
+        with self._lock:
+            self._seq += 1
+            entry = FlightEntry(self._seq, source, event, image, OcrResultSet.coerce(results), region, decision)
+            self._entries.append(entry)
+            self.stats['records'] += 1
+            # 刚移出原始画面窗口的记录交给后台压缩
+            stale = self._entries[-1 - self.raw_frames] if len(self._entries) > self.raw_frames else None
+        self._local.entry = entry
+        if stale is not None and stale._image is not None:
+            self._compress_later(stale)
+        return entry
+
+    def note(self, **decision):
+        """为当前线程最近一条记录补充匹配判断（如调用方在识别之后才知道是否命中）"""
+        entry = getattr(self._local, 'entry', None)
+        if entry is not None:
+            entry.decision.update(decision)
+
+    def _compress_later(self, entry: FlightEntry):
+        if self._compressor is None:
+            with self._lock:
+                if self._compressor is None:
+                    self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FlightRecorder")
+        self._compressor.submit(self._compress, entry)
+
+    def _compress(self, entry: FlightEntry):
+        image = entry._image
+        # 排队期间已被挤出缓冲区的记录不再压缩
+        if image is None or image.size == 0 or entry.seq <= self._seq - self.capacity:
+            return
+        ok, buf = cv2.imencode('.jpg', np.ascontiguousarray(image), [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return
+        entry._jpeg = buf.tobytes()
+        entry._image = None
+        with self._lock:
+            self.stats['compressed'] += 1
+
+    # ==================== 转储 ====================
+
+    def dump(self, reason: str = "", directory: str = None) -> Optional[str]:
+        """
+        把当前全部记录写到磁盘，返回转储目录；没有记录时返回None
+
+        Args:
+            reason: 转储原因，写入目录名和 records.json
+            directory: 转储根目录，None表示初始化时的目录
+        """
+        with self._lock:
+            entries = list(self._entries)
+            self.stats['dumps'] += 1
+        if not entries:
+            return None
+        stamp = time.strftime('%Y%m%d_%H%M%S') + f"_{int(time.time() * 1000) % 1000:03d}"
+        name = re.sub(r'[\\/:*?"<>|\s]+', '_', reason).strip('_')[:60]
+        path = os.path.join(directory or self.directory, f"flight_{stamp}" + (f"_{name}" if name else ""))
+        os.makedirs(path, exist_ok=True)
+        records = []
+        for i, entry in enumerate(entries):
+            record = entry.to_dict()
+            image = entry.image()
+            if image is not None and image.size:
+                filename = f"{i:03d}_{entry.source}_{entry.event or 'ocr'}.jpg"
+                cv2.imwrite(os.path.join(path, filename), self._annotate(entry, image))
+                record['image'] = filename
+            records.append(record)
+        with open(os.path.join(path, "records.json"), 'w', encoding='utf-8') as f:
+            json.dump({'reason': reason, 'dumped_at': stamp, 'records': records}, f, ensure_ascii=False,
+                      indent=2, default=str)
+        return path
+
+    def auto_dump(self, reason: str) -> Optional[str]:
+        """自动转储（超时、异常时调用），距上次自动转储不足 min_dump_interval 秒时跳过"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_auto_dump < self.min_dump_interval:
+                self.stats['suppressed'] += 1
+                return None
+            self._last_auto_dump = now
+        return self.dump(reason)
+
+    @contextmanager
+    def dump_on_error(self, reason: str = "") -> Iterator["FlightRecorder"]:
+        """代码块抛出异常时转储后重新抛出"""
+        try:
+            yield self
+        except Exception as e:
+            self.auto_dump(f"{reason}_{type(e).__name__}" if reason else type(e).__name__)
+            raise
+
+    @staticmethod
+    def _annotate(entry: FlightEntry, image: np.ndarray) -> np.ndarray:
+        """在画面上标注识别框：命中的框（decision['matched_bbox']）为红色，其余为绿色，框旁为结果序号"""
+        img = np.ascontiguousarray(image).copy()
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        dx, dy = (entry.region[0], entry.region[1]) if entry.region is not None else (0, 0)
+        matched = np.zeros(len(entry.results), dtype=bool)
+        for bbox in entry.decision.get('matched_bbox') or []:
+            matched |= np.abs(entry.results.bboxes - np.asarray(bbox, dtype=np.float32)).max(axis=1) <= 1.0
+        for i in range(len(entry.results)):
+            points = (entry.results.points[i] - np.asarray([dx, dy], dtype=np.float32)).astype(np.int32)
+            color = (0, 0, 255) if matched[i] else (0, 255, 0)
+            cv2.polylines(img, [points], True, color, 2)
+            x, y = int(points[:, 0].min()), int(points[:, 1].min())
+            cv2.putText(img, str(i), (x, max(y - 4, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        return img
+
+    # ==================== 查询 ====================
+
+    def entries(self) -> List[FlightEntry]:
+        """当前全部记录，最早的在前"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, float]:
+        """记录器统计：记录数、压缩数、转储次数、被限流跳过的自动转储数，以及画面占用的内存（MB）"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['memory_mb'] = sum(entry.nbytes for entry in self._entries) / (1024 * 1024)
+        return stats
+
+    def __repr__(self):
+        return f"FlightRecorder(capacity={self.capacity}, entries={len(self)}, directory={self.directory!r})"
@@ -0,0 +1,48 @@
+"""
+飞行记录器的类型存根文件
+"""
+
+from typing import ContextManager, Dict, List, Optional, Tuple
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+Region = Optional[Tuple[int, int, int, int]]
+
+class FlightEntry:
+    seq: int
+    timestamp: float
+    source: str
+    event: str
+    region: Region
+    results: OcrResultSet
+    decision: Dict
+    thread: str
+
+    def __init__(self, seq: int, source: str, event: str, image: Optional[np.ndarray], results: OcrResultSet,
+                 region: Region, decision: Optional[Dict]) -> None: ...
+    def image(self) -> Optional[np.ndarray]: ...
+    @property
+    def nbytes(self) -> int: ...
+    def to_dict(self) -> Dict: ...
+
+class FlightRecorder:
+    capacity: int
+    raw_frames: int
+    directory: str
+    jpeg_quality: int
+    min_dump_interval: float
+    stats: Dict[str, int]
+
+    def __init__(self, capacity: int = 30, raw_frames: int = 5, directory: str = "flight_records",
+                 jpeg_quality: int = 80, min_dump_interval: float = 10.0) -> None: ...
+    def record(self, source: str, image: Optional[np.ndarray], results: OcrResultSet, region: Region = None,
+               event: str = "", decision: Dict = None) -> FlightEntry: ...
+    def note(self, **decision) -> None: ...
+    def dump(self, reason: str = "", directory: str = None) -> Optional[str]: ...
+    def auto_dump(self, reason: str) -> Optional[str]: ...
+    def dump_on_error(self, reason: str = "") -> ContextManager["FlightRecorder"]: ...
+    def entries(self) -> List[FlightEntry]: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+    def get_stats(self) -> Dict[str, float]: ...
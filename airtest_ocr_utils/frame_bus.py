@@ -0,0 +1,203 @@
+"""
+共享画面总线
+前台的 OCRUtils 调用和后台的 OcrWatcher 通过同一条总线获取截图和识别结果：
+画面在有效期内直接复用，同一画面同一区域只识别一次，并发请求等待正在进行的截图/识别完成
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+Region = Optional[Tuple[int, int, int, int]]
+
+
+def clip_region(region: Region, shape: Tuple[int, ...]) -> Region:
+    """将区域限制在画面范围内，None表示全屏"""
+    if region is None:
+        return None
+    h, w = shape[:2]
+    x1, y1 = min(max(int(region[0]), 0), w), min(max(int(region[1]), 0), h)
+    x2, y2 = min(max(int(region[2]), x1), w), min(max(int(region[3]), y1), h)
+    return (x1, y1, x2, y2)
+
+
+def crop_frame(image: np.ndarray, region: Region) -> np.ndarray:
+    """按区域裁剪画面（视图，不复制）"""
+    if region is None:
+        return image
+    x1, y1, x2, y2 = clip_region(region, image.shape)
+    return image[y1:y2, x1:x2]
+
+
+def _covers(outer: Region, inner: Region) -> bool:
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+class BusFrame:
+    """总线上的一帧画面及其识别结果（屏幕坐标，按识别区域保存）"""
+    __slots__ = ('image', 'timestamp', 'seq', 'source', '_results', '_pending')
+
+    def __init__(self, image: np.ndarray, seq: int, source: str = ""):
+        self.image = image
+        self.timestamp = time.time()
+        self.seq = seq
+        self.source = source
+        self._results: Dict[Region, OcrResultSet] = {}
+        self._pending: Set[Region] = set()
+
+    @property
+    def age(self) -> float:
+        """画面已存在的时间（秒）"""
+        return time.time() - self.timestamp
+
+    def _lookup(self, region: Region) -> Optional[OcrResultSet]:
+        """查找覆盖该区域的已有结果，范围更大的结果按文字中心裁剪到区域内"""
+        if region in self._results:
+            return self._results[region]
+        for key, results in self._results.items():
+            if _covers(key, region):
+                return results.in_region(region)
+        return None
+
+    def _waiting_for(self, region: Region) -> bool:
+        return any(_covers(key, region) for key in self._pending)
+
+
+class FrameBus:
+    """
+    进程内共享的画面/识别结果总线
+
+    只保留最新一帧；各消费者通过 max_age 指定可接受的画面新鲜度。
+    点击、滑动等操作后调用 clear()，之后的请求不会再复用操作前的画面和识别结果
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest: Optional[BusFrame] = None
+        self._capturing = False
+        self._seq = 0
+        self._generation = 0  # clear() 时递增，操作前开始的截图不再发布为最新画面
+        self.stats = {'captures': 0, 'frame_hits': 0, 'recognitions': 0, 'result_hits': 0, 'waits': 0}
+
+    def publish(self, image: np.ndarray, source: str = "") -> BusFrame:
+        """发布一帧新画面"""
+        with self._cond:
+            self._seq += 1
+            frame = BusFrame(image, self._seq, source)
+            self._latest = frame
+            self._cond.notify_all()
+        return frame
+
+    def latest(self, max_age: float = None) -> Optional[BusFrame]:
+        """最新一帧，超过max_age（秒）时返回None"""
+        frame = self._latest
+        if frame is None or (max_age is not None and frame.age > max_age):
+            return None
+        return frame
+
+    def frame(self, max_age: float, capture: Callable[[], Optional[np.ndarray]],
+              source: str = "") -> Optional[BusFrame]:
+        """
+        获取不超过max_age秒的画面：有则复用，其他线程正在截图时等待其结果，否则调用capture截图并发布
+
+        Args:
+            max_age: 可接受的画面最长存在时间（秒）
+            capture: 截图函数，返回BGR数组
+            source: 截图方标识，便于排查
+        """
+        with self._cond:
+            while True:
+                latest = self.latest(max_age)
+                if latest is not None:
+                    self.stats['frame_hits'] += 1
+                    return latest
+                if not self._capturing:
+                    self._capturing = True
+                    generation = self._generation
+                    break
+                self.stats['waits'] += 1
+                self._cond.wait()
+
+        image = None
+        try:
+            image = capture()
+        finally:
+            with self._cond:
+                self._capturing = False
+                if image is None:
+                    self._cond.notify_all()
+        if image is None:
+            return None
+        with self._cond:
+            self.stats['captures'] += 1
+            if self._generation != generation:
+                # 截图期间总线被清空（如执行了点击），这一帧可能是操作前的画面，只交给本次调用
+                self._seq += 1
+                return BusFrame(image, self._seq, source)
+        return self.publish(image, source)
+
+    def results(self, frame: BusFrame, region: Region,
+                recognize: Callable[[np.ndarray, Region], OcrResultSet]) -> OcrResultSet:
+        """
+        获取该帧指定区域的识别结果：已识别过（或识别过更大范围）则复用，
+        其他线程正在识别覆盖该区域的范围时等待，否则调用recognize识别
+
+        Args:
+            frame: 总线画面
+            region: 识别区域（屏幕坐标），None表示全屏
+            recognize: 识别函数 recognize(整帧画面, 区域)，返回屏幕坐标的结果集
+        """
+        region = clip_region(region, frame.image.shape)
+        if region is not None and (region[2] <= region[0] or region[3] <= region[1]):
+            return OcrResultSet.empty()
+        with self._cond:
+            while True:
+                hit = frame._lookup(region)
+                if hit is not None:
+                    self.stats['result_hits'] += 1
+                    return hit
+                if not frame._waiting_for(region):
+                    frame._pending.add(region)
+                    break
+                self.stats['waits'] += 1
+                self._cond.wait()
+
+        results = None
+        try:
+            results = recognize(frame.image, region)
+        finally:
+            with self._cond:
+                frame._pending.discard(region)
+                if results is not None:
+                    frame._results[region] = results
+                    self.stats['recognitions'] += 1
+                self._cond.notify_all()
+        return results
+
+    def clear(self):
+        """丢弃最新画面及其识别结果（点击、滑动等操作后调用），正在进行的截图也不会再作为最新画面"""
+        with self._cond:
+            self._latest = None
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """总线统计：截图/识别次数、复用次数、等待次数，以及复用率"""
+        with self._cond:
+            stats = dict(self.stats)
+        frame_lookups = stats['captures'] + stats['frame_hits']
+        result_lookups = stats['recognitions'] + stats['result_hits']
+        stats['frame_reuse_rate'] = stats['frame_hits'] / frame_lookups if frame_lookups else 0.0
+        stats['result_reuse_rate'] = stats['result_hits'] / result_lookups if result_lookups else 0.0
+        return stats
+
+
+# 进程内共享的全局总线
+frame_bus = FrameBus()
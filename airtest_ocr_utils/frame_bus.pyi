@@ -0,0 +1,39 @@
+"""
+共享画面总线的类型存根文件
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+Region = Optional[Tuple[int, int, int, int]]
+
+def clip_region(region: Region, shape: Tuple[int, ...]) -> Region: ...
+def crop_frame(image: np.ndarray, region: Region) -> np.ndarray: ...
+
+class BusFrame:
+    image: np.ndarray
+    timestamp: float
+    seq: int
+    source: str
+
+    def __init__(self, image: np.ndarray, seq: int, source: str = "") -> None: ...
+    @property
+    def age(self) -> float: ...
+
+class FrameBus:
+    stats: Dict[str, int]
+
+    def __init__(self) -> None: ...
+    def publish(self, image: np.ndarray, source: str = "") -> BusFrame: ...
+    def latest(self, max_age: float = None) -> Optional[BusFrame]: ...
+    def frame(self, max_age: float, capture: Callable[[], Optional[np.ndarray]],
+              source: str = "") -> Optional[BusFrame]: ...
+    def results(self, frame: BusFrame, region: Region,
+                recognize: Callable[[np.ndarray, Region], OcrResultSet]) -> OcrResultSet: ...
+    def clear(self) -> None: ...
+    def get_stats(self) -> Dict[str, float]: ...
+
+# 进程内共享的全局总线
+frame_bus: FrameBus
@@ -0,0 +1,361 @@
+"""
+模型配置档
+按名称选择PaddleOCR模型组合：mobile（轻量快速）、server（精度优先）、default（PaddleOCR默认）及自定义本地模型目录；
+每个配置档创建引擎后可预热，并提供在样本集上对比速度与精度的简易基准测试
+"""
+
+import atexit
+import os
+import random
+import string
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .ocr_pipeline import load_image
+from .ocr_results import OcrResultSet
+from .text_match import similarity
+
+# server模型需手动下载解压到该目录（PaddleOCR不会自动下载server模型）
+SERVER_MODEL_HOME = os.path.join(os.path.expanduser("~"), ".paddleocr", "server")
+
+# 引擎串行创建：避免多个线程同时下载同一模型、争抢CPU
+_create_lock = threading.Lock()
+
+# 环境变量 AIRTEST_OCR_PRELOAD=0 时后台加载推迟到第一次使用（如批处理的子进程不需要全局实例的引擎）
+PRELOAD_ENV = "AIRTEST_OCR_PRELOAD"
+
+# 正在后台加载的线程，解释器退出前等待其结束，避免在模型初始化的原生代码中被强制终止；
+# 最多等待 LOADER_EXIT_TIMEOUT 秒（合计），模型下载卡住时不阻塞退出（加载线程为守护线程）
+_loaders: Set[threading.Thread] = set()
+LOADER_EXIT_TIMEOUT = 10.0
+
+
+class ModelProfile:
+    """
+    模型配置档
+
+    Args:
+        name: 配置档名称
+        det_model_dir: 检测模型目录，None表示使用PaddleOCR默认模型
+        rec_model_dir: 识别模型目录，None表示使用PaddleOCR默认模型
+        rec_langs: 识别模型适用的语言（字符字典由lang决定，须与识别模型一致），其他语言使用PaddleOCR该语言的默认识别模型；
+                   None表示适用于所有语言
+        cls_model_dir: 方向分类模型目录，None表示使用PaddleOCR默认模型
+        use_angle_cls: 是否启用方向分类
+        det_limit_side_len: 检测输入的最长边
+        rec_batch_num: 识别批大小
+        warmup_rounds: 预热时的推理次数
+        description: 说明
+        **extra: 其他透传给PaddleOCR的参数
+    """
+
+    def __init__(self, name: str, det_model_dir: str = None, rec_model_dir: str = None,
+                 cls_model_dir: str = None, use_angle_cls: bool = True, det_limit_side_len: int = None,
+                 rec_batch_num: int = None, warmup_rounds: int = 2, description: str = "",
+                 rec_langs: Sequence[str] = None, **extra):
+        self.name = name
+        self.det_model_dir = det_model_dir
+        self.rec_model_dir = rec_model_dir
+        self.rec_langs = tuple(rec_langs) if rec_langs is not None else None
+        self.cls_model_dir = cls_model_dir
+        self.use_angle_cls = use_angle_cls
+        self.det_limit_side_len = det_limit_side_len
+        self.rec_batch_num = rec_batch_num
+        self.warmup_rounds = warmup_rounds
+        self.description = description
+        self.extra = extra
+
+    @classmethod
+    def from_dir(cls, name: str, model_dir: str, **kwargs) -> "ModelProfile":
+        """由本地模型目录创建配置档，目录下需包含 det、rec 子目录（可选 cls）"""
+        cls_dir = os.path.join(model_dir, "cls")
+        return cls(name, det_model_dir=os.path.join(model_dir, "det"),
+                   rec_model_dir=os.path.join(model_dir, "rec"),
+                   cls_model_dir=cls_dir if os.path.isdir(cls_dir) else None, **kwargs)
+
+    def model_dirs(self, lang: str = None) -> Dict[str, str]:
+        """配置档指定的模型目录；指定lang时不含不适用于该语言的识别模型目录"""
+        rec_dir = self.rec_model_dir
+        if lang is not None and self.rec_langs is not None and lang not in self.rec_langs:
+            rec_dir = None
+        dirs = {'det_model_dir': self.det_model_dir, 'rec_model_dir': rec_dir,
+                'cls_model_dir': self.cls_model_dir}
+        return {key: value for key, value in dirs.items() if value}
+
+    def paddle_kwargs(self, lang: str = 'ch', use_gpu: bool = False, **overrides) -> Dict:
+        """生成PaddleOCR构造参数"""
+        kwargs = {'use_angle_cls': self.use_angle_cls, 'lang': lang, 'use_gpu': use_gpu}
+        kwargs.update(self.model_dirs(lang))
+        if self.det_limit_side_len is not None:
+            kwargs['det_limit_side_len'] = self.det_limit_side_len
+        if self.rec_batch_num is not None:
+            kwargs['rec_batch_num'] = self.rec_batch_num
+        kwargs.update(self.extra)
+        kwargs.update(overrides)
+        return kwargs
+
+    def to_dict(self) -> Dict:
+        data = {'name': self.name, 'det_model_dir': self.det_model_dir, 'rec_model_dir': self.rec_model_dir,
+                'cls_model_dir': self.cls_model_dir, 'use_angle_cls': self.use_angle_cls,
+                'det_limit_side_len': self.det_limit_side_len, 'rec_batch_num': self.rec_batch_num,
+                'warmup_rounds': self.warmup_rounds, 'description': self.description,
+                'rec_langs': list(self.rec_langs) if self.rec_langs is not None else None}
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ModelProfile":
+        return cls(**data)
+
+    def __repr__(self):
+        return f"ModelProfile(name={self.name!r})"
+
+
+_PROFILES: Dict[str, ModelProfile] = {
+    'default': ModelProfile(
+        'default', description="PaddleOCR默认模型，启用方向分类"),
+    'mobile': ModelProfile(
+        'mobile', use_angle_cls=False, det_limit_side_len=736, rec_batch_num=16,
+        description="轻量模型，关闭方向分类、缩小检测输入，适合后台监控等高频场景"),
+    'server': ModelProfile(
+        'server', det_model_dir=os.path.join(SERVER_MODEL_HOME, "ch_PP-OCRv4_det_server_infer"),
+        rec_model_dir=os.path.join(SERVER_MODEL_HOME, "ch_PP-OCRv4_rec_server_infer"), rec_langs=('ch',),
+        det_limit_side_len=1280, rec_batch_num=6,
+        description="服务端大模型，精度优先，适合精确读取；需手动下载模型到 SERVER_MODEL_HOME（识别模型仅用于中文，"
+                    "其他语言使用PaddleOCR默认识别模型）"),
+}
+
+
+def register_profile(profile: ModelProfile):
+    """注册（或覆盖）命名配置档"""
+    _PROFILES[profile.name] = profile
+
+
+def list_profiles() -> List[str]:
+    """已注册的配置档名称"""
+    return list(_PROFILES)
+
+
+def get_profile(profile: Union[str, ModelProfile, None]) -> ModelProfile:
+    """按名称或对象获取配置档，None表示default"""
+    if profile is None:
+        return _PROFILES['default']
+    if isinstance(profile, ModelProfile):
+        return profile
+    if profile not in _PROFILES:
+        raise ValueError(f"Unknown model profile: {profile}, expected one of {list_profiles()}")
+    return _PROFILES[profile]
+
+
+def profile_tag(profile: Union[str, ModelProfile, None]) -> Optional[str]:
+    """结果缓存键中的配置档标识，默认配置档返回None以兼容已有缓存"""
+    profile = get_profile(profile)
+    return None if profile.name == 'default' else f"profile={profile.name}"
+
+
+def create_engine(profile: Union[str, ModelProfile, None] = None, lang: str = 'ch', use_gpu: bool = False,
+                  warmup: bool = False, **overrides):
+    """
+    按配置档创建PaddleOCR实例
+
+    Args:
+        profile: 配置档名称或对象
+        warmup: 是否在返回前预热
+        **overrides: 覆盖配置档的PaddleOCR参数，如 show_log=False
+
+    Raises:
+        FileNotFoundError: 配置档指定的（该语言使用的）模型目录不存在
+    """
+    profile = get_profile(profile)
+    for key, path in profile.model_dirs(lang).items():
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Model directory not found for profile '{profile.name}': {path} ({key})")
+    from paddleocr import PaddleOCR
+    with _create_lock:
+        ocr = PaddleOCR(**profile.paddle_kwargs(lang=lang, use_gpu=use_gpu, **overrides))
+    if warmup:
+        warmup_engine(ocr, rounds=profile.warmup_rounds)
+    return ocr
+
+
+class _DeferredFuture(Future):
+    """第一次调用 result()/exception() 时才开始加载的Future"""
+
+    def __init__(self, start):
+        super().__init__()
+        self._start = start
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            start, self._start = self._start, None
+        if start is not None:
+            start()
+
+    def result(self, timeout=None):
+        self._ensure_started()
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        self._ensure_started()
+        return super().exception(timeout)
+
+
+def preload_enabled() -> bool:
+    """后台加载是否立即开始（环境变量 AIRTEST_OCR_PRELOAD 不为0）"""
+    return os.environ.get(PRELOAD_ENV, "1") != "0"
+
+
+def load_engine_async(profile: Union[str, ModelProfile, None] = None, lang: str = 'ch', use_gpu: bool = False,
+                      warmup: bool = True, **overrides) -> Future:
+    """
+    在后台线程中创建并预热引擎，不阻塞调用方；关闭预加载时推迟到第一次获取结果
+
+    Returns:
+        就绪Future：result() 返回引擎，加载失败时抛出创建引擎时的异常
+    """
+    def load():
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(create_engine(profile, lang=lang, use_gpu=use_gpu, warmup=warmup, **overrides))
+            except BaseException as e:
+                future.set_exception(e)
+        finally:
+            _loaders.discard(threading.current_thread())
+
+    def start():
+        thread = threading.Thread(name="OcrEngineLoader", target=load, daemon=True)
+        _loaders.add(thread)
+        thread.start()
+
+    if preload_enabled():
+        future = Future()
+        start()
+    else:
+        future = _DeferredFuture(start)
+    return future
+
+
+@atexit.register
+def _join_loaders():
+    deadline = time.time() + LOADER_EXIT_TIMEOUT
+    for thread in list(_loaders):
+        thread.join(max(deadline - time.time(), 0.0))
+
+
+def resolved(engine) -> Future:
+    """已完成的就绪Future，用于同步创建的引擎"""
+    future = Future()
+    future.set_result(engine)
+    return future
+
+
+# ==================== 预热与基准测试 ====================
+
+def _render_text(text: str, size: Tuple[int, int] = (160, 640), font_scale: float = 1.2) -> np.ndarray:
+    """白底黑字渲染单行文字（OpenCV字体仅支持ASCII）"""
+    h, w = size
+    img = np.full((h, w, 3), 255, dtype=np.uint8)
+    cv2.putText(img, text, (20, h // 2 + 12), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), 2, cv2.LINE_AA)
+    return img
+
+
+def warmup_engine(ocr, rounds: int = 2, image: np.ndarray = None) -> float:
+    """
+    预热：用合成图片完整推理几次，完成模型加载、内存分配等一次性开销
+
+    Returns:
+        预热耗时（秒）
+    """
+    img = image if image is not None else _render_text("Warmup 123")
+    start = time.time()
+    for _ in range(max(int(rounds), 1)):
+        ocr.ocr(img, cls=False)
+    return time.time() - start
+
+
+def builtin_corpus(count: int = 20, seed: int = 0) -> List[Tuple[np.ndarray, List[str]]]:
+    """内置样本集：随机字母数字组合渲染成的单行图片及其真值"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    corpus = []
+    for _ in range(count):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 12)))
+        corpus.append((_render_text(text, font_scale=rng.uniform(0.8, 1.4)), [text]))
+    return corpus
+
+
+def _text_accuracy(results: OcrResultSet, expected: Sequence[str]) -> float:
+    """真值中每条文字与识别结果的最高相似度的平均值"""
+    if not expected:
+        return 1.0
+    texts = results.texts.tolist()
+    return float(np.mean([max((similarity(t, e) for t in texts), default=0.0) for e in expected]))
+
+
+def benchmark_profiles(profiles: Sequence[Union[str, ModelProfile]] = ('mobile', 'default'),
+                       samples: Sequence[Tuple[Union[str, np.ndarray], Sequence[str]]] = None,
+                       lang: str = 'ch', use_gpu: bool = False, rounds: int = 1) -> List[Dict]:
+    """
+    在样本集上对比各配置档的速度与精度
+
+    Args:
+        profiles: 参与对比的配置档
+        samples: [(图片路径或BGR数组, 真值文字列表)]，None表示使用内置样本集
+        rounds: 每张样本的推理次数
+
+    Returns:
+        每个配置档一条记录：profile、init_time、warmup_time、avg_latency、p95_latency、accuracy；
+        模型目录缺失的配置档记录 error
+    """
+    samples = list(samples) if samples is not None else builtin_corpus()
+    images = [(load_image(image), list(expected)) for image, expected in samples]
+    report = []
+    for item in profiles:
+        profile = get_profile(item)
+        start = time.time()
+        try:
+            ocr = create_engine(profile, lang=lang, use_gpu=use_gpu, show_log=False)
+        except (FileNotFoundError, ValueError) as e:
+            report.append({'profile': profile.name, 'error': str(e)})
+            continue
+        init_time = time.time() - start
+        warmup_time = warmup_engine(ocr, rounds=profile.warmup_rounds)
+
+        latencies, accuracies = [], []
+        for img, expected in images:
+            if img is None:
+                continue
+            for _ in range(max(int(rounds), 1)):
+                t = time.time()
+                result = ocr.ocr(img, cls=profile.use_angle_cls)
+                latencies.append(time.time() - t)
+            accuracies.append(_text_accuracy(OcrResultSet.from_paddle(result[0] if result else None), expected))
+        report.append({
+            'profile': profile.name,
+            'init_time': init_time,
+            'warmup_time': warmup_time,
+            'avg_latency': float(np.mean(latencies)) if latencies else 0.0,
+            'p95_latency': float(np.percentile(latencies, 95)) if latencies else 0.0,
+            'accuracy': float(np.mean(accuracies)) if accuracies else 0.0,
+        })
+    return report
+
+
+def format_benchmark(report: List[Dict]) -> str:
+    """将基准测试结果格式化为文本表格"""
+    lines = [f"{'profile':<12}{'avg(ms)':>10}{'p95(ms)':>10}{'accuracy':>10}{'warmup(s)':>11}"]
+    for row in report:
+        if 'error' in row:
+            lines.append(f"{row['profile']:<12}  {row['error']}")
+            continue
+        lines.append(f"{row['profile']:<12}{row['avg_latency'] * 1000:>10.1f}{row['p95_latency'] * 1000:>10.1f}"
+                     f"{row['accuracy']:>10.3f}{row['warmup_time']:>11.2f}")
+    return "\n".join(lines)
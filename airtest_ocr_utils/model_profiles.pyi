@@ -0,0 +1,53 @@
+"""
+模型配置档的类型存根文件
+"""
+
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+SERVER_MODEL_HOME: str
+PRELOAD_ENV: str
+LOADER_EXIT_TIMEOUT: float
+
+class ModelProfile:
+    name: str
+    det_model_dir: Optional[str]
+    rec_model_dir: Optional[str]
+    rec_langs: Optional[Tuple[str, ...]]
+    cls_model_dir: Optional[str]
+    use_angle_cls: bool
+    det_limit_side_len: Optional[int]
+    rec_batch_num: Optional[int]
+    warmup_rounds: int
+    description: str
+    extra: Dict[str, Any]
+
+    def __init__(self, name: str, det_model_dir: str = None, rec_model_dir: str = None,
+                 cls_model_dir: str = None, use_angle_cls: bool = True, det_limit_side_len: int = None,
+                 rec_batch_num: int = None, warmup_rounds: int = 2, description: str = "",
+                 rec_langs: Sequence[str] = None, **extra) -> None: ...
+    @classmethod
+    def from_dir(cls, name: str, model_dir: str, **kwargs) -> "ModelProfile": ...
+    def model_dirs(self, lang: str = None) -> Dict[str, str]: ...
+    def paddle_kwargs(self, lang: str = 'ch', use_gpu: bool = False, **overrides) -> Dict: ...
+    def to_dict(self) -> Dict: ...
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ModelProfile": ...
+
+def register_profile(profile: ModelProfile) -> None: ...
+def list_profiles() -> List[str]: ...
+def get_profile(profile: Union[str, ModelProfile, None]) -> ModelProfile: ...
+def profile_tag(profile: Union[str, ModelProfile, None]) -> Optional[str]: ...
+def create_engine(profile: Union[str, ModelProfile, None] = None, lang: str = 'ch', use_gpu: bool = False,
+                  warmup: bool = False, **overrides) -> Any: ...
+def preload_enabled() -> bool: ...
+def load_engine_async(profile: Union[str, ModelProfile, None] = None, lang: str = 'ch', use_gpu: bool = False,
+                      warmup: bool = True, **overrides) -> Future: ...
+def resolved(engine: Any) -> Future: ...
+def warmup_engine(ocr: Any, rounds: int = 2, image: np.ndarray = None) -> float: ...
+def builtin_corpus(count: int = 20, seed: int = 0) -> List[Tuple[np.ndarray, List[str]]]: ...
+def benchmark_profiles(profiles: Sequence[Union[str, ModelProfile]] = ('mobile', 'default'),
+                       samples: Sequence[Tuple[Union[str, np.ndarray], Sequence[str]]] = None,
+                       lang: str = 'ch', use_gpu: bool = False, rounds: int = 1) -> List[Dict]: ...
+def format_benchmark(report: List[Dict]) -> str: ...
@@ -0,0 +1,22 @@
+"""
+OCR引擎接口
+OcrWatcher 使用的引擎抽象，进程内引擎（AirtestOcrEngine）和OCR服务客户端（RemoteOcrEngine）都实现该接口
+"""
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from .ocr_results import OcrResult
+
+
+class OcrEngine(ABC):
+    """OCR引擎抽象基类"""
+    @abstractmethod
+    def recognize(self, image_bytes: bytes) -> Sequence[OcrResult]:
+        """识别图片中的文字，返回OcrResult序列（推荐直接返回OcrResultSet）"""
+        pass
+
+    @abstractmethod
+    def set_confidence_threshold(self, threshold: float):
+        """设置置信度阈值"""
+        pass
@@ -0,0 +1,12 @@
+"""
+OCR引擎接口的类型存根文件
+"""
+
+from abc import ABC
+from typing import Sequence
+
+from .ocr_results import OcrResult
+
+class OcrEngine(ABC):
+    def recognize(self, image_bytes: bytes) -> Sequence[OcrResult]: ...
+    def set_confidence_threshold(self, threshold: float) -> None: ...
@@ -0,0 +1,296 @@
+"""
+操作-验证流程
+把"点击 → 等待结果文字"串成一个流程：每次操作后按缩略图等待画面开始变化并稳定下来再识别，
+并且只重新识别变化的区域，未变化部分沿用上一次的识别结果，
+省去固定的1秒轮询间隔，也不会在画面切换前识别到旧画面
+"""
+
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from airtest.core.api import touch
+
+from .device_capture import device_snapshot
+from .frame_bus import crop_frame
+from .ocr_results import OcrResultSet
+from .screen_change import ScreenChange, changed_regions, frame_thumbnail, merge_boxes, wait_for_change
+
+if TYPE_CHECKING:
+    from .ocr_utils import OCRUtils
+
+Region = Tuple[int, int, int, int]
+
+# 流程支持的步骤
+FLOW_STEPS = ('touch', 'expect', 'expect_gone', 'call')
+
+
+class FlowResult:
+    """
+    流程执行结果
+
+    - ok: 全部步骤是否成功
+    - failed: 失败的步骤序号（从0开始），成功为None
+    - steps: 每一步的记录：kind / text / ok / elapsed / waited / found（touch、expect找到的结果字典）
+    - stats: frames 截取帧数 / ocr_passes 识别次数 / ocr_pixels 实际识别的像素数 /
+      full_pixels 每次都整屏识别所需的像素数 / wait_time 等待画面变化的时间
+    """
+
+    def __init__(self):
+        self.ok = True
+        self.failed: Optional[int] = None
+        self.steps: List[Dict] = []
+        self.stats = {'frames': 0, 'ocr_passes': 0, 'ocr_pixels': 0, 'full_pixels': 0, 'wait_time': 0.0}
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        stats['ocr_ratio'] = stats['ocr_pixels'] / stats['full_pixels'] if stats['full_pixels'] else 0.0
+        return stats
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self):
+        return (f"FlowResult(ok={self.ok}, steps={len(self.steps)}, failed={self.failed}, "
+                f"ocr_passes={self.stats['ocr_passes']})")
+
+
+class OcrFlow:
+    """
+    操作-验证流程，通过 OCRUtils.flow() 创建，链式添加步骤后调用 run() 执行
+
+    识别结果按当前画面缓存：操作后等待画面变化并稳定，变化区域（扩展到与之相交的原有文字框）重新识别，
+    其余结果直接沿用；画面没有变化则不再识别。变化区域超过 full_ratio 时整屏识别。
+    下一步要点击的文字已在上一步验证时识别到时，点击前不需要再识别
+
+    Args:
+        utils: OCRUtils 实例
+        timeout: 每一步的默认超时时间（秒）
+        change_timeout: 操作后等待画面开始变化的最长时间（秒），画面没有变化时视为操作无可见效果，继续下一步
+        settle_timeout: 画面开始变化后等待稳定的最长时间（秒），超时按当时的画面识别
+        poll: 截图间隔（秒）
+        settle_frames: 连续多少帧不再变化视为稳定
+        change_threshold: 变化像素比例超过该值视为画面变化
+        pixel_threshold: 灰度差阈值
+        full_ratio: 变化区域面积超过画面该比例时整屏识别
+        lang: 识别语言，None表示 OCRUtils 初始化时的语言
+    """
+
+    def __init__(self, utils: "OCRUtils", timeout: float = 10, change_timeout: float = 3.0,
+                 settle_timeout: float = 3.0, poll: float = 0.1, settle_frames: int = 2,
+                 change_threshold: float = 0.001, pixel_threshold: int = 20, full_ratio: float = 0.5,
+                 lang: str = None):
+        self.utils = utils
+        self.timeout = timeout
+        self.change_timeout = change_timeout
+        self.settle_timeout = settle_timeout
+        self.poll = poll
+        self.settle_frames = settle_frames
+        self.change_threshold = change_threshold
+        self.pixel_threshold = pixel_threshold
+        self.full_ratio = full_ratio
+        self.lang = lang
+        self._steps: List[Dict] = []
+        # 执行状态：当前画面、其识别结果（屏幕坐标，None表示未识别）、识别后变化过的区域
+        self._frame: Optional[np.ndarray] = None
+        self._thumbnail: Optional[np.ndarray] = None
+        self._results: Optional[OcrResultSet] = None
+        self._dirty: List[Region] = []
+        self._result: Optional[FlowResult] = None
+
+    # ==================== 步骤 ====================
+
+    def touch(self, text: str, confidence: float = None, offset_x: int = 0, offset_y: int = 0,
+              region: Region = None, match_mode: str = 'exact', timeout: float = None) -> "OcrFlow":
+        """点击文字，点击后等待画面变化并稳定"""
+        return self._add('touch', text, confidence=confidence, offset=(offset_x, offset_y), region=region,
+                         match_mode=match_mode, timeout=timeout)
+
+    def expect(self, text: str, confidence: float = None, region: Region = None, match_mode: str = 'exact',
+               timeout: float = None) -> "OcrFlow":
+        """验证文字出现，未出现时等待画面再次变化后重新识别变化部分"""
+        return self._add('expect', text, confidence=confidence, region=region, match_mode=match_mode,
+                         timeout=timeout)
+
+    def expect_gone(self, text: str, confidence: float = None, region: Region = None, match_mode: str = 'exact',
+                    timeout: float = None) -> "OcrFlow":
+        """验证文字消失（如加载提示）"""
+        return self._add('expect_gone', text, confidence=confidence, region=region, match_mode=match_mode,
+                         timeout=timeout)
+
+    def call(self, action: Callable[[], None], name: str = None) -> "OcrFlow":
+        """执行自定义操作（如 keyevent('BACK')），之后同样等待画面变化并稳定"""
+        return self._add('call', name or getattr(action, '__name__', 'call'), action=action)
+
+    def _add(self, kind: str, text: str, **options) -> "OcrFlow":
+        if kind not in FLOW_STEPS:
+            raise ValueError(f"Unsupported flow step: {kind}, expected one of {FLOW_STEPS}")
+        self._steps.append(dict(options, kind=kind, text=text))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    # ==================== 执行 ====================
+
+    def run(self) -> FlowResult:
+        """依次执行全部步骤，某一步失败时停止，返回 FlowResult（失败时为假）"""
+        result = self._result = FlowResult()
+        self._frame = self._thumbnail = self._results = None
+        self._dirty = []
+        with self.utils.language(self.lang):
+            if not self._capture():
+                print("❌ 截图失败")
+                result.ok, result.failed = False, 0
+                return result
+            for i, step in enumerate(self._steps):
+                start = time.time()
+                record = {'kind': step['kind'], 'text': step['text'], 'ok': False, 'found': None}
+                waited = result.stats['wait_time']
+                try:
+                    record['ok'] = getattr(self, f"_run_{step['kind']}")(step, record)
+                except Exception as e:
+                    recorder = self.utils.flight_recorder
+                    if recorder is not None:
+                        recorder.auto_dump(f"flow_step{i + 1}_{step['kind']}_{type(e).__name__}")
+                    raise
+                finally:
+                    record['elapsed'] = time.time() - start
+                    record['waited'] = result.stats['wait_time'] - waited
+                    result.steps.append(record)
+                if not record['ok']:
+                    result.ok, result.failed = False, i
+                    print(f"❌ 流程第 {i + 1} 步失败: {step['kind']} '{step['text']}'")
+                    self.utils._flight_timeout(f"flow_step{i + 1}_{step['kind']}", step['text'])
+                    break
+        stats = result.get_stats()
+        if result.ok:
+            print(f"✅ 流程完成: {len(self._steps)} 步，识别 {stats['ocr_passes']} 次，"
+                  f"识别面积占比 {stats['ocr_ratio']:.0%}，等待画面 {stats['wait_time']:.1f}s")
+        return result
+
+    def _run_touch(self, step: Dict, record: Dict) -> bool:
+        found = self._wait_for(step, present=True)
+        if found is None:
+            return False
+        record['found'] = found
+        touch((found['center'][0] + step['offset'][0], found['center'][1] + step['offset'][1]))
+        self._after_action()
+        return True
+
+    def _run_expect(self, step: Dict, record: Dict) -> bool:
+        found = self._wait_for(step, present=True)
+        record['found'] = found
+        return found is not None
+
+    def _run_expect_gone(self, step: Dict, record: Dict) -> bool:
+        return self._wait_for(step, present=False) is not None
+
+    def _run_call(self, step: Dict, record: Dict) -> bool:
+        step['action']()
+        self._after_action()
+        return True
+
+    def _wait_for(self, step: Dict, present: bool) -> Optional[Dict]:
+        """
+        在当前画面中查找文字，不满足时等待画面再次变化后只识别变化部分，直到超时
+
+        Returns:
+            present为真时为找到的结果字典；为假时文字已消失返回空字典；超时返回None
+        """
+        confidence = step['confidence'] if step['confidence'] is not None else self.utils.confidence_threshold
+        timeout = step['timeout'] if step['timeout'] is not None else self.timeout
+        deadline = time.time() + timeout
+        while True:
+            results = self._current_results()
+            if step['region'] is not None:
+                results = results.in_region(step['region'])
+            matched, scores = self.utils._find_matches_scored(results, [step['text']], step['match_mode'],
+                                                              confidence)
+            self.utils._flight_record(self._frame, results, None, f"flow_{step['kind']}", target=step['text'],
+                                      match_mode=step['match_mode'], confidence=confidence,
+                                      matched_bbox=matched.bboxes[:1].tolist())
+            if present and matched:
+                found = matched.take(slice(0, 1)).to_dicts()[0]
+                found['match_score'] = float(scores[0])
+                return found
+            if not present and not matched:
+                return {}
+            remaining = deadline - time.time()
+            if remaining <= 0 or not self._await_change(remaining, remaining):
+                return None
+
+    def _after_action(self):
+        """操作后等待画面变化并稳定；没有可见变化时保留当前画面和识别结果"""
+        # 画面总线和稳定等待中操作前的画面失效
+        self.utils._after_action()
+        self._await_change(self.change_timeout, self.settle_timeout)
+
+    def _await_change(self, timeout: float, settle_timeout: float) -> bool:
+        """等待画面相对当前画面变化并稳定，记录变化区域，返回画面是否变化"""
+        change = wait_for_change(device_snapshot, self._thumbnail, timeout, settle_timeout=settle_timeout,
+                                 poll=self.poll, settle_frames=self.settle_frames,
+                                 change_threshold=self.change_threshold, pixel_threshold=self.pixel_threshold)
+        self._result.stats['frames'] += change.frames
+        self._result.stats['wait_time'] += change.waited
+        if not change.changed or change.frame is None:
+            return False
+        self._update(change)
+        return True
+
+    def _capture(self) -> bool:
+        frame = device_snapshot()
+        if frame is None:
+            return False
+        self._result.stats['frames'] += 1
+        self._frame, self._thumbnail = frame, frame_thumbnail(frame)
+        return True
+
+    def _update(self, change: ScreenChange):
+        """切换到新画面，累计自上次识别以来变化的区域"""
+        self._dirty.extend(changed_regions(self._thumbnail, change.thumbnail, change.frame.shape,
+                                           pixel_threshold=self.pixel_threshold))
+        self._frame, self._thumbnail = change.frame, change.thumbnail
+
+    # ==================== 增量识别 ====================
+
+    def _current_results(self) -> OcrResultSet:
+        """当前画面的识别结果：未识别过时整屏识别，否则只重新识别变化区域"""
+        if self._results is not None and not self._dirty:
+            return self._results
+        h, w = self._frame.shape[:2]
+        regions = self._expand_dirty() if self._results is not None else None
+        if regions is None or sum((r[2] - r[0]) * (r[3] - r[1]) for r in regions) > self.full_ratio * w * h:
+            results = self._recognize(None)
+        else:
+            # 与变化区域相交的原有文字丢弃，由重新识别的结果代替
+            keep = np.ones(len(self._results), dtype=bool)
+            bboxes = self._results.bboxes
+            for x1, y1, x2, y2 in regions:
+                keep &= ~((bboxes[:, 0] < x2) & (bboxes[:, 2] > x1) & (bboxes[:, 1] < y2) & (bboxes[:, 3] > y1))
+            results = OcrResultSet.concat([self._results.take(keep)] + [self._recognize(r) for r in regions])
+        self._results, self._dirty = results, []
+        self._result.stats['full_pixels'] += w * h
+        return results
+
+    def _expand_dirty(self) -> List[Region]:
+        """变化区域扩展到与之相交的原有文字框（同一行文字只变了几个字时整行重新识别），再合并相交区域"""
+        bboxes = self._results.bboxes
+        expanded = []
+        for x1, y1, x2, y2 in self._dirty:
+            hit = (bboxes[:, 0] < x2) & (bboxes[:, 2] > x1) & (bboxes[:, 1] < y2) & (bboxes[:, 3] > y1)
+            if hit.any():
+                boxes = bboxes[hit]
+                x1, y1 = min(x1, int(boxes[:, 0].min())), min(y1, int(boxes[:, 1].min()))
+                x2, y2 = max(x2, int(np.ceil(boxes[:, 2].max()))), max(y2, int(np.ceil(boxes[:, 3].max())))
+            expanded.append([x1, y1, x2, y2])
+        h, w = self._frame.shape[:2]
+        return [(max(int(x1), 0), max(int(y1), 0), min(int(x2), w), min(int(y2), h))
+                for x1, y1, x2, y2 in merge_boxes(expanded)]
+
+    def _recognize(self, region: Optional[Region]) -> OcrResultSet:
+        """识别当前画面的区域（None为整屏），返回屏幕坐标"""
+        image = crop_frame(self._frame, region)
+        self._result.stats['ocr_passes'] += 1
+        self._result.stats['ocr_pixels'] += image.shape[0] * image.shape[1]
+        return self.utils._recognize_frame(image, region, False, "")
@@ -0,0 +1,47 @@
+"""
+操作-验证流程的类型存根文件
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .ocr_utils import OCRUtils
+
+Region = Tuple[int, int, int, int]
+
+FLOW_STEPS: Tuple[str, ...]
+
+class FlowResult:
+    ok: bool
+    failed: Optional[int]
+    steps: List[Dict]
+    stats: Dict[str, float]
+
+    def __init__(self) -> None: ...
+    def get_stats(self) -> Dict[str, float]: ...
+    def __bool__(self) -> bool: ...
+
+class OcrFlow:
+    utils: OCRUtils
+    timeout: float
+    change_timeout: float
+    settle_timeout: float
+    poll: float
+    settle_frames: int
+    change_threshold: float
+    pixel_threshold: int
+    full_ratio: float
+    lang: Optional[str]
+
+    def __init__(self, utils: OCRUtils, timeout: float = 10, change_timeout: float = 3.0,
+                 settle_timeout: float = 3.0, poll: float = 0.1, settle_frames: int = 2,
+                 change_threshold: float = 0.001, pixel_threshold: int = 20, full_ratio: float = 0.5,
+                 lang: str = None) -> None: ...
+    def touch(self, text: str, confidence: float = None, offset_x: int = 0, offset_y: int = 0,
+              region: Region = None, match_mode: str = 'exact', timeout: float = None) -> OcrFlow: ...
+    def expect(self, text: str, confidence: float = None, region: Region = None, match_mode: str = 'exact',
+               timeout: float = None) -> OcrFlow: ...
+    def expect_gone(self, text: str, confidence: float = None, region: Region = None, match_mode: str = 'exact',
+                    timeout: float = None) -> OcrFlow: ...
+    def call(self, action: Callable[[], None], name: str = None) -> OcrFlow: ...
+    def __len__(self) -> int: ...
+    def run(self) -> FlowResult: ...
@@ -0,0 +1,358 @@
+"""
+OCR分阶段流水线
+将PaddleOCR的检测与识别拆开：在缩小后的图片上做文字检测，再从原图裁剪文字区域做识别
+
+PaddleOCR自身已把检测输入限制在 det_limit_side_len（默认960，'max'）以内，并从原图裁剪识别，
+因此缩放策略只在检测尺寸小于引擎上限时才有效果（进一步减少检测耗时）
+"""
+
+import json
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+# 识别结果低于该分数时丢弃（与PaddleOCR默认drop_score一致）
+DEFAULT_DROP_SCORE = 0.5
+
+
+class ScalePolicy:
+    """
+    检测缩放策略
+
+    引擎本身会把检测输入的最长边缩小到 det_limit_side_len（见 engine_det_limit），
+    det_max_side 不小于该值时与不缩放等价；需要更快的检测时取更小的值，可用 calibrate_scale 按设备校准
+
+    Args:
+        det_max_side: 检测输入的最长边（像素），大于该值的图片先缩小再检测
+        min_scale: 最小缩放比例，防止极端缩小导致小字丢失
+        enabled: 是否启用
+    """
+
+    def __init__(self, det_max_side: int = 960, min_scale: float = 0.2, enabled: bool = True):
+        self.det_max_side = int(det_max_side)
+        self.min_scale = float(min_scale)
+        self.enabled = enabled
+
+    def scale_for(self, shape: Tuple[int, ...]) -> float:
+        """计算指定尺寸图片的检测缩放比例（<=1）"""
+        if not self.enabled:
+            return 1.0
+        longest = max(shape[0], shape[1])
+        if longest <= self.det_max_side:
+            return 1.0
+        return max(self.det_max_side / float(longest), self.min_scale)
+
+    def to_dict(self) -> Dict:
+        return {'det_max_side': self.det_max_side, 'min_scale': self.min_scale, 'enabled': self.enabled}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScalePolicy":
+        return cls(**data)
+
+    def save(self, path: str):
+        """保存到JSON文件（按设备保存校准结果）"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "ScalePolicy":
+        """从JSON文件加载"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self):
+        return f"ScalePolicy(det_max_side={self.det_max_side}, min_scale={self.min_scale}, enabled={self.enabled})"
+
+
+# ==================== 图片读取 ====================
+
+def load_image(image: Union[str, bytes, np.ndarray]) -> Optional[np.ndarray]:
+    """读取图片为BGR数组，支持路径（含中文路径）、字节数据和数组"""
+    if isinstance(image, np.ndarray):
+        return image
+    if isinstance(image, (bytes, bytearray)):
+        data = np.frombuffer(image, dtype=np.uint8)
+    else:
+        data = np.fromfile(image, dtype=np.uint8)
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+# ==================== 检测 ====================
+
+def engine_det_limit(ocr) -> Optional[int]:
+    """
+    引擎检测输入的最长边上限（PaddleOCR的det_limit_side_len，limit_type为'max'时），无法获取时返回None
+
+    limit_type为'min'（按最短边放大）时引擎不会缩小输入，返回None
+    """
+    for args in (getattr(ocr, 'args', None), getattr(getattr(ocr, 'text_detector', None), 'args', None)):
+        limit = getattr(args, 'det_limit_side_len', None)
+        if limit is not None:
+            if getattr(args, 'det_limit_type', 'max') != 'max':
+                return None
+            return int(limit)
+    return None
+
+
+def sort_boxes(boxes: np.ndarray) -> np.ndarray:
+    """按从上到下、从左到右排序文字框（同PaddleOCR的sorted_boxes）"""
+    if len(boxes) == 0:
+        return boxes
+    order = np.lexsort((boxes[:, 0, 0], boxes[:, 0, 1]))
+    boxes = boxes[order]
+    # 同一行（y差小于10像素）内按x排序
+    for i in range(len(boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(boxes[j + 1, 0, 1] - boxes[j, 0, 1]) < 10 and boxes[j + 1, 0, 0] < boxes[j, 0, 0]:
+                boxes[[j, j + 1]] = boxes[[j + 1, j]]
+            else:
+                break
+    return boxes
+
+
+def detect_boxes(ocr, img: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """
+    文字检测
+
+    Args:
+        ocr: PaddleOCR实例
+        img: BGR原图
+        scale: 检测缩放比例，<1时在缩小图上检测
+
+    Returns:
+        (N, 4, 2) 原图坐标下的文字框
+    """
+    det_img = img
+    if scale < 1.0:
+        det_img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    result = ocr.ocr(det_img, det=True, rec=False, cls=False)
+    if not result or not result[0]:
+        return np.zeros((0, 4, 2), dtype=np.float32)
+    boxes = np.asarray(result[0], dtype=np.float32).reshape(-1, 4, 2)
+    if scale < 1.0:
+        boxes /= scale
+        # 映射回原图后限制在图片范围内
+        boxes[..., 0] = np.clip(boxes[..., 0], 0, img.shape[1] - 1)
+        boxes[..., 1] = np.clip(boxes[..., 1], 0, img.shape[0] - 1)
+    return sort_boxes(boxes)
+
+
+# ==================== 识别 ====================
+
+def crop_text_region(img: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """透视变换裁剪文字区域，竖排文字旋转为横排（同PaddleOCR的get_rotate_crop_image）"""
+    box = np.asarray(box, dtype=np.float32)
+    width = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+    height = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+    width, height = max(width, 1), max(height, 1)
+    target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    matrix = cv2.getPerspectiveTransform(box, target)
+    crop = cv2.warpPerspective(img, matrix, (width, height),
+                               borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if crop.shape[0] / float(crop.shape[1]) >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+def recognize_crops(ocr, crops: Sequence[np.ndarray], cls: bool = True) -> List[Tuple[str, float]]:
+    """
+    批量识别裁剪后的文字图片
+
+    Returns:
+        与crops一一对应的 (text, confidence)
+    """
+    crops = list(crops)
+    if not crops:
+        return []
+    recognizer = getattr(ocr, 'text_recognizer', None)
+    if recognizer is not None:
+        # 直接调用PaddleOCR内部的批量识别器
+        classifier = getattr(ocr, 'text_classifier', None)
+        if cls and classifier is not None and getattr(ocr, 'use_angle_cls', False):
+            crops, _, _ = classifier(crops)
+        rec_res, _ = recognizer(crops)
+        return [(text, float(score)) for text, score in rec_res]
+    # 兼容实现：逐张调用公开接口
+    results = []
+    for crop in crops:
+        res = ocr.ocr(crop, det=False, rec=True, cls=cls)
+        text, score = res[0][0] if res and res[0] else ('', 0.0)
+        results.append((text, float(score)))
+    return results
+
+
+def recognize_boxes(ocr, img: np.ndarray, boxes: np.ndarray, cls: bool = True,
+                    drop_score: float = None) -> OcrResultSet:
+    """从原图裁剪文字框并识别，返回结果集"""
+    if len(boxes) == 0:
+        return OcrResultSet.empty()
+    if drop_score is None:
+        drop_score = getattr(ocr, 'drop_score', DEFAULT_DROP_SCORE)
+    rec_res = recognize_crops(ocr, [crop_text_region(img, box) for box in boxes], cls=cls)
+    confidences = np.asarray([score for _, score in rec_res], dtype=np.float64)
+    keep = confidences >= drop_score
+    texts = [text for text, _ in rec_res]
+    return OcrResultSet(boxes, confidences, texts).take(keep)
+
+
+def run_ocr(ocr, image: Union[str, bytes, np.ndarray], scale_policy: ScalePolicy = None,
+            cls: bool = True) -> OcrResultSet:
+    """
+    执行一次完整识别
+
+    scale_policy为空或图片无需缩小时走PaddleOCR原始流程；
+    否则在缩小图上检测，再从原图裁剪识别
+    """
+    if scale_policy is None:
+        result = ocr.ocr(image, cls=cls)
+        return OcrResultSet.from_paddle(result[0] if result else None)
+    img = load_image(image)
+    if img is None:
+        return OcrResultSet.empty()
+    scale = scale_policy.scale_for(img.shape)
+    if scale >= 1.0:
+        result = ocr.ocr(img, cls=cls)
+        return OcrResultSet.from_paddle(result[0] if result else None)
+    return recognize_boxes(ocr, img, detect_boxes(ocr, img, scale), cls=cls)
+
+
+# ==================== 流式识别 ====================
+
+def prioritize_boxes(boxes: np.ndarray, region: Tuple[float, float, float, float] = None,
+                     near: Tuple[float, float] = None, target_size: Tuple[float, float] = None) -> np.ndarray:
+    """
+    按优先级提示对文字框排序，返回下标
+
+    排序规则：中心落在region内的框优先；同一档内按与near的距离、与target_size的尺寸差异之和升序，
+    都未提供时保持原有的阅读顺序
+
+    Args:
+        boxes: (N, 4, 2) 文字框
+        region: 优先区域 (x1, y1, x2, y2)
+        near: 优先位置（如上次找到目标的位置）
+        target_size: 目标文字框的 (宽, 高)
+    """
+    n = len(boxes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    mins, maxs = boxes.min(axis=1), boxes.max(axis=1)
+    centers = (mins + maxs) / 2
+    sizes = maxs - mins
+
+    outside = np.zeros(n, dtype=np.int8)
+    if region is not None:
+        inside = ((centers[:, 0] >= region[0]) & (centers[:, 0] <= region[2]) &
+                  (centers[:, 1] >= region[1]) & (centers[:, 1] <= region[3]))
+        outside = (~inside).astype(np.int8)
+
+    cost = np.zeros(n, dtype=np.float64)
+    if near is not None:
+        # 按整图对角线归一化
+        diag = max(float(np.linalg.norm(maxs.max(axis=0) - mins.min(axis=0))), 1.0)
+        cost += np.hypot(centers[:, 0] - near[0], centers[:, 1] - near[1]) / diag
+    if target_size is not None:
+        # 对数尺度的宽高差异，2倍差异约计0.7
+        target = np.maximum(np.asarray(target_size, dtype=np.float64), 1.0)
+        ratio = np.maximum(sizes, 1.0) / target
+        cost += np.abs(np.log(ratio)).sum(axis=1) / 2
+    return np.lexsort((np.arange(n), cost, outside))
+
+
+def recognize_stream(ocr, image: Union[str, bytes, np.ndarray], scale_policy: ScalePolicy = None,
+                     cls: bool = True, drop_score: float = None, batch_size: int = 4,
+                     region: Tuple[float, float, float, float] = None, near: Tuple[float, float] = None,
+                     target_size: Tuple[float, float] = None) -> Iterator[OcrResultSet]:
+    """
+    流式识别：检测全部文字框后按优先级分批识别，每批产出一个结果集（图片内坐标）
+
+    调用方找到目标后停止迭代即可跳过剩余文字框的识别；
+    region / near / target_size 为优先级提示，含义同 prioritize_boxes
+
+    Args:
+        batch_size: 每批识别的文字框数量，越小越早产出，越大识别吞吐越高
+    """
+    img = load_image(image)
+    if img is None:
+        return
+    scale = scale_policy.scale_for(img.shape) if scale_policy is not None else 1.0
+    boxes = detect_boxes(ocr, img, scale)
+    if len(boxes) == 0:
+        return
+    boxes = boxes[prioritize_boxes(boxes, region, near, target_size)]
+    batch_size = max(int(batch_size), 1)
+    for start in range(0, len(boxes), batch_size):
+        batch = recognize_boxes(ocr, img, boxes[start:start + batch_size], cls=cls, drop_score=drop_score)
+        if batch:
+            yield batch
+
+
+# ==================== 校准 ====================
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """两组外接矩形 (x1, y1, x2, y2) 的IoU矩阵"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def _boxes_to_rects(boxes: np.ndarray) -> np.ndarray:
+    return np.concatenate([boxes.min(axis=1), boxes.max(axis=1)], axis=1)
+
+
+def detection_recall(reference: np.ndarray, candidate: np.ndarray, iou_threshold: float = 0.5) -> float:
+    """候选检测框对参考检测框的召回率"""
+    if len(reference) == 0:
+        return 1.0
+    if len(candidate) == 0:
+        return 0.0
+    iou = box_iou(_boxes_to_rects(reference), _boxes_to_rects(candidate))
+    return float((iou.max(axis=1) >= iou_threshold).mean())
+
+
+def calibrate_scale(ocr, samples: Sequence[Union[str, bytes, np.ndarray]], target_recall: float = 0.95,
+                    candidates: Sequence[int] = (1280, 960, 736, 640, 480, 320),
+                    iou_threshold: float = 0.5) -> Tuple[ScalePolicy, Dict[int, float]]:
+    """
+    在样本集上寻找满足召回率要求的最小检测尺寸
+
+    以原图检测结果为参考，依次尝试更小的det_max_side，
+    返回召回率不低于target_recall的最小尺寸对应的策略。
+    大于引擎检测上限（engine_det_limit）的候选尺寸与不缩放等价，不参与校准
+
+    Returns:
+        (策略, {det_max_side: 平均召回率})
+    """
+    images = [img for img in (load_image(s) for s in samples) if img is not None]
+    if not images:
+        raise ValueError("No readable calibration samples")
+    limit = engine_det_limit(ocr)
+    if limit is not None:
+        candidates = [side for side in candidates if side < limit] or [limit]
+    references = [detect_boxes(ocr, img) for img in images]
+
+    recalls = {}
+    best = None
+    for side in sorted(candidates, reverse=True):
+        policy = ScalePolicy(det_max_side=side)
+        recall = float(np.mean([
+            detection_recall(ref, detect_boxes(ocr, img, policy.scale_for(img.shape)), iou_threshold)
+            for img, ref in zip(images, references)
+        ]))
+        recalls[side] = recall
+        if recall >= target_recall:
+            best = side
+        else:
+            # 更小的尺寸召回率只会更低
+            break
+    if best is None:
+        # 没有满足要求的尺寸，退回到不缩放
+        return ScalePolicy(enabled=False), recalls
+    return ScalePolicy(det_max_side=best), recalls
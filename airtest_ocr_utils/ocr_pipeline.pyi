@@ -0,0 +1,46 @@
+"""
+OCR分阶段流水线的类型存根文件
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+DEFAULT_DROP_SCORE: float
+
+_Image = Union[str, bytes, np.ndarray]
+
+class ScalePolicy:
+    det_max_side: int
+    min_scale: float
+    enabled: bool
+
+    def __init__(self, det_max_side: int = 960, min_scale: float = 0.2, enabled: bool = True) -> None: ...
+    def scale_for(self, shape: Tuple[int, ...]) -> float: ...
+    def to_dict(self) -> Dict: ...
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScalePolicy": ...
+    def save(self, path: str) -> None: ...
+    @classmethod
+    def load(cls, path: str) -> "ScalePolicy": ...
+
+def load_image(image: _Image) -> Optional[np.ndarray]: ...
+def sort_boxes(boxes: np.ndarray) -> np.ndarray: ...
+def engine_det_limit(ocr) -> Optional[int]: ...
+def detect_boxes(ocr, img: np.ndarray, scale: float = 1.0) -> np.ndarray: ...
+def crop_text_region(img: np.ndarray, box: np.ndarray) -> np.ndarray: ...
+def recognize_crops(ocr, crops: Sequence[np.ndarray], cls: bool = True) -> List[Tuple[str, float]]: ...
+def recognize_boxes(ocr, img: np.ndarray, boxes: np.ndarray, cls: bool = True,
+                    drop_score: float = None) -> OcrResultSet: ...
+def run_ocr(ocr, image: _Image, scale_policy: ScalePolicy = None, cls: bool = True) -> OcrResultSet: ...
+def prioritize_boxes(boxes: np.ndarray, region: Tuple[float, float, float, float] = None,
+                     near: Tuple[float, float] = None, target_size: Tuple[float, float] = None) -> np.ndarray: ...
+def recognize_stream(ocr, image: _Image, scale_policy: ScalePolicy = None, cls: bool = True,
+                     drop_score: float = None, batch_size: int = 4,
+                     region: Tuple[float, float, float, float] = None, near: Tuple[float, float] = None,
+                     target_size: Tuple[float, float] = None) -> Iterator[OcrResultSet]: ...
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray: ...
+def detection_recall(reference: np.ndarray, candidate: np.ndarray, iou_threshold: float = 0.5) -> float: ...
+def calibrate_scale(ocr, samples: Sequence[_Image], target_recall: float = 0.95,
+                    candidates: Sequence[int] = ..., iou_threshold: float = 0.5) -> Tuple[ScalePolicy, Dict[int, float]]: ...
@@ -0,0 +1,285 @@
+"""
+OCR识别结果容器
+基于NumPy数组的列式存储，支持向量化的置信度、区域和距离过滤
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class OcrResult:
+    """OCR识别结果（单条视图，使用__slots__减少对象开销）"""
+    __slots__ = ('text', 'bbox', 'confidence', 'center', 'points', 'match_score')
+    _FIELDS = ('text', 'bbox', 'confidence', 'center', 'points')
+
+    def __init__(self, text: str, bbox: Tuple[int, int, int, int], confidence: float,
+                 center: Tuple[float, float], points: List[Tuple[int, int]],
+                 match_score: Optional[float] = None):
+        self.text = text              # 识别的文字
+        self.bbox = bbox              # 边界框 (x1, y1, x2, y2)
+        self.confidence = confidence  # 置信度
+        self.center = center          # 中心点坐标
+        self.points = points          # 四个角点坐标
+        self.match_score = match_score  # 规则匹配分数（fuzzy模式为相似度）
+
+    def __repr__(self):
+        return (f"OcrResult(text={self.text!r}, bbox={self.bbox!r}, confidence={self.confidence!r}, "
+                f"center={self.center!r}, points={self.points!r})")
+
+    def __eq__(self, other):
+        if not isinstance(other, OcrResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+
+
+class OcrResultSet:
+    """
+    列式OCR结果集合
+
+    - points: (N, 4, 2) 四个角点坐标
+    - confidences: (N,) 置信度
+    - texts: (N,) 文字（object数组）
+    - bboxes / centers: 按需计算并缓存
+    """
+    __slots__ = ('points', 'confidences', 'texts', '_bboxes', '_centers', '_index')
+
+    def __init__(self, points, confidences, texts):
+        self.points = np.asarray(points, dtype=np.float32).reshape(-1, 4, 2)
+        self.confidences = np.asarray(confidences, dtype=np.float64).reshape(-1)
+        if isinstance(texts, np.ndarray) and texts.dtype == object:
+            self.texts = texts
+        else:
+            self.texts = np.empty(len(texts), dtype=object)
+            self.texts[:] = list(texts)
+        self._bboxes = None
+        self._centers = None
+        self._index = None
+
+    # ==================== 构造 ====================
+
+    @classmethod
+    def empty(cls) -> "OcrResultSet":
+        """空结果集"""
+        return cls(np.zeros((0, 4, 2), dtype=np.float32), [], [])
+
+    @classmethod
+    def from_paddle(cls, lines, offset: Tuple[float, float] = None) -> "OcrResultSet":
+        """
+        从PaddleOCR单张图片的输出构造
+
+        Args:
+            lines: PaddleOCR返回的 result[0]，每项为 [points, (text, confidence)]
+            offset: 坐标偏移 (dx, dy)，用于区域截图时还原到屏幕坐标
+        """
+        if not lines:
+            return cls.empty()
+        points = np.asarray([line[0] for line in lines], dtype=np.float32).reshape(-1, 4, 2)
+        if offset is not None:
+            points += np.asarray(offset[:2], dtype=np.float32)
+        return cls(points,
+                   [line[1][1] for line in lines],
+                   [line[1][0] for line in lines])
+
+    @classmethod
+    def from_results(cls, results: Iterable[Union[OcrResult, Dict]]) -> "OcrResultSet":
+        """从OcrResult列表或ocr_recognize格式的字典列表构造"""
+        points, confidences, texts = [], [], []
+        for res in results:
+            if isinstance(res, dict):
+                points.append(res['points'])
+                confidences.append(res['confidence'])
+                texts.append(res['text'])
+            else:
+                points.append(res.points)
+                confidences.append(res.confidence)
+                texts.append(res.text)
+        if not texts:
+            return cls.empty()
+        return cls(points, confidences, texts)
+
+    @classmethod
+    def coerce(cls, results) -> "OcrResultSet":
+        """将任意结果序列统一为OcrResultSet（自定义引擎可能返回列表）"""
+        if isinstance(results, cls):
+            return results
+        if not results:
+            return cls.empty()
+        return cls.from_results(results)
+
+    @classmethod
+    def concat(cls, sets: Sequence["OcrResultSet"]) -> "OcrResultSet":
+        """拼接多个结果集"""
+        sets = [s for s in sets if len(s)]
+        if not sets:
+            return cls.empty()
+        if len(sets) == 1:
+            return sets[0]
+        return cls(np.concatenate([s.points for s in sets]),
+                   np.concatenate([s.confidences for s in sets]),
+                   np.concatenate([s.texts for s in sets]))
+
+    # ==================== 派生列 ====================
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        """(N, 4) 外接矩形 (x1, y1, x2, y2)"""
+        if self._bboxes is None:
+            self._bboxes = np.concatenate([self.points.min(axis=1), self.points.max(axis=1)], axis=1)
+        return self._bboxes
+
+    @property
+    def centers(self) -> np.ndarray:
+        """(N, 2) 四个角点的平均中心"""
+        if self._centers is None:
+            self._centers = self.points.mean(axis=1)
+        return self._centers
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """(N, 2) 外接矩形宽高"""
+        bboxes = self.bboxes
+        return bboxes[:, 2:] - bboxes[:, :2]
+
+    # ==================== 序列协议 ====================
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __bool__(self) -> bool:
+        return len(self.texts) > 0
+
+    def __iter__(self) -> Iterator[OcrResult]:
+        for i in range(len(self)):
+            yield self.result(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.result(int(index))
+        return self.take(index)
+
+    def __repr__(self):
+        return f"OcrResultSet(n={len(self)}, texts={list(self.texts[:5])}{'...' if len(self) > 5 else ''})"
+
+    def result(self, i: int) -> OcrResult:
+        """第i条结果的OcrResult视图"""
+        if i < 0:
+            i += len(self)
+        bbox = self.bboxes[i]
+        center = self.centers[i]
+        return OcrResult(
+            text=self.texts[i],
+            bbox=(int(bbox[0]), int(bbox[1]), int(bbox[2]), int(bbox[3])),
+            confidence=float(self.confidences[i]),
+            center=(float(center[0]), float(center[1])),
+            points=[(int(x), int(y)) for x, y in self.points[i]],
+        )
+
+    def take(self, index) -> "OcrResultSet":
+        """按布尔掩码、索引数组或切片取子集"""
+        subset = OcrResultSet.__new__(OcrResultSet)
+        subset.points = self.points[index]
+        subset.confidences = self.confidences[index]
+        subset.texts = self.texts[index]
+        subset._bboxes = None if self._bboxes is None else self._bboxes[index]
+        subset._centers = None if self._centers is None else self._centers[index]
+        subset._index = None
+        return subset
+
+    # ==================== 向量化查询 ====================
+
+    def offset(self, dx: float, dy: float) -> "OcrResultSet":
+        """整体平移坐标"""
+        if dx == 0 and dy == 0:
+            return self
+        return OcrResultSet(self.points + np.asarray([dx, dy], dtype=np.float32),
+                            self.confidences, self.texts)
+
+    def filter_confidence(self, threshold: Optional[float]) -> "OcrResultSet":
+        """保留置信度不低于阈值的结果"""
+        if threshold is None:
+            return self
+        return self.take(self.confidences >= threshold)
+
+    def region_mask(self, region: Tuple[int, int, int, int]) -> np.ndarray:
+        """外接矩形中心点落在区域 (x1, y1, x2, y2) 内的掩码"""
+        bboxes = self.bboxes
+        cx = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        cy = (bboxes[:, 1] + bboxes[:, 3]) / 2
+        return (cx >= region[0]) & (cx <= region[2]) & (cy >= region[1]) & (cy <= region[3])
+
+    def in_region(self, region: Optional[Tuple[int, int, int, int]]) -> "OcrResultSet":
+        """保留中心点位于区域内的结果"""
+        if region is None:
+            return self
+        return self.take(self.region_mask(region))
+
+    def distances(self, pos: Tuple[float, float]) -> np.ndarray:
+        """各结果中心点到指定坐标的距离"""
+        return np.hypot(self.centers[:, 0] - pos[0], self.centers[:, 1] - pos[1])
+
+    def nearest(self, pos: Tuple[float, float], k: int = None,
+                max_distance: float = None) -> "OcrResultSet":
+        """
+        按到指定坐标的距离排序
+
+        Args:
+            pos: 目标坐标
+            k: 只保留最近的k个，None表示全部
+            max_distance: 只保留距离不超过该值的结果
+        """
+        dist = self.distances(pos)
+        order = np.argsort(dist, kind='stable')
+        if max_distance is not None:
+            order = order[dist[order] <= max_distance]
+        if k is not None:
+            order = order[:k]
+        return self.take(order)
+
+    def text_mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """按文字谓词计算掩码"""
+        return np.fromiter((bool(predicate(t)) for t in self.texts), dtype=bool, count=len(self))
+
+    def filter_text(self, predicate: Callable[[str], bool]) -> "OcrResultSet":
+        """保留文字满足谓词的结果"""
+        return self.take(self.text_mask(predicate))
+
+    def sort_by_confidence(self) -> "OcrResultSet":
+        """按置信度从高到低排序"""
+        return self.take(np.argsort(-self.confidences, kind='stable'))
+
+    def spatial_index(self):
+        """本结果集的空间索引（首次调用时构建，之后复用）"""
+        if self._index is None:
+            from .spatial_index import SpatialIndex
+            self._index = SpatialIndex(self)
+        return self._index
+
+    # ==================== 导出 ====================
+
+    def to_results(self) -> List[OcrResult]:
+        """导出为OcrResult列表"""
+        return list(self)
+
+    def to_paddle(self) -> List:
+        """导出为PaddleOCR单张图片的输出格式 [[points, (text, confidence)], ...]（from_paddle 的逆操作）"""
+        points = self.points.tolist()
+        confidences = self.confidences.tolist()
+        return [[points[i], (text, confidences[i])] for i, text in enumerate(self.texts)]
+
+    def to_dicts(self) -> List[Dict]:
+        """导出为 ocr_recognize 的字典格式"""
+        centers = self.centers.tolist()
+        points = self.points.tolist()
+        confidences = self.confidences.tolist()
+        formatted = []
+        for i, text in enumerate(self.texts):
+            pts = [tuple(p) for p in points[i]]
+            formatted.append({
+                'text': text,
+                'confidence': confidences[i],
+                'points': pts,
+                'center': tuple(centers[i]),
+                'bbox': pts  # 边界框坐标
+            })
+        return formatted
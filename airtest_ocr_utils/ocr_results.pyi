@@ -0,0 +1,62 @@
+"""
+OCR识别结果容器的类型存根文件
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .spatial_index import SpatialIndex
+
+class OcrResult:
+    """OCR识别结果"""
+    text: str
+    bbox: Tuple[int, int, int, int]
+    confidence: float
+    center: Tuple[float, float]
+    points: List[Tuple[int, int]]
+    match_score: Optional[float]
+
+    def __init__(self, text: str, bbox: Tuple[int, int, int, int], confidence: float,
+                 center: Tuple[float, float], points: List[Tuple[int, int]],
+                 match_score: Optional[float] = None) -> None: ...
+
+class OcrResultSet:
+    points: np.ndarray
+    confidences: np.ndarray
+    texts: np.ndarray
+
+    def __init__(self, points, confidences, texts) -> None: ...
+    @classmethod
+    def empty(cls) -> "OcrResultSet": ...
+    @classmethod
+    def from_paddle(cls, lines, offset: Tuple[float, float] = None) -> "OcrResultSet": ...
+    @classmethod
+    def from_results(cls, results: Iterable[Union[OcrResult, Dict]]) -> "OcrResultSet": ...
+    @classmethod
+    def coerce(cls, results) -> "OcrResultSet": ...
+    @classmethod
+    def concat(cls, sets: Sequence["OcrResultSet"]) -> "OcrResultSet": ...
+    @property
+    def bboxes(self) -> np.ndarray: ...
+    @property
+    def centers(self) -> np.ndarray: ...
+    @property
+    def sizes(self) -> np.ndarray: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[OcrResult]: ...
+    def __getitem__(self, index): ...
+    def result(self, i: int) -> OcrResult: ...
+    def take(self, index) -> "OcrResultSet": ...
+    def offset(self, dx: float, dy: float) -> "OcrResultSet": ...
+    def filter_confidence(self, threshold: Optional[float]) -> "OcrResultSet": ...
+    def region_mask(self, region: Tuple[int, int, int, int]) -> np.ndarray: ...
+    def in_region(self, region: Optional[Tuple[int, int, int, int]]) -> "OcrResultSet": ...
+    def distances(self, pos: Tuple[float, float]) -> np.ndarray: ...
+    def nearest(self, pos: Tuple[float, float], k: int = None, max_distance: float = None) -> "OcrResultSet": ...
+    def text_mask(self, predicate: Callable[[str], bool]) -> np.ndarray: ...
+    def filter_text(self, predicate: Callable[[str], bool]) -> "OcrResultSet": ...
+    def sort_by_confidence(self) -> "OcrResultSet": ...
+    def spatial_index(self) -> "SpatialIndex": ...
+    def to_results(self) -> List[OcrResult]: ...
+    def to_paddle(self) -> List: ...
+    def to_dicts(self) -> List[Dict]: ...
@@ -0,0 +1,581 @@
+"""
+本机OCR服务
+一个常驻进程加载并预热模型，同一台机器上的测试进程通过Unix域套接字（Windows为本机TCP）请求识别，
+画面经共享内存传递；并发请求合批：各画面分别检测，所有文字框的识别合并为一次批量推理。
+RemoteOcrEngine 为客户端，可直接用于 OcrWatcher 和 OCRUtils
+
+启动服务:
+    airtest-ocr-server --profile mobile --engines 2
+客户端（设置环境变量后全局 ocr_utils / ocr_watcher 自动使用服务）:
+    AIRTEST_OCR_SERVER=/tmp/airtest-ocr.sock python run_tests.py
+"""
+
+import os
+import sys
+import time
+import queue
+import secrets
+import socket
+import tempfile
+import argparse
+import threading
+import weakref
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7
+    shared_memory = None
+
+from .ocr_results import OcrResultSet
+from .ocr_pipeline import (ScalePolicy, DEFAULT_DROP_SCORE, detect_boxes, crop_text_region, recognize_crops,
+                           load_image)
+from .ocr_engine import OcrEngine
+from .model_profiles import ModelProfile, get_profile, create_engine, resolved
+
+SERVER_ENV = "AIRTEST_OCR_SERVER"
+AUTHKEY_ENV = "AIRTEST_OCR_AUTHKEY"
+DEFAULT_PORT = 47291
+
+Address = Union[str, Tuple[str, int]]
+
+
+def default_address() -> Address:
+    """默认地址：POSIX为临时目录下的Unix域套接字，Windows为本机TCP端口"""
+    if os.name == 'posix':
+        return os.path.join(tempfile.gettempdir(), "airtest-ocr.sock")
+    return ('127.0.0.1', DEFAULT_PORT)
+
+
+def parse_address(address: Union[str, Address, None]) -> Address:
+    """
+    解析服务地址
+
+    Args:
+        address: 'host:port'、Unix域套接字路径（可带 'unix:' 前缀）、(host, port)，None表示默认地址
+    """
+    if address is None or address == "":
+        return default_address()
+    if isinstance(address, tuple):
+        return address[0], int(address[1])
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address and '\\' not in address:
+        return host or '127.0.0.1', int(port)
+    return address
+
+
+def server_address() -> Optional[Address]:
+    """环境变量 AIRTEST_OCR_SERVER 指定的服务地址，未设置时返回None"""
+    value = os.environ.get(SERVER_ENV)
+    return parse_address(value) if value else None
+
+
+def authkey_path() -> str:
+    """本用户的认证密钥文件：~/.airtest-ocr/authkey"""
+    return os.path.join(os.path.expanduser("~"), ".airtest-ocr", "authkey")
+
+
+def _authkey(authkey: Optional[bytes], create: bool = False) -> bytes:
+    """
+    连接认证密钥：参数 > 环境变量 AIRTEST_OCR_AUTHKEY > 本用户的密钥文件
+
+    密钥文件由服务端（create=True）首次启动时生成随机密钥，权限仅本用户可读写；
+    同一用户的客户端读取该文件，其他用户无法连接
+    """
+    if authkey is not None:
+        return authkey
+    value = os.environ.get(AUTHKEY_ENV)
+    if value:
+        return value.encode()
+    path = authkey_path()
+    if create and not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # 同时启动的另一服务已生成
+            pass
+        else:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(secrets.token_hex(32).encode())
+    try:
+        with open(path, 'rb') as f:
+            key = f.read().strip()
+    except FileNotFoundError:
+        key = b""
+    if not key:
+        raise OSError(f"No OCR server authkey at {path}: start the server as the same user or set {AUTHKEY_ENV}")
+    return key
+
+
+def _attach_shared_memory(name: str):
+    """按名称打开客户端创建的共享内存，不交给本进程的资源跟踪器（避免服务退出时误删客户端的内存）"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+# ==================== 服务端 ====================
+
+class _Job:
+    __slots__ = ('request', 'image', 'reply', 'event')
+
+    def __init__(self, request: Dict, image: Optional[np.ndarray]):
+        self.request = request
+        self.image = image
+        self.reply = None
+        self.event = threading.Event()
+
+    def finish(self, reply: Tuple[str, Any]):
+        self.reply = reply
+        self.event.set()
+
+
+class OcrServer:
+    """
+    OCR服务
+
+    Args:
+        address: 监听地址，None表示默认地址
+        profile: 模型配置档
+        lang: 语言
+        use_gpu: 是否使用GPU
+        engines: 引擎数（同时执行的批次数）
+        max_batch: 每批最多合并的请求数
+        batch_window: 收到第一个请求后等待其他请求加入同一批的时间（秒）
+        authkey: 连接认证密钥，None时取环境变量 AIRTEST_OCR_AUTHKEY，未设置则使用（首次启动时生成）本用户的密钥文件
+    """
+
+    def __init__(self, address: Union[str, Address] = None, profile=None, lang: str = 'ch', use_gpu: bool = False,
+                 engines: int = 1, max_batch: int = 8, batch_window: float = 0.005, authkey: bytes = None):
+        self.address = parse_address(address)
+        self.profile = get_profile(profile)
+        self.lang = lang
+        self.use_gpu = use_gpu
+        self.engines = max(int(engines), 1)
+        self.max_batch = max(int(max_batch), 1)
+        self.batch_window = batch_window
+        self._authkey = _authkey(authkey, create=True)
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._listener: Optional[Listener] = None
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats = {'connections': 0, 'requests': 0, 'batches': 0, 'crops': 0, 'errors': 0,
+                      'busy_time': 0.0}
+
+    # ==================== 生命周期 ====================
+
+    def start(self):
+        """加载并预热全部引擎，开始监听；连接在后台线程中处理"""
+        for i in range(self.engines):
+            engine = create_engine(self.profile, lang=self.lang, use_gpu=self.use_gpu, warmup=True, show_log=False)
+            worker = threading.Thread(target=self._work, args=(engine,), name=f"OcrServerWorker-{i}", daemon=True)
+            worker.start()
+            self._threads.append(worker)
+        self._listener = self._listen()
+        acceptor = threading.Thread(target=self._accept_forever, name="OcrServerAccept", daemon=True)
+        acceptor.start()
+        self._threads.append(acceptor)
+
+    def _listen(self) -> Listener:
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            # 上次异常退出遗留的套接字文件：无法连接时删除
+            probe = socket.socket(socket.AF_UNIX)
+            try:
+                probe.connect(self.address)
+            except OSError:
+                os.unlink(self.address)
+            else:
+                raise OSError(f"OCR server already running at {self.address}")
+            finally:
+                probe.close()
+        return Listener(self.address, authkey=self._authkey)
+
+    def serve_forever(self):
+        """启动（尚未启动时）并阻塞到 stop() 或 Ctrl+C"""
+        if self._listener is None:
+            self.start()
+        try:
+            while not self._stopping.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """停止监听和批处理线程"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        for _ in range(self.engines):
+            self._queue.put(None)
+        if self._listener is not None:
+            # 连接一次唤醒阻塞中的 accept
+            try:
+                Client(self.address, authkey=self._authkey).close()
+            except Exception:
+                pass
+            self._listener.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    # ==================== 连接 ====================
+
+    def _accept_forever(self):
+        while not self._stopping.is_set():
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._stopping.is_set():
+                    break
+                continue
+            if self._stopping.is_set():
+                conn.close()
+                break
+            with self._stats_lock:
+                self.stats['connections'] += 1
+            threading.Thread(target=self._serve_connection, args=(conn,), name="OcrServerConn", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        """一个客户端连接：顺序处理请求，识别请求交给批处理线程"""
+        segment = None
+        try:
+            while not self._stopping.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                op = request.get('op')
+                image = None
+                try:
+                    if op == 'ping':
+                        reply = ('ok', self.info())
+                    elif op == 'stats':
+                        reply = ('ok', self.get_stats())
+                    elif op in ('ocr', 'rec'):
+                        if 'shm' in request:
+                            if segment is None or segment.name != request['shm']:
+                                if segment is not None:
+                                    segment.close()
+                                segment = _attach_shared_memory(request['shm'])
+                            image = np.ndarray(request['shape'], dtype=request['dtype'], buffer=segment.buf)
+                        else:
+                            image = request.get('image')
+                        job = _Job(request, image)
+                        self._queue.put(job)
+                        job.event.wait()
+                        job.image = None
+                        reply = job.reply
+                    else:
+                        reply = ('error', f"Unknown op: {op}")
+                except Exception as e:
+                    reply = ('error', f"{type(e).__name__}: {e}")
+                del image
+                if reply[0] == 'error':
+                    with self._stats_lock:
+                        self.stats['errors'] += 1
+                conn.send(reply)
+        finally:
+            conn.close()
+            if segment is not None:
+                try:
+                    segment.close()
+                except BufferError:
+                    pass
+
+    # ==================== 批处理 ====================
+
+    def _work(self, engine):
+        """批处理线程：取一个请求，再在batch_window内收集更多请求合为一批"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            deadline = time.time() + self.batch_window
+            while len(jobs) < self.max_batch:
+                try:
+                    job = self._queue.get(timeout=max(deadline - time.time(), 0))
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._queue.put(None)
+                    break
+                jobs.append(job)
+            self._run_batch(engine, jobs)
+
+    def _run_batch(self, engine, jobs: List[_Job]):
+        """各画面分别检测，所有待识别的文字图片合并为一次批量识别，再按请求拆分结果"""
+        start = time.perf_counter()
+        crops: List[np.ndarray] = []
+        owners = []  # (job, 起始下标, 数量, 文字框或None)
+        cls = False
+        for job in jobs:
+            request = job.request
+            try:
+                if request['op'] == 'rec':
+                    owners.append((job, len(crops), len(request['crops']), None))
+                    crops.extend(request['crops'])
+                    cls = cls or request.get('cls', True)
+                elif not request.get('det', True):
+                    owners.append((job, len(crops), 1, None))
+                    crops.append(job.image)
+                    cls = cls or request.get('cls', True)
+                elif not request.get('rec', True):
+                    result = engine.ocr(job.image, det=True, rec=False, cls=False)
+                    boxes = np.asarray(result[0] if result and result[0] else [], dtype=np.float32)
+                    job.finish(('ok', boxes.reshape(-1, 4, 2)))
+                else:
+                    scale = request.get('scale')
+                    scale = ScalePolicy.from_dict(scale).scale_for(job.image.shape) if scale else 1.0
+                    boxes = detect_boxes(engine, job.image, scale)
+                    owners.append((job, len(crops), len(boxes), boxes))
+                    crops.extend(crop_text_region(job.image, box) for box in boxes)
+                    cls = cls or request.get('cls', True)
+            except Exception as e:
+                job.finish(('error', f"{type(e).__name__}: {e}"))
+
+        try:
+            rec_res = recognize_crops(engine, crops, cls=cls and self.profile.use_angle_cls) if crops else []
+        except Exception as e:
+            for job, _, _, _ in owners:
+                job.finish(('error', f"{type(e).__name__}: {e}"))
+            rec_res = None
+        if rec_res is not None:
+            drop_score = getattr(engine, 'drop_score', DEFAULT_DROP_SCORE)
+            for job, first, count, boxes in owners:
+                part = rec_res[first:first + count]
+                if boxes is None:
+                    job.finish(('ok', part))
+                    continue
+                confidences = np.asarray([score for _, score in part], dtype=np.float64)
+                keep = confidences >= drop_score
+                texts = [text for (text, _), k in zip(part, keep) if k]
+                job.finish(('ok', (boxes[keep], confidences[keep], texts)))
+
+        with self._stats_lock:
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(jobs)
+            self.stats['crops'] += len(crops)
+            self.stats['busy_time'] += time.perf_counter() - start
+
+    # ==================== 查询 ====================
+
+    def info(self) -> Dict:
+        return {'profile': self.profile.to_dict(), 'lang': self.lang, 'engines': self.engines,
+                'max_batch': self.max_batch, 'pid': os.getpid()}
+
+    def get_stats(self) -> Dict[str, float]:
+        """服务统计：连接数、请求数、批次数、平均每批请求数、识别的文字图片数、出错次数"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['avg_batch'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+
+# ==================== 客户端 ====================
+
+def _release(resources: Dict):
+    """关闭连接并释放客户端创建的共享内存"""
+    conn, segment = resources.pop('conn', None), resources.pop('shm', None)
+    if conn is not None:
+        conn.close()
+    if segment is not None:
+        segment.close()
+        segment.unlink()
+
+
+class RemoteOcrEngine(OcrEngine):
+    """
+    OCR服务客户端
+
+    同时实现 OcrEngine 接口（供 OcrWatcher 使用）和 PaddleOCR 的 ocr() 接口（供 OCRUtils 的引擎池使用）；
+    每个实例一条连接，同一实例的请求串行，多个实例（如引擎池中的多个引擎）的并发请求由服务端合批
+
+    Args:
+        address: 服务地址，None时取环境变量 AIRTEST_OCR_SERVER，未设置则为默认地址
+        scale_policy: 检测缩放策略（recognize / recognize_image 使用），由服务端执行
+        use_shared_memory: 是否经共享内存传递画面（Python 3.8+）
+        authkey: 连接认证密钥，None时取环境变量 AIRTEST_OCR_AUTHKEY，未设置则读取本用户的密钥文件（连接时）
+    """
+
+    def __init__(self, address: Union[str, Address] = None, scale_policy: Optional[ScalePolicy] = None,
+                 use_shared_memory: bool = True, authkey: bytes = None):
+        self.address = parse_address(address) if address is not None else (server_address() or default_address())
+        self.scale_policy = scale_policy
+        self.use_shared_memory = use_shared_memory and shared_memory is not None
+        self.confidence_threshold = 0.7
+        # 方向分类由服务端按其配置档执行，本地的 recognize_crops 不再分类
+        self.use_angle_cls = False
+        self.ready = resolved(self)
+        self._authkey = authkey
+        self._info: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._resources: Dict[str, Any] = {}
+        self._finalizer = weakref.finalize(self, _release, self._resources)
+
+    # ==================== 连接 ====================
+
+    def _call(self, request: Dict) -> Any:
+        """发送请求并等待结果"""
+        with self._lock:
+            return self._call_locked(request)
+
+    def _call_locked(self, request: Dict) -> Any:
+        """发送请求并等待结果；连接断开时重连重试一次（服务重启）（调用方持有锁）"""
+        for attempt in (0, 1):
+            conn = self._resources.get('conn')
+            try:
+                if conn is None:
+                    conn = Client(self.address, authkey=_authkey(self._authkey))
+                    self._resources['conn'] = conn
+                conn.send(request)
+                status, payload = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._resources.pop('conn', None)
+                if conn is not None:
+                    conn.close()
+                if attempt:
+                    raise ConnectionError(f"OCR server unavailable at {self.address}: {e}") from e
+        if status == 'error':
+            raise RuntimeError(f"OCR server error: {payload}")
+        return payload
+
+    def _frame_request(self, image: np.ndarray, **params) -> Any:
+        """
+        识别请求：画面写入共享内存（大小不够时重新分配），否则随请求发送
+
+        从写入共享内存到收到结果全程持锁，避免其他线程在服务端读取前覆盖或重新分配同一块内存
+        """
+        image = np.ascontiguousarray(image)
+        request = dict(params, shape=image.shape, dtype=image.dtype.str)
+        if not self.use_shared_memory:
+            request['image'] = image
+            return self._call(request)
+        with self._lock:
+            segment = self._resources.get('shm')
+            if segment is None or segment.size < image.nbytes:
+                if segment is not None:
+                    segment.close()
+                    segment.unlink()
+                # 按MB取整，分辨率小幅变化时不必重新分配
+                size = max(-(-image.nbytes // (1 << 20)) << 20, 1 << 20)
+                segment = shared_memory.SharedMemory(create=True, size=size)
+                self._resources['shm'] = segment
+            np.ndarray(image.shape, dtype=image.dtype, buffer=segment.buf)[...] = image
+            request['shm'] = segment.name
+            return self._call_locked(request)
+
+    def close(self):
+        """关闭连接并释放共享内存"""
+        with self._lock:
+            _release(self._resources)
+
+    def ping(self) -> Dict:
+        """服务信息：配置档、语言、引擎数、进程号"""
+        self._info = self._call({'op': 'ping'})
+        return self._info
+
+    def get_stats(self) -> Dict[str, float]:
+        """服务端统计"""
+        return self._call({'op': 'stats'})
+
+    @property
+    def profile(self) -> ModelProfile:
+        """服务端使用的模型配置档"""
+        info = self._info or self.ping()
+        return ModelProfile.from_dict(info['profile'])
+
+    @property
+    def lang(self) -> str:
+        info = self._info or self.ping()
+        return info['lang']
+
+    # ==================== OcrEngine 接口 ====================
+
+    def set_confidence_threshold(self, threshold: float):
+        """设置置信度阈值"""
+        self.confidence_threshold = threshold
+
+    def recognize(self, image_bytes: bytes) -> OcrResultSet:
+        """识别图片字节数据"""
+        image = load_image(image_bytes) if image_bytes else None
+        if image is None:
+            return OcrResultSet.empty()
+        return self.recognize_image(image)
+
+    def recognize_image(self, image: np.ndarray) -> OcrResultSet:
+        """识别BGR画面"""
+        scale = self.scale_policy.to_dict() if self.scale_policy is not None else None
+        points, confidences, texts = self._frame_request(image, op='ocr', scale=scale)
+        return OcrResultSet(points, confidences, texts)
+
+    # ==================== PaddleOCR 兼容接口 ====================
+
+    def ocr(self, img, det: bool = True, rec: bool = True, cls: bool = True) -> List:
+        """与 PaddleOCR.ocr 相同的输入输出格式（单张图片）"""
+        image = load_image(img)
+        if image is None:
+            return [None]
+        if det and rec:
+            points, confidences, texts = self._frame_request(image, op='ocr', cls=cls)
+            lines = OcrResultSet(points, confidences, texts).to_paddle()
+            return [lines or None]
+        if det:
+            boxes = self._frame_request(image, op='ocr', rec=False)
+            return [boxes.tolist() or None]
+        return [self._frame_request(image, op='ocr', det=False, cls=cls)]
+
+    def text_recognizer(self, crops: Sequence[np.ndarray]) -> Tuple[List[Tuple[str, float]], float]:
+        """批量识别文字图片（recognize_crops 通过该属性一次发送全部文字框）"""
+        start = time.perf_counter()
+        rec_res = self._call({'op': 'rec', 'crops': [np.ascontiguousarray(c) for c in crops], 'cls': True})
+        return rec_res, time.perf_counter() - start
+
+
+# ==================== 命令行 ====================
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="airtest-ocr-server", description="本机OCR服务：常驻加载模型，供多个测试进程共用")
+    parser.add_argument("--address", default=os.environ.get(SERVER_ENV),
+                        help="监听地址：Unix域套接字路径或 host:port，默认 %s" % (default_address(),))
+    parser.add_argument("--profile", default=None, help="模型配置档名称或模型目录")
+    parser.add_argument("--lang", default="ch", help="语言")
+    parser.add_argument("--gpu", action="store_true", help="使用GPU")
+    parser.add_argument("--engines", type=int, default=1, help="引擎数（同时执行的批次数）")
+    parser.add_argument("--max-batch", type=int, default=8, help="每批最多合并的请求数")
+    parser.add_argument("--batch-window", type=float, default=5.0, help="合批等待时间（毫秒）")
+    args = parser.parse_args(argv)
+
+    profile = args.profile
+    if profile is not None and os.path.isdir(profile):
+        profile = ModelProfile.from_dir(os.path.basename(os.path.normpath(profile)), profile)
+    server = OcrServer(args.address, profile=profile, lang=args.lang, use_gpu=args.gpu, engines=args.engines,
+                       max_batch=args.max_batch, batch_window=args.batch_window / 1000.0)
+    print(f"✅ OCR服务启动中: {server.address} (配置档 {server.profile.name}, 引擎 {server.engines})")
+    try:
+        server.start()
+    except (OSError, FileNotFoundError) as e:
+        print(f"❌ OCR服务启动失败: {e}")
+        return 1
+    print("✅ OCR服务已就绪，Ctrl+C 停止")
+    server.serve_forever()
+    stats = server.get_stats()
+    print(f"✅ OCR服务已停止: 请求 {stats['requests']}，批次 {stats['batches']}，平均每批 {stats['avg_batch']:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
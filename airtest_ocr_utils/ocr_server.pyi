@@ -0,0 +1,65 @@
+"""
+本机OCR服务的类型存根文件
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from .ocr_results import OcrResultSet
+from .ocr_pipeline import ScalePolicy
+from .ocr_engine import OcrEngine
+from .model_profiles import ModelProfile
+
+SERVER_ENV: str
+AUTHKEY_ENV: str
+DEFAULT_PORT: int
+
+Address = Union[str, Tuple[str, int]]
+
+def default_address() -> Address: ...
+def parse_address(address: Union[str, Address, None]) -> Address: ...
+def server_address() -> Optional[Address]: ...
+def authkey_path() -> str: ...
+
+class OcrServer:
+    address: Address
+    profile: ModelProfile
+    lang: str
+    use_gpu: bool
+    engines: int
+    max_batch: int
+    batch_window: float
+    stats: Dict[str, float]
+
+    def __init__(self, address: Union[str, Address] = None, profile: Union[str, ModelProfile, None] = None,
+                 lang: str = 'ch', use_gpu: bool = False, engines: int = 1, max_batch: int = 8,
+                 batch_window: float = 0.005, authkey: bytes = None) -> None: ...
+    def start(self) -> None: ...
+    def serve_forever(self) -> None: ...
+    def stop(self) -> None: ...
+    def info(self) -> Dict: ...
+    def get_stats(self) -> Dict[str, float]: ...
+
+class RemoteOcrEngine(OcrEngine):
+    address: Address
+    scale_policy: Optional[ScalePolicy]
+    use_shared_memory: bool
+    confidence_threshold: float
+    use_angle_cls: bool
+
+    def __init__(self, address: Union[str, Address] = None, scale_policy: Optional[ScalePolicy] = None,
+                 use_shared_memory: bool = True, authkey: bytes = None) -> None: ...
+    def close(self) -> None: ...
+    def ping(self) -> Dict: ...
+    def get_stats(self) -> Dict[str, float]: ...
+    @property
+    def profile(self) -> ModelProfile: ...
+    @property
+    def lang(self) -> str: ...
+    def set_confidence_threshold(self, threshold: float) -> None: ...
+    def recognize(self, image_bytes: bytes) -> OcrResultSet: ...
+    def recognize_image(self, image: np.ndarray) -> OcrResultSet: ...
+    def ocr(self, img: Any, det: bool = True, rec: bool = True, cls: bool = True) -> List: ...
+    def text_recognizer(self, crops: Sequence[np.ndarray]) -> Tuple[List[Tuple[str, float]], float]: ...
+
+def main(argv: Sequence[str] = None) -> int: ...
@@ -20,38 +20,443 @@ os.environ['MKL_NUM_THREADS'] = '1'
 # 延迟导入PaddleOCR，确保环境变量生效
 import time
 import random
-from typing import List, Tuple, Dict, Optional
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Optional, Iterator
 from airtest.core.api import *
 from airtest.core.cv import Template
 import cv2
 import numpy as np
-from PIL import ImageGrab, Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont
+
+from .ocr_results import OcrResultSet
+from .ocr_pipeline import ScalePolicy, run_ocr, recognize_stream, calibrate_scale, load_image
+from .text_tracker import TextTracker
+from .result_cache import OcrResultCache, engine_tag
+from .text_match import text_match, NgramIndex
+from .frame_bus import FrameBus, BusFrame, clip_region, crop_frame
+from .device_capture import capture_region, device_snapshot
+from .engine_pool import EnginePool
+from .text_prefilter import TextPrefilter
+from .model_profiles import ModelProfile, get_profile, create_engine, load_engine_async, resolved, profile_tag
+from .tiled_ocr import TilePolicy, recognize_tiled
+from .engine_cache import EngineCache
+from .ocr_server import RemoteOcrEngine, parse_address, server_address
+from .scroll_search import SCROLL_DIRECTIONS, ScrollIndex, ScrollSearchResult, estimate_scroll, row_profile
+from .ocr_flow import OcrFlow
+from .screen_change import StabilityGate
+from .flight_recorder import FlightRecorder
 
 # 延迟导入PaddleOCR
-def init_paddleocr(lang='ch', use_gpu=False):
-    """延迟初始化PaddleOCR"""
-    from paddleocr import PaddleOCR
-    return PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=use_gpu)
+def init_paddleocr(lang='ch', use_gpu=False, profile=None, warmup=False):
+    """延迟初始化PaddleOCR，profile为模型配置档名称或对象，None表示PaddleOCR默认模型"""
+    return create_engine(profile, lang=lang, use_gpu=use_gpu, warmup=warmup)
 
 
 class OCRUtils:
-    def __init__(self, lang: str = 'ch', use_gpu: bool = False):
+    def __init__(self, lang: str = 'ch', use_gpu: bool = False, scale_policy: ScalePolicy = None,
+                 tracker: TextTracker = None, result_cache: OcrResultCache = None,
+                 frame_bus: FrameBus = None, frame_max_age: float = 0.5, pool_size: int = 1,
+                 profile=None, warmup: bool = True, background: bool = True, server: str = None):
         """
         初始化OCR工具
         
         Args:
             lang: 语言类型，'ch'中文, 'en'英文
             use_gpu: 是否使用GPU
+            scale_policy: 检测缩放策略，大图先缩小检测再从原图裁剪识别，None表示不缩放
+            tracker: 文字跟踪器，找到文字后用模板匹配重新定位，None表示每次都OCR
+            result_cache: 持久化结果缓存，相同画面跨运行复用识别结果，None表示不缓存
+            frame_bus: 共享画面总线，与OcrWatcher共用截图和识别结果，None表示独立截图识别
+            frame_max_age: 从总线复用画面时可接受的最长存在时间（秒）
+            pool_size: OCR引擎池大小，多线程并发调用时最多同时使用的PaddleOCR实例数
+            profile: 模型配置档，'mobile'/'server'/'default'、已注册的名称或 ModelProfile 对象
+            warmup: 是否预热引擎（用合成图片推理几次，消除首次识别的冷启动耗时）
+            background: 是否在后台线程中加载和预热引擎，初始化立即返回，可通过 ready / wait_ready 查看就绪状态
+            server: 本机OCR服务地址，使用服务时不在本进程加载模型；None时取环境变量 AIRTEST_OCR_SERVER
         """
         # 延迟初始化PaddleOCR
-        self.ocr = init_paddleocr(lang=lang, use_gpu=use_gpu)
+        self.profile = get_profile(profile)
+        self.lang = lang
+        self.use_gpu = use_gpu
+        self.server = parse_address(server) if server is not None else server_address()
+        # 引擎就绪Future：后台加载时首次识别会等待加载完成
+        self.ready = self._load_engine(self.profile, warmup, background)
         self.confidence_threshold = 0.7  # 默认置信度阈值
+        self.fuzzy_max_edits = None  # fuzzy匹配允许的最大错字数，None表示按目标文字长度
+        self.scale_policy = scale_policy
+        self.tracker = tracker
+        self.result_cache = result_cache
+        self.stream_batch_size = None  # 流式识别每批文字框数，None表示关闭
+        self._last_located = {}  # 跟踪键 -> 上次找到的文字框，作为流式识别的优先级提示
+        self.frame_bus = frame_bus
+        self.frame_max_age = frame_max_age
+        # 引擎池：每次识别借用一个引擎，多线程调用互不干扰；引擎按需创建
+        self.engine_pool = EnginePool(self._engine_factory(self.profile, self.ready), size=pool_size)
+        self._debug_seq = itertools.count(1)
+        self.prefilter = None  # 文字预筛器，None表示总是OCR
+        self.tile_policy = None  # 分块识别策略，None表示整图识别
+        self.tile_workers = None  # 并发识别的图块数，None表示等于引擎池大小
+        self.engine_cache = None  # 多语言引擎缓存，第一次使用其他语言时创建
+        self._lang_local = threading.local()  # 当前线程通过 language() 选择的识别语言
+        self.stability = None  # 识别前的画面稳定等待，None表示截图后立即识别
+        self.flight_recorder = None  # 最近识别记录，超时时转储，None表示不记录
         
     def set_confidence_threshold(self, threshold: float):
         """设置置信度阈值"""
         self.confidence_threshold = threshold
+
+    def set_fuzzy_max_edits(self, max_edits: Optional[int]):
+        """
+        设置fuzzy匹配模式允许的最大错字数，None表示按目标文字长度：
+        1个字不允许错字，2~3个字只允许1个形近字替换（如"确走"），4个字允许1个替换，更长的允许长度的20%（向上取整）；
+        指定数值时短目标也允许任意字的替换
+        """
+        self.fuzzy_max_edits = max_edits
+
+    def enable_tracking(self, match_threshold: float = 0.9, **kwargs) -> TextTracker:
+        """
+        启用文字跟踪：ocr_touch/ocr_wait_text等找到文字后保存图像块，
+        后续调用先在上次位置附近模板匹配，匹配分数低于阈值时才重新OCR
+        
+        Args:
+            match_threshold: 模板匹配最低分数
+            **kwargs: 透传给 TextTracker，如 search_margin、max_age
+        """
+        self.tracker = TextTracker(match_threshold=match_threshold, **kwargs)
+        return self.tracker
+
+    def disable_tracking(self):
+        """关闭文字跟踪"""
+        self.tracker = None
+
+    def enable_streaming(self, batch_size: int = 4):
+        """
+        启用流式识别：ocr_touch等单目标查找时按优先级分批识别文字框，找到目标即停止，
+        跳过剩余文字框的识别（调试模式或设置了结果缓存时仍使用完整识别）
+        
+        Args:
+            batch_size: 每批识别的文字框数量
+        """
+        self.stream_batch_size = max(int(batch_size), 1)
+
+    def disable_streaming(self):
+        """关闭流式识别"""
+        self.stream_batch_size = None
+
+    def enable_prefilter(self, **kwargs) -> TextPrefilter:
+        """
+        启用文字预筛：识别前在缩小的灰度图上按边缘密度判断是否可能有文字，
+        没有候选区域时跳过OCR，直接返回空结果
+        
+        Args:
+            **kwargs: 透传给 TextPrefilter，如 max_side、contrast
+        """
+        self.prefilter = TextPrefilter(**kwargs)
+        return self.prefilter
+
+    def disable_prefilter(self):
+        """关闭文字预筛"""
+        self.prefilter = None
+
+    def enable_tiling(self, tile_size: int = 1280, overlap: int = 160, min_side: int = 2000,
+                      workers: int = None, **kwargs) -> TilePolicy:
+        """
+        启用分块识别：最长边超过min_side的画面切成相互重叠的图块，在线程池中借用引擎池里的不同引擎并发识别，
+        结果去重并拼接跨图块的文字行；并发度受引擎池大小限制，多核机器上配合 set_pool_size 使用
+        
+        Args:
+            tile_size: 图块边长（像素）
+            overlap: 相邻图块的重叠宽度（像素），应大于最大的文字行高
+            min_side: 画面最长边超过该值时才分块
+            workers: 并发识别的图块数，None表示等于引擎池大小
+            **kwargs: 透传给 TilePolicy，如 iou_threshold、edge_margin
+        """
+        self.tile_policy = TilePolicy(tile_size=tile_size, overlap=overlap, min_side=min_side, **kwargs)
+        self.tile_workers = workers
+        return self.tile_policy
+
+    def disable_tiling(self):
+        """关闭分块识别"""
+        self.tile_policy = None
+
+    def enable_stability(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.5,
+                         poll: float = 0.1, **kwargs) -> StabilityGate:
+        """
+        开启识别前的画面稳定等待：截图后连续frames帧画面不再变化才识别，过渡动画期间不做无效识别
+        
+        Args:
+            frames: 连续多少帧不变视为稳定
+            threshold: 两帧缩略图之间变化像素比例的上限
+            max_wait: 每次截图最长等待时间(秒)，超时仍识别最后一帧
+            poll: 截图间隔(秒)
+            **kwargs: 透传给 StabilityGate，如 pixel_threshold、history
+            
+        Returns:
+            StabilityGate，get_stats() 中 wait_time 为等待时间，skipped 为画面仍在变化而未识别的帧数
+        """
+        self.stability = StabilityGate(frames=frames, threshold=threshold, max_wait=max_wait, poll=poll, **kwargs)
+        return self.stability
+
+    def disable_stability(self):
+        """关闭画面稳定等待"""
+        self.stability = None
+
+    def _after_action(self):
+        """
+        点击/滑动后画面即将变化：画面总线上操作前的画面和识别结果不能再复用，
+        稳定等待也不能再把操作前的画面当作已稳定的帧
+        """
+        bus = self.frame_bus
+        if bus is not None:
+            bus.clear()
+        stability = self.stability
+        if stability is not None:
+            stability.reset()
+
+    def enable_flight_recorder(self, capacity: int = 30, directory: str = "flight_records",
+                               recorder: FlightRecorder = None, **kwargs) -> FlightRecorder:
+        """
+        开启飞行记录：在内存中保留最近capacity次识别的画面、结果和匹配判断（只保存引用，较早的画面后台压缩），
+        查找/等待超时时自动写到磁盘，也可通过 dump_flight_record() 手动转储
+        
+        Args:
+            capacity: 保留的记录条数
+            directory: 转储目录
+            recorder: 已有的记录器（如与OcrWatcher共用一个），指定时忽略其他参数
+            **kwargs: 透传给 FlightRecorder，如 raw_frames、min_dump_interval
+        """
+        self.flight_recorder = recorder if recorder is not None else FlightRecorder(
+            capacity=capacity, directory=directory, **kwargs)
+        return self.flight_recorder
+
+    def disable_flight_recorder(self):
+        """关闭飞行记录"""
+        self.flight_recorder = None
+
+    def dump_flight_record(self, reason: str = "manual") -> Optional[str]:
+        """把飞行记录写到磁盘，返回转储目录；未开启或没有记录时返回None"""
+        recorder = self.flight_recorder
+        path = recorder.dump(reason) if recorder is not None else None
+        if path:
+            print(f"✅ 飞行记录已保存: {path}")
+        return path
+
+    def _flight_record(self, image: Optional[np.ndarray], results: OcrResultSet,
+                       region: Optional[Tuple[int, int, int, int]], event: str = "", **decision):
+        recorder = self.flight_recorder
+        if recorder is not None:
+            recorder.record("OCRUtils", image, results, region, event=event, decision=decision)
+
+    def _flight_note(self, **decision):
+        """为当前线程最近一条飞行记录补充匹配判断"""
+        recorder = self.flight_recorder
+        if recorder is not None:
+            recorder.note(**decision)
+
+    def _flight_timeout(self, method: str, text: str):
+        """查找/等待超时：转储飞行记录（记录器按最短间隔限流）"""
+        recorder = self.flight_recorder
+        if recorder is None:
+            return
+        path = recorder.auto_dump(f"{method}_timeout_{text}")
+        if path:
+            print(f"⚠️ {method} 超时未找到 '{text}'，飞行记录已保存: {path}")
+
+    def enable_languages(self, memory_budget_mb: float = None, share_detector: str = 'family',
+                         pool_size: int = 1, preload: List[str] = None) -> EngineCache:
+        """
+        配置多语言引擎缓存：lang 参数或 language() 选择其他语言时按需加载该语言的模型，
+        检测模型相同的语言共用检测器，超出内存预算时淘汰最久未使用的语言（lang 指定的基础语言使用引擎池，常驻）
+        
+        Args:
+            memory_budget_mb: 其他语言模型的内存预算（MB），None表示不淘汰
+            share_detector: 检测器共用方式，'family' 检测模型相同的语言共用，'all' 全部使用基础语言的检测器，'none' 不共用
+            pool_size: 每种语言的最大引擎数
+            preload: 提前加载的语言
+        """
+        self.engine_cache = self._create_engine_cache(memory_budget_mb=memory_budget_mb,
+                                                      share_detector=share_detector, pool_size=pool_size)
+        if preload:
+            self.engine_cache.preload(preload)
+        return self.engine_cache
+
+    def disable_languages(self):
+        """释放其他语言的模型，之后再选择其他语言时按默认设置重新创建缓存"""
+        if self.engine_cache is not None:
+            self.engine_cache.clear()
+        self.engine_cache = None
+
+    def _create_engine_cache(self, **kwargs) -> EngineCache:
+        # 使用OCR服务时基础语言的引擎是服务连接，不作为检测器共用
+        base_pool = self.engine_pool if self.server is None else None
+        return EngineCache(self.profile, base_lang=self.lang, use_gpu=self.use_gpu, base_pool=base_pool, **kwargs)
+
+    def _reset_engine_cache(self):
+        """引擎池或配置档更换后按原设置重建多语言缓存"""
+        cache = self.engine_cache
+        if cache is None:
+            return
+        cache.clear()
+        self.engine_cache = self._create_engine_cache(memory_budget_mb=cache.memory_budget_mb,
+                                                      share_detector=cache.share_detector,
+                                                      pool_size=cache.pool_size)
+
+    @contextmanager
+    def language(self, lang: Optional[str]) -> Iterator[None]:
+        """
+        在with块内（当前线程）使用指定语言识别，None表示沿用外层的选择；可以嵌套
+        示例: with ocr_utils.language('en'): ocr_touch("Settings")
+        """
+        if lang is None:
+            yield
+            return
+        previous = getattr(self._lang_local, 'lang', None)
+        self._lang_local.lang = lang
+        try:
+            yield
+        finally:
+            self._lang_local.lang = previous
+
+    def _active_lang(self) -> str:
+        """当前线程的识别语言"""
+        return getattr(self._lang_local, 'lang', None) or self.lang
+
+    def _language_cache(self) -> EngineCache:
+        cache = self.engine_cache
+        if cache is None:
+            cache = self.engine_cache = self._create_engine_cache()
+        return cache
+
+    def set_pool_size(self, size: int):
+        """
+        设置OCR引擎池大小：多线程并发识别时最多同时使用size个PaddleOCR实例，
+        引擎全忙时按调用顺序排队
+        """
+        self.engine_pool.resize(size)
+
+    @property
+    def ocr(self):
+        """主引擎，后台加载未完成时等待"""
+        return self.ready.result()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """
+        等待引擎加载和预热完成
+        
+        Returns:
+            是否已就绪，超时返回False；加载失败时抛出加载时的异常
+        """
+        try:
+            self.ready.result(timeout)
+        except FutureTimeoutError:
+            return False
+        return True
+
+    def _load_engine(self, profile: ModelProfile, warmup: bool, background: bool) -> Future:
+        if self.server is not None:
+            return resolved(RemoteOcrEngine(self.server))
+        if background:
+            return load_engine_async(profile, lang=self.lang, use_gpu=self.use_gpu, warmup=warmup)
+        return resolved(init_paddleocr(lang=self.lang, use_gpu=self.use_gpu, profile=profile, warmup=warmup))
+
+    def _engine_factory(self, profile: ModelProfile, ready: Future = None):
+        """引擎池的引擎工厂：第一个引擎取自就绪Future，之后按需同步创建"""
+        lang, use_gpu, server = self.lang, self.use_gpu, self.server
+        preloaded = [ready] if ready is not None else []
+
+        def factory():
+            try:
+                pending = preloaded.pop()
+            except IndexError:
+                pending = None
+            if pending is not None:
+                return pending.result()
+            if server is not None:
+                # 每个客户端一条连接，池中多个引擎的并发请求由服务端合批
+                return RemoteOcrEngine(server)
+            return init_paddleocr(lang=lang, use_gpu=use_gpu, profile=profile, warmup=True)
+        return factory
+
+    def set_profile(self, profile, warmup: bool = True, background: bool = False):
+        """
+        切换模型配置档：重新创建引擎并替换引擎池（池大小不变），正在进行的识别使用旧引擎完成
+        
+        Args:
+            profile: 配置档名称或 ModelProfile 对象，如 'mobile' 用于高频轮询，'server' 用于精确读取
+            warmup: 是否预热新引擎
+            background: 是否在后台加载新引擎，加载期间的识别等待新引擎就绪
+        """
+        if self.server is not None:
+            print(f"⚠️ 正在使用OCR服务 {self.server}，模型配置档由服务端决定；如需本进程加载请先调用 set_server(None)")
+            return
+        profile = get_profile(profile)
+        ready = self._load_engine(profile, warmup, background)
+        self.profile = profile
+        self.ready = ready
+        self.engine_pool = EnginePool(self._engine_factory(profile, ready), size=self.engine_pool.size)
+        self._reset_engine_cache()
+        if background:
+            print(f"✅ 正在后台加载模型配置档: {profile.name}")
+        else:
+            print(f"✅ 已切换模型配置档: {profile.name}")
+
+    def set_server(self, server: Optional[str]):
+        """
+        切换到本机OCR服务（或切回本进程加载模型）：替换引擎池（池大小不变）
+        
+        Args:
+            server: 服务地址，如 '/tmp/airtest-ocr.sock' 或 '127.0.0.1:47291'；None表示在本进程加载模型
+        """
+        self.server = parse_address(server) if server is not None else None
+        ready = self._load_engine(self.profile, True, self.server is None)
+        self.ready = ready
+        self.engine_pool = EnginePool(self._engine_factory(self.profile, ready), size=self.engine_pool.size)
+        self._reset_engine_cache()
+        print(f"✅ OCR引擎: {'本机OCR服务 ' + str(self.server) if self.server is not None else '本进程加载'}")
+
+    def set_frame_bus(self, frame_bus: Optional[FrameBus], max_age: float = 0.5):
+        """
+        设置共享画面总线：与同样接入总线的OcrWatcher共用截图和识别结果，
+        max_age秒内的画面和已识别过的区域直接复用，None表示独立截图识别
+        
+        Args:
+            frame_bus: 画面总线，通常为全局的 frame_bus
+            max_age: 可接受的画面最长存在时间（秒）
+        """
+        self.frame_bus = frame_bus
+        self.frame_max_age = max_age
+
+    def set_result_cache(self, result_cache: Optional[OcrResultCache]):
+        """设置持久化结果缓存，None表示不缓存"""
+        self.result_cache = result_cache
+
+    def set_scale_policy(self, scale_policy: Optional[ScalePolicy]):
+        """设置检测缩放策略，None表示不缩放"""
+        self.scale_policy = scale_policy
+
+    def calibrate_scale(self, samples: List, target_recall: float = 0.95, **kwargs) -> ScalePolicy:
+        """
+        在当前设备的样本截图上校准检测尺寸，并应用得到的缩放策略
         
-    def ocr_recognize(self, image_path: str = None, region: Tuple[int, int, int, int] = None, debug: bool = False) -> List[Dict]:
+        Args:
+            samples: 样本图片路径或BGR数组列表
+            target_recall: 相对原图检测的最低召回率
+            **kwargs: 透传给 calibrate_scale，如 candidates、iou_threshold
+            
+        Returns:
+            校准后的缩放策略，可通过 ScalePolicy.save 按设备保存
+        """
+        with self.engine_pool.engine() as ocr:
+            policy, recalls = calibrate_scale(ocr, samples, target_recall=target_recall, **kwargs)
+        print(f"✅ 检测尺寸校准完成: {policy}, 召回率: {recalls}")
+        self.scale_policy = policy
+        return policy
+        
+    def ocr_recognize(self, image_path: str = None, region: Tuple[int, int, int, int] = None, debug: bool = False,
+                      lang: str = None) -> List[Dict]:
         """
         OCR识别文字
         
@@ -59,139 +464,404 @@ class OCRUtils:
             image_path: 图片路径，如果为None则截取当前屏幕
             region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
             debug: 是否生成调试图片，在文字下方标注识别结果
+            lang: 本次识别使用的语言，None表示初始化时的语言
             
         Returns:
             识别结果列表，每个元素包含文字、坐标和置信度
         """
+        return self.ocr_recognize_set(image_path=image_path, region=region, debug=debug, lang=lang).to_dicts()
+
+    def ocr_recognize_set(self, image_path: str = None, region: Tuple[int, int, int, int] = None,
+                          debug: bool = False, lang: str = None) -> OcrResultSet:
+        """
+        OCR识别文字，返回列式结果集
+        
+        Args:
+            image_path: 图片路径，如果为None则截取当前屏幕
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            debug: 是否生成调试图片，在文字下方标注识别结果
+            lang: 本次识别使用的语言，None表示初始化时的语言（或 language() 选择的语言）
+            
+        Returns:
+            OcrResultSet，坐标已换算为屏幕坐标
+        """
+        if lang is not None:
+            with self.language(lang):
+                return self.ocr_recognize_set(image_path=image_path, region=region, debug=debug)
+        if image_path is None and self._bus_results_enabled() and not debug:
+            # 从共享总线获取画面和识别结果
+            bus_frame = self._capture_bus_frame()
+            if bus_frame is None:
+                return OcrResultSet.empty()
+            results = self.frame_bus.results(bus_frame, region, self._recognize_bus_region)
+            if self.flight_recorder is not None:
+                region = clip_region(region, bus_frame.image.shape)
+                self._flight_record(crop_frame(bus_frame.image, region), results, region, "recognize")
+            return results
         if image_path is None:
             # 截取屏幕
-            if region:
-                # 使用PIL截取指定区域
-                x1, y1, x2, y2 = region
-                screenshot = ImageGrab.grab(bbox=(x1, y1, x2, y2))
-                screenshot.save("temp_screenshot.png")
-                debug_image_path = "temp_screenshot_debug.png"
-            else:
-                # 使用Airtest截取全屏
-                snapshot(filename="temp_screenshot.png")
-                debug_image_path = "temp_screenshot_debug.png"
-            image_path = "temp_screenshot.png"
+            frame, region = self._capture_frame(region)
+            if frame is None:
+                return OcrResultSet.empty()
+            results = self._recognize_frame(frame, region, debug, self._debug_image_path() if debug else "")
+            self._flight_record(frame, results, region, "recognize")
+            return results
+        debug_image_path = image_path.replace('.png', '_debug.png')
+        return self._recognize_frame(image_path, region, debug, debug_image_path)
+
+    def ocr_recognize_regions(self, regions: List[Tuple[int, int, int, int]], image_path: str = None,
+                              max_workers: int = None) -> List[OcrResultSet]:
+        """
+        并行识别多个区域：截取一次屏幕，各区域在线程池中使用引擎池里的不同引擎同时识别
+        
+        Args:
+            regions: 区域列表 (x1, y1, x2, y2)
+            image_path: 图片路径，如果为None则截取当前屏幕
+            max_workers: 并发线程数，默认等于引擎池大小
+            
+        Returns:
+            与regions一一对应的OcrResultSet，坐标为屏幕坐标
+        """
+        image = self._capture_frame()[0] if image_path is None else load_image(image_path)
+        if image is None:
+            return [OcrResultSet.empty() for _ in regions]
+        workers = max_workers or self.engine_pool.size
+        lang = self._active_lang()
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="OCRUtils") as executor:
+            return list(executor.map(lambda r: self._recognize_region(image, r, lang), regions))
+
+    def _recognize_region(self, image: np.ndarray, region: Tuple[int, int, int, int],
+                          lang: str = None) -> OcrResultSet:
+        """识别整帧画面中的一个区域，返回屏幕坐标"""
+        region = clip_region(region, image.shape)
+        if region[2] <= region[0] or region[3] <= region[1]:
+            return OcrResultSet.empty()
+        with self.language(lang):
+            return self._recognize_frame(crop_frame(image, region), region, False, "")
+
+    def _debug_image_path(self) -> str:
+        """每次调用使用独立的调试图片路径，避免并发调用互相覆盖"""
+        return f"temp_screenshot_debug_{os.getpid()}_{threading.get_ident()}_{next(self._debug_seq)}.png"
+
+    def ocr_recognize_stream(self, image_path: str = None, region: Tuple[int, int, int, int] = None,
+                             priority_region: Tuple[int, int, int, int] = None,
+                             near: Tuple[float, float] = None, target_size: Tuple[float, float] = None,
+                             batch_size: int = 4) -> Iterator[OcrResultSet]:
+        """
+        流式OCR识别：先检测全部文字框，再按优先级分批识别并逐批产出，找到所需文字后停止迭代即可
+        
+        Args:
+            image_path: 图片路径，如果为None则截取当前屏幕
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            priority_region: 优先识别该区域内的文字框（屏幕坐标）
+            near: 优先识别靠近该位置的文字框（屏幕坐标）
+            target_size: 优先识别尺寸接近 (宽, 高) 的文字框
+            batch_size: 每批识别的文字框数量
+            
+        Yields:
+            OcrResultSet，坐标已换算为屏幕坐标
+        """
+        if image_path is None:
+            image, region = self._capture_frame(region)
         else:
-            debug_image_path = image_path.replace('.png', '_debug.png')
-            
-        # 使用PaddleOCR识别
-        result = self.ocr.ocr(image_path, cls=True)
-        
-        # 格式化结果
-        formatted_results = []
-        if result and result[0]:
-            # 读取图片用于调试标注
-            if debug:
-                img = cv2.imread(image_path)
-                if img is None:
-                    # 如果是新截图的，重新读取
-                    img = cv2.imread("temp_screenshot.png")
-            
-            for line in result[0]:
-                text = line[1][0]
-                confidence = line[1][1]
-                points = line[0]
-                
-                # 计算中心点坐标
-                center_x = sum(point[0] for point in points) / 4
-                center_y = sum(point[1] for point in points) / 4
-                
-                # 如果指定了区域，坐标需要加上区域偏移
-                if region:
-                    x1, y1, _, _ = region
-                    center_x += x1
-                    center_y += y1
-                    # 更新边界框坐标
-                    points = [(point[0] + x1, point[1] + y1) for point in points]
-                
-                formatted_results.append({
-                    'text': text,
-                    'confidence': confidence,
-                    'points': points,
-                    'center': (center_x, center_y),
-                    'bbox': points  # 边界框坐标
-                })
-                
-                # 调试模式下，在图片上标注识别结果
-                if debug and img is not None:
-                    # 计算文字标注位置（在识别框下方）
-                    min_y = min(point[1] for point in line[0])
-                    max_y = max(point[1] for point in line[0])
-                    text_y = int(max_y) + 20  # 在框下方20像素处
-                    text_x = int(min(point[0] for point in line[0]))  # 使用框的左侧作为起始位置
-                    
-                    # 绘制识别框（绿色）
-                    points_np = np.array(line[0], dtype=np.int32)
-                    cv2.polylines(img, [points_np], True, (0, 255, 0), 2)
-                    
-                    # 绘制红色文字（使用putText，对于中文可能会显示问号）
-                    # 注意：OpenCV的putText对中文支持不好，可能会显示问号
-                    cv2.putText(img, text, (text_x, text_y), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-                    
-                    # 绘制置信度（蓝色）
-                    conf_text = f"{confidence:.2f}"
-                    cv2.putText(img, conf_text, (text_x, text_y + 20), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 0, 0), 1)
-            
-            # 保存调试图片
-            if debug and img is not None:
-                cv2.imwrite(debug_image_path, img)
-                print(f"✅ 调试图片已保存: {debug_image_path}")
-                
-                # 同时创建一个使用PIL绘制中文的版本
+            image = image_path
+        if image is None:
+            return
+        dx, dy = (region[0], region[1]) if region else (0, 0)
+        if priority_region is not None:
+            priority_region = (priority_region[0] - dx, priority_region[1] - dy,
+                               priority_region[2] - dx, priority_region[3] - dy)
+        if near is not None:
+            near = (near[0] - dx, near[1] - dy)
+        # 迭代期间独占一个引擎，提前停止迭代时随生成器关闭归还
+        with self.engine_pool.engine() as ocr:
+            for batch in recognize_stream(ocr, image, self.scale_policy, cls=self.profile.use_angle_cls,
+                                          batch_size=batch_size, region=priority_region,
+                                          near=near, target_size=target_size):
+                yield batch.offset(dx, dy) if region else batch
+
+    def _capture_frame(self, region: Tuple[int, int, int, int] = None
+                       ) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int, int, int]]]:
+        """
+        截取当前设备画面为BGR数组，指定区域时从设备整帧画面中裁剪（视图，不复制）
+        
+        Returns:
+            (画面, 按画面范围裁剪后的区域)，截图失败或区域为空时画面为None
+        """
+        if self.frame_bus is not None:
+            bus_frame = self._capture_bus_frame()
+            if bus_frame is None:
+                return None, region
+            region = clip_region(region, bus_frame.image.shape)
+            if region is not None and (region[2] <= region[0] or region[3] <= region[1]):
+                return None, region
+            return crop_frame(bus_frame.image, region), region
+        stability = self.stability
+        if stability is None:
+            return capture_region(region)
+        # 区域截图时只比较该区域，区域外的动画不影响；截图已按区域裁剪，区域只作为复用上一帧的键
+        captured = [region]
+
+        def capture():
+            frame, captured[0] = capture_region(region)
+            return frame
+
+        frame = stability.wait(capture, key=region)
+        return frame, captured[0]
+
+    def _bus_results_enabled(self) -> bool:
+        """是否复用总线上的识别结果：总线结果是基础语言识别的，选择其他语言时只复用画面"""
+        return self.frame_bus is not None and self._active_lang() == self.lang
+
+    def _capture_bus_frame(self) -> Optional[BusFrame]:
+        """从共享总线获取足够新的设备画面，没有时截图并发布"""
+        return self.frame_bus.frame(self.frame_max_age, self._snapshot, source="OCRUtils")
+
+    def _snapshot(self) -> Optional[np.ndarray]:
+        """截取设备整帧画面，开启稳定等待时等画面稳定后返回"""
+        stability = self.stability
+        if stability is None:
+            return device_snapshot()
+        # 整帧画面：键为None，与不限区域的截图共用上一帧
+        return stability.wait(device_snapshot)
+
+    def _recognize_bus_region(self, image: np.ndarray, region: Optional[Tuple[int, int, int, int]]) -> OcrResultSet:
+        """总线识别回调：识别整帧画面中的区域，返回屏幕坐标"""
+        return self._recognize_frame(crop_frame(image, region), region, False, "")
+
+    def _run_ocr(self, image) -> OcrResultSet:
+        """从引擎池借用一个引擎执行识别，启用分块时大图按图块并发识别"""
+        lang = self._active_lang()
+        tile_policy = self.tile_policy
+        if tile_policy is not None:
+            frame = load_image(image)
+            if frame is not None and tile_policy.applies_to(frame.shape):
+                # 每个图块单独借用引擎，等待引擎时不占用其他引擎；语言在工作线程中显式传入
+                workers = self.tile_workers or self.engine_pool.size
+                return recognize_tiled(frame, lambda tile: self._run_engine(tile, lang), tile_policy,
+                                       max_workers=workers)
+        return self._run_engine(image, lang)
+
+    def _run_engine(self, image, lang: str = None) -> OcrResultSet:
+        if lang is not None and lang != self.lang:
+            return self._language_cache().recognize(image, lang, self.scale_policy,
+                                                    cls=self.profile.use_angle_cls)
+        with self.engine_pool.engine() as ocr:
+            return run_ocr(ocr, image, self.scale_policy, cls=self.profile.use_angle_cls)
+
+    def _recognize_frame(self, image, region: Optional[Tuple[int, int, int, int]], debug: bool,
+                         debug_image_path: str) -> OcrResultSet:
+        """识别图片（路径或BGR数组），坐标按区域偏移换算为屏幕坐标"""
+        # 文字预筛：没有候选文字区域时跳过OCR
+        prefilter = self.prefilter
+        if prefilter is not None:
+            image = load_image(image)
+            if image is None or not prefilter.has_text(image):
+                return OcrResultSet.empty()
+
+        # 使用PaddleOCR识别（图片内坐标，调试标注使用）
+        result_cache = self.result_cache
+        if result_cache is not None:
+            frame = load_image(image)
+            if frame is None:
+                return OcrResultSet.empty()
+            local_results = result_cache.recognize(
+                frame, lambda: self._run_ocr(frame), region=region,
+                engine=engine_tag(self.ocr, self._active_lang(), self.scale_policy, profile_tag(self.profile),
+                                  self.tile_policy))
+        else:
+            local_results = self._run_ocr(image)
+        if not local_results:
+            return local_results
+
+        # 如果指定了区域，坐标需要加上区域偏移
+        results = local_results.offset(region[0], region[1]) if region else local_results
+
+        # 调试模式下，在图片上标注识别结果
+        if debug:
+            self._save_debug_image(image, debug_image_path, local_results, results)
+
+        return results
+
+    def _save_debug_image(self, image, debug_image_path: str,
+                          local_results: OcrResultSet, results: OcrResultSet):
+        """保存调试图片，在识别框下方标注文字和置信度"""
+        img = load_image(image)
+        if img is None:
+            return
+        img = img.copy()
+
+        bboxes = local_results.bboxes
+        for i, text in enumerate(local_results.texts):
+            # 计算文字标注位置（在识别框下方）
+            text_y = int(bboxes[i, 3]) + 20  # 在框下方20像素处
+            text_x = int(bboxes[i, 0])  # 使用框的左侧作为起始位置
+            
+            # 绘制识别框（绿色）
+            points_np = local_results.points[i].astype(np.int32)
+            cv2.polylines(img, [points_np], True, (0, 255, 0), 2)
+            
+            # 绘制红色文字（使用putText，对于中文可能会显示问号）
+            # 注意：OpenCV的putText对中文支持不好，可能会显示问号
+            cv2.putText(img, text, (text_x, text_y), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            
+            # 绘制置信度（蓝色）
+            conf_text = f"{local_results.confidences[i]:.2f}"
+            cv2.putText(img, conf_text, (text_x, text_y + 20), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 0, 0), 1)
+        
+        # 保存调试图片
+        cv2.imwrite(debug_image_path, img)
+        print(f"✅ 调试图片已保存: {debug_image_path}")
+        
+        # 同时创建一个使用PIL绘制中文的版本
+        try:
+            # 使用PIL重新打开图片并添加中文标注
+            pil_img = Image.open(debug_image_path)
+            draw = ImageDraw.Draw(pil_img)
+            
+            # 使用默认字体（支持中文）
+            try:
+                # 尝试使用系统字体
+                font = ImageFont.truetype("simhei.ttf", 15)  # 黑体
+            except:
                 try:
-                    # 使用PIL重新打开图片并添加中文标注
-                    pil_img = Image.open(debug_image_path)
-                    draw = ImageDraw.Draw(pil_img)
-                    
-                    # 使用默认字体（支持中文）
-                    try:
-                        # 尝试使用系统字体
-                        font = ImageFont.truetype("simhei.ttf", 15)  # 黑体
-                    except:
-                        try:
-                            font = ImageFont.truetype("msyh.ttc", 15)  # 微软雅黑
-                        except:
-                            font = ImageFont.load_default()  # 默认字体
-                    
-                    for result in formatted_results:
-                        points = result['points']
-                        text = result['text']
-                        confidence = result['confidence']
-                        
-                        # 计算标注位置（在识别框下方）
-                        min_x = min(point[0] for point in points)
-                        max_y = max(point[1] for point in points)
-                        
-                        # 绘制文字
-                        text_position = (int(min_x), int(max_y) + 5)
-                        draw.text(text_position, text, fill=(255, 0, 0), font=font)
-                        
-                        # 绘制置信度
-                        conf_text = f"{confidence:.2f}"
-                        conf_position = (int(min_x), int(max_y) + 25)
-                        draw.text(conf_position, conf_text, fill=(0, 0, 255), font=font)
-                    
-                    # 保存PIL版本
-                    pil_debug_path = debug_image_path.replace('.png', '_pil.png')
-                    pil_img.save(pil_debug_path)
-                    print(f"✅ PIL中文调试图片已保存: {pil_debug_path}")
-                    
-                except Exception as e:
-                    print(f"⚠️  PIL中文标注失败: {e}")
+                    font = ImageFont.truetype("msyh.ttc", 15)  # 微软雅黑
+                except:
+                    font = ImageFont.load_default()  # 默认字体
+            
+            bboxes = results.bboxes
+            for i, text in enumerate(results.texts):
+                # 计算标注位置（在识别框下方）
+                min_x = bboxes[i, 0]
+                max_y = bboxes[i, 3]
                 
-        return formatted_results
+                # 绘制文字
+                text_position = (int(min_x), int(max_y) + 5)
+                draw.text(text_position, text, fill=(255, 0, 0), font=font)
+                
+                # 绘制置信度
+                conf_text = f"{results.confidences[i]:.2f}"
+                conf_position = (int(min_x), int(max_y) + 25)
+                draw.text(conf_position, conf_text, fill=(0, 0, 255), font=font)
+            
+            # 保存PIL版本
+            pil_debug_path = debug_image_path.replace('.png', '_pil.png')
+            pil_img.save(pil_debug_path)
+            print(f"✅ PIL中文调试图片已保存: {pil_debug_path}")
+            
+        except Exception as e:
+            print(f"⚠️  PIL中文标注失败: {e}")
+
+    def _find_matches(self, results: OcrResultSet, texts: List[str], match_mode: str,
+                      confidence: float) -> OcrResultSet:
+        """
+        筛选置信度达标且匹配任一目标文字的结果
+        
+        非fuzzy模式保持识别顺序；fuzzy模式按匹配分数（错字越少越高）从高到低排序
+        """
+        matched, _ = self._find_matches_scored(results, texts, match_mode, confidence)
+        return matched
+
+    def _find_matches_scored(self, results: OcrResultSet, texts: List[str], match_mode: str,
+                             confidence: float) -> Tuple[OcrResultSet, np.ndarray]:
+        """同 _find_matches，同时返回每条结果的匹配分数"""
+        results = results.filter_confidence(confidence)
+        if not results:
+            return results, np.zeros(0)
+        if match_mode != 'fuzzy':
+            matched = results.filter_text(
+                lambda actual: any(self._text_match(actual, text, match_mode) for text in texts))
+            return matched, np.ones(len(matched))
+        # fuzzy：先用n-gram索引预筛候选关键字，再计算编辑距离
+        index = NgramIndex(texts, max_edits=self.fuzzy_max_edits)
+        scores = np.zeros(len(results))
+        for i, actual in enumerate(results.texts):
+            best = index.best_match(actual)
+            if best is not None:
+                scores[i] = best[1]
+        order = np.flatnonzero(scores > 0)
+        order = order[np.argsort(-scores[order], kind='stable')]
+        return results.take(order), scores[order]
+    
+    def _locate_text(self, text: str, confidence: float, region: Optional[Tuple[int, int, int, int]],
+                     match_mode: str, debug: bool = False) -> Optional[Tuple[float, float]]:
+        """
+        定位单个文字的中心坐标
+        
+        启用跟踪时先在上次位置附近做模板匹配，失败再OCR；OCR命中后记录图像块供下次使用
+        """
+        key = (text, match_mode, tuple(region) if region else None)
+        bus_frame = None
+        if self._bus_results_enabled() and not debug:
+            bus_frame = self._capture_bus_frame()
+            if bus_frame is None:
+                return None
+            region = clip_region(region, bus_frame.image.shape)
+            frame = crop_frame(bus_frame.image, region)
+        else:
+            frame, region = self._capture_frame(region)
+        if frame is None or frame.size == 0:
+            return None
+        offset = (region[0], region[1]) if region else (0, 0)
+        tracker = self.tracker
+        if tracker is not None:
+            position = tracker.relocate(key, frame, offset)
+            if position is not None:
+                self._flight_record(frame, OcrResultSet.empty(), region, "locate", target=text,
+                                    match_mode=match_mode, via='tracker', position=list(position))
+                return position
+            
+        if bus_frame is not None:
+            results = self.frame_bus.results(bus_frame, region, self._recognize_bus_region)
+            matched = self._find_matches(results, [text], match_mode, confidence)
+        elif self.stream_batch_size and self.result_cache is None and not debug and self._active_lang() == self.lang:
+            matched = self._stream_find(frame, region, text, match_mode, confidence, key)
+            results = matched  # 流式识别找到后即停止，只有命中的结果
+        else:
+            results = self._recognize_frame(frame, region, debug, self._debug_image_path() if debug else "")
+            matched = self._find_matches(results, [text], match_mode, confidence)
+        if self.flight_recorder is not None:
+            self._flight_record(frame, results, region, "locate", target=text, match_mode=match_mode,
+                                confidence=confidence, matched_bbox=matched.bboxes[:1].tolist(),
+                                position=matched.centers[0].tolist() if matched else None)
+        if not matched:
+            return None
+        bbox = matched.bboxes[0]
+        self._last_located[key] = tuple(bbox.tolist())
+        if tracker is not None:
+            tracker.remember(key, frame, bbox, offset)
+        return tuple(matched.centers[0].tolist())
+
+    def _stream_find(self, frame: np.ndarray, region: Optional[Tuple[int, int, int, int]], text: str,
+                     match_mode: str, confidence: float, key) -> OcrResultSet:
+        """流式识别直到找到置信度达标的匹配，以上次找到的位置和尺寸作为优先级提示"""
+        near = target_size = None
+        last = self._last_located.get(key)
+        if last is not None:
+            near = ((last[0] + last[2]) / 2.0, (last[1] + last[3]) / 2.0)
+            target_size = (last[2] - last[0], last[3] - last[1])
+        dx, dy = (region[0], region[1]) if region else (0, 0)
+        if near is not None:
+            near = (near[0] - dx, near[1] - dy)
+        with self.engine_pool.engine() as ocr:
+            stream = recognize_stream(ocr, frame, self.scale_policy, cls=self.profile.use_angle_cls,
+                                      batch_size=self.stream_batch_size, near=near, target_size=target_size)
+            try:
+                for batch in stream:
+                    matched = self._find_matches(batch.offset(dx, dy) if region else batch,
+                                                 [text], match_mode, confidence)
+                    if matched:
+                        return matched
+            finally:
+                stream.close()
+        return OcrResultSet.empty()
     
     def ocr_touch(self, text: str, confidence: float = None, 
                   offset_x: int = 0, offset_y: int = 0, 
                   timeout: int = 10, region: Tuple[int, int, int, int] = None,
-                  match_mode: str = 'exact', debug: bool = False) -> bool:
+                  match_mode: str = 'exact', debug: bool = False, lang: str = None) -> bool:
         """
         OCR点击文字
         
@@ -208,7 +878,9 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
             debug: 是否生成调试图片，在文字下方标注识别结果
+            lang: 识别语言，None表示初始化时的语言
             
         Returns:
             是否成功点击
@@ -218,19 +890,20 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region, debug=debug)
-            
-            for result in results:
-                if self._text_match(result['text'], text, match_mode) and result['confidence'] >= confidence:
-                    center_x, center_y = result['center']
-                    target_x = center_x + offset_x
-                    target_y = center_y + offset_y
-                    
-                    touch((target_x, target_y))
-                    return True
+            with self.language(lang):
+                position = self._locate_text(text, confidence, region, match_mode, debug=debug)
+            if position:
+                center_x, center_y = position
+                target_x = center_x + offset_x
+                target_y = center_y + offset_y
+                
+                touch((target_x, target_y))
+                self._after_action()
+                return True
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_touch", text)
         return False
     
     def ocr_double_click(self, text: str, confidence: float = None,
@@ -253,6 +926,7 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
             
         Returns:
             是否成功双击
@@ -262,20 +936,20 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region)
-            
-            for result in results:
-                if self._text_match(result['text'], text, match_mode) and result['confidence'] >= confidence:
-                    center_x, center_y = result['center']
-                    target_x = center_x + offset_x
-                    target_y = center_y + offset_y
-                    
-                    # 双击操作
-                    double_click((target_x, target_y))
-                    return True
+            position = self._locate_text(text, confidence, region, match_mode)
+            if position:
+                center_x, center_y = position
+                target_x = center_x + offset_x
+                target_y = center_y + offset_y
+                
+                # 双击操作
+                double_click((target_x, target_y))
+                self._after_action()
+                return True
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_double_click", text)
         return False
     
     def ocr_swipe(self, start_text: str, end_text: str, 
@@ -302,23 +976,21 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize()
+            results = self.ocr_recognize_set()
             
-            start_pos = None
-            end_pos = None
+            is_start = (results.texts == start_text) & (results.confidences >= start_confidence)
+            is_end = ~is_start & (results.texts == end_text) & (results.confidences >= end_confidence)
             
-            for result in results:
-                if result['text'] == start_text and result['confidence'] >= start_confidence:
-                    start_pos = result['center']
-                elif result['text'] == end_text and result['confidence'] >= end_confidence:
-                    end_pos = result['center']
-                    
-                if start_pos and end_pos:
-                    swipe(start_pos, end_pos, duration=duration)
-                    return True
+            if is_start.any() and is_end.any():
+                start_pos = tuple(results.centers[np.argmax(is_start)].tolist())
+                end_pos = tuple(results.centers[np.argmax(is_end)].tolist())
+                swipe(start_pos, end_pos, duration=duration)
+                self._after_action()
+                return True
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_swipe", f"{start_text}->{end_text}")
         return False
     
     def ocr_touch_multiple(self, texts: List[str], strategy: str = 'confidence',
@@ -345,6 +1017,7 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
             
         Returns:
             是否成功点击
@@ -354,15 +1027,9 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region)
-            
-            # 筛选匹配的文字
-            matched_results = []
-            for result in results:
-                # 检查是否匹配列表中的任何一个文字
-                matched = any(self._text_match(result['text'], text, match_mode) for text in texts)
-                if matched and result['confidence'] >= confidence:
-                    matched_results.append(result)
+            # 筛选匹配列表中任何一个文字的结果
+            matched_results = self._find_matches(self.ocr_recognize_set(region=region),
+                                                 texts, match_mode, confidence)
                     
             if not matched_results:
                 time.sleep(1)
@@ -370,16 +1037,17 @@ class OCRUtils:
                 
             # 根据策略选择目标
             if strategy == 'confidence':
-                target_result = max(matched_results, key=lambda x: x['confidence'])
+                target_index = int(np.argmax(matched_results.confidences))
             elif strategy == 'nearest' and target_pos:
-                target_result = min(matched_results, 
-                                  key=lambda x: self._calculate_distance(x['center'], target_pos))
+                target_index = int(np.argmin(matched_results.distances(target_pos)))
             else:  # first
-                target_result = matched_results[0]
+                target_index = 0
                 
-            touch(target_result['center'])
+            touch(tuple(matched_results.centers[target_index].tolist()))
+            self._after_action()
             return True
             
+        self._flight_timeout("ocr_touch_multiple", "|".join(texts))
         return False
     
     def ocr_find_text_with_offset(self, text: str, offset_x: int, offset_y: int,
@@ -402,6 +1070,7 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
             
         Returns:
             是否成功点击
@@ -411,21 +1080,195 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region)
-            
-            for result in results:
-                if self._text_match(result['text'], text, match_mode) and result['confidence'] >= confidence:
-                    center_x, center_y = result['center']
-                    target_x = center_x + offset_x
-                    target_y = center_y + offset_y
-                    
-                    touch((target_x, target_y))
-                    return True
+            position = self._locate_text(text, confidence, region, match_mode)
+            if position:
+                center_x, center_y = position
+                target_x = center_x + offset_x
+                target_y = center_y + offset_y
+                
+                touch((target_x, target_y))
+                self._after_action()
+                return True
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_find_text_with_offset", text)
         return False
     
+    def ocr_find_relative(self, anchor: str, direction: str = 'right', text: str = None,
+                          confidence: float = None, timeout: int = 10,
+                          region: Tuple[int, int, int, int] = None,
+                          match_mode: str = 'exact', text_match_mode: str = 'contains',
+                          max_distance: float = None) -> Optional[Dict]:
+        """
+        查找锚点文字相对方向上最近的文字（如"用户名"右侧的输入值、表头下方的值）
+        
+        Args:
+            anchor: 锚点文字
+            direction: 方向
+                'right' / 'left' - 同一行中锚点右侧/左侧
+                'above' / 'below' - 同一列中锚点上方/下方
+                'row' / 'column' - 同一行/同一列
+            text: 目标文字，None表示取该方向上最近的任意文字
+            confidence: 置信度阈值
+            timeout: 超时时间(秒)
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            match_mode: 锚点文字的匹配模式
+            text_match_mode: 目标文字的匹配模式，默认包含匹配
+            max_distance: 与锚点的最大间距（像素），None表示不限制
+            
+        Returns:
+            目标文字的结果字典（格式同ocr_recognize），未找到返回None
+        """
+        if confidence is None:
+            confidence = self.confidence_threshold
+            
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            target = self._locate_relative(self.ocr_recognize_set(region=region), anchor, direction,
+                                           text, confidence, match_mode, text_match_mode, max_distance)
+            if target:
+                return target.to_dicts()[0]
+                
+            time.sleep(1)
+            
+        self._flight_timeout("ocr_find_relative", anchor)
+        return None
+    
+    def ocr_touch_relative(self, anchor: str, direction: str = 'right', text: str = None,
+                           confidence: float = None, timeout: int = 10,
+                           region: Tuple[int, int, int, int] = None,
+                           match_mode: str = 'exact', text_match_mode: str = 'contains',
+                           max_distance: float = None) -> bool:
+        """
+        点击锚点文字相对方向上最近的文字，参数同 ocr_find_relative
+        
+        Returns:
+            是否成功点击
+        """
+        target = self.ocr_find_relative(anchor, direction=direction, text=text, confidence=confidence,
+                                        timeout=timeout, region=region, match_mode=match_mode,
+                                        text_match_mode=text_match_mode, max_distance=max_distance)
+        if target is None:
+            return False
+        touch(target['center'])
+        self._after_action()
+        return True
+    
+    def ocr_get_row_texts(self, anchor: str, confidence: float = None, timeout: int = 10,
+                          region: Tuple[int, int, int, int] = None,
+                          match_mode: str = 'exact') -> List[str]:
+        """
+        获取与锚点文字位于同一行的所有文字（含锚点，从左到右）
+        
+        Args:
+            anchor: 锚点文字
+            confidence: 置信度阈值
+            timeout: 超时时间(秒)
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            match_mode: 锚点文字的匹配模式
+            
+        Returns:
+            文字列表，未找到锚点返回空列表
+        """
+        if confidence is None:
+            confidence = self.confidence_threshold
+            
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            results = self.ocr_recognize_set(region=region).filter_confidence(confidence)
+            anchors = np.flatnonzero(results.text_mask(lambda actual: self._text_match(actual, anchor, match_mode)))
+            if len(anchors):
+                anchor_index = int(anchors[0])
+                row = OcrResultSet.concat([results.spatial_index().row_of(anchor_index),
+                                           results.take([anchor_index])])
+                return row.take(np.argsort(row.bboxes[:, 0], kind='stable')).texts.tolist()
+                
+            time.sleep(1)
+            
+        self._flight_timeout("ocr_get_row_texts", anchor)
+        return []
+    
+    def ocr_read_fields(self, labels: List[str], direction: str = 'right',
+                        confidence: float = None, region: Tuple[int, int, int, int] = None,
+                        match_mode: str = 'exact', max_distance: float = None) -> Dict[str, Optional[str]]:
+        """
+        一次识别读取多个"标签-值"字段，例如表单中标签右侧或表头下方的值
+        
+        Args:
+            labels: 标签文字列表
+            direction: 值相对于标签的方向，默认右侧
+            confidence: 置信度阈值
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            match_mode: 标签文字的匹配模式
+            max_distance: 值与标签的最大间距（像素），None表示不限制
+            
+        Returns:
+            {标签: 值}，未找到的标签对应None
+        """
+        if confidence is None:
+            confidence = self.confidence_threshold
+            
+        results = self.ocr_recognize_set(region=region)
+        fields = {}
+        for label in labels:
+            target = self._locate_relative(results, label, direction, None, confidence,
+                                           match_mode, 'contains', max_distance)
+            fields[label] = target.texts[0] if target else None
+        return fields
+    
+    def _locate_relative(self, results: OcrResultSet, anchor: str, direction: str, text: Optional[str],
+                         confidence: float, match_mode: str, text_match_mode: str,
+                         max_distance: Optional[float]) -> Optional[OcrResultSet]:
+        """在一次识别结果中按锚点做空间查询，返回最近的单条结果"""
+        results = results.filter_confidence(confidence)
+        index = results.spatial_index()
+        anchors = np.flatnonzero(results.text_mask(lambda actual: self._text_match(actual, anchor, match_mode)))
+        for anchor_index in anchors:
+            candidates = index.relative(int(anchor_index), direction, max_distance=max_distance)
+            if text is not None:
+                candidates = candidates.filter_text(
+                    lambda actual: self._text_match(actual, text, text_match_mode))
+            if candidates:
+                return candidates.take(slice(0, 1))
+        return None
+    
+    def ocr_find_text(self, text: str, confidence: float = None,
+                      timeout: int = 10, region: Tuple[int, int, int, int] = None,
+                      match_mode: str = 'exact', lang: str = None) -> Optional[Dict]:
+        """
+        查找文字，返回匹配结果及匹配分数
+        
+        Args:
+            text: 文字
+            confidence: 置信度阈值
+            timeout: 超时时间(秒)
+            region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            match_mode: 匹配模式，支持 'fuzzy' 模糊匹配（允许的错字数见 set_fuzzy_max_edits）
+            lang: 识别语言，None表示初始化时的语言
+            
+        Returns:
+            结果字典（格式同ocr_recognize，另含 'match_score'），未找到返回None
+        """
+        if confidence is None:
+            confidence = self.confidence_threshold
+            
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            matched, scores = self._find_matches_scored(self.ocr_recognize_set(region=region, lang=lang),
+                                                        [text], match_mode, confidence)
+            self._flight_note(target=text, match_mode=match_mode, confidence=confidence,
+                              matched_bbox=matched.bboxes[:1].tolist())
+            if matched:
+                result = matched.take(slice(0, 1)).to_dicts()[0]
+                result['match_score'] = float(scores[0])
+                return result
+                
+            time.sleep(1)
+            
+        self._flight_timeout("ocr_find_text", text)
+        return None
+    
     def ocr_get_text_position(self, text: str, confidence: float = None,
                             timeout: int = 10, region: Tuple[int, int, int, int] = None,
                             match_mode: str = 'exact') -> Optional[Tuple[float, float]]:
@@ -443,6 +1286,7 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
             
         Returns:
             文字中心坐标，如果未找到返回None
@@ -452,19 +1296,18 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region)
-            
-            for result in results:
-                if self._text_match(result['text'], text, match_mode) and result['confidence'] >= confidence:
-                    return result['center']
+            position = self._locate_text(text, confidence, region, match_mode)
+            if position:
+                return position
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_get_text_position", text)
         return None
     
     def ocr_wait_text(self, text: str, confidence: float = None,
                      timeout: int = 10, region: Tuple[int, int, int, int] = None,
-                     match_mode: str = 'exact') -> bool:
+                     match_mode: str = 'exact', lang: str = None) -> bool:
         """
         等待文字出现
         
@@ -479,6 +1322,8 @@ class OCRUtils:
                 'startswith' - 开头匹配
                 'endswith' - 结尾匹配
                 'regex' - 正则表达式匹配
+                'fuzzy' - 模糊匹配（容忍少量OCR错字）
+            lang: 识别语言，None表示初始化时的语言
             
         Returns:
             是否在超时时间内找到文字
@@ -488,14 +1333,14 @@ class OCRUtils:
             
         start_time = time.time()
         while time.time() - start_time < timeout:
-            results = self.ocr_recognize(region=region)
-            
-            for result in results:
-                if self._text_match(result['text'], text, match_mode) and result['confidence'] >= confidence:
-                    return True
+            with self.language(lang):
+                found = self._locate_text(text, confidence, region, match_mode)
+            if found:
+                return True
                     
             time.sleep(1)
             
+        self._flight_timeout("ocr_wait_text", text)
         return False
     
     def _text_match(self, actual_text: str, target_text: str, match_mode: str) -> bool:
@@ -505,36 +1350,26 @@ class OCRUtils:
         Args:
             actual_text: 实际识别的文字
             target_text: 目标文字
-            match_mode: 匹配模式
+            match_mode: 匹配模式（fuzzy模式使用 fuzzy_max_edits 作为最大错字数）
             
         Returns:
             是否匹配
         """
-        if match_mode == 'exact':
-            return actual_text == target_text
-        elif match_mode == 'contains':
-            return target_text in actual_text
-        elif match_mode == 'startswith':
-            return actual_text.startswith(target_text)
-        elif match_mode == 'endswith':
-            return actual_text.endswith(target_text)
-        elif match_mode == 'regex':
-            import re
-            return bool(re.search(target_text, actual_text))
-        else:
-            return actual_text == target_text  # 默认精确匹配
+        return text_match(actual_text, target_text, match_mode, self.fuzzy_max_edits)
     
     def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
         """计算两点之间的距离"""
         return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
     
-    def ocr_get_all_texts(self, confidence: float = None, region: Tuple[int, int, int, int] = None) -> List[str]:
+    def ocr_get_all_texts(self, confidence: float = None, region: Tuple[int, int, int, int] = None,
+                          lang: str = None) -> List[str]:
         """
         获取屏幕上所有识别到的文字
         
         Args:
             confidence: 置信度阈值
             region: 截图区域 (x1, y1, x2, y2)，如果为None则截取全屏
+            lang: 识别语言，None表示初始化时的语言
             
         Returns:
             文字列表
@@ -542,8 +1377,157 @@ class OCRUtils:
         if confidence is None:
             confidence = self.confidence_threshold
             
-        results = self.ocr_recognize(region=region)
-        return [result['text'] for result in results if result['confidence'] >= confidence]
+        results = self.ocr_recognize_set(region=region, lang=lang).filter_confidence(confidence)
+        return results.texts.tolist()
+
+    def ocr_scroll_search(self, text: str = None, direction: str = 'up', region: Tuple[int, int, int, int] = None,
+                          max_swipes: int = 20, swipe_ratio: float = 0.6, duration: float = 0.5, settle: float = 0.8,
+                          overlap: int = 48, confidence: float = None, match_mode: str = 'exact',
+                          min_score: float = 0.5) -> ScrollSearchResult:
+        """
+        滚动查找：首屏完整识别，之后每次滑动后按行特征相关性估计滚动距离，只识别新露出的条带，
+        直到找到目标文字或到达列表末端（滑动后画面不再移动）
+        
+        Args:
+            text: 目标文字，None表示不查找，滚动到末端收集整个列表的文字
+            direction: 'up' 手指上滑查看下方内容，'down' 手指下滑查看上方内容
+            region: 列表区域 (x1, y1, x2, y2)，滑动和识别都限制在该区域内，None表示全屏
+            max_swipes: 最多滑动次数
+            swipe_ratio: 每次滑动距离占区域高度的比例
+            duration: 滑动持续时间(秒)
+            settle: 滑动后等待惯性滚动停止的时间(秒)
+            overlap: 新条带向已识别部分多识别的行数，应不小于文字行高（被边缘截断的文字行完整识别一次）
+            confidence: 置信度阈值
+            match_mode: 匹配模式，同 ocr_find_text
+            min_score: 滚动估计的最低相关系数，低于该值时整屏重新识别
+            
+        Returns:
+            ScrollSearchResult：found 为找到的目标（屏幕坐标），index 为去重后的已见文字，stats 含识别行数占比
+        """
+        if direction not in SCROLL_DIRECTIONS:
+            raise ValueError(f"Unsupported scroll direction: {direction}, expected one of {SCROLL_DIRECTIONS}")
+        if confidence is None:
+            confidence = self.confidence_threshold
+        result = ScrollSearchResult(ScrollIndex())
+        frame, region = capture_region(region)
+        if frame is None:
+            print("❌ 截图失败")
+            return result
+        if region is None:
+            region = (0, 0, frame.shape[1], frame.shape[0])
+        x1, y1, x2, y2 = region
+        height = y2 - y1
+        overlap = min(int(overlap), height // 2)
+
+        # 首屏完整识别
+        offset = 0.0
+        self._scroll_collect(result, self._recognize_frame(frame, region, False, ""),
+                             region, None, direction, offset, text, confidence, match_mode)
+        result.stats['ocr_rows'] += height
+        result.stats['full_rows'] += height
+        profile = row_profile(frame)
+
+        distance = int(height * swipe_ratio)
+        cx, cy = (x1 + x2) / 2.0, (y1 + y2) / 2.0
+        sign = 1 if direction == 'up' else -1
+        start, end = (cx, cy + sign * distance / 2.0), (cx, cy - sign * distance / 2.0)
+        while result.found is None and result.stats['swipes'] < max_swipes:
+            swipe(start, end, duration=duration)
+            self._after_action()
+            result.stats['swipes'] += 1
+            time.sleep(settle)
+            # 直接截取设备画面，不复用总线上滑动前的画面
+            frame, _ = capture_region(region)
+            if frame is None:
+                print("❌ 截图失败")
+                break
+            current = row_profile(frame)
+            shift, score = estimate_scroll(profile, current, direction, max_shift=height - overlap,
+                                           expected=distance)
+            profile = current
+            result.stats['full_rows'] += height
+            if shift is not None and score >= min_score and shift <= 2:
+                result.reached_end = True
+                break
+            if shift is None or score < min_score:
+                # 无法可靠估计滚动距离：整屏识别，按预期距离换算内容坐标
+                result.stats['fallbacks'] += 1
+                offset += sign * distance
+                strip = region
+            else:
+                offset += sign * shift
+                if direction == 'up':
+                    strip = (x1, y2 - shift - overlap, x2, y2)
+                else:
+                    strip = (x1, y1, x2, y1 + shift + overlap)
+            local = (strip[0] - x1, strip[1] - y1, strip[2] - x1, strip[3] - y1)
+            results = self._recognize_frame(crop_frame(frame, local), strip, False, "")
+            result.stats['ocr_rows'] += strip[3] - strip[1]
+            self._scroll_collect(result, results, region, strip if strip != region else None, direction,
+                                 offset, text, confidence, match_mode)
+
+        stats = result.get_stats()
+        if result.found:
+            status = f"✅ 找到文字 '{text}'"
+        elif text is not None:
+            status = f"⚠️ 未找到文字 '{text}'"
+        else:
+            status = "✅ 滚动识别完成" if result.reached_end else "⚠️ 达到最大滑动次数"
+        print(f"{status}: 滑动 {stats['swipes']} 次，已见文字 {len(result.index)} 条，"
+              f"{'已到列表末端，' if result.reached_end else ''}识别行数占比 {stats['ocr_ratio']:.0%}")
+        return result
+
+    def _scroll_collect(self, result: ScrollSearchResult, results: OcrResultSet,
+                        region: Tuple[int, int, int, int], strip: Optional[Tuple[int, int, int, int]],
+                        direction: str, offset: float, text: Optional[str], confidence: float, match_mode: str):
+        """丢弃被区域/条带边缘截断的文字（在相邻画面中完整识别），其余加入索引并检查目标"""
+        bboxes = results.bboxes
+        keep = np.ones(len(results), dtype=bool)
+        margin = 2
+        if direction == 'up':
+            keep &= bboxes[:, 3] < region[3] - margin
+            if strip is not None:
+                keep &= bboxes[:, 1] > strip[1] + margin
+        else:
+            keep &= bboxes[:, 1] > region[1] + margin
+            if strip is not None:
+                keep &= bboxes[:, 3] < strip[3] - margin
+        results = results.take(keep).filter_confidence(confidence)
+        new = result.index.add(results, offset)
+        if text is None or result.found is not None:
+            return
+        # 已见过的文字在之前的画面中已检查过，只需检查新出现的
+        matched, scores = self._find_matches_scored(new, [text], match_mode, confidence)
+        if matched:
+            found = matched.take(slice(0, 1)).to_dicts()[0]
+            found['match_score'] = float(scores[0])
+            result.found = found
+
+    def ocr_scroll_find(self, text: str, **kwargs) -> Optional[Dict]:
+        """
+        滚动查找文字，返回找到时的结果字典（格式同 ocr_find_text），滚动到末端仍未找到返回None
+        
+        Args:
+            text: 目标文字
+            **kwargs: 透传给 ocr_scroll_search，如 direction、region、match_mode
+        """
+        return self.ocr_scroll_search(text, **kwargs).found
+
+    def flow(self, timeout: float = 10, **kwargs) -> OcrFlow:
+        """
+        创建操作-验证流程：每次操作后等待画面变化并稳定再识别，只重新识别变化的区域
+        
+        Args:
+            timeout: 每一步的默认超时时间(秒)
+            **kwargs: 透传给 OcrFlow，如 change_timeout、settle_frames、lang
+            
+        Returns:
+            OcrFlow，链式添加 touch / expect / expect_gone / call 步骤后调用 run()
+        
+        Example:
+            ocr_utils.flow().touch("下一步").expect("完成").touch("确定").run()
+        """
+        return OcrFlow(self, timeout=timeout, **kwargs)
 
 
 # 创建全局实例
@@ -570,6 +1554,10 @@ def ocr_find_text_with_offset(text: str, offset_x: int, offset_y: int, **kwargs)
     """便捷偏移量点击函数"""
     return ocr_utils.ocr_find_text_with_offset(text, offset_x, offset_y, **kwargs)
 
+def ocr_touch_relative(anchor: str, direction: str = 'right', **kwargs):
+    """便捷锚点相对点击函数"""
+    return ocr_utils.ocr_touch_relative(anchor, direction, **kwargs)
+
 def ocr_wait_text(text: str, **kwargs):
     """便捷等待文字函数"""
     return ocr_utils.ocr_wait_text(text, **kwargs)
@@ -578,6 +1566,14 @@ def ocr_get_all_texts(**kwargs):
     """便捷获取所有文字函数"""
     return ocr_utils.ocr_get_all_texts(**kwargs)
 
+def ocr_flow(**kwargs):
+    """便捷操作-验证流程"""
+    return ocr_utils.flow(**kwargs)
+
+def ocr_scroll_find(text: str, **kwargs):
+    """便捷滚动查找函数"""
+    return ocr_utils.ocr_scroll_find(text, **kwargs)
+
 
 if __name__ == "__main__":
     # 示例用法
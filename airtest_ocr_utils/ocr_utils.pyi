@@ -3,21 +3,132 @@ OCR工具类的类型存根文件
 """
 
 import time
-from typing import List, Tuple, Dict, Optional, Any
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Optional, Any, Iterator, Union
+
+from .ocr_results import OcrResultSet
+from .ocr_pipeline import ScalePolicy
+from .text_tracker import TextTracker
+from .result_cache import OcrResultCache
+from .frame_bus import FrameBus
+from .engine_pool import EnginePool
+from .text_prefilter import TextPrefilter
+from .model_profiles import ModelProfile
+from .tiled_ocr import TilePolicy
+from .scroll_search import ScrollSearchResult
+from .engine_cache import EngineCache
+from .ocr_flow import OcrFlow
+from .screen_change import StabilityGate
+from .flight_recorder import FlightRecorder
 
 class OCRUtils:
-    def __init__(self, lang: str = 'ch', use_gpu: bool = False) -> None: ...
+    lang: str
+    use_gpu: bool
+    server: Optional[Union[str, Tuple[str, int]]]
+    profile: ModelProfile
+    ready: Future
+    fuzzy_max_edits: Optional[int]
+    tracker: Optional[TextTracker]
+    stream_batch_size: Optional[int]
+    frame_bus: Optional[FrameBus]
+    frame_max_age: float
+    engine_pool: EnginePool
+    prefilter: Optional[TextPrefilter]
+    tile_policy: Optional[TilePolicy]
+    tile_workers: Optional[int]
+    engine_cache: Optional[EngineCache]
+    stability: Optional[StabilityGate]
+    flight_recorder: Optional[FlightRecorder]
+    result_cache: Optional[OcrResultCache]
+
+    def __init__(self, lang: str = 'ch', use_gpu: bool = False, scale_policy: ScalePolicy = None,
+                 tracker: TextTracker = None, result_cache: OcrResultCache = None,
+                 frame_bus: FrameBus = None, frame_max_age: float = 0.5, pool_size: int = 1,
+                 profile: Union[str, ModelProfile, None] = None, warmup: bool = True,
+                 background: bool = True, server: str = None) -> None: ...
+    
+    @property
+    def ocr(self) -> Any: ...
+    
+    def wait_ready(self, timeout: float = None) -> bool: ...
+    
+    def enable_streaming(self, batch_size: int = 4) -> None: ...
+    
+    def disable_streaming(self) -> None: ...
+    
+    def enable_prefilter(self, **kwargs) -> TextPrefilter: ...
+    
+    def disable_prefilter(self) -> None: ...
+    
+    def enable_tiling(self, tile_size: int = 1280, overlap: int = 160, min_side: int = 2000,
+                      workers: int = None, **kwargs) -> TilePolicy: ...
+    
+    def disable_tiling(self) -> None: ...
+    
+    def enable_stability(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.5,
+                         poll: float = 0.1, **kwargs) -> StabilityGate: ...
+    
+    def disable_stability(self) -> None: ...
+    
+    def enable_flight_recorder(self, capacity: int = 30, directory: str = "flight_records",
+                               recorder: FlightRecorder = None, **kwargs) -> FlightRecorder: ...
+    
+    def disable_flight_recorder(self) -> None: ...
+    
+    def dump_flight_record(self, reason: str = "manual") -> Optional[str]: ...
+    
+    def enable_languages(self, memory_budget_mb: float = None, share_detector: str = 'family',
+                         pool_size: int = 1, preload: List[str] = None) -> EngineCache: ...
+    
+    def disable_languages(self) -> None: ...
+    
+    @contextmanager
+    def language(self, lang: Optional[str]) -> Iterator[None]: ...
+    
+    def set_pool_size(self, size: int) -> None: ...
+    
+    def set_profile(self, profile: Union[str, ModelProfile], warmup: bool = True,
+                    background: bool = False) -> None: ...
+    
+    def set_server(self, server: Optional[str]) -> None: ...
+    
+    def set_frame_bus(self, frame_bus: Optional[FrameBus], max_age: float = 0.5) -> None: ...
+    
+    def set_result_cache(self, result_cache: Optional[OcrResultCache]) -> None: ...
     
     def set_confidence_threshold(self, threshold: float) -> None: ...
     
-    def ocr_recognize(self, image_path: str = None, region: Tuple[int, int, int, int] = None) -> List[Dict]: ...
+    def set_fuzzy_max_edits(self, max_edits: Optional[int]) -> None: ...
+    
+    def enable_tracking(self, match_threshold: float = 0.9, **kwargs) -> TextTracker: ...
+    
+    def disable_tracking(self) -> None: ...
+    
+    def set_scale_policy(self, scale_policy: Optional[ScalePolicy]) -> None: ...
+    
+    def calibrate_scale(self, samples: List, target_recall: float = 0.95, **kwargs) -> ScalePolicy: ...
+    
+    def ocr_recognize(self, image_path: str = None, region: Tuple[int, int, int, int] = None, debug: bool = False,
+                      lang: str = None) -> List[Dict]: ...
+    
+    def ocr_recognize_set(self, image_path: str = None, region: Tuple[int, int, int, int] = None, debug: bool = False,
+                          lang: str = None) -> OcrResultSet: ...
+    
+    def ocr_recognize_regions(self, regions: List[Tuple[int, int, int, int]], image_path: str = None,
+                              max_workers: int = None) -> List[OcrResultSet]: ...
+    
+    def ocr_recognize_stream(self, image_path: str = None, region: Tuple[int, int, int, int] = None,
+                             priority_region: Tuple[int, int, int, int] = None,
+                             near: Tuple[float, float] = None, target_size: Tuple[float, float] = None,
+                             batch_size: int = 4) -> Iterator[OcrResultSet]: ...
     
     def _text_match(self, actual_text: str, target_text: str, match_mode: str) -> bool: ...
     
     def ocr_touch(self, text: str, confidence: float = None, 
                   offset_x: int = 0, offset_y: int = 0, 
                   timeout: int = 10, region: Tuple[int, int, int, int] = None,
-                  match_mode: str = 'exact') -> bool: ...
+                  match_mode: str = 'exact', debug: bool = False, lang: str = None) -> bool: ...
     
     def ocr_double_click(self, text: str, confidence: float = None,
                         offset_x: int = 0, offset_y: int = 0,
@@ -39,17 +150,48 @@ class OCRUtils:
                                 region: Tuple[int, int, int, int] = None,
                                 match_mode: str = 'exact') -> bool: ...
     
+    def ocr_find_relative(self, anchor: str, direction: str = 'right', text: str = None,
+                          confidence: float = None, timeout: int = 10,
+                          region: Tuple[int, int, int, int] = None,
+                          match_mode: str = 'exact', text_match_mode: str = 'contains',
+                          max_distance: float = None) -> Optional[Dict]: ...
+    
+    def ocr_touch_relative(self, anchor: str, direction: str = 'right', text: str = None,
+                           confidence: float = None, timeout: int = 10,
+                           region: Tuple[int, int, int, int] = None,
+                           match_mode: str = 'exact', text_match_mode: str = 'contains',
+                           max_distance: float = None) -> bool: ...
+    
+    def ocr_get_row_texts(self, anchor: str, confidence: float = None, timeout: int = 10,
+                          region: Tuple[int, int, int, int] = None,
+                          match_mode: str = 'exact') -> List[str]: ...
+    
+    def ocr_read_fields(self, labels: List[str], direction: str = 'right',
+                        confidence: float = None, region: Tuple[int, int, int, int] = None,
+                        match_mode: str = 'exact', max_distance: float = None) -> Dict[str, Optional[str]]: ...
+    
+    def ocr_find_text(self, text: str, confidence: float = None,
+                      timeout: int = 10, region: Tuple[int, int, int, int] = None,
+                      match_mode: str = 'exact', lang: str = None) -> Optional[Dict]: ...
+    
     def ocr_get_text_position(self, text: str, confidence: float = None,
                             timeout: int = 10, region: Tuple[int, int, int, int] = None,
                             match_mode: str = 'exact') -> Optional[Tuple[float, float]]: ...
     
     def ocr_wait_text(self, text: str, confidence: float = None,
                      timeout: int = 10, region: Tuple[int, int, int, int] = None,
-                     match_mode: str = 'exact') -> bool: ...
+                     match_mode: str = 'exact', lang: str = None) -> bool: ...
     
     def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float: ...
     
-    def ocr_get_all_texts(self, confidence: float = None, region: Tuple[int, int, int, int] = None) -> List[str]: ...
+    def ocr_get_all_texts(self, confidence: float = None, region: Tuple[int, int, int, int] = None,
+                          lang: str = None) -> List[str]: ...
+    def ocr_scroll_search(self, text: str = None, direction: str = 'up', region: Tuple[int, int, int, int] = None,
+                          max_swipes: int = 20, swipe_ratio: float = 0.6, duration: float = 0.5, settle: float = 0.8,
+                          overlap: int = 48, confidence: float = None, match_mode: str = 'exact',
+                          min_score: float = 0.5) -> ScrollSearchResult: ...
+    def ocr_scroll_find(self, text: str, **kwargs) -> Optional[Dict]: ...
+    def flow(self, timeout: float = 10, **kwargs) -> OcrFlow: ...
 
 # 全局实例
 ocr_utils: OCRUtils
@@ -60,5 +202,8 @@ def ocr_double_click(text: str, **kwargs) -> bool: ...
 def ocr_swipe(start_text: str, end_text: str, **kwargs) -> bool: ...
 def ocr_touch_multiple(texts: List[str], **kwargs) -> bool: ...
 def ocr_find_text_with_offset(text: str, offset_x: int, offset_y: int, **kwargs) -> bool: ...
+def ocr_touch_relative(anchor: str, direction: str = 'right', **kwargs) -> bool: ...
 def ocr_wait_text(text: str, **kwargs) -> bool: ...
-def ocr_get_all_texts(**kwargs) -> List[str]: ...
\ No newline at end of file
+def ocr_get_all_texts(**kwargs) -> List[str]: ...
+def ocr_scroll_find(text: str, **kwargs) -> Optional[Dict]: ...
+def ocr_flow(**kwargs) -> OcrFlow: ...
\ No newline at end of file
@@ -3,86 +3,73 @@ OCR Watcher - 后台监控器
 整合参考代码的链式API和后台监控功能到本地方案
 """
 
+import gc
 import threading
 import time
 import logging
-import re
-from typing import List, Dict, Callable, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Callable, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
-from airtest.core.api import snapshot, touch
-import tempfile
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from airtest.core.api import touch
 import cv2
 import numpy as np
 
-
-@dataclass
-class OcrResult:
-    """OCR识别结果"""
-    text: str           # 识别的文字
-    bbox: Tuple[int, int, int, int]  # 边界框 (x1, y1, x2, y2)
-    confidence: float   # 置信度
-    center: Tuple[float, float]  # 中心点坐标
-    points: List[Tuple[int, int]]  # 四个角点坐标
-
-
-class OcrEngine(ABC):
-    """OCR引擎抽象基类"""
-    @abstractmethod
-    def recognize(self, image_bytes: bytes) -> List[OcrResult]:
-        pass
-
-    @abstractmethod
-    def set_confidence_threshold(self, threshold: float):
-        """设置置信度阈值"""
-        pass
+from .ocr_results import OcrResult, OcrResultSet
+from .ocr_engine import OcrEngine
+from .ocr_pipeline import ScalePolicy, run_ocr, load_image
+from .result_cache import OcrResultCache, engine_tag, screen_signature
+from .text_match import MATCH_MODES, NgramIndex, text_match
+from .watch_scheduler import WatchGovernor, union_region
+from .callback_executor import CallbackExecutor
+from .frame_bus import FrameBus, clip_region, crop_frame
+from .engine_cache import EngineCache
+from .engine_pool import EnginePool
+from .text_state import TextStateTracker
+from .screen_change import StabilityGate
+from .flight_recorder import FlightRecorder
+from .text_prefilter import TextPrefilter
+from .device_capture import device_snapshot
+from .model_profiles import get_profile, create_engine, load_engine_async, resolved, profile_tag
+from .resource_guard import BufferPool, MemoryGuard, get_logger
+from .ocr_server import RemoteOcrEngine, server_address
 
 
 class AirtestOcrEngine(OcrEngine):
     """基于Airtest和PaddleOCR的OCR引擎"""
-    def __init__(self, lang='ch', use_gpu=False):
-        from paddleocr import PaddleOCR
-        self._ocr = PaddleOCR(use_angle_cls=True, lang=lang, use_gpu=use_gpu, show_log=False)
+    def __init__(self, lang='ch', use_gpu=False, scale_policy: Optional[ScalePolicy] = None,
+                 profile=None, warmup: bool = True, background: bool = True):
+        # 模型配置档：监控通常使用轻量的 'mobile'，精确读取交给 OCRUtils 的 'server'
+        self.profile = get_profile(profile)
+        # 引擎就绪Future：background为True时在后台线程加载和预热，构造立即返回
+        if background:
+            self.ready = load_engine_async(self.profile, lang=lang, use_gpu=use_gpu, warmup=warmup, show_log=False)
+        else:
+            self.ready = resolved(create_engine(self.profile, lang=lang, use_gpu=use_gpu, warmup=warmup,
+                                                show_log=False))
+        self.lang = lang
+        self.use_gpu = use_gpu
         self.confidence_threshold = 0.7
+        self.scale_policy = scale_policy  # 检测缩放策略，None表示不缩放
+
+    @property
+    def _ocr(self):
+        """PaddleOCR实例，后台加载未完成时等待"""
+        return self.ready.result()
 
     def set_confidence_threshold(self, threshold: float):
         """设置置信度阈值"""
         self.confidence_threshold = threshold
 
-    def recognize(self, image_bytes: bytes) -> List[OcrResult]:
-        """识别图片中的文字"""
-        # 将bytes转为临时文件
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
-            f.write(image_bytes)
-            temp_path = f.name
-
-        results = self._ocr.ocr(temp_path, cls=True)
-
-        ocr_results = []
-        if results and results[0]:
-            for line in results[0]:
-                bbox = line[0]  # [[x1,y1],[x2,y2],[x3,y3],[x4,y4]]
-                text = line[1][0]
-                conf = line[1][1]
+    def recognize(self, image_bytes: bytes) -> OcrResultSet:
+        """识别图片中的文字（在内存中解码，不写临时文件）"""
+        image = load_image(image_bytes) if image_bytes else None
+        if image is None:
+            return OcrResultSet.empty()
+        return self.recognize_image(image)
 
-                # 转换为简单矩形 (x1, y1, x2, y2)
-                xs = [p[0] for p in bbox]
-                ys = [p[1] for p in bbox]
-                simple_bbox = (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
-
-                # 计算中心点
-                center_x = sum(xs) / 4
-                center_y = sum(ys) / 4
-
-                ocr_results.append(OcrResult(
-                    text=text,
-                    bbox=simple_bbox,
-                    confidence=conf,
-                    center=(center_x, center_y),
-                    points=[(int(p[0]), int(p[1])) for p in bbox]
-                ))
-
-        return ocr_results
+    def recognize_image(self, image: np.ndarray) -> OcrResultSet:
+        """识别BGR画面，省去编码解码"""
+        return run_ocr(self._ocr, image, self.scale_policy, cls=self.profile.use_angle_cls)
 
 
 class DeviceController(ABC):
@@ -106,24 +93,17 @@ class AirtestDevice(DeviceController):
     def __init__(self):
         pass
 
+    def capture(self) -> Optional[np.ndarray]:
+        """截取当前设备画面为BGR数组（Android / iOS / Windows 通用），无需编码解码"""
+        return device_snapshot()
+
     def screenshot(self) -> bytes:
-        """获取截图"""
-        import io
-        from PIL import Image
-
-        # 使用Airtest截图
-        img = snapshot(filename=None)
-
-        # 转换为bytes
-        if isinstance(img, str):
-            # 如果返回的是文件路径，读取文件
-            with open(img, 'rb') as f:
-                return f.read()
-        else:
-            # 如果返回的是PIL Image对象
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG')
-            return img_byte_arr.getvalue()
+        """获取截图的PNG字节数据"""
+        img = self.capture()
+        if img is None:
+            return b""
+        ok, buf = cv2.imencode('.png', img)
+        return buf.tobytes() if ok else b""
 
     def click(self, x: int, y: int):
         """点击屏幕"""
@@ -143,10 +123,15 @@ class TextWatcher:
     def __init__(self, parent: "OcrWatcher", text: str = ""):
         self._parent = parent
         self._keywords = [text] if text else []
-        self._match_mode = "contains"  # contains | exact | regex
+        self._match_mode = "contains"  # contains | exact | regex | startswith | endswith | fuzzy
+        self._fuzzy_max_edits = None  # fuzzy模式允许的最大错字数，None表示按关键字长度
         self._region = None  # 限制监控区域 (x1, y1, x2, y2)
         self._confidence = None  # 置信度阈值
         self._cooldown = 0  # 冷却时间（秒）
+        self._interval = None  # 轮询间隔（秒），None表示使用start()的默认间隔
+        self._lang = None  # 识别语言，None表示使用OCR引擎的语言
+        self._event = None  # 触发事件，None表示每轮出现都触发（受冷却时间限制）
+        self._persist = 0.0  # persisted事件的持续时间（秒）
         self._last_triggered = 0  # 上次触发时间
 
     def when(self, text: str):
@@ -154,7 +139,7 @@ class TextWatcher:
         self._keywords.append(text)
         return self
 
-    def match_mode(self, mode: str):
+    def match_mode(self, mode: str, max_edits: int = None):
         """
         设置匹配模式:
         - contains: 包含即匹配（默认）
@@ -162,8 +147,13 @@ class TextWatcher:
         - regex: 正则匹配
         - startswith: 开头匹配
         - endswith: 结尾匹配
+        - fuzzy: 模糊匹配，容忍少量OCR错字（如"确走"匹配"确定"，"定位"、"确认"不匹配"确定"）
+        :param max_edits: fuzzy模式允许的最大错字数，默认按关键字长度：1个字不允许，2~3个字1个形近字替换，
+                          4个字1个替换，更长的为长度的20%（向上取整）；指定数值时短关键字也允许任意字的替换
         """
         self._match_mode = mode
+        if max_edits is not None:
+            self._fuzzy_max_edits = max_edits
         return self
 
     def region(self, x1: int, y1: int, x2: int, y2: int):
@@ -181,6 +171,41 @@ class TextWatcher:
         self._cooldown = seconds
         return self
 
+    def interval(self, seconds: float):
+        """
+        设置该规则的轮询间隔，如低频的"发现新版本"规则可设为10秒，
+        权限弹窗等关键规则保持较短间隔；每轮只识别到期规则的区域
+        """
+        self._interval = seconds
+        return self
+
+    def lang(self, lang: str):
+        """
+        设置该规则的识别语言，如 watcher.when("Allow").lang("en").click()；
+        同一轮中各语言的规则分别识别，其他语言的模型由多语言引擎缓存按需加载（见 OcrWatcher.enable_languages）
+        """
+        self._lang = lang
+        return self
+
+    def on_appear(self):
+        """
+        文字出现时触发一次：同一条文字（按文字 + 位置关联的稳定标识）停留期间不再重复触发，
+        消失后再次出现才会再触发，如 watcher.when("允许").on_appear().click()
+        """
+        self._event = 'appeared'
+        return self
+
+    def on_disappear(self):
+        """文字消失时触发一次，回调收到的是消失前最后一次的识别结果"""
+        self._event = 'disappeared'
+        return self
+
+    def on_persist(self, seconds: float):
+        """文字持续出现seconds秒后触发一次，如卡住的加载提示"""
+        self._event = 'persisted'
+        self._persist = seconds
+        return self
+
     def call(self, callback: Callable[[OcrResult, DeviceController], None]):
         """
         注册自定义回调
@@ -189,11 +214,18 @@ class TextWatcher:
         rule = {
             "keywords": self._keywords.copy(),
             "mode": self._match_mode,
+            "fuzzy_max_edits": self._fuzzy_max_edits,
             "region": self._region,
             "confidence": self._confidence,
             "callback": callback,
             "cooldown": self._cooldown,
             "last_triggered": self._last_triggered,
+            "interval": self._interval,
+            "lang": self._lang,
+            "event": self._event,
+            "persist": self._persist,
+            "track_ids": set(),  # 事件规则：已处理（appeared / persisted）或已看到（disappeared）的文字标识
+            "next_due": 0.0,
         }
         self._parent._watchers.append(rule)
         return self
@@ -213,41 +245,272 @@ class TextWatcher:
 
 class OcrWatcher:
     """OCR 弹窗监控器，核心控制器"""
-    def __init__(self, device: Optional[DeviceController] = None, ocr_engine: Optional[OcrEngine] = None):
-        # 使用默认实现
+    def __init__(self, device: Optional[DeviceController] = None, ocr_engine: Optional[OcrEngine] = None,
+                 result_cache: Optional[OcrResultCache] = None, governor: Optional[WatchGovernor] = None,
+                 callback_executor: Optional[CallbackExecutor] = None,
+                 frame_bus: Optional[FrameBus] = None, frame_max_age: float = 0.5,
+                 prefilter: Optional[TextPrefilter] = None, profile=None):
+        # 使用默认实现，profile 为默认OCR引擎的模型配置档
         self._device = device if device is not None else AirtestDevice()
-        self._ocr = ocr_engine if ocr_engine is not None else AirtestOcrEngine()
+        if ocr_engine is None:
+            # 设置了环境变量 AIRTEST_OCR_SERVER 时使用本机OCR服务，否则在本进程加载模型
+            address = server_address()
+            ocr_engine = RemoteOcrEngine(address) if address is not None else AirtestOcrEngine(profile=profile)
+        self._ocr = ocr_engine
+        # 持久化结果缓存（可选），相同画面跨运行复用识别结果
+        self._result_cache = result_cache
+        # 节奏调节器：按画面变化率和CPU预算调整轮询节奏
+        self._governor = governor if governor is not None else WatchGovernor()
+        # 共享画面总线（可选），与OCRUtils共用截图和识别结果
+        self._frame_bus = frame_bus
+        self._frame_max_age = frame_max_age
+        # 文字预筛器（可选），没有候选文字区域时跳过OCR
+        self._prefilter = prefilter
+        # 长时间运行模式（可选）：整帧临时缓冲区复用 + 内存上限
+        self._buffers: Optional[BufferPool] = None
+        self._memory_guard: Optional[MemoryGuard] = None
+        # 多语言引擎缓存（可选），规则指定了其他语言时创建
+        self._engine_cache: Optional[EngineCache] = None
+        # 画面文字状态（按识别语言），有事件规则时维护
+        self._text_states: Dict[Optional[str], TextStateTracker] = {}
+        self._text_state_options: Dict = {}
+        # 识别前的画面稳定等待（可选），过渡动画期间不识别
+        self._stability: Optional[StabilityGate] = None
+        # 飞行记录器（可选）：记录每轮的画面、识别结果和触发的规则，异常时转储
+        self._recorder: Optional[FlightRecorder] = None
+        self._recorded_frame: Optional[np.ndarray] = None
+        self._fired: Optional[Dict] = None  # 本轮记录的匹配判断，派发时补充触发的规则
         self._watchers: List[Dict] = []
         self._lock = threading.Lock()
+        self.stats = {'rule_checks': 0, 'rules_skipped': 0, 'events': 0}
 
         # 线程控制
         self._stop_event = threading.Event()
         self._watch_thread: Optional[threading.Thread] = None
         self._running = False
 
-        # 日志
-        self.logger = logging.getLogger("OcrWatcher")
-        self.logger.setLevel(logging.INFO)
+        # 日志：所有实例共用一个日志器，控制台输出只配置一次
+        self.logger = get_logger("OcrWatcher")
 
-        # 配置日志输出
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(handler)
+        # 回调执行器：回调在线程池中执行，不阻塞监控线程
+        self._executor = callback_executor if callback_executor is not None else CallbackExecutor(logger=self.logger)
 
     def when(self, text: str) -> TextWatcher:
         """入口方法：创建新的监控规则"""
         return TextWatcher(self, text)
 
-    def start(self, interval: float = 1.0):
+    def set_governor(self, cpu_budget: float = None, max_backoff: float = 1.0, **kwargs) -> WatchGovernor:
+        """
+        设置节奏调节器
+        :param cpu_budget: CPU预算（单核比例），如0.25表示最多占用四分之一个核，None表示不限制
+        :param max_backoff: 画面静止时轮询间隔的最大放大倍数，1表示不根据变化率调节
+        """
+        self._governor = WatchGovernor(cpu_budget=cpu_budget, max_backoff=max_backoff, **kwargs)
+        return self._governor
+
+    def set_profile(self, profile, lang: str = None, use_gpu: bool = False, warmup: bool = True):
+        """
+        切换模型配置档：用该配置档创建新的 AirtestOcrEngine 替换当前引擎（保留缩放策略和置信度阈值），
+        新引擎在后台加载，就绪前监控线程等待
+        示例: watcher.set_profile("mobile")
+        """
+        old = self._ocr
+        engine = AirtestOcrEngine(lang=lang or getattr(old, 'lang', 'ch'), use_gpu=use_gpu or getattr(old, 'use_gpu', False),
+                                  scale_policy=getattr(old, 'scale_policy', None), profile=profile, warmup=warmup)
+        engine.set_confidence_threshold(getattr(old, 'confidence_threshold', engine.confidence_threshold))
+        self._ocr = engine
+        cache = self._engine_cache
+        if cache is not None:
+            # 其他语言的模型按新配置档重新加载
+            self.enable_languages(cache.memory_budget_mb, cache.share_detector)
+        self.logger.info(f"OCR model profile: {engine.profile.name}")
+
+    def set_frame_bus(self, frame_bus: Optional[FrameBus], max_age: float = 0.5):
+        """
+        设置共享画面总线：与同样接入总线的OCRUtils共用截图和识别结果，
+        max_age秒内的画面和已识别过的区域直接复用，None表示独立截图识别
+        """
+        self._frame_bus = frame_bus
+        self._frame_max_age = max_age
+
+    def set_prefilter(self, prefilter: Optional[TextPrefilter]):
+        """
+        设置文字预筛器：识别前按边缘密度判断画面（或规则区域）是否可能有文字，没有时跳过OCR
+        示例: watcher.set_prefilter(TextPrefilter())
+        """
+        self._prefilter = prefilter
+
+    def enable_stability(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.0,
+                         poll: float = 0.1, **kwargs) -> StabilityGate:
+        """
+        开启识别前的画面稳定等待：连续frames帧画面（到期规则区域的外接矩形）不再变化才识别，
+        过渡动画期间的画面不识别，统计见 get_stats()['stability']
+        :param frames: 连续多少帧不变视为稳定
+        :param threshold: 两帧缩略图之间变化像素比例的上限
+        :param max_wait: 每轮最长等待时间（秒），超时仍识别最后一帧
+        :param poll: 截图间隔（秒）
+        """
+        self._stability = StabilityGate(frames=frames, threshold=threshold, max_wait=max_wait, poll=poll, **kwargs)
+        return self._stability
+
+    def disable_stability(self):
+        """关闭画面稳定等待"""
+        self._stability = None
+
+    def set_flight_recorder(self, recorder: Optional[FlightRecorder]):
+        """
+        设置飞行记录器：每轮检测记录画面、识别结果和触发的规则（只保存引用），检测或回调出错时转储到磁盘
+        示例: watcher.set_flight_recorder(ocr_utils.enable_flight_recorder())  # 与OCRUtils共用
+        """
+        self._recorder = recorder
+        self._recorded_frame = None
+
+    def dump_flight_record(self, reason: str = "manual") -> Optional[str]:
+        """把飞行记录写到磁盘，返回转储目录；未设置记录器或没有记录时返回None"""
+        recorder = self._recorder
+        path = recorder.dump(reason) if recorder is not None else None
+        if path:
+            self.logger.info(f"Flight record saved: {path}")
+        return path
+
+    def _flight_error(self, reason: str):
+        """出错时自动转储（记录器按最短间隔限流）"""
+        recorder = self._recorder
+        if recorder is None:
+            return
+        path = recorder.auto_dump(reason)
+        if path:
+            self.logger.warning(f"Flight record saved: {path}")
+
+    def enable_languages(self, memory_budget_mb: float = None, share_detector: str = 'family',
+                         preload: Sequence[str] = None) -> EngineCache:
         """
-        启动后台监控线程
-        :param interval: 轮询间隔（秒）
+        配置多语言引擎缓存：规则通过 lang() 指定其他语言时按需加载该语言的模型，
+        检测模型相同的语言共用检测器，超出内存预算时淘汰最久未使用的语言
+        示例: watcher.enable_languages(memory_budget_mb=600, preload=["en", "japan"])
+        :param memory_budget_mb: 其他语言模型的内存预算（MB），None表示不淘汰
+        :param share_detector: 检测器共用方式，'family' / 'all' / 'none'
+        :param preload: 提前加载的语言
+        """
+        if self._engine_cache is not None:
+            self._engine_cache.clear()
+        engine = self._ocr
+        base_pool = None
+        if isinstance(engine, AirtestOcrEngine):
+            # 基础语言复用监控引擎已加载的模型（作为检测器或基础语言的规则），不再加载第二份；
+            # 缓存只在监控线程中使用，与监控引擎不会并发推理
+            base_pool = EnginePool(lambda: engine._ocr, size=1)
+        self._engine_cache = EngineCache(getattr(engine, 'profile', None),
+                                         base_lang=getattr(engine, 'lang', None) or 'ch',
+                                         use_gpu=getattr(engine, 'use_gpu', False),
+                                         memory_budget_mb=memory_budget_mb, share_detector=share_detector,
+                                         base_pool=base_pool)
+        if preload:
+            self._engine_cache.preload(preload)
+        return self._engine_cache
+
+    def _language_cache(self) -> EngineCache:
+        if self._engine_cache is None:
+            self.enable_languages()
+        return self._engine_cache
+
+    def enable_long_run(self, rss_limit_mb: float = None, check_interval: float = 30.0, restart_after: int = 2,
+                        max_free_buffers: int = 2) -> Optional[MemoryGuard]:
+        """
+        长时间运行模式：画面变化检测和文字预筛使用的整帧灰度图从缓冲池借用，不再每轮分配；
+        设置rss_limit_mb时定期检查进程内存，超限先释放缓存（结果缓存淘汰一半、丢弃总线画面、释放空闲缓冲区），
+        清理后仍连续超限restart_after次时在后台重建OCR引擎
+        示例: watcher.enable_long_run(rss_limit_mb=1500)
+        :param rss_limit_mb: 常驻内存上限（MB），None表示不检查
+        :param check_interval: 内存检查间隔（秒）
+        :param restart_after: 清理后仍超限多少次检查后重建引擎，0表示从不重建
+        :param max_free_buffers: 每种尺寸最多保留的空闲缓冲区数
+        """
+        self._buffers = BufferPool(max_free=max_free_buffers)
+        self._memory_guard = None
+        if rss_limit_mb is not None:
+            self._memory_guard = MemoryGuard(rss_limit_mb, check_interval=check_interval, restart_after=restart_after,
+                                             on_trim=self._trim_resources, on_restart=self._restart_engine)
+        return self._memory_guard
+
+    def disable_long_run(self):
+        """关闭长时间运行模式"""
+        self._buffers = None
+        self._memory_guard = None
+
+    def _trim_resources(self):
+        """内存超限时的清理"""
+        self._release_caches()
+        self.logger.warning(f"RSS above limit, caches trimmed ({self._memory_guard.stats['rss'] >> 20} MB)")
+
+    def _release_caches(self):
+        if self._result_cache is not None:
+            self._result_cache.trim()
+        if self._engine_cache is not None:
+            self._engine_cache.trim()
+        if self._frame_bus is not None:
+            self._frame_bus.clear()
+        if self._buffers is not None:
+            self._buffers.trim()
+        gc.collect()
+
+    def _restart_engine(self):
+        """内存清理无效时重建OCR引擎：内置引擎按原配置档后台重建，自定义引擎需提供 restart()"""
+        engine = self._ocr
+        if isinstance(engine, AirtestOcrEngine):
+            self.set_profile(engine.profile, use_gpu=engine.use_gpu)
+        elif hasattr(engine, 'restart'):
+            engine.restart()
+        else:
+            self.logger.warning("OCR engine does not support restart")
+            return
+        self._release_caches()
+        self.logger.warning("OCR engine restarted to release memory")
+
+    def set_callback_executor(self, executor: Optional[CallbackExecutor]):
+        """
+        设置回调执行器，None表示在监控线程中直接执行回调（慢回调会阻塞监控）
+        示例: watcher.set_callback_executor(CallbackExecutor(max_workers=4, timeout=5, overflow="drop_newest"))
+        """
+        if self._executor is not None and self._executor is not executor:
+            self._executor.shutdown(wait=False)
+        self._executor = executor
+
+    @property
+    def ready(self) -> Future:
+        """OCR引擎的就绪Future，不支持后台加载的引擎视为已就绪"""
+        ready = getattr(self._ocr, 'ready', None)
+        return ready if isinstance(ready, Future) else resolved(self._ocr)
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """等待OCR引擎加载和预热完成，超时返回False；加载失败时抛出加载时的异常"""
+        try:
+            self.ready.result(timeout)
+        except FutureTimeoutError:
+            return False
+        return True
+
+    def _engine_ready(self, timeout: float) -> bool:
+        """最多等待timeout秒引擎就绪（同时触发延迟加载）；加载失败视为就绪，由检测流程记录错误"""
+        try:
+            self.ready.result(timeout)
+        except FutureTimeoutError:
+            return False
+        except Exception:
+            pass
+        return True
+
+    def start(self, interval: float = 1.0, cpu_budget: float = None):
+        """
+        启动后台监控线程，不等待OCR引擎加载：引擎就绪前监控线程空转等待
+        :param interval: 默认轮询间隔（秒），未通过 interval() 单独设置的规则使用该值
+        :param cpu_budget: CPU预算（单核比例），None表示沿用调节器的设置
         """
         if self._running:
             self.logger.warning("Watcher already running")
             return
+        if cpu_budget is not None:
+            self._governor.cpu_budget = cpu_budget
 
         self._stop_event.clear()
         self._running = True
@@ -267,39 +530,112 @@ class OcrWatcher:
         self._stop_event.set()
         if self._watch_thread:
             self._watch_thread.join(timeout=5)
+        if self._executor is not None:
+            # 丢弃未开始的回调，等待执行中的回调结束
+            self._executor.shutdown(wait=True, timeout=5)
+        if self._buffers is not None:
+            self._buffers.trim()
         self._running = False
         self.logger.info("Watcher stopped")
 
     def _watch_forever(self, interval: float):
-        """后台线程主循环"""
+        """后台线程主循环：每轮只检测到期的规则，再等待到下一条规则到期"""
+        governor = self._governor
         while not self._stop_event.is_set():
+            if not self._engine_ready(0.05):
+                # 引擎仍在后台加载，规则保持到期状态，就绪后立即检测
+                continue
             cycle_start = time.time()
-            try:
-                self._check_once()
-            except Exception as e:
-                self.logger.error(f"Check cycle error: {e}", exc_info=True)
-
-            # 精准控制间隔
-            elapsed = time.time() - cycle_start
-            sleep_time = max(0, interval - elapsed)
+            with self._lock:
+                watchers = self._watchers.copy()
+            due = [rule for rule in watchers if rule.get('next_due', 0.0) <= cycle_start]
+
+            if due:
+                timer = governor.begin()
+                try:
+                    self._check_once(due)
+                except Exception as e:
+                    self.logger.error(f"Check cycle error: {e}", exc_info=True)
+                    self._flight_error(f"check_error_{type(e).__name__}")
+                governor.end(timer)
+                if self._memory_guard is not None:
+                    self._memory_guard.check()
+                for rule in due:
+                    base = rule.get('interval') or interval
+                    rule['next_due'] = cycle_start + governor.interval_for(base)
+                self.stats['rules_skipped'] += len(watchers) - len(due)
+
+            # 等待到最早到期的规则，同时满足CPU预算
+            now = time.time()
+            next_due = min((rule.get('next_due', 0.0) for rule in watchers), default=now + interval)
+            sleep_time = governor.throttle(max(0, next_due - now), now)
             self._stop_event.wait(sleep_time)
 
-    def _check_once(self):
-        """单次检测流程：截图 -> OCR -> 匹配 -> 执行"""
-        # 1. 获取截图
-        img_bytes = self._device.screenshot()
-        if not img_bytes:
-            self.logger.warning("Failed to get screenshot")
+    def _check_once(self, rules: Optional[List[Dict]] = None):
+        """
+        单次检测流程：截图 -> OCR -> 匹配 -> 执行
+        :param rules: 本轮检测的规则，None表示全部规则；所有规则都限制了区域时只识别这些区域的外接矩形
+        """
+        if rules is None:
+            with self._lock:
+                rules = self._watchers.copy()
+        if not rules:
             return
 
-        # 2. OCR 识别
-        ocr_results = self._ocr.recognize(img_bytes)
-
-        # 3. 遍历所有规则进行匹配
-        with self._lock:
-            watchers = self._watchers.copy()
+        # 规则按识别语言分组，引擎自身语言的规则归入None
+        base_lang = getattr(self._ocr, 'lang', None)
+        groups: Dict[Optional[str], List[Dict]] = {}
+        for rule in rules:
+            lang = rule.get('lang')
+            groups.setdefault(None if lang == base_lang else lang, []).append(rule)
+
+        # 1-2. 截图 + OCR 识别（仅到期规则的区域）
+        if list(groups) == [None]:
+            region = union_region([rule['region'] for rule in rules])
+            if self._frame_bus is not None:
+                ocr_results = self._recognize_from_bus(region)
+            else:
+                ocr_results = self._capture_and_recognize(region)
+            if ocr_results is None:
+                return
+            self._match_rules(rules, ocr_results, region)
+            return
 
-        for rule in watchers:
+        # 多种语言：截图一次，各语言分别识别本组规则的区域
+        bus_frame = None
+        watched = union_region([rule['region'] for rule in rules])
+        if self._frame_bus is not None:
+            bus_frame = self._frame_bus.frame(self._frame_max_age, lambda: self._capture_image(watched),
+                                              source="OcrWatcher")
+            frame = bus_frame.image if bus_frame is not None else None
+        else:
+            frame = self._capture_image(watched)
+        if frame is None:
+            self.logger.warning("Failed to get screenshot")
+            return
+        self._observe(frame)
+        for lang, group in groups.items():
+            region = union_region([rule['region'] for rule in group])
+            if lang is None and bus_frame is not None:
+                # 总线上的识别结果是引擎自身语言的，只对该组复用
+                ocr_results = self._frame_bus.results(bus_frame, region,
+                                                      lambda image, r: self._recognize(None, image, r))
+            else:
+                ocr_results = self._recognize(None, frame, region, lang=lang)
+            self._match_rules(group, ocr_results, region, lang)
+
+    def _match_rules(self, rules: List[Dict], ocr_results: OcrResultSet,
+                     region: Optional[Tuple[int, int, int, int]] = None, lang: Optional[str] = None):
+        """3. 遍历规则进行匹配，命中且不在冷却中的规则派发回调；事件规则按画面文字状态触发"""
+        self.stats['rule_checks'] += len(rules)
+        if self._recorder is not None:
+            self._record_cycle(rules, ocr_results, region, lang)
+        event_rules = [rule for rule in rules if rule.get('event')]
+        if event_rules:
+            self._match_events(event_rules, self._text_state(lang), ocr_results, region)
+        for rule in rules:
+            if rule.get('event'):
+                continue
             matched = self._match_rule(rule, ocr_results)
             if matched:
                 # 检查冷却时间
@@ -307,49 +643,327 @@ class OcrWatcher:
                 if current_time - rule['last_triggered'] < rule['cooldown']:
                     continue
 
-                # 执行回调
-                try:
-                    rule['callback'](matched, self._device)
-                    rule['last_triggered'] = current_time
-                except Exception as e:
-                    self.logger.error(f"Callback error: {e}", exc_info=True)
+                # 执行回调（冷却时间从派发时开始计算，避免回调执行期间重复触发）
+                rule['last_triggered'] = current_time
+                self._dispatch(rule, matched)
+        self._fired = None
 
-    def _match_rule(self, rule: Dict, ocr_results: List[OcrResult]) -> Optional[OcrResult]:
+    def set_text_state(self, iou_threshold: float = 0.5, text_similarity: float = 0.8, appear_after: int = 1,
+                       disappear_after: int = 2):
+        """
+        设置事件规则（on_appear / on_disappear / on_persist）使用的画面文字状态参数，已有状态会被重置
+        :param iou_threshold: 与上一帧的文字关联所需的最小文字框IoU
+        :param text_similarity: 文字不同但相似度不低于该值时仍视为同一条文字（容忍识别抖动）
+        :param appear_after: 连续看到多少轮后确认出现
+        :param disappear_after: 连续多少轮未看到后确认消失
+        """
+        self._text_state_options = dict(iou_threshold=iou_threshold, text_similarity=text_similarity,
+                                        appear_after=appear_after, disappear_after=disappear_after)
+        self._text_states.clear()
+
+    def _text_state(self, lang: Optional[str]) -> TextStateTracker:
+        state = self._text_states.get(lang)
+        if state is None:
+            state = self._text_states[lang] = TextStateTracker(**self._text_state_options)
+        return state
+
+    def _match_events(self, rules: List[Dict], state: TextStateTracker, ocr_results: OcrResultSet,
+                      region: Optional[Tuple[int, int, int, int]]):
+        """
+        更新画面文字状态并按事件触发规则：每条文字标识对每条规则只触发一次
+        （规则按各自的间隔检测，以规则自己记录的标识判断出现/消失，不依赖两次检测之间的单帧事件）
+        """
+        now = time.time()
+        state.update(ocr_results, region, now)
+        live, ids = state.results()
+        on_screen = set(ids.tolist())
+        for rule in rules:
+            mask = self._rule_mask(rule, live)
+            current = set(ids[mask].tolist())
+            handled = rule['track_ids']
+            fired = []
+            if rule['event'] == 'appeared':
+                fired = [state.get(i) for i in ids[mask] if i not in handled]
+            elif rule['event'] == 'persisted':
+                fired = [state.get(i) for i in ids[mask]
+                         if i not in handled and state.get(i).age(now) >= rule['persist']]
+            elif rule['event'] == 'disappeared':
+                gone = [state.removed(i) for i in handled - current]
+                fired = [track for track in gone if track is not None]
+            # 只有派发了的标识才算已处理：冷却中跳过的文字在冷却结束后（仍满足条件时）再触发
+            dispatched = set()
+            for track in fired:
+                if now - rule['last_triggered'] < rule['cooldown']:
+                    continue
+                rule['last_triggered'] = now
+                self.stats['events'] += 1
+                self._dispatch(rule, track.result())
+                dispatched.add(track.id)
+            if rule['event'] == 'disappeared':
+                # 仍在屏幕上（如暂时未确认消失）的保留；已消失但尚未派发的保留到消失记录过期
+                rule['track_ids'] = current | {i for i in handled - current - dispatched
+                                               if state.get(i) is not None or state.removed(i) is not None}
+            else:
+                # 已不在屏幕上的标识不再需要记录
+                rule['track_ids'] = (handled | dispatched) & on_screen
+
+    def _rule_mask(self, rule: Dict, results: OcrResultSet) -> np.ndarray:
+        """结果集中满足规则（区域、置信度、关键字）的行"""
+        if not results:
+            return np.zeros(0, dtype=bool)
+        mask = results.region_mask(rule['region']) if rule['region'] is not None else np.ones(len(results), bool)
+        threshold = rule.get('confidence')
+        if threshold is not None:
+            mask &= results.confidences >= threshold
+        if rule['mode'] == 'fuzzy':
+            index = rule.get("fuzzy_index")
+            if index is None:
+                index = NgramIndex(rule["keywords"], max_edits=rule.get("fuzzy_max_edits"))
+                rule["fuzzy_index"] = index
+            text_mask = results.text_mask(lambda text: index.best_match(text) is not None)
+        else:
+            text_mask = results.text_mask(
+                lambda text: any(self._text_match(text, kw, rule['mode']) for kw in rule['keywords']))
+        return mask & text_mask
+
+    def _record_cycle(self, rules: List[Dict], ocr_results: OcrResultSet,
+                      region: Optional[Tuple[int, int, int, int]], lang: Optional[str]):
+        """把本轮的画面（识别区域）、识别结果和检测的规则交给飞行记录器；触发的规则在派发时补充，回调出错转储时已在记录中"""
+        frame = self._recorded_frame
+        if frame is not None:
+            region = clip_region(region, frame.shape)
+            frame = crop_frame(frame, region)
+        decision = {
+            'lang': lang,
+            'rules': [{'keywords': rule['keywords'], 'mode': rule['mode'], 'event': rule.get('event')}
+                      for rule in rules],
+            'fired': [],
+            'matched_bbox': [],
+        }
+        self._recorder.record("OcrWatcher", frame, ocr_results, region, event="watch", decision=decision)
+        self._fired = decision
+
+    def _dispatch(self, rule: Dict, matched: OcrResult):
+        """派发回调：有执行器时按规则串行地在线程池中执行，否则在当前线程执行"""
+        fired = self._fired
+        if fired is not None:
+            fired['fired'].append({'keywords': rule['keywords'], 'text': matched.text, 'bbox': list(matched.bbox)})
+            fired['matched_bbox'].append(list(matched.bbox))
+        if self._executor is None:
+            self._run_callback(rule, matched)
+            return
+        self._executor.submit(id(rule), self._run_callback, rule, matched, label="|".join(rule['keywords']))
+
+    def _run_callback(self, rule: Dict, matched: OcrResult):
+        try:
+            rule['callback'](matched, self._device)
+        except Exception as e:
+            self.logger.error(f"Callback error: {e}", exc_info=True)
+            self._flight_error(f"callback_error_{'|'.join(rule['keywords'])}")
+        finally:
+            # 回调通常会点击：画面总线上点击前的画面和识别结果失效，之后的画面需要重新确认稳定
+            bus = self._frame_bus
+            if bus is not None:
+                bus.clear()
+            stability = self._stability
+            if stability is not None:
+                stability.reset()
+
+    def _capture_and_recognize(self, region: Optional[Tuple[int, int, int, int]]) -> Optional[OcrResultSet]:
+        """独立截图并识别，截图失败返回None"""
+        if hasattr(self._device, 'capture') or self._stability is not None:
+            # 设备直接提供BGR画面，省去PNG编码再解码；稳定等待需要解码后逐帧比较
+            frame = self._capture_image(region)
+            if frame is None:
+                self.logger.warning("Failed to get screenshot")
+                return None
+            self._observe(frame)
+            return self._recognize(None, frame, region)
+
+        img_bytes = self._device.screenshot()
+        if not img_bytes:
+            self.logger.warning("Failed to get screenshot")
+            return None
+        frame = None
+        if (region is not None or self._result_cache is not None or self._prefilter is not None
+                or self._governor.tracks_changes or self._recorder is not None):
+            frame = load_image(img_bytes)
+            if frame is None:
+                self.logger.warning("Failed to decode screenshot")
+                return None
+            self._observe(frame)
+        return self._recognize(img_bytes, frame, region)
+
+    def _recognize_from_bus(self, region: Optional[Tuple[int, int, int, int]]) -> Optional[OcrResultSet]:
+        """从共享总线获取画面和识别结果，画面足够新或已被其他调用方识别过时直接复用"""
+        bus_frame = self._frame_bus.frame(self._frame_max_age, lambda: self._capture_image(region),
+                                          source="OcrWatcher")
+        if bus_frame is None:
+            self.logger.warning("Failed to get screenshot")
+            return None
+        self._observe(bus_frame.image)
+        return self._frame_bus.results(bus_frame, region,
+                                       lambda image, r: self._recognize(None, image, r))
+
+    def _observe(self, frame: np.ndarray):
+        """把画面签名交给节奏调节器（长时间运行模式下灰度图使用复用的缓冲区），开启飞行记录时保留画面引用"""
+        if self._recorder is not None:
+            self._recorded_frame = frame
+        if not self._governor.tracks_changes:
+            return
+        if self._buffers is None:
+            self._governor.observe(screen_signature(frame))
+            return
+        with self._buffers.gray(frame) as gray:
+            self._governor.observe(screen_signature(gray))
+
+    def _has_text(self, frame: np.ndarray) -> bool:
+        """文字预筛，未配置预筛器时视为有文字"""
+        if self._prefilter is None:
+            return True
+        if self._buffers is None:
+            return self._prefilter.has_text(frame)
+        with self._buffers.gray(frame) as gray:
+            return self._prefilter.has_text(gray)
+
+    def _capture_image(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """截图为BGR数组，开启稳定等待时等画面在region（None为整帧）内稳定后返回"""
+        stability = self._stability
+        if stability is None:
+            return self._grab_image()
+        return stability.wait(self._grab_image, region)
+
+    def _grab_image(self) -> Optional[np.ndarray]:
+        """截图为BGR数组：设备提供 capture() 时直接使用，否则解码 screenshot() 的字节数据"""
+        if hasattr(self._device, 'capture'):
+            return self._device.capture()
+        img_bytes = self._device.screenshot()
+        return load_image(img_bytes) if img_bytes else None
+
+    def _recognize(self, img_bytes: Optional[bytes], frame: Optional[np.ndarray] = None,
+                   region: Optional[Tuple[int, int, int, int]] = None, lang: str = None) -> OcrResultSet:
+        """
+        OCR识别：配置了预筛器时先判断是否可能有文字，配置了持久化缓存时先查缓存
+        :param img_bytes: 截图字节数据，None时由frame编码得到；引擎提供 recognize_image 时直接识别frame
+        :param frame: 已解码的截图（BGR），指定region、使用缓存、预筛或img_bytes为None时必需
+        :param region: 只识别该区域，结果坐标换算回全屏
+        :param lang: 其他识别语言，由多语言引擎缓存识别（需要frame），None表示使用OCR引擎
+        """
+        dx = dy = 0
+        if region is not None:
+            x1, y1, x2, y2 = clip_region(region, frame.shape)
+            if x2 <= x1 or y2 <= y1:
+                return OcrResultSet.empty()
+            frame = crop_frame(frame, (x1, y1, x2, y2))
+            img_bytes = None
+            dx, dy = x1, y1
+        if frame is not None and not self._has_text(frame):
+            return OcrResultSet.empty()
+
+        def recognize():
+            if lang is not None:
+                cls = getattr(getattr(self._ocr, 'profile', None), 'use_angle_cls', True)
+                return self._language_cache().recognize(frame, lang, getattr(self._ocr, 'scale_policy', None),
+                                                        cls=cls)
+            recognize_image = getattr(self._ocr, 'recognize_image', None)
+            if frame is not None and recognize_image is not None:
+                # 引擎直接接受BGR画面，省去PNG编码解码
+                return OcrResultSet.coerce(recognize_image(frame))
+            data = img_bytes
+            if data is None:
+                ok, buf = cv2.imencode('.png', frame)
+                if not ok:
+                    return OcrResultSet.empty()
+                data = buf.tobytes()
+            return OcrResultSet.coerce(self._ocr.recognize(data))
+
+        if self._result_cache is None:
+            results = recognize()
+        else:
+            results = self._result_cache.recognize(
+                frame, recognize, region=region,
+                engine=engine_tag(self._ocr, profile_tag(getattr(self._ocr, 'profile', None)),
+                                  f"lang={lang}" if lang is not None else None))
+        return results.offset(dx, dy) if region is not None else results
+
+    def get_stats(self) -> Dict:
+        """
+        监控统计：规则检测次数、因未到期跳过的规则数，
+        调节器的检测轮数、CPU占用、每轮耗时、画面变化率、间隔放大倍数、限流次数，
+        回调执行统计（callbacks，含超时的慢回调 slow_callbacks），
+        以及接入时的画面总线统计（frame_bus）和文字预筛统计（prefilter，含跳过率 skip_rate），
+        长时间运行模式下的缓冲池统计（buffers）和内存统计（memory，含 rss / peak_rss / trims / restarts），
+        以及多语言引擎缓存统计（languages）、飞行记录统计（flight_recorder）、画面稳定等待统计（stability，含等待时间 wait_time
+        和因画面仍在变化而未识别的帧数 skipped）；有事件规则时附加触发的事件数（events）
+        和画面文字状态统计（text_state，按识别语言：当前文字数、出现/消失次数）
+        """
+        stats = dict(self.stats)
+        stats.update(self._governor.get_stats())
+        if self._executor is not None:
+            stats['callbacks'] = self._executor.get_stats()
+        if self._frame_bus is not None:
+            stats['frame_bus'] = self._frame_bus.get_stats()
+        if self._prefilter is not None:
+            stats['prefilter'] = self._prefilter.get_stats()
+        if self._buffers is not None:
+            stats['buffers'] = self._buffers.get_stats()
+        if self._memory_guard is not None:
+            stats['memory'] = self._memory_guard.get_stats()
+        if self._engine_cache is not None:
+            stats['languages'] = self._engine_cache.get_stats()
+        if self._stability is not None:
+            stats['stability'] = self._stability.get_stats()
+        if self._recorder is not None:
+            stats['flight_recorder'] = self._recorder.get_stats()
+        if self._text_states:
+            stats['text_state'] = {lang or 'default': state.get_stats() for lang, state in self._text_states.items()}
+        return stats
+
+    def _match_rule(self, rule: Dict, ocr_results: Sequence[OcrResult]) -> Optional[OcrResult]:
         """匹配单个规则"""
         keywords = rule["keywords"]
         mode = rule["mode"]
-        region = rule["region"]
-        confidence = rule.get("confidence")
 
-        for res in ocr_results:
-            # 区域过滤
-            if region and not self._in_region(res.bbox, region):
-                continue
+        # 区域过滤 + 置信度过滤（向量化）
+        candidates = (OcrResultSet.coerce(ocr_results)
+                      .in_region(rule["region"])
+                      .filter_confidence(rule.get("confidence")))
 
-            # 置信度过滤
-            if confidence is not None and res.confidence < confidence:
-                continue
+        if mode == "fuzzy":
+            return self._match_fuzzy(rule, candidates)
 
-            # 文字匹配
-            text = res.text
+        # 文字匹配
+        for i, text in enumerate(candidates.texts):
             for kw in keywords:
                 if self._text_match(text, kw, mode):
-                    return res
+                    matched = candidates.result(i)
+                    matched.match_score = 1.0
+                    return matched
         return None
 
+    def _match_fuzzy(self, rule: Dict, candidates: OcrResultSet) -> Optional[OcrResult]:
+        """fuzzy模式：通过规则的n-gram索引预筛关键字，返回匹配分数（错字最少）最高的结果"""
+        index = rule.get("fuzzy_index")
+        if index is None:
+            index = NgramIndex(rule["keywords"], max_edits=rule.get("fuzzy_max_edits"))
+            rule["fuzzy_index"] = index
+
+        best_index, best_score = None, 0.0
+        for i, text in enumerate(candidates.texts):
+            best = index.best_match(text)
+            if best is not None and best[1] > best_score:
+                best_index, best_score = i, best[1]
+        if best_index is None:
+            return None
+        matched = candidates.result(best_index)
+        matched.match_score = best_score
+        return matched
+
     def _text_match(self, text: str, keyword: str, mode: str) -> bool:
         """文字匹配逻辑"""
-        if mode == "contains":
-            return keyword in text
-        elif mode == "exact":
-            return text == keyword
-        elif mode == "regex":
-            return bool(re.search(keyword, text))
-        elif mode == "startswith":
-            return text.startswith(keyword)
-        elif mode == "endswith":
-            return text.endswith(keyword)
-        return False
+        if mode not in MATCH_MODES:
+            return False
+        return text_match(text, keyword, mode)
 
     def _in_region(self, bbox: Tuple, region: Tuple) -> bool:
         """检查文字中心点是否在指定区域内"""
@@ -362,6 +976,7 @@ class OcrWatcher:
         """清空所有规则"""
         with self._lock:
             self._watchers.clear()
+        self._text_states.clear()
 
     def set_confidence_threshold(self, threshold: float):
         """设置全局置信度阈值"""
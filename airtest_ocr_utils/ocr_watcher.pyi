@@ -2,25 +2,37 @@
 OCR Watcher 类型存根文件
 """
 
-from typing import List, Dict, Callable, Optional, Tuple
+from typing import List, Dict, Callable, Optional, Sequence, Tuple, Union
 from abc import ABC
-from dataclasses import dataclass
+from concurrent.futures import Future
+import numpy as np
 
-@dataclass
-class OcrResult:
-    """OCR识别结果"""
-    text: str
-    bbox: Tuple[int, int, int, int]
-    confidence: float
-    center: Tuple[float, float]
-    points: List[Tuple[int, int]]
-
-class OcrEngine(ABC):
-    def recognize(self, image_bytes: bytes) -> List[OcrResult]: ...
-    def set_confidence_threshold(self, threshold: float) -> None: ...
+from .ocr_results import OcrResult, OcrResultSet
+from .ocr_engine import OcrEngine
+from .ocr_pipeline import ScalePolicy
+from .result_cache import OcrResultCache
+from .watch_scheduler import WatchGovernor
+from .callback_executor import CallbackExecutor
+from .frame_bus import FrameBus
+from .text_prefilter import TextPrefilter
+from .model_profiles import ModelProfile
+from .resource_guard import BufferPool, MemoryGuard
+from .engine_cache import EngineCache
+from .text_state import TextStateTracker
+from .screen_change import StabilityGate
+from .flight_recorder import FlightRecorder
 
 class AirtestOcrEngine(OcrEngine):
-    def __init__(self, lang: str = 'ch', use_gpu: bool = False) -> None: ...
+    lang: str
+    use_gpu: bool
+    scale_policy: Optional[ScalePolicy]
+    profile: ModelProfile
+    ready: Future
+    def __init__(self, lang: str = 'ch', use_gpu: bool = False, scale_policy: Optional[ScalePolicy] = None,
+                 profile: Union[str, ModelProfile, None] = None, warmup: bool = True,
+                 background: bool = True) -> None: ...
+    def recognize(self, image_bytes: bytes) -> OcrResultSet: ...
+    def recognize_image(self, image: np.ndarray) -> OcrResultSet: ...
 
 class DeviceController(ABC):
     def screenshot(self) -> bytes: ...
@@ -29,21 +41,33 @@ class DeviceController(ABC):
 
 class AirtestDevice(DeviceController):
     def __init__(self) -> None: ...
+    def capture(self) -> Optional[np.ndarray]: ...
+    def screenshot(self) -> bytes: ...
 
 class TextWatcher:
     _parent: "OcrWatcher"
     _keywords: List[str]
     _match_mode: str
+    _fuzzy_max_edits: Optional[int]
     _region: Optional[Tuple[int, int, int, int]]
     _confidence: Optional[float]
     _cooldown: float
+    _interval: Optional[float]
+    _lang: Optional[str]
+    _event: Optional[str]
+    _persist: float
     _last_triggered: float
 
     def when(self, text: str) -> "TextWatcher": ...
-    def match_mode(self, mode: str) -> "TextWatcher": ...
+    def match_mode(self, mode: str, max_edits: int = None) -> "TextWatcher": ...
     def region(self, x1: int, y1: int, x2: int, y2: int) -> "TextWatcher": ...
     def confidence(self, threshold: float) -> "TextWatcher": ...
     def cooldown(self, seconds: float) -> "TextWatcher": ...
+    def interval(self, seconds: float) -> "TextWatcher": ...
+    def lang(self, lang: str) -> "TextWatcher": ...
+    def on_appear(self) -> "TextWatcher": ...
+    def on_disappear(self) -> "TextWatcher": ...
+    def on_persist(self, seconds: float) -> "TextWatcher": ...
     def call(self, callback: Callable[[OcrResult, DeviceController], None]) -> "TextWatcher": ...
     def click(self) -> "TextWatcher": ...
     def dismiss(self) -> "TextWatcher": ...
@@ -56,15 +80,67 @@ class OcrWatcher:
     _stop_event: object
     _watch_thread: Optional[object]
     _running: bool
+    _result_cache: Optional[OcrResultCache]
+    _governor: WatchGovernor
+    _executor: Optional[CallbackExecutor]
+    _frame_bus: Optional[FrameBus]
+    _frame_max_age: float
+    _prefilter: Optional[TextPrefilter]
+    _buffers: Optional[BufferPool]
+    _memory_guard: Optional[MemoryGuard]
+    _engine_cache: Optional[EngineCache]
+    _text_states: Dict[Optional[str], TextStateTracker]
+    stats: Dict[str, int]
     logger: object
 
-    def __init__(self, device: Optional[DeviceController] = None, ocr_engine: Optional[OcrEngine] = None) -> None: ...
+    def __init__(self, device: Optional[DeviceController] = None, ocr_engine: Optional[OcrEngine] = None,
+                 result_cache: Optional[OcrResultCache] = None,
+                 governor: Optional[WatchGovernor] = None,
+                 callback_executor: Optional[CallbackExecutor] = None,
+                 frame_bus: Optional[FrameBus] = None, frame_max_age: float = 0.5,
+                 prefilter: Optional[TextPrefilter] = None,
+                 profile: Union[str, ModelProfile, None] = None) -> None: ...
     def when(self, text: str) -> TextWatcher: ...
-    def start(self, interval: float = 1.0) -> None: ...
+    def set_governor(self, cpu_budget: float = None, max_backoff: float = 1.0, **kwargs) -> WatchGovernor: ...
+    def set_profile(self, profile: Union[str, ModelProfile], lang: str = None, use_gpu: bool = False,
+                    warmup: bool = True) -> None: ...
+    def set_frame_bus(self, frame_bus: Optional[FrameBus], max_age: float = 0.5) -> None: ...
+    def set_prefilter(self, prefilter: Optional[TextPrefilter]) -> None: ...
+    def set_text_state(self, iou_threshold: float = 0.5, text_similarity: float = 0.8, appear_after: int = 1,
+                       disappear_after: int = 2) -> None: ...
+    def enable_stability(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.0,
+                         poll: float = 0.1, **kwargs) -> StabilityGate: ...
+    def disable_stability(self) -> None: ...
+    def set_flight_recorder(self, recorder: Optional[FlightRecorder]) -> None: ...
+    def dump_flight_record(self, reason: str = "manual") -> Optional[str]: ...
+    def enable_languages(self, memory_budget_mb: float = None, share_detector: str = 'family',
+                         preload: Sequence[str] = None) -> EngineCache: ...
+    def enable_long_run(self, rss_limit_mb: float = None, check_interval: float = 30.0, restart_after: int = 2,
+                        max_free_buffers: int = 2) -> Optional[MemoryGuard]: ...
+    def disable_long_run(self) -> None: ...
+    def set_callback_executor(self, executor: Optional[CallbackExecutor]) -> None: ...
+    @property
+    def ready(self) -> Future: ...
+    def wait_ready(self, timeout: float = None) -> bool: ...
+    def start(self, interval: float = 1.0, cpu_budget: float = None) -> None: ...
     def stop(self) -> None: ...
     def _watch_forever(self, interval: float) -> None: ...
-    def _check_once(self) -> None: ...
-    def _match_rule(self, rule: Dict, ocr_results: List[OcrResult]) -> Optional[OcrResult]: ...
+    def _check_once(self, rules: Optional[List[Dict]] = None) -> None: ...
+    def _capture_and_recognize(self, region: Optional[Tuple[int, int, int, int]]) -> Optional[OcrResultSet]: ...
+    def _recognize_from_bus(self, region: Optional[Tuple[int, int, int, int]]) -> Optional[OcrResultSet]: ...
+    def _capture_image(self) -> Optional[np.ndarray]: ...
+    def _recognize(self, img_bytes: Optional[bytes], frame: Optional[np.ndarray] = None,
+                   region: Optional[Tuple[int, int, int, int]] = None, lang: str = None) -> OcrResultSet: ...
+    def _match_rules(self, rules: List[Dict], ocr_results: OcrResultSet,
+                     region: Optional[Tuple[int, int, int, int]] = None, lang: Optional[str] = None) -> None: ...
+    def _match_events(self, rules: List[Dict], state: TextStateTracker, ocr_results: OcrResultSet,
+                      region: Optional[Tuple[int, int, int, int]]) -> None: ...
+    def _rule_mask(self, rule: Dict, results: OcrResultSet) -> np.ndarray: ...
+    def _dispatch(self, rule: Dict, matched: OcrResult) -> None: ...
+    def _run_callback(self, rule: Dict, matched: OcrResult) -> None: ...
+    def get_stats(self) -> Dict: ...
+    def _match_rule(self, rule: Dict, ocr_results: Sequence[OcrResult]) -> Optional[OcrResult]: ...
+    def _match_fuzzy(self, rule: Dict, candidates: OcrResultSet) -> Optional[OcrResult]: ...
     def _text_match(self, text: str, keyword: str, mode: str) -> bool: ...
     def _in_region(self, bbox: Tuple, region: Tuple) -> bool: ...
     def clear(self) -> None: ...
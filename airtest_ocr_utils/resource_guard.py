@@ -0,0 +1,195 @@
+"""
+长时间运行的资源控制
+缓冲区复用、进程内存（RSS）读取与超限处理、日志只配置一次，供连续运行数天的监控使用
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    """
+    获取日志器，首次获取时添加一个控制台输出；重复调用（如多次创建OcrWatcher）不会重复添加，
+    避免同一条日志输出多遍、处理器随实例数增长
+    """
+    logger = logging.getLogger(name)
+    if not any(getattr(h, '_airtest_ocr_handler', False) for h in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler._airtest_ocr_handler = True
+        logger.addHandler(handler)
+        logger.setLevel(level)
+    return logger
+
+
+# ==================== 缓冲区复用 ====================
+
+class BufferPool:
+    """
+    按形状复用的数组缓冲区池
+
+    每轮检测都要用到的整帧临时数组（如灰度图）从池中借用，用完归还，
+    画面尺寸不变时不再重复分配内存
+
+    Args:
+        max_free: 每种形状最多保留的空闲缓冲区数
+    """
+
+    def __init__(self, max_free: int = 2):
+        self.max_free = max(int(max_free), 0)
+        self._free: Dict[Tuple, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'allocated': 0, 'reused': 0}
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """借用缓冲区（内容未初始化）"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.stats['reused'] += 1
+                return free.pop()
+            self.stats['allocated'] += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer: np.ndarray):
+        """归还缓冲区"""
+        key = (buffer.shape, buffer.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free:
+                free.append(buffer)
+
+    @contextmanager
+    def borrow(self, shape: Tuple[int, ...], dtype=np.uint8) -> Iterator[np.ndarray]:
+        """借用缓冲区，离开with块时归还"""
+        buffer = self.acquire(shape, dtype)
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    @contextmanager
+    def gray(self, frame: np.ndarray) -> Iterator[np.ndarray]:
+        """把BGR画面转换到借用的灰度缓冲区中，已是灰度图时直接返回"""
+        if frame.ndim == 2:
+            yield frame
+            return
+        with self.borrow(frame.shape[:2], frame.dtype) as buffer:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buffer)
+            yield buffer
+
+    def trim(self):
+        """释放全部空闲缓冲区"""
+        with self._lock:
+            self._free.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            free = sum(len(v) for v in self._free.values())
+            free_bytes = sum(b.nbytes for v in self._free.values() for b in v)
+        return dict(self.stats, free=free, free_bytes=free_bytes)
+
+
+# ==================== 内存 ====================
+
+def process_rss() -> Optional[int]:
+    """当前进程的常驻内存（字节），无法获取时返回None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return int(counters.WorkingSetSize)
+    return None
+
+
+class MemoryGuard:
+    """
+    进程内存上限
+
+    每隔check_interval秒读取一次RSS：超过上限时先执行清理（释放缓存、缓冲区），
+    清理后仍连续超限restart_after次时重建OCR引擎（释放推理库随输入尺寸增长的显存/内存池）
+
+    Args:
+        rss_limit_mb: 常驻内存上限（MB）
+        check_interval: 检查间隔（秒）
+        restart_after: 清理后仍超限多少次检查后重建引擎，0表示从不重建
+        on_trim: 清理回调
+        on_restart: 重建引擎回调
+    """
+
+    def __init__(self, rss_limit_mb: float, check_interval: float = 30.0, restart_after: int = 2,
+                 on_trim: Callable[[], None] = None, on_restart: Callable[[], None] = None):
+        self.rss_limit = int(rss_limit_mb * 1024 * 1024)
+        self.check_interval = check_interval
+        self.restart_after = restart_after
+        self.on_trim = on_trim
+        self.on_restart = on_restart
+        self._last_check = 0.0
+        self._over_count = 0
+        self.stats = {'checks': 0, 'trims': 0, 'restarts': 0, 'rss': 0, 'peak_rss': 0}
+
+    def check(self, now: float = None) -> Optional[str]:
+        """
+        到检查时间时读取RSS并按需处理
+
+        Returns:
+            'trim' / 'restart' 表示执行了对应处理，None表示未超限或未到检查时间
+        """
+        now = time.time() if now is None else now
+        if now - self._last_check < self.check_interval:
+            return None
+        self._last_check = now
+        rss = process_rss()
+        if rss is None:
+            return None
+        self.stats['checks'] += 1
+        self.stats['rss'] = rss
+        self.stats['peak_rss'] = max(self.stats['peak_rss'], rss)
+        if rss <= self.rss_limit:
+            self._over_count = 0
+            return None
+
+        self._over_count += 1
+        if self.restart_after and self._over_count > self.restart_after and self.on_restart is not None:
+            self._over_count = 0
+            self.stats['restarts'] += 1
+            self.on_restart()
+            return 'restart'
+        self.stats['trims'] += 1
+        if self.on_trim is not None:
+            self.on_trim()
+        return 'trim'
+
+    def get_stats(self) -> Dict[str, float]:
+        return dict(self.stats, rss_limit=self.rss_limit)
@@ -0,0 +1,41 @@
+"""
+长时间运行资源控制的类型存根文件
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import numpy as np
+
+LOG_FORMAT: str
+
+def get_logger(name: str, level: int = logging.INFO) -> logging.Logger: ...
+
+class BufferPool:
+    max_free: int
+    stats: Dict[str, int]
+
+    def __init__(self, max_free: int = 2) -> None: ...
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray: ...
+    def release(self, buffer: np.ndarray) -> None: ...
+    @contextmanager
+    def borrow(self, shape: Tuple[int, ...], dtype=np.uint8) -> Iterator[np.ndarray]: ...
+    @contextmanager
+    def gray(self, frame: np.ndarray) -> Iterator[np.ndarray]: ...
+    def trim(self) -> None: ...
+    def get_stats(self) -> Dict[str, float]: ...
+
+def process_rss() -> Optional[int]: ...
+
+class MemoryGuard:
+    rss_limit: int
+    check_interval: float
+    restart_after: int
+    on_trim: Optional[Callable[[], None]]
+    on_restart: Optional[Callable[[], None]]
+    stats: Dict[str, int]
+
+    def __init__(self, rss_limit_mb: float, check_interval: float = 30.0, restart_after: int = 2,
+                 on_trim: Callable[[], None] = None, on_restart: Callable[[], None] = None) -> None: ...
+    def check(self, now: float = None) -> Optional[str]: ...
+    def get_stats(self) -> Dict[str, float]: ...
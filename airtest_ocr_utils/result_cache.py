@@ -0,0 +1,252 @@
+"""
+OCR结果持久化缓存
+以画面内容哈希（缩小灰度图像素的blake2b）+ 区域 + 引擎版本为键，将识别结果保存到本地SQLite，跨运行复用
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_cache (
+    key TEXT PRIMARY KEY,
+    points BLOB NOT NULL,
+    confidences BLOB NOT NULL,
+    texts TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def screen_signature(frame: np.ndarray, hash_size: int = 16) -> str:
+    """
+    计算画面签名：缩小到 (hash_size+1) x hash_size 灰度图后取水平差分符号（dHash）
+
+    对压缩噪声、轻微亮度变化不敏感，画面布局或大块内容变化时签名改变
+    """
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).reshape(-1)
+    # 附带宽高，避免不同分辨率的画面冲突
+    return f"{frame.shape[1]}x{frame.shape[0]}:{np.packbits(bits).tobytes().hex()}"
+
+
+def content_hash(frame: np.ndarray, max_side: int = 640) -> str:
+    """
+    画面内容哈希：长边缩小到max_side的灰度图像素的blake2b
+
+    与 screen_signature 不同，任何像素变化（如倒计时数字、金额）都会改变哈希，用作结果缓存的键；
+    缩小只为减少哈希的数据量，同一画面每次得到相同的哈希
+    """
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    scale = max_side / float(max(gray.shape[:2]))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    digest = hashlib.blake2b(np.ascontiguousarray(gray).tobytes(), digest_size=16)
+    digest.update(str(gray.shape).encode('ascii'))
+    # 附带原始宽高，避免缩小后尺寸相同的不同分辨率画面冲突
+    return f"{frame.shape[1]}x{frame.shape[0]}:{digest.hexdigest()}"
+
+
+def engine_tag(engine, *parts) -> str:
+    """引擎版本标识：引擎类型 + PaddleOCR版本 + 语言/缩放策略等附加信息"""
+    try:
+        import paddleocr
+        version = getattr(paddleocr, '__version__', '')
+    except ImportError:
+        version = ''
+    extra = [str(p) for p in parts if p is not None]
+    for attr in ('lang', 'scale_policy'):
+        value = getattr(engine, attr, None)
+        if value is not None:
+            extra.append(f"{attr}={value}")
+    return "|".join([type(engine).__name__, f"paddleocr-{version}"] + extra)
+
+
+def _same_results(a: OcrResultSet, b: OcrResultSet, tolerance: float = 4.0) -> bool:
+    """校验用：文字和位置（按文字排序后逐个比较外接框，误差不超过tolerance像素）一致即视为未过期"""
+    if len(a) != len(b):
+        return False
+    order_a = sorted(range(len(a)), key=lambda i: (a.texts[i], tuple(a.bboxes[i])))
+    order_b = sorted(range(len(b)), key=lambda i: (b.texts[i], tuple(b.bboxes[i])))
+    if [a.texts[i] for i in order_a] != [b.texts[i] for i in order_b]:
+        return False
+    return not len(a) or float(np.abs(a.bboxes[order_a] - b.bboxes[order_b]).max()) <= tolerance
+
+
+class OcrResultCache:
+    """
+    OCR结果持久化缓存
+
+    Args:
+        path: SQLite数据库文件路径
+        max_entries: 最大条目数
+        max_bytes: 结果数据总大小上限（字节）
+        validate_ratio: 命中后重新OCR校验的比例（0~1），用于发现过期缓存
+        max_side: 计算内容哈希前画面缩小到的长边
+    """
+
+    def __init__(self, path: str = ".ocr_cache.sqlite3", max_entries: int = 5000,
+                 max_bytes: int = 64 * 1024 * 1024, validate_ratio: float = 0.05, max_side: int = 640):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.validate_ratio = validate_ratio
+        self.max_side = max_side
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON ocr_cache(last_access)")
+        self._conn.commit()
+        self.stats = {'hits': 0, 'misses': 0, 'validations': 0, 'stale': 0, 'evictions': 0}
+
+    # ==================== 键 ====================
+
+    def make_key(self, frame: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None,
+                 engine: str = "") -> str:
+        """由画面内容哈希、区域和引擎版本生成缓存键：文字不同的画面即使布局相同也不会共用结果"""
+        raw = f"{engine}|{tuple(region) if region else None}|{content_hash(frame, self.max_side)}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    # ==================== 读写 ====================
+
+    def get(self, key: str) -> Optional[OcrResultSet]:
+        """读取缓存，未命中返回None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT points, confidences, texts FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE ocr_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        points = np.frombuffer(row[0], dtype=np.float32).reshape(-1, 4, 2)
+        confidences = np.frombuffer(row[1], dtype=np.float64)
+        return OcrResultSet(points, confidences, json.loads(row[2]))
+
+    def put(self, key: str, results: OcrResultSet):
+        """写入缓存，超出容量时按最近访问时间淘汰"""
+        points = np.ascontiguousarray(results.points, dtype=np.float32).tobytes()
+        confidences = np.ascontiguousarray(results.confidences, dtype=np.float64).tobytes()
+        texts = json.dumps(results.texts.tolist(), ensure_ascii=False)
+        size = len(points) + len(confidences) + len(texts.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, points, confidences, texts, size, created, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)", (key, points, confidences, texts, size, now, now))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """淘汰最久未访问的条目，直到满足条目数和大小限制（调用方持有锁）"""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+        removed = 0
+        if count > self.max_entries:
+            excess = count - self.max_entries
+            total -= self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM "
+                "(SELECT size FROM ocr_cache ORDER BY last_access ASC LIMIT ?)", (excess,)).fetchone()[0]
+            self._conn.execute(
+                "DELETE FROM ocr_cache WHERE key IN "
+                "(SELECT key FROM ocr_cache ORDER BY last_access ASC LIMIT ?)", (excess,))
+            removed += excess
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM ocr_cache ORDER BY last_access ASC LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        self.stats['evictions'] += removed
+
+    def invalidate(self, key: str):
+        """删除指定条目"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._conn.commit()
+
+    def trim(self, ratio: float = 0.5):
+        """按最近访问时间淘汰一部分条目（内存/磁盘紧张时使用）"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+            drop = int(count * ratio)
+            if drop:
+                self._conn.execute(
+                    "DELETE FROM ocr_cache WHERE key IN "
+                    "(SELECT key FROM ocr_cache ORDER BY last_access ASC LIMIT ?)", (drop,))
+                self._conn.commit()
+                self.stats['evictions'] += drop
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    # ==================== 识别 ====================
+
+    def recognize(self, frame: np.ndarray, recognize: Callable[[], OcrResultSet],
+                  region: Optional[Tuple[int, int, int, int]] = None, engine: str = "") -> OcrResultSet:
+        """
+        带缓存的识别：命中时直接返回缓存结果，并按validate_ratio抽样重新OCR校验
+
+        Args:
+            frame: 待识别的画面（BGR数组），用于计算内容哈希
+            recognize: 实际执行OCR的函数，返回画面内坐标的结果集
+            region: 画面对应的屏幕区域，参与缓存键
+            engine: 引擎版本标识，参与缓存键
+        """
+        key = self.make_key(frame, region, engine)
+        cached = self.get(key)
+        if cached is None:
+            self.stats['misses'] += 1
+            results = recognize()
+            self.put(key, results)
+            return results
+
+        self.stats['hits'] += 1
+        if self.validate_ratio > 0 and random.random() < self.validate_ratio:
+            self.stats['validations'] += 1
+            results = recognize()
+            if not _same_results(cached, results):
+                self.stats['stale'] += 1
+                self.put(key, results)
+            return results
+        return cached
+
+    def get_stats(self) -> Dict[str, float]:
+        """缓存统计，含命中率"""
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,35 @@
+"""
+OCR结果持久化缓存的类型存根文件
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+def screen_signature(frame: np.ndarray, hash_size: int = 16) -> str: ...
+def content_hash(frame: np.ndarray, max_side: int = 640) -> str: ...
+def engine_tag(engine, *parts) -> str: ...
+
+class OcrResultCache:
+    path: str
+    max_entries: int
+    max_bytes: int
+    validate_ratio: float
+    max_side: int
+    stats: Dict[str, int]
+
+    def __init__(self, path: str = ".ocr_cache.sqlite3", max_entries: int = 5000,
+                 max_bytes: int = 64 * 1024 * 1024, validate_ratio: float = 0.05, max_side: int = 640) -> None: ...
+    def make_key(self, frame: np.ndarray, region: Optional[Tuple[int, int, int, int]] = None,
+                 engine: str = "") -> str: ...
+    def get(self, key: str) -> Optional[OcrResultSet]: ...
+    def put(self, key: str, results: OcrResultSet) -> None: ...
+    def invalidate(self, key: str) -> None: ...
+    def clear(self) -> None: ...
+    def trim(self, ratio: float = 0.5) -> None: ...
+    def __len__(self) -> int: ...
+    def close(self) -> None: ...
+    def recognize(self, frame: np.ndarray, recognize: Callable[[], OcrResultSet],
+                  region: Optional[Tuple[int, int, int, int]] = None, engine: str = "") -> OcrResultSet: ...
+    def get_stats(self) -> Dict[str, float]: ...
@@ -0,0 +1,264 @@
+"""
+画面变化检测
+在缩小的灰度图上比较前后两帧：判断画面是否变化、等待操作后的画面变化并稳定下来，
+并给出变化的区域（屏幕坐标），供只重新识别变化部分使用；识别前等待画面稳定（StabilityGate）
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .frame_bus import crop_frame
+
+Region = Tuple[int, int, int, int]
+
+
+def frame_thumbnail(frame: np.ndarray, max_side: int = 320) -> np.ndarray:
+    """缩小的灰度图：长边不超过max_side，用于快速比较"""
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    scale = max_side / float(max(gray.shape[:2]))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def frame_difference(a: np.ndarray, b: np.ndarray, pixel_threshold: int = 20) -> float:
+    """两张缩略图中灰度差超过pixel_threshold的像素比例；尺寸不同（如旋转屏幕）视为完全不同"""
+    if a.shape != b.shape:
+        return 1.0
+    return float(np.count_nonzero(cv2.absdiff(a, b) > pixel_threshold)) / a.size
+
+
+def merge_boxes(boxes: List[List[float]]) -> List[List[float]]:
+    """合并相交的矩形，直到互不相交"""
+    merged = True
+    while merged and len(boxes) > 1:
+        merged = False
+        result = []
+        for box in boxes:
+            for other in result:
+                if box[0] <= other[2] and other[0] <= box[2] and box[1] <= other[3] and other[1] <= box[3]:
+                    other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                    other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(list(box))
+        boxes = result
+    return boxes
+
+
+def changed_regions(before: np.ndarray, after: np.ndarray, frame_shape: Tuple[int, ...],
+                    pixel_threshold: int = 20, pad: int = 16, min_pixels: int = 2) -> List[Region]:
+    """
+    两张缩略图之间变化的区域，换算为原画面坐标
+
+    变化像素膨胀后按连通域取外接矩形，向外扩展pad像素（缩略图精度有限，且文字边缘需要留白），
+    相交的矩形合并
+
+    Args:
+        before: 变化前的缩略图
+        after: 变化后的缩略图
+        frame_shape: 原画面尺寸
+        pixel_threshold: 灰度差阈值
+        pad: 区域向外扩展的像素数（原画面坐标）
+        min_pixels: 连通域的最少像素数（缩略图），更小的视为噪声
+    """
+    h, w = frame_shape[:2]
+    if before.shape != after.shape:
+        return [(0, 0, w, h)]
+    mask = (cv2.absdiff(before, after) > pixel_threshold).astype(np.uint8)
+    if not mask.any():
+        return []
+    # 膨胀使同一行文字的相邻字符连成一个区域
+    mask = cv2.dilate(mask, np.ones((3, 3), np.uint8), iterations=2)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    sx, sy = w / float(before.shape[1]), h / float(before.shape[0])
+    boxes = [[x * sx - pad, y * sy - pad, (x + bw) * sx + pad, (y + bh) * sy + pad]
+             for x, y, bw, bh, area in stats[1:count] if area >= min_pixels]
+    regions = []
+    for x1, y1, x2, y2 in merge_boxes(boxes):
+        region = (max(int(x1), 0), max(int(y1), 0), min(int(np.ceil(x2)), w), min(int(np.ceil(y2)), h))
+        if region[2] > region[0] and region[3] > region[1]:
+            regions.append(region)
+    return regions
+
+
+class ScreenChange:
+    """
+    一次等待的结果
+
+    - frame / thumbnail: 最后一帧画面及其缩略图
+    - changed: 是否检测到与基准画面不同
+    - settled: 变化后是否已稳定（连续settle_frames帧不再变化）
+    - waited: 等待时间（秒）
+    - frames: 截取的帧数
+    """
+    __slots__ = ('frame', 'thumbnail', 'changed', 'settled', 'waited', 'frames')
+
+    def __init__(self, frame: Optional[np.ndarray], thumbnail: Optional[np.ndarray], changed: bool,
+                 settled: bool, waited: float, frames: int):
+        self.frame = frame
+        self.thumbnail = thumbnail
+        self.changed = changed
+        self.settled = settled
+        self.waited = waited
+        self.frames = frames
+
+    def __repr__(self):
+        return (f"ScreenChange(changed={self.changed}, settled={self.settled}, "
+                f"waited={self.waited:.2f}s, frames={self.frames})")
+
+
+def wait_for_change(capture: Callable[[], Optional[np.ndarray]], baseline: np.ndarray, timeout: float,
+                    settle_timeout: float = None, poll: float = 0.1, settle_frames: int = 2,
+                    change_threshold: float = 0.001, pixel_threshold: int = 20,
+                    max_side: int = 320) -> ScreenChange:
+    """
+    等待画面相对基准缩略图发生变化，再等待变化停止
+
+    Args:
+        capture: 截图函数，返回BGR数组
+        baseline: 基准画面的缩略图（frame_thumbnail）
+        timeout: 等待画面开始变化的最长时间（秒）
+        settle_timeout: 开始变化后等待稳定的最长时间（秒），None表示与timeout相同；超时返回当时的画面
+        poll: 截图间隔（秒）
+        settle_frames: 连续多少帧与上一帧相同视为稳定
+        change_threshold: 变化像素比例超过该值视为画面变化
+        pixel_threshold: 灰度差阈值
+        max_side: 缩略图长边
+    """
+    settle_timeout = timeout if settle_timeout is None else settle_timeout
+    start = time.time()
+    changed_at = None
+    frame = thumbnail = previous = None
+    frames = stable = 0
+    while True:
+        image = capture()
+        now = time.time()
+        if image is not None:
+            frame, thumbnail = image, frame_thumbnail(image, max_side)
+            frames += 1
+            if changed_at is None:
+                if frame_difference(baseline, thumbnail, pixel_threshold) > change_threshold:
+                    changed_at = now
+            elif frame_difference(previous, thumbnail, pixel_threshold) <= change_threshold:
+                stable += 1
+                if stable >= settle_frames:
+                    return ScreenChange(frame, thumbnail, True, True, now - start, frames)
+            else:
+                stable = 0
+            previous = thumbnail
+        if changed_at is None and now - start >= timeout:
+            return ScreenChange(frame, thumbnail, False, False, now - start, frames)
+        if changed_at is not None and now - changed_at >= settle_timeout:
+            return ScreenChange(frame, thumbnail, True, False, now - start, frames)
+        time.sleep(poll)
+
+
+class StabilityGate:
+    """
+    识别前的画面稳定等待
+
+    连续 frames 帧缩略图之间的变化像素比例都不超过 threshold 时才把画面交给识别，最多等待 max_wait 秒
+    （超时仍返回最后一帧）。过渡动画期间的画面不会被识别，避免识别了也匹配不上、一秒后再识别一次。
+    上一次调用的最后一帧在 history 秒内且键（默认为区域）相同时计为第一帧，静止画面上的轮询不需要额外截图
+
+    Args:
+        frames: 连续多少帧不变视为稳定，1表示不等待
+        threshold: 两帧之间变化像素比例的上限
+        max_wait: 最长等待时间（秒）
+        poll: 截图间隔（秒）
+        pixel_threshold: 灰度差阈值
+        max_side: 缩略图长边
+        history: 上一次调用的最后一帧可作为本次第一帧的最长时间（秒），0表示不复用
+    """
+
+    def __init__(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.5, poll: float = 0.1,
+                 pixel_threshold: int = 20, max_side: int = 320, history: float = 1.5):
+        self.frames = max(int(frames), 1)
+        self.threshold = threshold
+        self.max_wait = max_wait
+        self.poll = poll
+        self.pixel_threshold = pixel_threshold
+        self.max_side = max_side
+        self.history = history
+        self._last: Optional[Tuple[Hashable, np.ndarray, float]] = None  # (键, 缩略图, 时间)
+        self._lock = threading.Lock()
+        self.stats = {'checks': 0, 'waits': 0, 'timeouts': 0, 'frames': 0, 'skipped': 0, 'wait_time': 0.0}
+
+    def wait(self, capture: Callable[[], Optional[np.ndarray]], region: Region = None,
+             key: Optional[Hashable] = None) -> Optional[np.ndarray]:
+        """
+        截图直到画面稳定，返回最后一帧（截图失败返回None）
+
+        Args:
+            capture: 截图函数，返回BGR数组
+            region: 只比较画面中的该区域（如规则所在区域），区域外的动画不影响判断，None表示整帧
+            key: 复用上一次最后一帧的键，None表示使用region；capture 已按区域截图时传入该区域作为键，
+                 不必再传region裁剪一次，不同区域的截图也不会互相比较
+        """
+        start = time.time()
+        if key is None:
+            key = region
+        with self._lock:
+            last = self._last
+        previous = None
+        if last is not None and last[0] == key and start - last[2] <= self.history:
+            previous = last[1]
+        stable = 1 if previous is not None else 0
+        frame = None
+        captured = skipped = 0
+        timed_out = False
+        while True:
+            image = capture()
+            now = time.time()
+            if image is None:
+                break
+            frame = image
+            captured += 1
+            thumbnail = frame_thumbnail(crop_frame(image, region), self.max_side)
+            if previous is not None and frame_difference(previous, thumbnail, self.pixel_threshold) > self.threshold:
+                # 画面仍在变化：这一帧即使识别也大概率匹配不上
+                stable = 1
+                skipped += 1
+            else:
+                stable += 1
+            previous = thumbnail
+            if stable >= self.frames:
+                break
+            if now - start >= self.max_wait:
+                timed_out = True
+                break
+            time.sleep(self.poll)
+        waited = time.time() - start
+        with self._lock:
+            self._last = (key, previous, time.time()) if previous is not None else None
+            self.stats['checks'] += 1
+            self.stats['frames'] += captured
+            self.stats['skipped'] += skipped
+            self.stats['timeouts'] += timed_out
+            if skipped or captured > 1:
+                self.stats['waits'] += 1
+                self.stats['wait_time'] += waited
+        return frame
+
+    def reset(self):
+        """丢弃记录的上一帧（如执行了点击等操作后，下一次必须重新确认稳定）"""
+        with self._lock:
+            self._last = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """稳定等待统计：调用次数、需要等待的次数、超时次数、截图帧数、
+        因画面仍在变化而未识别的帧数（skipped）、总等待时间和平均每次调用的等待时间"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['avg_wait'] = stats['wait_time'] / stats['checks'] if stats['checks'] else 0.0
+        return stats
+
+    def __repr__(self):
+        return (f"StabilityGate(frames={self.frames}, threshold={self.threshold}, "
+                f"max_wait={self.max_wait}, poll={self.poll})")
@@ -0,0 +1,47 @@
+"""
+画面变化检测的类型存根文件
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+Region = Tuple[int, int, int, int]
+
+def frame_thumbnail(frame: np.ndarray, max_side: int = 320) -> np.ndarray: ...
+def frame_difference(a: np.ndarray, b: np.ndarray, pixel_threshold: int = 20) -> float: ...
+def merge_boxes(boxes: List[List[float]]) -> List[List[float]]: ...
+def changed_regions(before: np.ndarray, after: np.ndarray, frame_shape: Tuple[int, ...],
+                    pixel_threshold: int = 20, pad: int = 16, min_pixels: int = 2) -> List[Region]: ...
+
+class ScreenChange:
+    frame: Optional[np.ndarray]
+    thumbnail: Optional[np.ndarray]
+    changed: bool
+    settled: bool
+    waited: float
+    frames: int
+
+    def __init__(self, frame: Optional[np.ndarray], thumbnail: Optional[np.ndarray], changed: bool,
+                 settled: bool, waited: float, frames: int) -> None: ...
+
+def wait_for_change(capture: Callable[[], Optional[np.ndarray]], baseline: np.ndarray, timeout: float,
+                    settle_timeout: float = None, poll: float = 0.1, settle_frames: int = 2,
+                    change_threshold: float = 0.001, pixel_threshold: int = 20,
+                    max_side: int = 320) -> ScreenChange: ...
+
+class StabilityGate:
+    frames: int
+    threshold: float
+    max_wait: float
+    poll: float
+    pixel_threshold: int
+    max_side: int
+    history: float
+    stats: Dict[str, float]
+
+    def __init__(self, frames: int = 2, threshold: float = 0.001, max_wait: float = 1.5, poll: float = 0.1,
+                 pixel_threshold: int = 20, max_side: int = 320, history: float = 1.5) -> None: ...
+    def wait(self, capture: Callable[[], Optional[np.ndarray]], region: Region = None,
+             key: Optional[Hashable] = None) -> Optional[np.ndarray]: ...
+    def reset(self) -> None: ...
+    def get_stats(self) -> Dict[str, float]: ...
@@ -0,0 +1,204 @@
+"""
+滚动查找
+在长列表中边滑动边查找文字：用相邻两帧的行特征相关性估计滚动距离，只识别新露出的条带，
+已见文字按内容坐标（屏幕坐标 + 累计滚动距离）去重
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+SCROLL_DIRECTIONS = ('up', 'down')
+
+
+def row_profile(image: np.ndarray) -> np.ndarray:
+    """
+    行特征：每行的平均灰度和水平梯度能量
+
+    Returns:
+        (H, 2) float32，各列已标准化
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray = gray.astype(np.float32)
+    mean = gray.mean(axis=1)
+    energy = np.abs(np.diff(gray, axis=1)).mean(axis=1) if gray.shape[1] > 1 else np.zeros_like(mean)
+    profile = np.stack([mean, energy], axis=1)
+    profile -= profile.mean(axis=0)
+    std = profile.std(axis=0)
+    profile /= np.where(std > 1e-6, std, 1.0)
+    return profile
+
+
+def _overlap_correlation(prev: np.ndarray, cur: np.ndarray, max_shift: int) -> np.ndarray:
+    """
+    每个滚动距离s下两帧重叠部分 prev[s:] 与 cur[:h-s] 的相关系数（各特征列取平均）
+
+    用整段重叠计算而不是只取一小段模板，列表项外观相似时也不容易错位；
+    互相关用np.correlate一次算出全部位移，均值和方差由累加和得到
+    """
+    h = len(prev)
+    shifts = np.arange(max_shift + 1)
+    n = (h - shifts).astype(np.float64)
+    zero = np.zeros((1, prev.shape[1]))
+    prev_sum = np.cumsum(np.vstack([zero, prev]), axis=0)
+    prev_sq = np.cumsum(np.vstack([zero, prev * prev]), axis=0)
+    cur_sum = np.cumsum(np.vstack([zero, cur]), axis=0)
+    cur_sq = np.cumsum(np.vstack([zero, cur * cur]), axis=0)
+    sum_a = prev_sum[h] - prev_sum[shifts]
+    sum_a2 = prev_sq[h] - prev_sq[shifts]
+    sum_b = cur_sum[h - shifts]
+    sum_b2 = cur_sq[h - shifts]
+    # correlate(prev, cur, 'full')[h - 1 + s] = sum_y prev[y + s] * cur[y]
+    sum_ab = np.stack([np.correlate(prev[:, k], cur[:, k], 'full')[h - 1:h + max_shift]
+                       for k in range(prev.shape[1])], axis=1)
+    n = n[:, None]
+    cov = sum_ab - sum_a * sum_b / n
+    var = (sum_a2 - sum_a ** 2 / n) * (sum_b2 - sum_b ** 2 / n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.where(var > 1e-6 * n * n, cov / np.sqrt(np.maximum(var, 1e-12)), np.nan)
+    valid = np.isfinite(corr)
+    count = valid.sum(axis=1)
+    return np.where(count > 0, np.where(valid, corr, 0.0).sum(axis=1) / np.maximum(count, 1), np.nan)
+
+
+def estimate_scroll(prev: np.ndarray, cur: np.ndarray, direction: str = 'up', max_shift: int = None,
+                    expected: float = None, min_overlap: int = 32,
+                    tie_margin: float = 0.01) -> Tuple[Optional[int], float]:
+    """
+    估计两帧之间内容滚动的距离
+
+    Args:
+        prev: 上一帧的行特征（row_profile）
+        cur: 当前帧的行特征
+        direction: 'up' 手指上滑、内容上移（新内容出现在底部），'down' 相反
+        max_shift: 最大滚动距离（像素），默认为高度减去min_overlap
+        expected: 预期滚动距离（滑动距离），相关性接近的多个峰值中优先选择接近该值的（列表项外观相似时避免错位）
+        min_overlap: 两帧至少重叠的行数
+        tie_margin: 相关系数与最高峰相差不超过该值的位置视为同样好的候选
+
+    Returns:
+        (滚动距离, 相关系数)；画面没有可用于估计的纹理时距离为None
+    """
+    if direction not in SCROLL_DIRECTIONS:
+        raise ValueError(f"Unsupported scroll direction: {direction}, expected one of {SCROLL_DIRECTIONS}")
+    if prev.shape != cur.shape:
+        return None, 0.0
+    if direction == 'down':
+        prev, cur = prev[::-1], cur[::-1]
+    h = len(prev)
+    if np.allclose(prev, cur, atol=1e-3):
+        return 0, 1.0
+    max_shift = h - min_overlap if max_shift is None else min(int(max_shift), h - min_overlap)
+    if max_shift <= 0:
+        return None, 0.0
+    scores = _overlap_correlation(prev.astype(np.float64), cur.astype(np.float64), max_shift)
+    if not np.isfinite(scores).any():
+        return None, 0.0
+    scores = np.clip(np.nan_to_num(scores, nan=-1.0), -1.0, 1.0)
+    shift = int(np.argmax(scores))
+    if expected is not None:
+        # 与最高峰几乎一样好的候选中取最接近滑动距离的（最后一次滑动到底时实际距离可能远小于预期，不能强行靠近）
+        candidates = np.flatnonzero(scores >= scores[shift] - tie_margin)
+        shift = int(candidates[np.argmin(np.abs(candidates - expected))])
+    return shift, float(scores[shift])
+
+
+class ScrollIndex:
+    """
+    滚动过程中已见文字的去重索引
+
+    坐标为内容坐标：向上滑动时为屏幕坐标加累计滚动距离。同一文字的中心在内容坐标中相距不超过
+    行高的tolerance倍时视为同一条（列表中重复出现的相同文字按位置区分）
+
+    Args:
+        tolerance: 去重距离（相对文字框高度）
+    """
+
+    def __init__(self, tolerance: float = 0.6):
+        self.tolerance = tolerance
+        self._points: List[np.ndarray] = []
+        self._confidences: List[np.ndarray] = []
+        self._texts: List[np.ndarray] = []
+        self._by_text: Dict[str, List[Tuple[float, float, float]]] = {}  # 文字 -> [(cx, cy, 高度)]
+
+    def add(self, results: OcrResultSet, offset: float) -> OcrResultSet:
+        """
+        加入一批识别结果（屏幕坐标），返回其中未见过的部分（仍为屏幕坐标）
+
+        Args:
+            results: 识别结果
+            offset: 屏幕坐标到内容坐标的纵向偏移
+        """
+        if not results:
+            return results
+        centers = results.centers
+        heights = results.sizes[:, 1]
+        fresh = np.ones(len(results), dtype=bool)
+        for i, text in enumerate(results.texts):
+            cx, cy, h = float(centers[i, 0]), float(centers[i, 1]) + offset, float(heights[i])
+            seen = self._by_text.setdefault(text, [])
+            if any(abs(cy - sy) <= self.tolerance * max(h, sh) and abs(cx - sx) <= max(h, sh) * 2
+                   for sx, sy, sh in seen):
+                fresh[i] = False
+                continue
+            seen.append((cx, cy, h))
+        new = results.take(fresh)
+        if new:
+            self._points.append(new.points + np.asarray([0, offset], dtype=np.float32))
+            self._confidences.append(new.confidences)
+            self._texts.append(new.texts)
+        return new
+
+    def results(self) -> OcrResultSet:
+        """全部已见文字（内容坐标），按从上到下、从左到右排列"""
+        if not self._texts:
+            return OcrResultSet.empty()
+        results = OcrResultSet(np.concatenate(self._points), np.concatenate(self._confidences),
+                               np.concatenate(self._texts))
+        centers = results.centers
+        return results.take(np.lexsort((centers[:, 0], np.round(centers[:, 1] / 8.0))))
+
+    def texts(self) -> List[str]:
+        """全部已见文字，按内容中的阅读顺序"""
+        return self.results().texts.tolist()
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return bool(self._by_text.get(text))
+
+
+class ScrollSearchResult:
+    """
+    滚动查找的结果
+
+    - found: 找到的目标（ocr_find_text 的字典格式，屏幕坐标为停止滚动时的位置），未找到为None
+    - index: 已见文字索引
+    - reached_end: 是否滚动到了列表末端
+    - stats: swipes 滑动次数 / ocr_rows 实际识别的行数 / full_rows 每次都整屏识别所需的行数 / ocr_ratio
+    """
+
+    def __init__(self, index: ScrollIndex):
+        self.found: Optional[Dict] = None
+        self.index = index
+        self.reached_end = False
+        self.stats = {'swipes': 0, 'ocr_rows': 0, 'full_rows': 0, 'fallbacks': 0}
+
+    def texts(self) -> List[str]:
+        return self.index.texts()
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        stats['ocr_ratio'] = stats['ocr_rows'] / stats['full_rows'] if stats['full_rows'] else 0.0
+        return stats
+
+    def __bool__(self) -> bool:
+        return self.found is not None
+
+    def __repr__(self):
+        return (f"ScrollSearchResult(found={self.found['text'] if self.found else None!r}, "
+                f"seen={len(self.index)}, reached_end={self.reached_end}, swipes={self.stats['swipes']})")
@@ -0,0 +1,36 @@
+"""
+滚动查找的类型存根文件
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+SCROLL_DIRECTIONS: Tuple[str, ...]
+
+def row_profile(image: np.ndarray) -> np.ndarray: ...
+def estimate_scroll(prev: np.ndarray, cur: np.ndarray, direction: str = 'up', max_shift: int = None,
+                    expected: float = None, min_overlap: int = 32,
+                    tie_margin: float = 0.01) -> Tuple[Optional[int], float]: ...
+
+class ScrollIndex:
+    tolerance: float
+
+    def __init__(self, tolerance: float = 0.6) -> None: ...
+    def add(self, results: OcrResultSet, offset: float) -> OcrResultSet: ...
+    def results(self) -> OcrResultSet: ...
+    def texts(self) -> List[str]: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, text: str) -> bool: ...
+
+class ScrollSearchResult:
+    found: Optional[Dict]
+    index: ScrollIndex
+    reached_end: bool
+    stats: Dict[str, int]
+
+    def __init__(self, index: ScrollIndex) -> None: ...
+    def texts(self) -> List[str]: ...
+    def get_stats(self) -> Dict[str, float]: ...
+    def __bool__(self) -> bool: ...
@@ -0,0 +1,189 @@
+"""
+OCR结果空间索引
+基于均匀网格，支持"标签右侧的文字"、"表头下方最近的值"、"同一行的所有文字"等锚点相对查询
+每次识别只构建一次索引，多次查询复用
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .ocr_results import OcrResult, OcrResultSet
+
+# 结果数量少于该值时直接向量化全量扫描，不走网格
+_BRUTE_FORCE_LIMIT = 64
+
+# 支持的方向
+DIRECTIONS = ('right', 'left', 'above', 'below', 'row', 'column')
+
+
+class SpatialIndex:
+    """
+    OCR结果的网格空间索引
+
+    Args:
+        results: 一次识别得到的结果集
+        cell_size: 网格边长（像素），None则按文字框高度中位数自动估计
+    """
+
+    def __init__(self, results: OcrResultSet, cell_size: float = None):
+        self.results = results
+        self._bboxes = results.bboxes
+        self._centers = results.centers
+        heights = self._bboxes[:, 3] - self._bboxes[:, 1]
+        if cell_size is None:
+            cell_size = float(np.median(heights)) * 4 if len(results) else 100.0
+        self.cell_size = max(float(cell_size), 1.0)
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        if len(results) > _BRUTE_FORCE_LIMIT:
+            self._build()
+
+    def _build(self):
+        """将每个文字框登记到其覆盖的所有网格"""
+        cells = np.floor(self._bboxes / self.cell_size).astype(np.int64)
+        for i, (gx1, gy1, gx2, gy2) in enumerate(cells.tolist()):
+            for gx in range(gx1, gx2 + 1):
+                for gy in range(gy1, gy2 + 1):
+                    self._cells[(gx, gy)].append(i)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    # ==================== 基础查询 ====================
+
+    def query_rect(self, rect: Tuple[float, float, float, float]) -> np.ndarray:
+        """返回与矩形 (x1, y1, x2, y2) 相交的结果下标（升序）"""
+        if not self._cells:
+            candidates = np.arange(len(self.results))
+        else:
+            gx1, gy1 = int(np.floor(rect[0] / self.cell_size)), int(np.floor(rect[1] / self.cell_size))
+            gx2, gy2 = int(np.floor(rect[2] / self.cell_size)), int(np.floor(rect[3] / self.cell_size))
+            if (gx2 - gx1 + 1) * (gy2 - gy1 + 1) > len(self._cells):
+                # 查询范围比索引本身还大，直接遍历已占用的网格
+                keys = [k for k in self._cells if gx1 <= k[0] <= gx2 and gy1 <= k[1] <= gy2]
+            else:
+                keys = [(gx, gy) for gx in range(gx1, gx2 + 1) for gy in range(gy1, gy2 + 1)]
+            hits = [self._cells[k] for k in keys if k in self._cells]
+            if not hits:
+                return np.zeros(0, dtype=np.int64)
+            candidates = np.unique(np.concatenate(hits))
+        b = self._bboxes[candidates]
+        mask = (b[:, 0] <= rect[2]) & (b[:, 2] >= rect[0]) & (b[:, 1] <= rect[3]) & (b[:, 3] >= rect[1])
+        return candidates[mask]
+
+    def nearest(self, pos: Tuple[float, float], k: int = 1, max_distance: float = None) -> OcrResultSet:
+        """离指定坐标最近的k个结果"""
+        if max_distance is not None:
+            rect = (pos[0] - max_distance, pos[1] - max_distance,
+                    pos[0] + max_distance, pos[1] + max_distance)
+            return self.results.take(self.query_rect(rect)).nearest(pos, k=k, max_distance=max_distance)
+        return self.results.nearest(pos, k=k)
+
+    # ==================== 锚点相对查询 ====================
+
+    def _anchor_bbox(self, anchor: Union[int, OcrResult, Tuple[float, float, float, float]]) -> np.ndarray:
+        if isinstance(anchor, (int, np.integer)):
+            return self._bboxes[int(anchor)]
+        if isinstance(anchor, OcrResult):
+            return np.asarray(anchor.bbox, dtype=np.float32)
+        return np.asarray(anchor, dtype=np.float32)
+
+    @staticmethod
+    def _overlap_ratio(a1: float, a2: float, b1: np.ndarray, b2: np.ndarray) -> np.ndarray:
+        """一维区间重叠长度 / 较短区间长度"""
+        overlap = np.minimum(a2, b2) - np.maximum(a1, b1)
+        shorter = np.maximum(np.minimum(a2 - a1, b2 - b1), 1e-6)
+        return np.clip(overlap, 0, None) / shorter
+
+    def relative(self, anchor, direction: str = 'right', max_distance: float = None,
+                 overlap: float = 0.5) -> OcrResultSet:
+        """
+        锚点相对查询，按与锚点的距离从近到远排序（不含锚点自身）
+
+        Args:
+            anchor: 锚点，可以是结果下标、OcrResult或边界框 (x1, y1, x2, y2)
+            direction: 方向
+                'right' / 'left' - 同一行中位于锚点右侧/左侧的文字
+                'above' / 'below' - 同一列中位于锚点上方/下方的文字
+                'row' - 同一行的所有文字（按x排序）
+                'column' - 同一列的所有文字（按y排序）
+            max_distance: 最大间距（像素），None表示不限制
+            overlap: 同行/同列判定所需的最小重叠比例（相对较短边）
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unsupported direction: {direction}, expected one of {DIRECTIONS}")
+        ax1, ay1, ax2, ay2 = self._anchor_bbox(anchor).tolist()
+        acx, acy = (ax1 + ax2) / 2, (ay1 + ay2) / 2
+        reach = np.inf if max_distance is None else max_distance
+
+        # 先用网格粗筛搜索带内的候选
+        far = 1e9 if max_distance is None else max_distance
+        rect = {
+            'right': (ax2, ay1, ax2 + far, ay2),
+            'left': (ax1 - far, ay1, ax1, ay2),
+            'below': (ax1, ay2, ax2, ay2 + far),
+            'above': (ax1, ay1 - far, ax2, ay1),
+            'row': (acx - far, ay1, acx + far, ay2),
+            'column': (ax1, acy - far, ax2, acy + far),
+        }[direction]
+        candidates = self.query_rect(rect)
+
+        b = self._bboxes[candidates]
+        c = self._centers[candidates]
+        # 排除锚点自身
+        not_self = ~((np.abs(b[:, 0] - ax1) < 1) & (np.abs(b[:, 1] - ay1) < 1) &
+                     (np.abs(b[:, 2] - ax2) < 1) & (np.abs(b[:, 3] - ay2) < 1))
+        row_overlap = self._overlap_ratio(ay1, ay2, b[:, 1], b[:, 3]) >= overlap
+        col_overlap = self._overlap_ratio(ax1, ax2, b[:, 0], b[:, 2]) >= overlap
+
+        if direction == 'right':
+            gap = np.clip(b[:, 0] - ax2, 0, None)
+            mask = row_overlap & (c[:, 0] > ax2) & (gap <= reach)
+            key = gap + 0.1 * np.abs(c[:, 1] - acy)
+        elif direction == 'left':
+            gap = np.clip(ax1 - b[:, 2], 0, None)
+            mask = row_overlap & (c[:, 0] < ax1) & (gap <= reach)
+            key = gap + 0.1 * np.abs(c[:, 1] - acy)
+        elif direction == 'below':
+            gap = np.clip(b[:, 1] - ay2, 0, None)
+            mask = col_overlap & (c[:, 1] > ay2) & (gap <= reach)
+            key = gap + 0.1 * np.abs(c[:, 0] - acx)
+        elif direction == 'above':
+            gap = np.clip(ay1 - b[:, 3], 0, None)
+            mask = col_overlap & (c[:, 1] < ay1) & (gap <= reach)
+            key = gap + 0.1 * np.abs(c[:, 0] - acx)
+        elif direction == 'row':
+            mask = row_overlap & (np.abs(c[:, 0] - acx) <= reach)
+            key = b[:, 0]
+        else:  # column
+            mask = col_overlap & (np.abs(c[:, 1] - acy) <= reach)
+            key = b[:, 1]
+
+        mask &= not_self
+        selected = candidates[mask]
+        return self.results.take(selected[np.argsort(key[mask], kind='stable')])
+
+    def right_of(self, anchor, **kwargs) -> OcrResultSet:
+        """锚点右侧的文字（如"标签: 值"中的值）"""
+        return self.relative(anchor, 'right', **kwargs)
+
+    def left_of(self, anchor, **kwargs) -> OcrResultSet:
+        """锚点左侧的文字"""
+        return self.relative(anchor, 'left', **kwargs)
+
+    def below(self, anchor, **kwargs) -> OcrResultSet:
+        """锚点下方的文字（如表头下方的值）"""
+        return self.relative(anchor, 'below', **kwargs)
+
+    def above(self, anchor, **kwargs) -> OcrResultSet:
+        """锚点上方的文字"""
+        return self.relative(anchor, 'above', **kwargs)
+
+    def row_of(self, anchor, **kwargs) -> OcrResultSet:
+        """与锚点同一行的所有文字（不含锚点，按x排序）"""
+        return self.relative(anchor, 'row', **kwargs)
+
+    def column_of(self, anchor, **kwargs) -> OcrResultSet:
+        """与锚点同一列的所有文字（不含锚点，按y排序）"""
+        return self.relative(anchor, 'column', **kwargs)
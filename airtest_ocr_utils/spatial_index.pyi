@@ -0,0 +1,29 @@
+"""
+OCR结果空间索引的类型存根文件
+"""
+
+from typing import Tuple, Union
+import numpy as np
+
+from .ocr_results import OcrResult, OcrResultSet
+
+DIRECTIONS: Tuple[str, ...]
+
+_Anchor = Union[int, OcrResult, Tuple[float, float, float, float]]
+
+class SpatialIndex:
+    results: OcrResultSet
+    cell_size: float
+
+    def __init__(self, results: OcrResultSet, cell_size: float = None) -> None: ...
+    def __len__(self) -> int: ...
+    def query_rect(self, rect: Tuple[float, float, float, float]) -> np.ndarray: ...
+    def nearest(self, pos: Tuple[float, float], k: int = 1, max_distance: float = None) -> OcrResultSet: ...
+    def relative(self, anchor: _Anchor, direction: str = 'right', max_distance: float = None,
+                 overlap: float = 0.5) -> OcrResultSet: ...
+    def right_of(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
+    def left_of(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
+    def below(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
+    def above(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
+    def row_of(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
+    def column_of(self, anchor: _Anchor, **kwargs) -> OcrResultSet: ...
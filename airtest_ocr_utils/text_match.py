@@ -0,0 +1,238 @@
+"""
+文字匹配
+OCRUtils 与 OcrWatcher 共用的匹配逻辑，支持 exact / contains / startswith / endswith / regex / fuzzy
+fuzzy 模式按目标长度限定允许的错字数（编辑距离），并通过 n-gram 倒排索引预筛候选关键字
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+MATCH_MODES = ('exact', 'contains', 'startswith', 'endswith', 'regex', 'fuzzy')
+
+# 不超过该长度的目标文字，fuzzy 模式只容忍替换错字（不允许多字、少字）
+SHORT_TARGET_LENGTH = 4
+
+# 不超过该长度的目标文字（如按钮"确定"），默认只容忍常见的OCR形近字替换：
+# "确认"、"设定"与"确定"只差一个字，却是另一个按钮
+CONFUSABLE_TARGET_LENGTH = 3
+
+# 常见的OCR形近字（每项中的字两两可互相替换）
+OCR_CONFUSIONS = ["走定", "0OoD", "1lI|", "5S", "8B", "2Z", "6b", "9g", "忖付", "己已巳", "未末", "土士",
+                  "日曰", "人入", "千干", "天夭", "住往", "侍待", "碓确", "拔拨"]
+
+_confusions: Dict[str, Set[str]] = defaultdict(set)
+
+
+def add_ocr_confusions(groups: Sequence[str]):
+    """登记形近字组（如 ["走定"]），短目标的fuzzy匹配容忍组内字的互相替换"""
+    for group in groups:
+        for char in group:
+            _confusions[char].update(c for c in group if c != char)
+
+
+add_ocr_confusions(OCR_CONFUSIONS)
+
+
+def confusable(a: str, b: str) -> bool:
+    """两个字是否为相同的字或已登记的OCR形近字"""
+    return a == b or b in _confusions.get(a, ())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein编辑距离"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def substring_distance(target: str, text: str) -> int:
+    """target 与 text 任意子串之间的最小编辑距离（半全局对齐）"""
+    if not target:
+        return 0
+    # 行：target字符；列：text字符，首行全0表示可以从text任意位置开始
+    previous = [0] * (len(text) + 1)
+    for i, ct in enumerate(target, 1):
+        current = [i]
+        for j, cx in enumerate(text, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ct != cx)))
+        previous = current
+    return min(previous)
+
+
+def fuzzy_max_edits(target: str, max_edits: int = None) -> int:
+    """
+    fuzzy 模式允许的最大错字数
+
+    默认按目标长度：1个字的目标不允许错字，2~4个字允许1个（2~3个字只能是形近字，见 fuzzy_distance），
+    更长的允许 ceil(20%)；指定 max_edits 时使用该值，但至少要有一个字与目标相同
+    """
+    length = len(target)
+    if max_edits is None:
+        max_edits = 0 if length <= 1 else 1 if length <= SHORT_TARGET_LENGTH else math.ceil(0.2 * length)
+    return max(min(int(max_edits), length - 1), 0)
+
+
+def _substitutions(window: str, target: str, confusions_only: bool) -> int:
+    """等长片段与目标逐字比较的错字数；confusions_only 时出现非形近字的替换视为完全不同"""
+    edits = 0
+    for a, b in zip(window, target):
+        if a != b:
+            if confusions_only and not confusable(a, b):
+                return len(target)
+            edits += 1
+    return edits
+
+
+def fuzzy_distance(text: str, target: str, confusions_only: bool = False) -> int:
+    """
+    fuzzy 模式下 text 与 target 的错字数
+
+    短目标（不超过 SHORT_TARGET_LENGTH 个字）只与 text 中等长的片段逐字比较（只计替换），
+    避免"定位"这类只共享一个字的文字靠增删字符匹配上"确定"；text 比短目标还短时视为不匹配。
+    confusions_only 时替换的字必须是登记的OCR形近字，否则视为不匹配（"确认"不是"确定"）。
+    更长的目标按编辑距离计算，text 比 target 长时取最接近的子串
+    """
+    if not target:
+        return 0
+    if len(target) <= SHORT_TARGET_LENGTH:
+        if len(text) < len(target):
+            return len(target)
+        return min(_substitutions(text[i:i + len(target)], target, confusions_only)
+                   for i in range(len(text) - len(target) + 1))
+    if len(text) <= len(target):
+        return edit_distance(text, target)
+    return substring_distance(target, text)
+
+
+def fuzzy_score(text: str, target: str, max_edits: int = None) -> float:
+    """
+    fuzzy 模式的匹配分数：错字数不超过 fuzzy_max_edits 时为 1 - 错字数/目标长度，否则为0.0
+
+    未指定 max_edits 时，不超过 CONFUSABLE_TARGET_LENGTH 个字的目标只容忍形近字替换；
+    显式指定 max_edits 时允许任意字的替换
+    """
+    if not target:
+        return 1.0
+    confusions_only = max_edits is None and len(target) <= CONFUSABLE_TARGET_LENGTH
+    dist = fuzzy_distance(text, target, confusions_only)
+    if dist > fuzzy_max_edits(target, max_edits):
+        return 0.0
+    return 1.0 - dist / float(len(target))
+
+
+def similarity(text: str, target: str) -> float:
+    """
+    模糊相似度（0~1）：target 与 text 中最接近子串的编辑距离归一化
+
+    text 比 target 长时按子串计算，因此"请点击确走按钮"与"确定"的相似度为0.5
+    """
+    if not target:
+        return 1.0
+    if len(text) <= len(target):
+        dist = edit_distance(text, target)
+    else:
+        dist = substring_distance(target, text)
+    return max(0.0, 1.0 - dist / float(len(target)))
+
+
+def match_score(actual_text: str, target_text: str, match_mode: str, max_edits: int = None) -> float:
+    """
+    匹配分数：非fuzzy模式匹配为1.0、不匹配为0.0；fuzzy模式见 fuzzy_score
+    """
+    if match_mode == 'fuzzy':
+        return fuzzy_score(actual_text, target_text, max_edits)
+    return 1.0 if text_match(actual_text, target_text, match_mode) else 0.0
+
+
+def text_match(actual_text: str, target_text: str, match_mode: str, max_edits: int = None) -> bool:
+    """
+    文本匹配
+
+    Args:
+        actual_text: 实际识别的文字
+        target_text: 目标文字
+        match_mode: 匹配模式，未知模式按精确匹配处理
+        max_edits: fuzzy模式允许的最大错字数，None表示按目标长度（见 fuzzy_max_edits）
+    """
+    if match_mode == 'exact':
+        return actual_text == target_text
+    elif match_mode == 'contains':
+        return target_text in actual_text
+    elif match_mode == 'startswith':
+        return actual_text.startswith(target_text)
+    elif match_mode == 'endswith':
+        return actual_text.endswith(target_text)
+    elif match_mode == 'regex':
+        return bool(re.search(target_text, actual_text))
+    elif match_mode == 'fuzzy':
+        return fuzzy_score(actual_text, target_text, max_edits) > 0.0
+    else:
+        return actual_text == target_text  # 默认精确匹配
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """
+    关键字的 n-gram 倒排索引，用于 fuzzy 匹配前预筛候选
+
+    依据 q-gram 引理：若关键字与文本某子串的编辑距离不超过d，
+    则关键字至少有 |grams| - n*d 个不同的n-gram出现在文本中；达不到的关键字无需计算编辑距离
+
+    Args:
+        keywords: 关键字列表
+        max_edits: 允许的最大错字数，None表示按关键字长度（见 fuzzy_max_edits）
+        n: gram长度
+    """
+
+    def __init__(self, keywords: Sequence[str], max_edits: int = None, n: int = 2):
+        self.keywords = list(keywords)
+        self.max_edits = max_edits
+        self.n = n
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._required: List[int] = []
+        self._always: List[int] = []
+        for i, keyword in enumerate(self.keywords):
+            grams = _grams(keyword, n)
+            max_dist = fuzzy_max_edits(keyword, max_edits)
+            required = len(grams) - n * max_dist
+            self._required.append(required)
+            if required <= 0 or len(keyword) < n:
+                # 关键字太短，无法用gram过滤，总是参与比较
+                self._always.append(i)
+                continue
+            for gram in grams:
+                self._postings[gram].append(i)
+
+    def candidates(self, text: str) -> List[int]:
+        """可能与text匹配的关键字下标"""
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in _grams(text, self.n):
+            for i in self._postings.get(gram, ()):
+                counts[i] += 1
+        matched = [i for i, count in counts.items() if count >= self._required[i]]
+        return sorted(matched + self._always)
+
+    def best_match(self, text: str) -> Optional[Tuple[str, float]]:
+        """text 最相似的关键字及匹配分数（见 fuzzy_score），错字数都超出限制时返回None"""
+        best = None
+        for i in self.candidates(text):
+            score = fuzzy_score(text, self.keywords[i], self.max_edits)
+            if score > 0.0 and (best is None or score > best[1]):
+                best = (self.keywords[i], score)
+        return best
+
+    def __len__(self) -> int:
+        return len(self.keywords)
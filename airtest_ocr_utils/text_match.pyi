@@ -0,0 +1,32 @@
+"""
+文字匹配的类型存根文件
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+MATCH_MODES: Tuple[str, ...]
+SHORT_TARGET_LENGTH: int
+CONFUSABLE_TARGET_LENGTH: int
+OCR_CONFUSIONS: List[str]
+
+def add_ocr_confusions(groups: Sequence[str]) -> None: ...
+def confusable(a: str, b: str) -> bool: ...
+
+def edit_distance(a: str, b: str) -> int: ...
+def substring_distance(target: str, text: str) -> int: ...
+def fuzzy_max_edits(target: str, max_edits: int = None) -> int: ...
+def fuzzy_distance(text: str, target: str, confusions_only: bool = False) -> int: ...
+def fuzzy_score(text: str, target: str, max_edits: int = None) -> float: ...
+def similarity(text: str, target: str) -> float: ...
+def match_score(actual_text: str, target_text: str, match_mode: str, max_edits: int = None) -> float: ...
+def text_match(actual_text: str, target_text: str, match_mode: str, max_edits: int = None) -> bool: ...
+
+class NgramIndex:
+    keywords: List[str]
+    max_edits: Optional[int]
+    n: int
+
+    def __init__(self, keywords: Sequence[str], max_edits: int = None, n: int = 2) -> None: ...
+    def candidates(self, text: str) -> List[int]: ...
+    def best_match(self, text: str) -> Optional[Tuple[str, float]]: ...
+    def __len__(self) -> int: ...
@@ -0,0 +1,94 @@
+"""
+文字存在性预筛
+在缩小的灰度图上用形态学梯度（边缘密度）粗略找出可能含文字的区域，
+画面中没有候选区域时（加载页、纯色背景等）直接跳过检测+识别
+"""
+
+import threading
+from typing import Dict
+
+import cv2
+import numpy as np
+
+
+class TextPrefilter:
+    """
+    基于边缘密度的文字预筛器
+
+    判定偏保守：宁可放过无文字画面也不漏掉有文字的画面，视频、游戏等纹理丰富的画面通常仍会进入OCR
+
+    Args:
+        max_side: 预筛时缩小后的最长边（像素）
+        contrast: 梯度阈值，文字笔画与背景的最小灰度差
+        min_height: 候选区域的最小高度（缩小后像素）
+        min_area: 候选区域的最小面积（缩小后像素）
+        min_fill: 候选区域内边缘像素的最小占比
+    """
+
+    def __init__(self, max_side: int = 480, contrast: int = 40, min_height: int = 3,
+                 min_area: int = 16, min_fill: float = 0.15):
+        self.max_side = max_side
+        self.contrast = contrast
+        self.min_height = min_height
+        self.min_area = min_area
+        self.min_fill = min_fill
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self._close_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 3))
+        self._lock = threading.Lock()
+        self.stats = {'checks': 0, 'skips': 0}
+
+    def propose(self, image: np.ndarray) -> np.ndarray:
+        """
+        候选文字区域
+
+        Returns:
+            (N, 4) 原图坐标下的外接矩形 (x1, y1, x2, y2)
+        """
+        if image is None or image.size == 0:
+            return np.zeros((0, 4), dtype=np.float32)
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape[:2]
+        scale = min(self.max_side / float(max(h, w)), 1.0)
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        # 笔画边缘：形态学梯度超过对比度阈值
+        edges = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, self._kernel) >= self.contrast
+        if not edges.any():
+            return np.zeros((0, 4), dtype=np.float32)
+
+        # 水平方向闭运算，把同一行的字符连成文字块
+        mask = edges.astype(np.uint8)
+        blocks = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._close_kernel)
+        count, _, comp_stats, _ = cv2.connectedComponentsWithStats(blocks, connectivity=8)
+        if count <= 1:
+            return np.zeros((0, 4), dtype=np.float32)
+
+        comp_stats = comp_stats[1:]
+        x, y = comp_stats[:, cv2.CC_STAT_LEFT], comp_stats[:, cv2.CC_STAT_TOP]
+        bw, bh = comp_stats[:, cv2.CC_STAT_WIDTH], comp_stats[:, cv2.CC_STAT_HEIGHT]
+        # 每个块内的边缘像素数（积分图）
+        integral = cv2.integral(mask)
+        edge_count = (integral[y + bh, x + bw] - integral[y, x + bw]
+                      - integral[y + bh, x] + integral[y, x])
+        area = bw * bh
+        keep = ((bh >= self.min_height) & (area >= self.min_area) &
+                (edge_count >= self.min_fill * area))
+        boxes = np.stack([x, y, x + bw, y + bh], axis=1)[keep].astype(np.float32)
+        return boxes / scale
+
+    def has_text(self, image: np.ndarray) -> bool:
+        """画面中是否可能有文字，并记录统计"""
+        found = len(self.propose(image)) > 0
+        with self._lock:
+            self.stats['checks'] += 1
+            if not found:
+                self.stats['skips'] += 1
+        return found
+
+    def get_stats(self) -> Dict[str, float]:
+        """预筛统计：检查次数、跳过OCR的次数和跳过率"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['skip_rate'] = stats['skips'] / stats['checks'] if stats['checks'] else 0.0
+        return stats
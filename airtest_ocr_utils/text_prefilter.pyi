@@ -0,0 +1,20 @@
+"""
+文字存在性预筛的类型存根文件
+"""
+
+from typing import Dict
+import numpy as np
+
+class TextPrefilter:
+    max_side: int
+    contrast: int
+    min_height: int
+    min_area: int
+    min_fill: float
+    stats: Dict[str, int]
+
+    def __init__(self, max_side: int = 480, contrast: int = 40, min_height: int = 3,
+                 min_area: int = 16, min_fill: float = 0.15) -> None: ...
+    def propose(self, image: np.ndarray) -> np.ndarray: ...
+    def has_text(self, image: np.ndarray) -> bool: ...
+    def get_stats(self) -> Dict[str, float]: ...
@@ -0,0 +1,224 @@
+"""
+画面文字状态
+逐帧维护屏幕上的文字及其稳定标识：按文字 + 文字框重叠度与上一帧关联，
+产生出现（appeared）/ 消失（disappeared）事件，并记录持续时间，供监控规则按事件触发
+"""
+
+import itertools
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ocr_pipeline import box_iou
+from .ocr_results import OcrResult, OcrResultSet
+from .text_match import similarity
+
+# 规则可订阅的事件
+TEXT_EVENTS = ('appeared', 'disappeared', 'persisted')
+
+
+class TextTrack:
+    """一条被跟踪的文字：稳定标识 + 最近一次的位置"""
+    __slots__ = ('id', 'text', 'points', 'confidence', 'first_seen', 'last_seen', 'hits', 'missed', 'confirmed')
+
+    def __init__(self, track_id: int, text: str, points: np.ndarray, confidence: float, now: float):
+        self.id = track_id
+        self.text = text
+        self.points = points          # (4, 2) 屏幕坐标
+        self.confidence = confidence
+        self.first_seen = now
+        self.last_seen = now
+        self.hits = 1                 # 连续看到的帧数
+        self.missed = 0               # 连续未看到的帧数
+        self.confirmed = False        # 是否已确认出现（发出过appeared事件）
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        return (float(self.points[:, 0].min()), float(self.points[:, 1].min()),
+                float(self.points[:, 0].max()), float(self.points[:, 1].max()))
+
+    def age(self, now: float = None) -> float:
+        """已持续出现的时间（秒）"""
+        return (time.time() if now is None else now) - self.first_seen
+
+    def result(self) -> OcrResult:
+        """最近一次位置的识别结果"""
+        return OcrResultSet(self.points[None], [self.confidence], [self.text]).result(0)
+
+    def __repr__(self):
+        return f"TextTrack(id={self.id}, text={self.text!r}, bbox={self.bbox!r}, age={self.age():.1f}s)"
+
+
+class TextChanges:
+    """一次更新产生的事件"""
+    __slots__ = ('appeared', 'disappeared')
+
+    def __init__(self):
+        self.appeared: List[TextTrack] = []
+        self.disappeared: List[TextTrack] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.appeared or self.disappeared)
+
+    def __repr__(self):
+        return (f"TextChanges(appeared={[t.text for t in self.appeared]}, "
+                f"disappeared={[t.text for t in self.disappeared]})")
+
+
+class TextStateTracker:
+    """
+    逐帧文字状态
+
+    新一帧的识别结果与现有文字按文字框IoU贪心关联：文字相同，或OCR偶发错字（相似度不低于text_similarity）
+    时视为同一条文字，沿用原标识。连续appear_after帧看到才确认出现，连续disappear_after帧未看到才确认消失，
+    避免识别抖动产生成对的出现/消失事件。只有位于本次识别区域内的文字才会被判定为未看到
+
+    Args:
+        iou_threshold: 关联所需的最小IoU
+        text_similarity: 文字不同但相似度不低于该值时仍可关联
+        appear_after: 连续看到多少帧后确认出现
+        disappear_after: 连续多少帧未看到后确认消失
+        history: 保留的已消失文字数量（供查询消失前的位置）
+    """
+
+    def __init__(self, iou_threshold: float = 0.5, text_similarity: float = 0.8, appear_after: int = 1,
+                 disappear_after: int = 2, history: int = 256):
+        self.iou_threshold = iou_threshold
+        self.text_similarity = text_similarity
+        self.appear_after = max(int(appear_after), 1)
+        self.disappear_after = max(int(disappear_after), 1)
+        self.history = history
+        self._tracks: List[TextTrack] = []
+        self._removed: "OrderedDict[int, TextTrack]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self.stats = {'updates': 0, 'appeared': 0, 'disappeared': 0}
+
+    def update(self, results: OcrResultSet, region: Tuple[int, int, int, int] = None,
+               now: float = None) -> TextChanges:
+        """
+        用一帧的识别结果（屏幕坐标）更新状态
+
+        Args:
+            results: 本帧识别结果
+            region: 本次识别的区域，区域外的文字不视为未看到；None表示全屏
+            now: 当前时间
+        """
+        now = time.time() if now is None else now
+        results = OcrResultSet.coerce(results)
+        changes = TextChanges()
+        self.stats['updates'] += 1
+
+        assigned = self._associate(results)
+        matched_tracks = set()
+        for row, track in assigned.items():
+            track.points = results.points[row].copy()
+            track.confidence = float(results.confidences[row])
+            track.last_seen = now
+            track.hits += 1
+            track.missed = 0
+            matched_tracks.add(track.id)
+
+        for row in range(len(results)):
+            if row not in assigned:
+                track = TextTrack(next(self._ids), results.texts[row], results.points[row].copy(),
+                                  float(results.confidences[row]), now)
+                self._tracks.append(track)
+                matched_tracks.add(track.id)
+
+        kept = []
+        for track in self._tracks:
+            if track.id not in matched_tracks and self._observed(track, region):
+                track.hits = 0
+                track.missed += 1
+                if not track.confirmed or track.missed >= self.disappear_after:
+                    # 未确认的文字直接丢弃，不产生事件
+                    if track.confirmed:
+                        changes.disappeared.append(track)
+                        self._remember_removed(track)
+                    continue
+            if not track.confirmed and track.hits >= self.appear_after:
+                track.confirmed = True
+                changes.appeared.append(track)
+            kept.append(track)
+        self._tracks = kept
+        self.stats['appeared'] += len(changes.appeared)
+        self.stats['disappeared'] += len(changes.disappeared)
+        return changes
+
+    def _associate(self, results: OcrResultSet) -> Dict[int, TextTrack]:
+        """本帧结果行号 -> 关联到的现有文字"""
+        if not self._tracks or not results:
+            return {}
+        track_boxes = np.asarray([track.bbox for track in self._tracks], dtype=np.float64)
+        iou = box_iou(track_boxes, results.bboxes.astype(np.float64))
+        track_texts = np.empty(len(self._tracks), dtype=object)
+        track_texts[:] = [track.text for track in self._tracks]
+        same = track_texts[:, None] == results.texts[None, :]
+        candidates = iou >= self.iou_threshold
+        # 位置重叠但文字不同：按相似度判断是否为同一条文字的识别抖动
+        for i, j in np.argwhere(candidates & ~same):
+            if similarity(track_texts[i], results.texts[j]) < self.text_similarity:
+                candidates[i, j] = False
+        # 文字相同的关联优先，其次按IoU从高到低贪心分配
+        score = np.where(candidates, iou + same, -1.0)
+        assigned: Dict[int, TextTrack] = {}
+        used = set()
+        pairs = np.argwhere(candidates)
+        for i, j in pairs[np.argsort(-score[pairs[:, 0], pairs[:, 1]], kind='stable')]:
+            if i in used or j in assigned:
+                continue
+            used.add(i)
+            assigned[int(j)] = self._tracks[i]
+        return assigned
+
+    @staticmethod
+    def _observed(track: TextTrack, region: Optional[Tuple[int, int, int, int]]) -> bool:
+        """文字中心是否在本次识别区域内"""
+        if region is None:
+            return True
+        x1, y1, x2, y2 = track.bbox
+        cx, cy = (x1 + x2) / 2.0, (y1 + y2) / 2.0
+        return region[0] <= cx <= region[2] and region[1] <= cy <= region[3]
+
+    def _remember_removed(self, track: TextTrack):
+        self._removed[track.id] = track
+        while len(self._removed) > self.history:
+            self._removed.popitem(last=False)
+
+    # ==================== 查询 ====================
+
+    def tracks(self) -> List[TextTrack]:
+        """当前屏幕上已确认出现的文字"""
+        return [track for track in self._tracks if track.confirmed]
+
+    def results(self) -> Tuple[OcrResultSet, np.ndarray]:
+        """当前已确认文字的结果集（最近一次位置）及对应的标识数组"""
+        tracks = self.tracks()
+        if not tracks:
+            return OcrResultSet.empty(), np.zeros(0, dtype=np.int64)
+        results = OcrResultSet(np.stack([track.points for track in tracks]),
+                               [track.confidence for track in tracks], [track.text for track in tracks])
+        return results, np.asarray([track.id for track in tracks], dtype=np.int64)
+
+    def get(self, track_id: int) -> Optional[TextTrack]:
+        """按标识查找当前文字"""
+        for track in self._tracks:
+            if track.id == track_id:
+                return track
+        return None
+
+    def removed(self, track_id: int) -> Optional[TextTrack]:
+        """按标识查找已消失的文字（保留最近history条）"""
+        return self._removed.get(track_id)
+
+    def clear(self):
+        self._tracks.clear()
+        self._removed.clear()
+
+    def __len__(self) -> int:
+        return len(self.tracks())
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, tracks=len(self))
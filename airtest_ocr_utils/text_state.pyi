@@ -0,0 +1,53 @@
+"""
+画面文字状态的类型存根文件
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .ocr_results import OcrResult, OcrResultSet
+
+TEXT_EVENTS: Tuple[str, ...]
+
+class TextTrack:
+    id: int
+    text: str
+    points: np.ndarray
+    confidence: float
+    first_seen: float
+    last_seen: float
+    hits: int
+    missed: int
+    confirmed: bool
+
+    def __init__(self, track_id: int, text: str, points: np.ndarray, confidence: float, now: float) -> None: ...
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]: ...
+    def age(self, now: float = None) -> float: ...
+    def result(self) -> OcrResult: ...
+
+class TextChanges:
+    appeared: List[TextTrack]
+    disappeared: List[TextTrack]
+
+    def __bool__(self) -> bool: ...
+
+class TextStateTracker:
+    iou_threshold: float
+    text_similarity: float
+    appear_after: int
+    disappear_after: int
+    history: int
+    stats: Dict[str, int]
+
+    def __init__(self, iou_threshold: float = 0.5, text_similarity: float = 0.8, appear_after: int = 1,
+                 disappear_after: int = 2, history: int = 256) -> None: ...
+    def update(self, results: OcrResultSet, region: Tuple[int, int, int, int] = None,
+               now: float = None) -> TextChanges: ...
+    def tracks(self) -> List[TextTrack]: ...
+    def results(self) -> Tuple[OcrResultSet, np.ndarray]: ...
+    def get(self, track_id: int) -> Optional[TextTrack]: ...
+    def removed(self, track_id: int) -> Optional[TextTrack]: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+    def get_stats(self) -> Dict[str, int]: ...
@@ -0,0 +1,149 @@
+"""
+文字位置跟踪
+OCR找到文字后保存其图像块，后续在上次位置附近用模板匹配重新定位，匹配分数不足时才回退到OCR
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def _to_gray(frame: np.ndarray) -> np.ndarray:
+    if frame.ndim == 2:
+        return frame
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+class TrackedText:
+    """一个被跟踪的文字：图像块 + 最近一次的位置（屏幕坐标）"""
+    __slots__ = ('patch', 'bbox', 'score', 'hits', 'last_seen')
+
+    def __init__(self, patch: np.ndarray, bbox: Tuple[int, int, int, int]):
+        self.patch = patch      # 灰度图像块
+        self.bbox = bbox        # (x1, y1, x2, y2)
+        self.score = 1.0        # 最近一次匹配分数
+        self.hits = 0           # 模板匹配命中次数
+        self.last_seen = time.time()
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return ((self.bbox[0] + self.bbox[2]) / 2.0, (self.bbox[1] + self.bbox[3]) / 2.0)
+
+
+class TextTracker:
+    """
+    基于模板匹配的文字跟踪器
+
+    Args:
+        match_threshold: 模板匹配最低分数（TM_CCOEFF_NORMED），低于该值视为丢失
+        search_margin: 搜索窗口在上次位置基础上向外扩展的像素数，None则按文字框尺寸自动计算
+        max_age: 跟踪记录的最长有效期（秒），超时后重新OCR
+        min_patch_std: 图像块灰度标准差下限，过于平坦的图像块无法可靠匹配，不做跟踪
+    """
+
+    def __init__(self, match_threshold: float = 0.9, search_margin: int = None,
+                 max_age: float = 60.0, min_patch_std: float = 8.0):
+        self.match_threshold = match_threshold
+        self.search_margin = search_margin
+        self.max_age = max_age
+        self.min_patch_std = min_patch_std
+        self._tracks: Dict[Hashable, TrackedText] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'remembered': 0}
+
+    def remember(self, key: Hashable, frame: np.ndarray, bbox, offset: Tuple[int, int] = (0, 0)) -> bool:
+        """
+        记录OCR定位到的文字
+
+        Args:
+            key: 跟踪键，如 (文字, 匹配模式, 区域)
+            frame: 识别所用的图片（BGR或灰度）
+            bbox: 文字框 (x1, y1, x2, y2)，屏幕坐标
+            offset: frame左上角对应的屏幕坐标
+
+        Returns:
+            是否成功记录
+        """
+        h, w = frame.shape[:2]
+        x1 = int(max(bbox[0] - offset[0], 0))
+        y1 = int(max(bbox[1] - offset[1], 0))
+        x2 = int(min(bbox[2] - offset[0], w))
+        y2 = int(min(bbox[3] - offset[1], h))
+        if x2 - x1 < 4 or y2 - y1 < 4:
+            return False
+        patch = _to_gray(frame[y1:y2, x1:x2]).copy()
+        if float(patch.std()) < self.min_patch_std:
+            return False
+        with self._lock:
+            self._tracks[key] = TrackedText(patch, (x1 + offset[0], y1 + offset[1], x2 + offset[0], y2 + offset[1]))
+            self.stats['remembered'] += 1
+        return True
+
+    def relocate(self, key: Hashable, frame: np.ndarray,
+                 offset: Tuple[int, int] = (0, 0)) -> Optional[Tuple[float, float]]:
+        """
+        在新画面中重新定位文字
+
+        Returns:
+            文字中心的屏幕坐标，匹配失败返回None（并清除该跟踪记录）
+        """
+        with self._lock:
+            track = self._tracks.get(key)
+        if track is None:
+            return None
+        if time.time() - track.last_seen > self.max_age:
+            self.forget(key)
+            return None
+
+        ph, pw = track.patch.shape[:2]
+        margin = self.search_margin if self.search_margin is not None else max(2 * ph, pw // 2, 20)
+        h, w = frame.shape[:2]
+        wx1 = int(max(track.bbox[0] - offset[0] - margin, 0))
+        wy1 = int(max(track.bbox[1] - offset[1] - margin, 0))
+        wx2 = int(min(track.bbox[2] - offset[0] + margin, w))
+        wy2 = int(min(track.bbox[3] - offset[1] + margin, h))
+        if wx2 - wx1 < pw or wy2 - wy1 < ph:
+            self._miss(key)
+            return None
+
+        window = _to_gray(frame[wy1:wy2, wx1:wx2])
+        scores = cv2.matchTemplate(window, track.patch, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(scores)
+        if score < self.match_threshold:
+            self._miss(key)
+            return None
+
+        x1, y1 = wx1 + loc[0] + offset[0], wy1 + loc[1] + offset[1]
+        with self._lock:
+            track.bbox = (x1, y1, x1 + pw, y1 + ph)
+            track.score = float(score)
+            track.hits += 1
+            track.last_seen = time.time()
+            self.stats['hits'] += 1
+        return track.center
+
+    def _miss(self, key: Hashable):
+        with self._lock:
+            self._tracks.pop(key, None)
+            self.stats['misses'] += 1
+
+    def get(self, key: Hashable) -> Optional[TrackedText]:
+        """获取跟踪记录"""
+        with self._lock:
+            return self._tracks.get(key)
+
+    def forget(self, key: Hashable):
+        """删除跟踪记录"""
+        with self._lock:
+            self._tracks.pop(key, None)
+
+    def clear(self):
+        """清空所有跟踪记录"""
+        with self._lock:
+            self._tracks.clear()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
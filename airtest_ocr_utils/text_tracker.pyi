@@ -0,0 +1,34 @@
+"""
+文字位置跟踪的类型存根文件
+"""
+
+from typing import Dict, Hashable, Optional, Tuple
+import numpy as np
+
+class TrackedText:
+    patch: np.ndarray
+    bbox: Tuple[int, int, int, int]
+    score: float
+    hits: int
+    last_seen: float
+
+    def __init__(self, patch: np.ndarray, bbox: Tuple[int, int, int, int]) -> None: ...
+    @property
+    def center(self) -> Tuple[float, float]: ...
+
+class TextTracker:
+    match_threshold: float
+    search_margin: Optional[int]
+    max_age: float
+    min_patch_std: float
+    stats: Dict[str, int]
+
+    def __init__(self, match_threshold: float = 0.9, search_margin: int = None,
+                 max_age: float = 60.0, min_patch_std: float = 8.0) -> None: ...
+    def remember(self, key: Hashable, frame: np.ndarray, bbox, offset: Tuple[int, int] = (0, 0)) -> bool: ...
+    def relocate(self, key: Hashable, frame: np.ndarray,
+                 offset: Tuple[int, int] = (0, 0)) -> Optional[Tuple[float, float]]: ...
+    def get(self, key: Hashable) -> Optional[TrackedText]: ...
+    def forget(self, key: Hashable) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
@@ -0,0 +1,272 @@
+"""
+分块识别
+超大画面（4K、多显示器桌面）切成相互重叠的图块并发识别，避免检测器整图缩小丢失小字；
+各图块的结果用向量化的非极大值抑制去重，并把被图块边界截断的同一行文字拼接回完整的一行
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+
+class TilePolicy:
+    """
+    分块策略
+
+    Args:
+        tile_size: 图块边长（像素）
+        overlap: 相邻图块的重叠宽度（像素），应大于最大的文字行高，保证被横向边界截断的文字完整出现在相邻图块中
+        min_side: 画面最长边超过该值时才分块
+        iou_threshold: 去重时两个文字框的交并比阈值
+        contain_threshold: 去重时较小文字框被覆盖的比例阈值（截断的碎片落在完整文字框内）
+        edge_margin: 文字框距图块内部边界小于该值（像素）时视为被截断
+    """
+
+    def __init__(self, tile_size: int = 1280, overlap: int = 160, min_side: int = 2000,
+                 iou_threshold: float = 0.5, contain_threshold: float = 0.8, edge_margin: int = 4):
+        self.tile_size = int(tile_size)
+        self.overlap = min(int(overlap), self.tile_size // 2)
+        self.min_side = int(min_side)
+        self.iou_threshold = float(iou_threshold)
+        self.contain_threshold = float(contain_threshold)
+        self.edge_margin = int(edge_margin)
+
+    def applies_to(self, shape: Tuple[int, ...]) -> bool:
+        """该尺寸的画面是否需要分块"""
+        return max(shape[0], shape[1]) > max(self.min_side, self.tile_size)
+
+    def to_dict(self) -> Dict:
+        return {'tile_size': self.tile_size, 'overlap': self.overlap, 'min_side': self.min_side,
+                'iou_threshold': self.iou_threshold, 'contain_threshold': self.contain_threshold,
+                'edge_margin': self.edge_margin}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TilePolicy":
+        return cls(**data)
+
+    def __repr__(self):
+        return f"TilePolicy(tile_size={self.tile_size}, overlap={self.overlap}, min_side={self.min_side})"
+
+
+# ==================== 切块 ====================
+
+def _axis_starts(length: int, tile: int, overlap: int) -> np.ndarray:
+    if length <= tile:
+        return np.zeros(1, dtype=np.int64)
+    count = int(np.ceil((length - overlap) / float(tile - overlap)))
+    return np.round(np.linspace(0, length - tile, count)).astype(np.int64)
+
+
+def tile_grid(shape: Tuple[int, ...], tile_size: int, overlap: int) -> np.ndarray:
+    """
+    切块网格
+
+    Returns:
+        (N, 4) 图块 (x1, y1, x2, y2)，按行优先排列，相邻图块至少重叠overlap像素
+    """
+    h, w = shape[:2]
+    xs = _axis_starts(w, tile_size, overlap)
+    ys = _axis_starts(h, tile_size, overlap)
+    gy, gx = np.meshgrid(ys, xs, indexing='ij')
+    x1, y1 = gx.ravel(), gy.ravel()
+    return np.stack([x1, y1, np.minimum(x1 + tile_size, w), np.minimum(y1 + tile_size, h)], axis=1)
+
+
+# ==================== 去重 ====================
+
+def box_nms(bboxes: np.ndarray, priority: np.ndarray, iou_threshold: float = 0.5,
+            contain_threshold: float = 0.8) -> np.ndarray:
+    """
+    非极大值抑制：按priority从高到低保留文字框，抑制与已保留框交并比或被覆盖比例超过阈值的框
+
+    Args:
+        bboxes: (N, 4) 外接矩形
+        priority: (N,) 优先级，越大越优先
+        iou_threshold: 交并比阈值
+        contain_threshold: 交集占较小框面积的比例阈值
+
+    Returns:
+        保留的下标（按优先级降序）
+    """
+    if len(bboxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    bboxes = np.asarray(bboxes, dtype=np.float64)
+    areas = np.maximum(bboxes[:, 2] - bboxes[:, 0], 0) * np.maximum(bboxes[:, 3] - bboxes[:, 1], 0)
+    order = np.argsort(-np.asarray(priority, dtype=np.float64), kind='stable')
+    keep = []
+    while order.size:
+        i, rest = order[0], order[1:]
+        keep.append(i)
+        # 当前框与其余所有框的交集，一次向量化计算
+        iw = np.clip(np.minimum(bboxes[i, 2], bboxes[rest, 2]) - np.maximum(bboxes[i, 0], bboxes[rest, 0]), 0, None)
+        ih = np.clip(np.minimum(bboxes[i, 3], bboxes[rest, 3]) - np.maximum(bboxes[i, 1], bboxes[rest, 1]), 0, None)
+        inter = iw * ih
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-6)
+        contain = inter / np.maximum(np.minimum(areas[i], areas[rest]), 1e-6)
+        order = rest[(iou < iou_threshold) & (contain < contain_threshold)]
+    return np.asarray(keep, dtype=np.int64)
+
+
+# ==================== 跨图块拼接 ====================
+
+def _join_text(left: str, right: str, overlap_chars: int) -> str:
+    """拼接同一行的左右两段：重叠区内的文字两段都识别到了，去掉右段开头的重复部分"""
+    if overlap_chars <= 0:
+        return left + right
+    # 优先按文字本身的重叠（左段后缀 == 右段前缀），长度需与重叠宽度估计相符
+    for k in range(min(len(left), len(right), overlap_chars + 2), 0, -1):
+        if left.endswith(right[:k]):
+            return left + right[k:]
+    return left + right[min(overlap_chars, len(right)):]
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def join_cut_lines(results: OcrResultSet, cut: np.ndarray, line_overlap: float = 0.6,
+                   max_gap: float = 0.5) -> OcrResultSet:
+    """
+    拼接被图块纵向边界截断的文字行
+
+    Args:
+        results: 去重后的结果（全图坐标）
+        cut: (N,) 是否被图块边界截断
+        line_overlap: 两段垂直方向重叠占较矮一段高度的最小比例（同一行）
+        max_gap: 两段之间允许的最大水平间隙（相对行高）
+    """
+    idx = np.flatnonzero(cut)
+    if len(idx) < 2:
+        return results
+    b = results.bboxes[idx].astype(np.float64)
+    heights = np.maximum(b[:, 3] - b[:, 1], 1.0)
+
+    # 两两判断是否为同一行中左右相接的两段（矩阵运算）
+    v_inter = np.clip(np.minimum(b[:, None, 3], b[None, :, 3]) - np.maximum(b[:, None, 1], b[None, :, 1]), 0, None)
+    same_line = v_inter >= line_overlap * np.minimum(heights[:, None], heights[None, :])
+    right_of = b[None, :, 0] > b[:, None, 0]
+    adjacent = b[None, :, 0] <= b[:, None, 2] + max_gap * np.minimum(heights[:, None], heights[None, :])
+    pairs = np.argwhere(same_line & right_of & adjacent)
+    if len(pairs) == 0:
+        return results
+
+    parent = list(range(len(idx)))
+    for i, j in pairs:
+        parent[_find(parent, j)] = _find(parent, i)
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(idx)):
+        groups.setdefault(_find(parent, i), []).append(i)
+
+    texts = results.texts.tolist()
+    confidences = results.confidences
+    drop = np.zeros(len(results), dtype=bool)
+    merged_points, merged_conf, merged_texts = [], [], []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda m: b[m, 0])
+        text, right_edge = texts[idx[members[0]]], b[members[0], 2]
+        for m in members[1:]:
+            width = max(b[m, 2] - b[m, 0], 1.0)
+            overlap_px = right_edge - b[m, 0]
+            segment = texts[idx[m]]
+            text = _join_text(text, segment, int(round(len(segment) * overlap_px / width)))
+            right_edge = max(right_edge, b[m, 2])
+        box = b[members]
+        x1, y1, x2, y2 = box[:, 0].min(), box[:, 1].min(), box[:, 2].max(), box[:, 3].max()
+        weights = np.asarray([max(len(texts[idx[m]]), 1) for m in members], dtype=np.float64)
+        merged_points.append([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+        merged_conf.append(float(np.average(confidences[idx[members]], weights=weights)))
+        merged_texts.append(text)
+        drop[idx[members]] = True
+    if not merged_texts:
+        return results
+    merged = OcrResultSet(np.asarray(merged_points, dtype=np.float32), merged_conf, merged_texts)
+    return OcrResultSet.concat([results.take(~drop), merged])
+
+
+# ==================== 分块识别 ====================
+
+def merge_tile_results(tile_results: Sequence[OcrResultSet], tiles: np.ndarray, shape: Tuple[int, ...],
+                       policy: TilePolicy) -> OcrResultSet:
+    """
+    合并各图块的识别结果
+
+    Args:
+        tile_results: 各图块的结果（图块内坐标）
+        tiles: (N, 4) 图块
+        shape: 整图尺寸
+        policy: 分块策略
+    """
+    h, w = shape[:2]
+    sets, cut_flags = [], []
+    for results, (x1, y1, x2, y2) in zip(tile_results, tiles):
+        if not results:
+            continue
+        results = results.offset(int(x1), int(y1))
+        b = results.bboxes
+        m = policy.edge_margin
+        # 贴着图块内部边界（非整图边界）的文字框可能被截断
+        cut = (((x1 > 0) & (b[:, 0] <= x1 + m)) | ((x2 < w) & (b[:, 2] >= x2 - m)) |
+               ((y1 > 0) & (b[:, 1] <= y1 + m)) | ((y2 < h) & (b[:, 3] >= y2 - m)))
+        sets.append(results)
+        cut_flags.append(cut)
+    if not sets:
+        return OcrResultSet.empty()
+    results = OcrResultSet.concat(sets)
+    cut = np.concatenate(cut_flags)
+
+    # 完整的文字框优先于截断的碎片，其次按面积、置信度
+    sizes = results.sizes
+    area = sizes[:, 0].astype(np.float64) * sizes[:, 1]
+    area_rank = area / max(float(area.max()), 1.0)
+    priority = (~cut).astype(np.float64) * 4 + area_rank * 2 + results.confidences
+    keep = box_nms(results.bboxes, priority, policy.iou_threshold, policy.contain_threshold)
+    keep.sort()
+    results = join_cut_lines(results.take(keep), cut[keep])
+    order = _reading_order(results)
+    return results.take(order)
+
+
+def _reading_order(results: OcrResultSet) -> np.ndarray:
+    """从上到下、从左到右的下标顺序（规则同 sort_boxes）"""
+    points = results.points
+    order = np.lexsort((points[:, 0, 0], points[:, 0, 1]))
+    for i in range(len(order) - 1):
+        for j in range(i, -1, -1):
+            upper, lower = points[order[j], 0], points[order[j + 1], 0]
+            if abs(lower[1] - upper[1]) < 10 and lower[0] < upper[0]:
+                order[[j, j + 1]] = order[[j + 1, j]]
+            else:
+                break
+    return order
+
+
+def recognize_tiled(image: np.ndarray, recognize: Callable[[np.ndarray], OcrResultSet],
+                    policy: TilePolicy, max_workers: int = 1) -> OcrResultSet:
+    """
+    分块并发识别整张画面
+
+    Args:
+        image: BGR画面
+        recognize: 识别单个图块的函数，返回图块内坐标的结果；并发调用时需线程安全（如每次从引擎池借用引擎）
+        policy: 分块策略
+        max_workers: 并发识别的图块数
+
+    Returns:
+        整图坐标的结果集，按阅读顺序排列
+    """
+    tiles = tile_grid(image.shape, policy.tile_size, policy.overlap)
+    crops = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+    if max_workers <= 1 or len(crops) == 1:
+        tile_results = [recognize(crop) for crop in crops]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(crops)), thread_name_prefix="OcrTile") as executor:
+            tile_results = list(executor.map(recognize, crops))
+    return merge_tile_results(tile_results, tiles, image.shape, policy)
@@ -0,0 +1,33 @@
+"""
+分块识别的类型存根文件
+"""
+
+from typing import Callable, Dict, Sequence, Tuple
+import numpy as np
+
+from .ocr_results import OcrResultSet
+
+class TilePolicy:
+    tile_size: int
+    overlap: int
+    min_side: int
+    iou_threshold: float
+    contain_threshold: float
+    edge_margin: int
+
+    def __init__(self, tile_size: int = 1280, overlap: int = 160, min_side: int = 2000,
+                 iou_threshold: float = 0.5, contain_threshold: float = 0.8, edge_margin: int = 4) -> None: ...
+    def applies_to(self, shape: Tuple[int, ...]) -> bool: ...
+    def to_dict(self) -> Dict: ...
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TilePolicy": ...
+
+def tile_grid(shape: Tuple[int, ...], tile_size: int, overlap: int) -> np.ndarray: ...
+def box_nms(bboxes: np.ndarray, priority: np.ndarray, iou_threshold: float = 0.5,
+            contain_threshold: float = 0.8) -> np.ndarray: ...
+def join_cut_lines(results: OcrResultSet, cut: np.ndarray, line_overlap: float = 0.6,
+                   max_gap: float = 0.5) -> OcrResultSet: ...
+def merge_tile_results(tile_results: Sequence[OcrResultSet], tiles: np.ndarray, shape: Tuple[int, ...],
+                       policy: TilePolicy) -> OcrResultSet: ...
+def recognize_tiled(image: np.ndarray, recognize: Callable[[np.ndarray], OcrResultSet],
+                    policy: TilePolicy, max_workers: int = 1) -> OcrResultSet: ...
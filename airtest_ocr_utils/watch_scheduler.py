@@ -0,0 +1,125 @@
+"""
+监控节奏调节
+OcrWatcher 按规则各自的轮询间隔调度，本模块根据画面变化率和CPU预算动态放慢节奏，
+避免监控线程在共享机器上抢占被测应用的CPU
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+
+def union_region(regions: Sequence[Optional[Tuple[int, int, int, int]]]) -> Optional[Tuple[int, int, int, int]]:
+    """多个区域的外接矩形；任一区域为None（全屏）时返回None"""
+    if not regions or any(r is None for r in regions):
+        return None
+    return (min(r[0] for r in regions), min(r[1] for r in regions),
+            max(r[2] for r in regions), max(r[3] for r in regions))
+
+
+class WatchGovernor:
+    """
+    监控节奏调节器
+
+    - 变化率：每次检测记录画面签名是否变化（EWMA），画面长时间不变时按比例放大规则的轮询间隔，
+      最多放大到 max_backoff 倍，画面一变化立即恢复
+    - CPU预算：记录每轮检测消耗的监控线程CPU时间（EWMA），保证 CPU时间 / (检测耗时 + 间隔) 不超过预算，
+      预算按单核计算，如0.25表示最多占用四分之一个核。只计监控线程本身（推理库已限制为单线程），
+      同一进程中前台的 ocr_utils 识别和回调线程的CPU不计入，前台繁忙时不会拖慢监控
+
+    Args:
+        cpu_budget: CPU预算（单核比例），None表示不限制
+        max_backoff: 画面静止时轮询间隔的最大放大倍数，1表示不根据变化率调节
+        smoothing: EWMA平滑系数（0~1），越大越快跟随最新观测
+    """
+
+    def __init__(self, cpu_budget: float = None, max_backoff: float = 1.0, smoothing: float = 0.2):
+        self.cpu_budget = cpu_budget
+        self.max_backoff = max(float(max_backoff), 1.0)
+        self.smoothing = smoothing
+        self.cpu_cost = 0.0       # 每轮检测CPU耗时（秒，EWMA）
+        self.wall_cost = 0.0      # 每轮检测墙钟耗时（秒，EWMA）
+        self.change_rate = 1.0    # 画面变化率（EWMA）
+        self._last_signature = None
+        self._next_allowed = 0.0
+        self._started = time.time()
+        self._lock = threading.Lock()
+        self.stats = {'cycles': 0, 'cpu_time': 0.0, 'throttled': 0}
+
+    @property
+    def tracks_changes(self) -> bool:
+        """是否需要画面签名来估计变化率"""
+        return self.max_backoff > 1.0
+
+    def begin(self) -> Tuple[float, float]:
+        """一轮检测开始，返回计时起点（须与 end 在同一线程调用）"""
+        return time.thread_time(), time.time()
+
+    def end(self, start: Tuple[float, float]):
+        """一轮检测结束，更新耗时估计并计算下一轮最早开始时间"""
+        cpu = max(time.thread_time() - start[0], 0.0)
+        now = time.time()
+        wall = max(now - start[1], 0.0)
+        a = self.smoothing
+        with self._lock:
+            if self.stats['cycles'] == 0:
+                self.cpu_cost, self.wall_cost = cpu, wall
+            else:
+                self.cpu_cost = a * cpu + (1 - a) * self.cpu_cost
+                self.wall_cost = a * wall + (1 - a) * self.wall_cost
+            self.stats['cycles'] += 1
+            self.stats['cpu_time'] += cpu
+            self._next_allowed = now + self.min_gap()
+
+    def observe(self, signature: Optional[str]) -> bool:
+        """记录本轮画面签名，返回画面是否变化"""
+        if signature is None:
+            return True
+        with self._lock:
+            changed = signature != self._last_signature
+            self._last_signature = signature
+            self.change_rate = self.smoothing * changed + (1 - self.smoothing) * self.change_rate
+        return changed
+
+    def min_gap(self) -> float:
+        """满足CPU预算所需的两轮检测之间的最小间隔（秒）"""
+        if not self.cpu_budget:
+            return 0.0
+        return max(self.cpu_cost / self.cpu_budget - self.wall_cost, 0.0)
+
+    def backoff(self) -> float:
+        """当前轮询间隔放大倍数：变化率越低放大越多"""
+        return 1.0 + (self.max_backoff - 1.0) * (1.0 - self.change_rate)
+
+    def interval_for(self, base_interval: float) -> float:
+        """规则的实际轮询间隔"""
+        return base_interval * self.backoff()
+
+    def delay(self, now: float = None) -> float:
+        """距离CPU预算允许的下一轮检测还需等待的时间（秒）"""
+        now = time.time() if now is None else now
+        return max(self._next_allowed - now, 0.0)
+
+    def throttle(self, wait: float, now: float = None) -> float:
+        """在计划等待时间的基础上应用CPU预算，必要时记录一次限流"""
+        budget_wait = self.delay(now)
+        if budget_wait > wait:
+            with self._lock:
+                self.stats['throttled'] += 1
+            return budget_wait
+        return wait
+
+    def get_stats(self) -> Dict[str, float]:
+        """调节器统计：平均CPU占用、每轮耗时、变化率、当前放大倍数等"""
+        with self._lock:
+            stats = dict(self.stats)
+            elapsed = max(time.time() - self._started, 1e-6)
+            stats.update({
+                'cpu_usage': stats['cpu_time'] / elapsed,
+                'cpu_per_cycle': self.cpu_cost,
+                'wall_per_cycle': self.wall_cost,
+                'change_rate': self.change_rate,
+                'backoff': self.backoff(),
+                'min_gap': self.min_gap(),
+            })
+        return stats
@@ -0,0 +1,29 @@
+"""
+监控节奏调节的类型存根文件
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+def union_region(regions: Sequence[Optional[Tuple[int, int, int, int]]]) -> Optional[Tuple[int, int, int, int]]: ...
+
+class WatchGovernor:
+    cpu_budget: Optional[float]
+    max_backoff: float
+    smoothing: float
+    cpu_cost: float
+    wall_cost: float
+    change_rate: float
+    stats: Dict[str, float]
+
+    def __init__(self, cpu_budget: float = None, max_backoff: float = 1.0, smoothing: float = 0.2) -> None: ...
+    @property
+    def tracks_changes(self) -> bool: ...
+    def begin(self) -> Tuple[float, float]: ...
+    def end(self, start: Tuple[float, float]) -> None: ...
+    def observe(self, signature: Optional[str]) -> bool: ...
+    def min_gap(self) -> float: ...
+    def backoff(self) -> float: ...
+    def interval_for(self, base_interval: float) -> float: ...
+    def delay(self, now: float = None) -> float: ...
+    def throttle(self, wait: float, now: float = None) -> float: ...
+    def get_stats(self) -> Dict[str, float]: ...
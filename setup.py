@@ -17,6 +17,12 @@ setup(
         "Pillow>=8.0.0",
         "numpy==1.24.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "airtest-ocr-batch = airtest_ocr_utils.batch:main",
+            "airtest-ocr-server = airtest_ocr_utils.ocr_server:main",
+        ],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,71 @@
+"""测试公用的桩设备和不加载模型的 OCRUtils"""
+
+import importlib
+
+import numpy as np
+import pytest
+from airtest.core.helper import G
+
+from airtest_ocr_utils.ocr_results import OcrResultSet
+
+
+def make_results(*items):
+    """由 (文字, (x1, y1, x2, y2)) 构造结果集"""
+    if not items:
+        return OcrResultSet.empty()
+    points = np.array([[[x1, y1], [x2, y1], [x2, y2], [x1, y2]] for _, (x1, y1, x2, y2) in items], np.float32)
+    return OcrResultSet(points, [0.95] * len(items), [text for text, _ in items])
+
+
+class StubScreen:
+    """
+    桩设备：pages 为 {页面名: 结果集}，每个页面渲染为不同灰度的画面；
+    touch 按 transitions 切换页面，recognize 按画面灰度返回对应页面的结果
+    """
+
+    def __init__(self, pages, start, transitions=None, shape=(200, 300)):
+        self.pages = dict(pages)
+        self.names = list(self.pages)
+        self.page = start
+        self.transitions = dict(transitions or {})
+        self.shape = shape
+        self.snapshots = 0
+        self.recognitions = 0
+        self.touches = []
+
+    def snapshot(self, *args, **kwargs):
+        self.snapshots += 1
+        return np.full(self.shape + (3,), 40 + 20 * self.names.index(self.page), np.uint8)
+
+    def touch(self, pos, *args, **kwargs):
+        self.touches.append(tuple(pos))
+        self.page = self.transitions.get(self.page, self.page)
+
+    def recognize(self, image, region=None):
+        self.recognitions += 1
+        page = self.names[(int(image.reshape(-1)[0]) - 40) // 20]
+        results = self.pages[page]
+        return results.in_region(region) if region is not None else results
+
+
+@pytest.fixture
+def ocr_module():
+    """airtest_ocr_utils.ocr_utils 模块（包属性同名的是全局实例）"""
+    return importlib.import_module("airtest_ocr_utils.ocr_utils")
+
+
+@pytest.fixture
+def make_utils(ocr_module, monkeypatch):
+    """创建截图、点击和识别都由 StubScreen 提供的 OCRUtils（引擎为未连接的远程客户端，不加载模型）"""
+
+    def factory(screen, **kwargs):
+        monkeypatch.setattr(G, "DEVICE", screen)
+        monkeypatch.setattr(ocr_module, "touch", screen.touch)
+        monkeypatch.setattr(ocr_module, "swipe", lambda *args, **kw: None)
+        monkeypatch.setattr(ocr_module.time, "sleep", lambda seconds: None)
+        utils = ocr_module.OCRUtils(server="127.0.0.1:1", warmup=False, **kwargs)
+        monkeypatch.setattr(utils, "_recognize_frame",
+                            lambda image, region, debug, path: screen.recognize(image, region))
+        return utils
+
+    return factory
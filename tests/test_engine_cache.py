@@ -0,0 +1,57 @@
+"""多语言引擎缓存：基础语言复用已加载的引擎"""
+
+import importlib
+
+import pytest
+
+from airtest_ocr_utils import engine_cache
+from airtest_ocr_utils.model_profiles import resolved
+
+
+class StubPaddle:
+    def __init__(self, lang):
+        self.lang = lang
+        self.text_detector = object()
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """缓存加载的引擎（语言列表）"""
+    loaded = []
+
+    def create_engine(profile, lang='ch', **kwargs):
+        loaded.append(lang)
+        return StubPaddle(lang)
+
+    monkeypatch.setattr(engine_cache, "create_engine", create_engine)
+    return loaded
+
+
+@pytest.mark.parametrize("share_detector", ['all', 'family'])
+def test_watcher_base_language_reuses_watcher_engine(loads, monkeypatch, share_detector):
+    module = importlib.import_module("airtest_ocr_utils.ocr_watcher")
+    base = StubPaddle('ch')
+    monkeypatch.setattr(module, "load_engine_async", lambda profile, lang='ch', **kwargs: resolved(base))
+    watcher = module.OcrWatcher(device=object(), ocr_engine=module.AirtestOcrEngine(lang='ch'))
+    cache = watcher.enable_languages(share_detector=share_detector)
+    # 基础语言（及'all'模式下其他语言的检测器）就是监控引擎已加载的模型
+    with cache.engine('ch') as ocr:
+        assert ocr is base
+    if share_detector == 'all':
+        assert cache.detector_lang('en') == 'ch'
+    with cache.engine('en') as ocr:
+        assert ocr.lang == 'en'
+    assert loads == ['en']
+    cache.clear()
+    with cache.engine('ch') as ocr:
+        assert ocr is base
+    assert loads == ['en']
+
+
+def test_custom_engine_has_no_base_pool(loads):
+    module = importlib.import_module("airtest_ocr_utils.ocr_watcher")
+    watcher = module.OcrWatcher(device=object(), ocr_engine=object())
+    cache = watcher.enable_languages()
+    with cache.engine('ch'):
+        pass
+    assert loads == ['ch']
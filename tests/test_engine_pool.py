@@ -0,0 +1,143 @@
+"""引擎池：多线程借用时的数量上限、排队顺序、异常归还和调整大小"""
+
+import itertools
+import threading
+import time
+
+import pytest
+
+from airtest_ocr_utils.engine_pool import EnginePool
+
+
+class Factory:
+    """桩引擎工厂：每个引擎是一个递增编号"""
+
+    def __init__(self, fail_first: int = 0):
+        self.ids = itertools.count()
+        self.fail_first = fail_first
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            if self.calls <= self.fail_first:
+                raise RuntimeError("model load failed")
+            return next(self.ids)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_size_bound_under_contention():
+    factory = Factory()
+    pool = EnginePool(factory, size=2)
+    in_use, lock = set(), threading.Lock()
+    peak, errors = [0], []
+
+    def worker():
+        for _ in range(50):
+            with pool.engine() as engine:
+                with lock:
+                    if engine in in_use:
+                        errors.append(engine)
+                    in_use.add(engine)
+                    peak[0] = max(peak[0], len(in_use))
+                time.sleep(0.0002)
+                with lock:
+                    in_use.discard(engine)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors  # 同一引擎不会同时借给两个线程
+    assert peak[0] <= 2
+    assert factory.calls == 2
+    stats = pool.get_stats()
+    assert stats['acquisitions'] == 400 and stats['created'] == 2 and stats['idle'] == 2
+
+
+def test_waiters_served_in_arrival_order():
+    pool = EnginePool(Factory(), size=1)
+    held = pool.acquire()
+    order = []
+
+    def worker(i):
+        with pool.engine():
+            order.append(i)
+
+    threads = []
+    for i in range(5):
+        t = threading.Thread(target=worker, args=(i,))
+        t.start()
+        threads.append(t)
+        wait_until(lambda: pool.get_stats()['waiting'] == i + 1)
+    pool.release(held)
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_engine_returned_when_body_raises():
+    factory = Factory()
+    pool = EnginePool(factory, size=1)
+    with pytest.raises(ValueError):
+        with pool.engine():
+            raise ValueError("recognition failed")
+    assert pool.get_stats()['idle'] == 1
+    with pool.engine(timeout=0.1) as engine:
+        assert engine == 0
+    assert factory.calls == 1
+
+
+def test_failed_creation_frees_slot():
+    pool = EnginePool(Factory(fail_first=1), size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.get_stats()['created'] == 0
+    assert pool.acquire(timeout=0.1) == 0
+
+
+def test_timeout_leaves_queue():
+    pool = EnginePool(Factory(), size=1)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    stats = pool.get_stats()
+    assert stats['waiting'] == 0 and stats['timeouts'] == 1
+    pool.release(held)
+    assert pool.acquire(timeout=0.1) == held
+
+
+def test_shrink_while_checked_out():
+    pool = EnginePool(Factory(), size=2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.resize(1)
+    pool.release(a)  # 超出新上限的引擎归还时丢弃
+    assert pool.get_stats()['created'] == 1 and pool.get_stats()['idle'] == 0
+    pool.release(b)
+    stats = pool.get_stats()
+    assert stats['created'] == 1 and stats['idle'] == 1
+
+
+def test_grow_wakes_waiter():
+    factory = Factory()
+    pool = EnginePool(factory, size=1)
+    held = pool.acquire()
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.acquire(timeout=2)))
+    t.start()
+    wait_until(lambda: pool.get_stats()['waiting'] == 1)
+    pool.resize(2)
+    t.join()
+    # 排队的线程直接创建第二个引擎，不必等held归还
+    assert got == [1] and factory.calls == 2
+    pool.release(held)
+    pool.release(got[0])
+    assert pool.get_stats()['idle'] == 2
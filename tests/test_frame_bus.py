@@ -0,0 +1,53 @@
+"""画面总线：点击、滑动等操作后不再复用操作前的画面和识别结果"""
+
+import threading
+
+import numpy as np
+
+from airtest_ocr_utils.frame_bus import FrameBus
+from conftest import StubScreen, make_results
+
+PAGES = {
+    'start': make_results(("下一步", (100, 100, 180, 130))),
+    'done': make_results(("完成", (100, 100, 160, 130))),
+}
+
+
+def test_touch_invalidates_bus(make_utils):
+    screen = StubScreen(PAGES, 'start', {'start': 'done'})
+    utils = make_utils(screen, frame_bus=FrameBus(), frame_max_age=60)
+    assert utils.ocr_touch("下一步", timeout=1)
+    assert screen.page == 'done'
+    # 总线上的画面仍在有效期内，但它是点击前的画面
+    assert utils.ocr_find_text("下一步", timeout=0.2) is None
+    assert utils.ocr_find_text("完成", timeout=0.2) is not None
+
+
+def test_bus_reused_without_action(make_utils):
+    screen = StubScreen(PAGES, 'start')
+    utils = make_utils(screen, frame_bus=FrameBus(), frame_max_age=60)
+    assert utils.ocr_find_text("下一步", timeout=0.2) is not None
+    assert utils.ocr_find_text("下一步", timeout=0.2) is not None
+    assert screen.snapshots == 1
+    assert screen.recognitions == 1
+
+
+def test_clear_drops_capture_in_flight():
+    bus = FrameBus()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_capture():
+        started.set()
+        release.wait(5)
+        return np.zeros((10, 10, 3), np.uint8)
+
+    frames = []
+    worker = threading.Thread(target=lambda: frames.append(bus.frame(60, slow_capture)))
+    worker.start()
+    started.wait(5)
+    bus.clear()  # 截图期间执行了操作
+    release.set()
+    worker.join(5)
+    assert frames[0] is not None
+    # 操作前开始的截图只交给发起者，不作为最新画面共享
+    assert bus.latest() is None
@@ -0,0 +1,42 @@
+"""模型配置档：识别模型只用于其适用的语言"""
+
+import pytest
+
+from airtest_ocr_utils.model_profiles import ModelProfile, create_engine, get_profile
+
+
+def test_server_rec_model_only_for_chinese():
+    profile = get_profile('server')
+    ch = profile.paddle_kwargs(lang='ch')
+    assert ch['rec_model_dir'] == profile.rec_model_dir
+    assert ch['det_model_dir'] == profile.det_model_dir
+    en = profile.paddle_kwargs(lang='en')
+    # 中文识别模型不能配英文字符字典：其他语言使用PaddleOCR默认识别模型，检测模型共用
+    assert 'rec_model_dir' not in en
+    assert en['det_model_dir'] == profile.det_model_dir
+    assert en['lang'] == 'en'
+
+
+def test_rec_langs_default_applies_to_all_languages():
+    profile = ModelProfile('custom', rec_model_dir='/models/rec')
+    assert profile.paddle_kwargs(lang='japan')['rec_model_dir'] == '/models/rec'
+
+
+def test_rec_langs_round_trip():
+    profile = ModelProfile.from_dict(get_profile('server').to_dict())
+    assert profile.rec_langs == ('ch',)
+    assert 'rec_model_dir' not in profile.model_dirs('korean')
+
+
+def test_create_engine_checks_only_dirs_used_by_lang(tmp_path, monkeypatch):
+    det = tmp_path / "det"
+    det.mkdir()
+    profile = ModelProfile('partial', det_model_dir=str(det), rec_model_dir=str(tmp_path / "missing"),
+                           rec_langs=['ch'])
+    with pytest.raises(FileNotFoundError):
+        create_engine(profile, lang='ch')
+    created = []
+    paddleocr = pytest.importorskip("paddleocr")
+    monkeypatch.setattr(paddleocr, "PaddleOCR", lambda **kwargs: created.append(kwargs) or object())
+    create_engine(profile, lang='en')
+    assert created and 'rec_model_dir' not in created[0]
@@ -0,0 +1,158 @@
+"""列式结果集：与原来逐条字典处理的结果一致，导出格式可往返，空结果集的边界情况"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from airtest_ocr_utils.ocr_results import OcrResult, OcrResultSet
+from conftest import make_results
+
+
+def paddle_lines(count=40, seed=1):
+    """PaddleOCR单张图片输出格式的随机结果（整数坐标，略微倾斜的四边形）"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        x, y = rng.randint(0, 1000), rng.randint(0, 2000)
+        w, h, skew = rng.randint(20, 200), rng.randint(10, 40), rng.randint(-3, 3)
+        points = [[x, y], [x + w, y + skew], [x + w, y + h + skew], [x, y + h]]
+        lines.append([points, (f"文字{i}", round(rng.uniform(0.3, 1.0), 4))])
+    return lines
+
+
+def legacy_format(lines, region=None):
+    """原 ocr_recognize 的逐条格式化：中心为四个角点的平均，区域截图时加上区域偏移"""
+    formatted = []
+    for line in lines:
+        text, confidence = line[1]
+        points = line[0]
+        center_x = sum(point[0] for point in points) / 4
+        center_y = sum(point[1] for point in points) / 4
+        if region:
+            x1, y1 = region[:2]
+            center_x += x1
+            center_y += y1
+            points = [(point[0] + x1, point[1] + y1) for point in points]
+        formatted.append({'text': text, 'confidence': confidence, 'points': [tuple(p) for p in points],
+                          'center': (center_x, center_y)})
+    return formatted
+
+
+def legacy_in_region(item, region):
+    """原 OcrWatcher._in_region：外接矩形中心在区域内"""
+    xs = [p[0] for p in item['points']]
+    ys = [p[1] for p in item['points']]
+    cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+    return region[0] <= cx <= region[2] and region[1] <= cy <= region[3]
+
+
+def assert_same(results, expected):
+    dicts = results.to_dicts()
+    assert [d['text'] for d in dicts] == [e['text'] for e in expected]
+    for got, want in zip(dicts, expected):
+        assert got['confidence'] == pytest.approx(want['confidence'])
+        assert got['points'] == pytest.approx(want['points'])
+        assert got['center'] == pytest.approx(want['center'])
+        assert got['bbox'] == got['points']
+
+
+@pytest.mark.parametrize("region", [None, (100, 300, 900, 1500)])
+def test_from_paddle_matches_legacy_format(region):
+    lines = paddle_lines()
+    results = OcrResultSet.from_paddle(lines, offset=region[:2] if region else None)
+    assert_same(results, legacy_format(lines, region))
+
+
+def test_filter_confidence_matches_legacy():
+    lines = paddle_lines()
+    results = OcrResultSet.from_paddle(lines)
+    expected = [d for d in legacy_format(lines) if d['confidence'] >= 0.7]
+    assert_same(results.filter_confidence(0.7), expected)
+    assert results.filter_confidence(None) is results
+
+
+def test_in_region_matches_legacy():
+    lines = paddle_lines()
+    results = OcrResultSet.from_paddle(lines)
+    region = (200, 400, 800, 1600)
+    expected = [d for d in legacy_format(lines) if legacy_in_region(d, region)]
+    assert expected  # 区域内有结果，比较才有意义
+    assert_same(results.in_region(region), expected)
+    assert results.in_region(None) is results
+
+
+def test_nearest_matches_legacy_sort():
+    lines = paddle_lines()
+    results = OcrResultSet.from_paddle(lines)
+    target = (500, 1000)
+    expected = sorted(legacy_format(lines), key=lambda d: math.hypot(d['center'][0] - target[0],
+                                                                     d['center'][1] - target[1]))
+    assert_same(results.nearest(target), expected)
+    assert_same(results.nearest(target, k=3), expected[:3])
+    within = [d for d in expected if math.hypot(d['center'][0] - target[0], d['center'][1] - target[1]) <= 400]
+    assert_same(results.nearest(target, max_distance=400), within)
+
+
+def test_take_and_offset():
+    results = OcrResultSet.from_paddle(paddle_lines(10))
+    bboxes = results.bboxes  # 已缓存的派生列随子集一起取
+    subset = results.take(np.array([7, 2, 5]))
+    assert subset.texts.tolist() == ["文字7", "文字2", "文字5"]
+    assert np.array_equal(subset.bboxes, bboxes[[7, 2, 5]])
+    mask = results.confidences > 0.5
+    assert results.take(mask).texts.tolist() == [t for t, m in zip(results.texts, mask) if m]
+    assert results[2:4].texts.tolist() == ["文字2", "文字3"]
+    assert results[-1] == results.result(len(results) - 1)
+
+    moved = results.offset(10, -5)
+    assert np.array_equal(moved.points, results.points + np.float32([10, -5]))
+    assert np.array_equal(moved.centers, results.centers + np.float32([10, -5]))
+    assert results.offset(0, 0) is results
+
+
+def test_paddle_round_trip():
+    lines = paddle_lines(10)
+    results = OcrResultSet.from_paddle(lines)
+    again = OcrResultSet.from_paddle(results.to_paddle())
+    assert again.texts.tolist() == results.texts.tolist()
+    assert np.array_equal(again.points, results.points)
+    assert np.allclose(again.confidences, results.confidences)
+    assert [line[1][0] for line in results.to_paddle()] == [line[1][0] for line in lines]
+
+
+def test_dicts_and_results_round_trip():
+    results = make_results(("设置", (10, 20, 60, 40)), ("关于", (10, 80, 60, 100)))
+    for items in (results.to_dicts(), results.to_results()):
+        again = OcrResultSet.from_results(items)
+        assert again.texts.tolist() == ["设置", "关于"]
+        assert np.array_equal(again.points, results.points)
+        assert np.allclose(again.confidences, results.confidences)
+    first = results.result(0)
+    assert isinstance(first, OcrResult)
+    assert first.bbox == (10, 20, 60, 40) and first.center == (35.0, 30.0)
+    assert OcrResultSet.coerce(results.to_results()).texts.tolist() == ["设置", "关于"]
+    assert OcrResultSet.coerce(results) is results
+
+
+def test_empty_set():
+    empty = OcrResultSet.empty()
+    assert len(empty) == 0 and not empty
+    assert empty.bboxes.shape == (0, 4) and empty.centers.shape == (0, 2)
+    assert len(empty.filter_confidence(0.5)) == 0
+    assert len(empty.in_region((0, 0, 10, 10))) == 0
+    assert len(empty.nearest((0, 0), k=1)) == 0
+    assert len(empty.filter_text(lambda t: True)) == 0
+    assert len(empty.sort_by_confidence()) == 0
+    assert len(empty.offset(5, 5)) == 0
+    assert empty.to_dicts() == [] and empty.to_paddle() == [] and list(empty) == []
+    assert len(OcrResultSet.from_paddle(None)) == 0
+    assert len(OcrResultSet.from_paddle([])) == 0
+    assert len(OcrResultSet.from_results([])) == 0
+    assert len(OcrResultSet.coerce(None)) == 0
+    assert len(OcrResultSet.concat([empty, empty])) == 0
+    # 空集参与拼接时不影响结果
+    one = make_results(("确定", (0, 0, 10, 10)))
+    assert OcrResultSet.concat([empty, one, empty]) is one
+    assert OcrResultSet.concat([one, one]).texts.tolist() == ["确定", "确定"]
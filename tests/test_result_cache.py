@@ -0,0 +1,84 @@
+"""OcrResultCache 缓存键：布局相同但文字不同的画面不能命中"""
+
+import cv2
+import numpy as np
+import pytest
+
+from airtest_ocr_utils.ocr_results import OcrResultSet
+from airtest_ocr_utils.result_cache import OcrResultCache, content_hash
+
+
+def render(text, size=(1080, 1920)):
+    frame = np.full(size + (3,), 255, np.uint8)
+    cv2.rectangle(frame, (600, 400), (1320, 680), (40, 40, 40), -1)
+    cv2.putText(frame, text, (700, 560), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
+    return frame
+
+
+def results(text):
+    points = np.array([[[700, 530], [1000, 530], [1000, 570], [700, 570]]], np.float32)
+    return OcrResultSet(points, [0.95], [text])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = OcrResultCache(str(tmp_path / "cache.sqlite3"), validate_ratio=0)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize("a, b", [("Skip in 3s", "Skip in 2s"), ("Balance: 1,024.00", "Balance: 9,876.55")])
+def test_different_text_same_layout_misses(cache, a, b):
+    frame_a, frame_b = render(a), render(b)
+    assert content_hash(frame_a) != content_hash(frame_b)
+
+    calls = []
+
+    def recognize(text):
+        calls.append(text)
+        return results(text)
+
+    assert cache.recognize(frame_a, lambda: recognize(a)).texts.tolist() == [a]
+    assert cache.recognize(frame_b, lambda: recognize(b)).texts.tolist() == [b]
+    assert calls == [a, b]
+    assert cache.get_stats()['misses'] == 2
+
+
+def test_identical_frame_hits(cache):
+    frame = render("Skip in 3s")
+    calls = []
+    cache.recognize(frame, lambda: calls.append(1) or results("Skip in 3s"))
+    cached = cache.recognize(frame.copy(), lambda: calls.append(1) or results("Skip in 3s"))
+    assert len(calls) == 1
+    assert cached.texts.tolist() == ["Skip in 3s"]
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_key_includes_region_and_engine(cache):
+    frame = render("OK")
+    key = cache.make_key(frame, (0, 0, 100, 100), "engine-a")
+    assert key != cache.make_key(frame, (0, 0, 100, 200), "engine-a")
+    assert key != cache.make_key(frame, (0, 0, 100, 100), "engine-b")
+
+
+def test_results_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    frame = render("Balance: 1,024.00")
+    first = OcrResultCache(path, validate_ratio=0)
+    first.recognize(frame, lambda: results("Balance: 1,024.00"))
+    first.close()
+    second = OcrResultCache(path, validate_ratio=0)
+    try:
+        assert second.recognize(render("Balance: 9,876.55"), lambda: results("new")).texts.tolist() == ["new"]
+        assert second.recognize(frame, lambda: results("new")).texts.tolist() == ["Balance: 1,024.00"]
+    finally:
+        second.close()
+
+
+def test_validation_detects_moved_boxes(cache):
+    frame = render("OK")
+    cache.recognize(frame, lambda: results("OK"))
+    cache.validate_ratio = 1.0
+    moved = results("OK").offset(0, 50)
+    assert cache.recognize(frame, lambda: moved).bboxes.tolist() == moved.bboxes.tolist()
+    assert cache.get_stats()['stale'] == 1
@@ -0,0 +1,71 @@
+"""滚动查找：两帧之间滚动距离的估计和已见文字的去重"""
+
+import numpy as np
+import pytest
+
+from airtest_ocr_utils.scroll_search import ScrollIndex, estimate_scroll, row_profile
+from conftest import make_results
+
+HEIGHT = 240
+
+
+def content(height=1200, width=120, seed=7):
+    """纵向纹理各不相同的长页面"""
+    rng = np.random.default_rng(seed)
+    page = np.repeat(rng.integers(0, 256, (height, 1, 1), dtype=np.uint8), width, axis=1)
+    page[:, ::7] = rng.integers(0, 256, (height, 1, 1), dtype=np.uint8)
+    return np.repeat(page, 3, axis=2)
+
+
+def window(page, top):
+    return row_profile(page[top:top + HEIGHT])
+
+
+@pytest.mark.parametrize("shift", [1, 37, 120, 200])
+def test_scroll_up(shift):
+    page = content()
+    distance, score = estimate_scroll(window(page, 300), window(page, 300 + shift), 'up')
+    assert distance == shift
+    assert score > 0.99
+
+
+def test_scroll_down():
+    page = content()
+    distance, _ = estimate_scroll(window(page, 300), window(page, 300 - 80), 'down')
+    assert distance == 80
+
+
+def test_unchanged_frame():
+    page = content()
+    assert estimate_scroll(window(page, 300), window(page, 300)) == (0, 1.0)
+
+
+def test_repeated_items_prefer_expected_distance():
+    # 每40行重复一次的列表项：10、50、90……都同样吻合，按滑动距离选50
+    item = content(40, seed=3)
+    page = np.concatenate([item] * 30)
+    prev, cur = window(page, 200), window(page, 250)
+    distance, _ = estimate_scroll(prev, cur, 'up', expected=48)
+    assert distance == 50
+    distance, _ = estimate_scroll(prev, cur, 'up')
+    assert distance % 40 == 10
+
+
+def test_no_texture_or_size_change():
+    blank = np.full((HEIGHT, 120, 3), 128, np.uint8)
+    page = content()
+    assert estimate_scroll(row_profile(blank), window(page, 0))[0] is None
+    assert estimate_scroll(window(page, 0), row_profile(page[:HEIGHT - 10]))[0] is None
+    with pytest.raises(ValueError):
+        estimate_scroll(window(page, 0), window(page, 10), 'left')
+
+
+def test_scroll_index_deduplicates_by_content_position():
+    index = ScrollIndex()
+    first = index.add(make_results(("设置", (10, 100, 60, 120)), ("关于", (10, 200, 60, 220))), offset=0)
+    assert len(first) == 2
+    # 滚动100像素后，"关于"出现在屏幕100处（内容坐标200），是同一条；新的"设置"在内容坐标300
+    second = index.add(make_results(("关于", (10, 100, 60, 120)), ("设置", (10, 200, 60, 220))), offset=100)
+    assert second.texts.tolist() == ["设置"]
+    assert index.texts() == ["设置", "关于", "设置"]
+    assert "关于" in index and "帮助" not in index
@@ -0,0 +1,99 @@
+"""画面稳定等待：连续帧不变才交给识别，上一帧只在键（区域）相同时复用"""
+
+import numpy as np
+import pytest
+
+from airtest_ocr_utils import screen_change
+from airtest_ocr_utils.screen_change import StabilityGate
+from conftest import StubScreen, make_results
+
+
+class Frames:
+    """按顺序返回给定灰度的画面，用完后重复最后一帧"""
+
+    def __init__(self, *levels, shape=(60, 80)):
+        self.levels = list(levels)
+        self.shape = shape
+        self.calls = 0
+
+    def __call__(self):
+        level = self.levels[min(self.calls, len(self.levels) - 1)]
+        self.calls += 1
+        return np.full(self.shape + (3,), level, np.uint8)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(screen_change.time, "sleep", lambda seconds: None)
+
+
+def test_static_frame_needs_frames_captures():
+    gate = StabilityGate(frames=2)
+    capture = Frames(50)
+    assert gate.wait(capture) is not None
+    assert capture.calls == 2
+    assert gate.get_stats()['skipped'] == 0
+
+
+def test_changing_frames_are_skipped():
+    gate = StabilityGate(frames=2)
+    capture = Frames(50, 120, 200, 200)
+    frame = gate.wait(capture)
+    assert capture.calls == 4
+    assert int(frame[0, 0, 0]) == 200
+    assert gate.get_stats()['skipped'] == 2
+
+
+def test_timeout_returns_last_frame():
+    gate = StabilityGate(frames=2, max_wait=0.05)
+    capture = Frames(*([0, 255] * 100000))
+    assert gate.wait(capture) is not None
+    assert gate.get_stats()['timeouts'] == 1
+
+
+def test_history_reused_only_for_same_key():
+    gate = StabilityGate(frames=2)
+    first = Frames(50)
+    gate.wait(first, key=(0, 0, 80, 60))
+    again = Frames(50)
+    gate.wait(again, key=(0, 0, 80, 60))
+    assert again.calls == 1
+    # 另一区域的截图内容相同，但不能用上一区域的最后一帧确认稳定
+    other = Frames(50)
+    gate.wait(other, key=(100, 0, 180, 60))
+    assert other.calls == 2
+
+
+def test_region_is_default_key():
+    gate = StabilityGate(frames=2)
+    gate.wait(Frames(50), region=(0, 0, 40, 30))
+    same = Frames(50)
+    gate.wait(same, region=(0, 0, 40, 30))
+    assert same.calls == 1
+    full = Frames(50)
+    gate.wait(full)
+    assert full.calls == 2
+
+
+def test_reset_requires_new_confirmation():
+    gate = StabilityGate(frames=2)
+    gate.wait(Frames(50))
+    gate.reset()
+    capture = Frames(50)
+    gate.wait(capture)
+    assert capture.calls == 2
+
+
+def test_region_captures_keyed_by_requested_region(make_utils):
+    pages = {'home': make_results(("设置", (10, 10, 60, 40)), ("消息", (110, 10, 160, 40)))}
+    screen = StubScreen(pages, 'home')
+    utils = make_utils(screen)
+    utils.enable_stability(frames=2)
+    assert utils.ocr_find_text("设置", region=(0, 0, 100, 50), timeout=0.2) is not None
+    assert screen.snapshots == 2
+    # 同样大小的另一区域：重新确认稳定
+    assert utils.ocr_find_text("消息", region=(100, 0, 200, 50), timeout=0.2) is not None
+    assert screen.snapshots == 4
+    # 同一区域：复用上一帧
+    assert utils.ocr_find_text("消息", region=(100, 0, 200, 50), timeout=0.2) is not None
+    assert screen.snapshots == 5
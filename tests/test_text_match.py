@@ -0,0 +1,83 @@
+"""fuzzy 匹配：按目标长度限定错字数"""
+
+from collections import defaultdict
+
+import pytest
+
+import airtest_ocr_utils.text_match as matching
+from airtest_ocr_utils.text_match import NgramIndex, fuzzy_max_edits, fuzzy_score, text_match
+
+
+@pytest.mark.parametrize("text, target", [
+    ("确走", "确定"),
+    ("0K", "OK"),
+    ("确认支忖", "确认支付"),
+    ("请点击确走按钮", "确定"),
+    ("网络连揍失败", "网络连接失败"),
+    ("网络连接失败了", "网络连接失败"),
+])
+def test_fuzzy_matches_ocr_typos(text, target):
+    assert text_match(text, target, 'fuzzy')
+
+
+@pytest.mark.parametrize("text, target", [
+    ("定位", "确定"),   # 只共享一个字
+    ("确", "确定"),     # 少字
+    ("定", "确定"),
+    ("取消", "确定"),
+    ("确认", "确定"),   # 只差一个字的另一个按钮
+    ("决定", "确定"),
+    ("设定", "确定"),
+    ("请点击确认按钮", "确定"),
+    ("OX", "OK"),
+    ("X", "O"),         # 1个字的目标不允许错字
+    ("确认支", "确认支付"),
+])
+def test_fuzzy_rejects_other_labels(text, target):
+    assert not text_match(text, target, 'fuzzy')
+
+
+def test_max_edits_by_length():
+    assert [fuzzy_max_edits("x" * n) for n in (1, 2, 4, 5, 10, 11)] == [0, 1, 1, 1, 2, 3]
+    # 显式指定时至少保留一个相同的字
+    assert fuzzy_max_edits("确定", max_edits=5) == 1
+
+
+def test_short_target_substitution_is_opt_in():
+    assert not text_match("确认", "确定", 'fuzzy')
+    assert text_match("确认", "确定", 'fuzzy', max_edits=1)
+    assert not text_match("确认", "确定", 'fuzzy', max_edits=0)
+    # 4个字的目标默认允许任意一个字的替换
+    assert text_match("确认支忖", "确认支付", 'fuzzy')
+    assert text_match("确认支柱", "确认支付", 'fuzzy')
+
+
+def test_added_confusions(monkeypatch):
+    monkeypatch.setattr(matching, "_confusions", defaultdict(set))
+    assert not text_match("眼晴", "眼睛", 'fuzzy')
+    matching.add_ocr_confusions(["晴睛"])
+    assert text_match("眼晴", "眼睛", 'fuzzy')
+    assert not text_match("确走", "确定", 'fuzzy')
+
+
+def test_score_prefers_fewer_edits():
+    assert fuzzy_score("确定", "确定") == 1.0
+    assert fuzzy_score("确走", "确定") == 0.5
+    assert fuzzy_score("定位", "确定") == 0.0
+
+
+def test_index_best_match():
+    index = NgramIndex(["确定", "取消"])
+    assert index.best_match("确走") == ("确定", 0.5)
+    assert index.best_match("定位") is None
+    assert index.best_match("确认") is None
+    assert NgramIndex(["确定", "取消"], max_edits=1).best_match("取清") == ("取消", 0.5)
+
+
+def test_index_prefilter_keeps_true_matches():
+    keywords = ["网络连接失败", "确认支付", "重新加载页面", "OK"]
+    index = NgramIndex(keywords)
+    for text, expected in [("网络连揍失败", "网络连接失败"), ("确认支忖", "确认支付"), ("0K", "OK"),
+                           ("重新加栽页面", "重新加载页面")]:
+        assert index.best_match(text)[0] == expected
+    assert index.best_match("设置") is None
@@ -0,0 +1,109 @@
+"""画面文字状态与事件规则：出现/消失确认、冷却期间跳过的文字在冷却结束后触发"""
+
+import importlib
+
+import pytest
+
+from airtest_ocr_utils.text_state import TextStateTracker
+from conftest import make_results
+
+ALLOW = ("允许", (100, 100, 160, 130))
+DENY = ("拒绝", (200, 100, 260, 130))
+
+
+def test_tracker_keeps_id_across_jitter():
+    state = TextStateTracker()
+    first = state.update(make_results(ALLOW), now=0.0)
+    assert [t.text for t in first.appeared] == ["允许"]
+    track_id = first.appeared[0].id
+    # 位置轻微移动、识别抖动成相似文字时仍是同一条文字，不产生新事件
+    changes = state.update(make_results(("允许", (102, 101, 162, 131))), now=1.0)
+    assert not changes
+    assert [t.id for t in state.tracks()] == [track_id]
+
+
+def test_tracker_confirms_disappearance():
+    state = TextStateTracker(disappear_after=2)
+    track_id = state.update(make_results(ALLOW), now=0.0).appeared[0].id
+    assert not state.update(make_results(), now=1.0)
+    changes = state.update(make_results(), now=2.0)
+    assert [t.id for t in changes.disappeared] == [track_id]
+    assert state.removed(track_id) is not None
+    assert state.get(track_id) is None
+
+
+def test_tracker_ignores_text_outside_region():
+    state = TextStateTracker(disappear_after=1)
+    state.update(make_results(ALLOW, DENY), now=0.0)
+    # 本次只识别了右半部分：左侧的"允许"不算未看到
+    changes = state.update(make_results(DENY), region=(180, 0, 400, 300), now=1.0)
+    assert not changes
+    assert sorted(t.text for t in state.tracks()) == ["允许", "拒绝"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    """回调在当前线程执行、时间可控的 OcrWatcher（引擎不会被调用）"""
+    module = importlib.import_module("airtest_ocr_utils.ocr_watcher")
+    clock = Clock()
+    monkeypatch.setattr(module.time, "time", clock)
+    watcher = module.OcrWatcher(device=object(), ocr_engine=object())
+    watcher.set_callback_executor(None)
+    watcher.clock = clock
+    return watcher
+
+
+def test_on_appear_fires_once_per_appearance(watcher):
+    fired = []
+    watcher.when("允许").on_appear().call(lambda result, device: fired.append(result.text))
+    rules = watcher._watchers
+    watcher._match_rules(rules, make_results(ALLOW))
+    watcher._match_rules(rules, make_results(ALLOW))
+    assert fired == ["允许"]
+    # 消失（连续两轮未看到）后再次出现
+    watcher._match_rules(rules, make_results())
+    watcher._match_rules(rules, make_results())
+    watcher._match_rules(rules, make_results(ALLOW))
+    assert fired == ["允许", "允许"]
+
+
+def test_appear_skipped_by_cooldown_fires_later(watcher):
+    fired = []
+    watcher.when("允许").when("拒绝").on_appear().cooldown(5).call(lambda result, device: fired.append(result.text))
+    rules = watcher._watchers
+    watcher._match_rules(rules, make_results(ALLOW, DENY))
+    assert len(fired) == 1
+    watcher.clock.now += 1
+    watcher._match_rules(rules, make_results(ALLOW, DENY))
+    assert len(fired) == 1
+    # 冷却结束：冷却期间未派发的另一条文字仍在屏幕上，此时触发
+    watcher.clock.now += 5
+    watcher._match_rules(rules, make_results(ALLOW, DENY))
+    assert sorted(fired) == ["允许", "拒绝"]
+    watcher.clock.now += 10
+    watcher._match_rules(rules, make_results(ALLOW, DENY))
+    assert len(fired) == 2
+
+
+def test_disappear_skipped_by_cooldown_fires_later(watcher):
+    fired = []
+    watcher.when("允许").when("拒绝").on_disappear().cooldown(5).call(lambda result, device: fired.append(result.text))
+    rules = watcher._watchers
+    watcher._match_rules(rules, make_results(ALLOW, DENY))
+    watcher._match_rules(rules, make_results())
+    watcher._match_rules(rules, make_results())
+    assert len(fired) == 1
+    watcher.clock.now += 6
+    watcher._match_rules(rules, make_results())
+    assert sorted(fired) == ["允许", "拒绝"]
+    watcher.clock.now += 10
+    watcher._match_rules(rules, make_results())
+    assert len(fired) == 2
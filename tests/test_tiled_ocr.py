@@ -0,0 +1,48 @@
+"""分块识别：重叠区重复文字框的抑制和被图块边界截断的文字行拼接"""
+
+import numpy as np
+
+from airtest_ocr_utils.tiled_ocr import box_nms, join_cut_lines
+from conftest import make_results
+
+
+def test_box_nms_keeps_highest_priority():
+    boxes = np.array([[0, 0, 100, 20], [2, 1, 101, 21], [200, 0, 260, 20]])
+    keep = box_nms(boxes, np.array([0.5, 0.9, 0.7]))
+    assert keep.tolist() == [1, 2]
+
+
+def test_box_nms_suppresses_contained_box():
+    # 小框完全在大框内：交并比低，但被覆盖比例为1
+    boxes = np.array([[0, 0, 200, 20], [10, 2, 50, 18]])
+    assert box_nms(boxes, np.array([0.9, 0.95])).tolist() == [1]
+    assert box_nms(boxes, np.array([0.9, 0.95]), contain_threshold=1.1).tolist() == [1, 0]
+
+
+def test_box_nms_empty():
+    assert box_nms(np.zeros((0, 4)), np.zeros(0)).tolist() == []
+
+
+def test_join_cut_lines_removes_overlap_text():
+    results = make_results(("账户设置中", (0, 100, 100, 120)), ("设置中心", (60, 100, 140, 120)),
+                           ("返回", (0, 200, 40, 220)))
+    joined = join_cut_lines(results, np.array([True, True, False]))
+    assert sorted(joined.texts.tolist()) == ["账户设置中心", "返回"]
+    row = joined.texts.tolist().index("账户设置中心")
+    assert tuple(joined.bboxes[row]) == (0, 100, 140, 120)
+
+
+def test_join_cut_lines_uses_overlap_width_without_text_match():
+    results = make_results(("ABCD", (0, 0, 80, 20)), ("XYEF", (40, 0, 120, 20)))
+    joined = join_cut_lines(results, np.array([True, True]))
+    assert joined.texts.tolist() == ["ABCDEF"]
+
+
+def test_join_cut_lines_keeps_separate_lines():
+    results = make_results(("第一行", (0, 0, 60, 20)), ("第二行", (40, 40, 100, 60)),
+                           ("远处", (300, 0, 340, 20)))
+    joined = join_cut_lines(results, np.array([True, True, True]))
+    assert joined.texts.tolist() == ["第一行", "第二行", "远处"]
+    # 未被截断的文字不参与拼接
+    uncut = make_results(("账户设置中", (0, 100, 100, 120)), ("设置中心", (60, 100, 140, 120)))
+    assert len(join_cut_lines(uncut, np.array([False, True]))) == 2
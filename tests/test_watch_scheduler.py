@@ -0,0 +1,38 @@
+"""监控节奏调节：CPU预算只计监控线程自身的CPU时间"""
+
+import threading
+import time
+
+from airtest_ocr_utils.watch_scheduler import WatchGovernor
+
+
+def burn(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_other_thread_cpu_does_not_throttle():
+    governor = WatchGovernor(cpu_budget=0.25)
+    timer = governor.begin()
+    # 前台线程（如 ocr_utils 的识别）在监控的这一轮中占满CPU
+    foreground = threading.Thread(target=burn, args=(0.2,))
+    foreground.start()
+    foreground.join()
+    governor.end(timer)
+    assert governor.cpu_cost < 0.05
+    assert governor.min_gap() < 0.1
+    assert governor.throttle(0.0) < 0.1
+    assert governor.get_stats()['throttled'] == 0
+
+
+def test_own_cpu_is_throttled():
+    governor = WatchGovernor(cpu_budget=0.25)
+    timer = governor.begin()
+    burn(0.1)
+    governor.end(timer)
+    assert governor.cpu_cost >= 0.09
+    # 0.1秒CPU按25%预算需要约0.4秒的周期
+    assert governor.min_gap() > 0.2
+    assert governor.throttle(0.0) > 0.2
+    assert governor.get_stats()['throttled'] == 1